@@ -0,0 +1,169 @@
+"""
+Encoding of the JSON API responses: fast serialization, columnar shapes and compression.
+
+init_app() installs FastJSONProvider as the app's JSON provider, so every
+jsonify() call serializes with orjson when it is installed (falling back to
+Flask's json module otherwise), and registers an after_request hook that
+compresses JSON bodies with brotli (if installed) or gzip, as negotiated
+through Accept-Encoding. The JSON is equivalent to what Flask's default
+provider sends (compact instead of indented in debug mode, UTF-8 instead of
+ASCII escapes): keys are still sorted, and dates, UUIDs and dataclasses still go
+through Flask's default() conversion.
+
+The heatmap, index trend and industry status endpoints also accept
+?format=columnar, which returns one array per field aligned with a dates
+array instead of one object per month (see the to_columnar_* helpers).
+"""
+
+import os
+import gzip
+import json
+import logging
+from typing import Any, Dict, List, Optional
+
+from flask import request
+from flask.json.provider import DefaultJSONProvider
+
+from cache_utils import GenerationalCache
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+COMPRESS_MIN_BYTES = int(os.environ.get('ISM_COMPRESS_MIN_BYTES', 1024))  # Smaller JSON bodies are sent uncompressed (negative disables)
+GZIP_LEVEL = int(os.environ.get('ISM_GZIP_LEVEL', 6))  # zlib compression level, 1-9
+BROTLI_QUALITY = int(os.environ.get('ISM_BROTLI_QUALITY', 5))  # brotli quality, 0-11
+
+# No OPT_NON_STR_KEYS: orjson would sort integer keys (e.g. lagged_correlations) as strings,
+# so dicts with non-string keys fall back to the json module, which sorts them numerically
+_ORJSON_OPTIONS = orjson.OPT_SORT_KEYS | orjson.OPT_PASSTHROUGH_DATETIME if orjson is not None else 0
+
+# Compressed bodies of ETagged responses, so repeat requests served from the response cache skip recompression
+_compressed = GenerationalCache(128, name='compressed responses')
+
+
+def dumps(obj: Any) -> bytes:
+    """Compact JSON bytes for obj, as Flask's provider would produce them."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, default=DefaultJSONProvider.default, option=_ORJSON_OPTIONS)
+        except TypeError:
+            pass  # non-string keys or integers beyond 64 bits; the json module handles them
+    return json.dumps(obj, default=DefaultJSONProvider.default, sort_keys=True,
+                      separators=(',', ':')).encode('utf-8')
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider serializing with orjson when it is available."""
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return dumps(obj).decode('utf-8')
+
+    def response(self, *args: Any, **kwargs: Any):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps(obj), mimetype=self.mimetype)
+
+
+def negotiate_encoding() -> Optional[str]:
+    """'br', 'gzip' or None for the current request's Accept-Encoding."""
+    if COMPRESS_MIN_BYTES < 0:
+        return None
+    offered = ['br', 'gzip'] if brotli is not None else ['gzip']
+    return request.accept_encodings.best_match(offered)
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """Body compressed with 'br' or 'gzip'."""
+    if encoding == 'br':
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def compress_response(response):
+    """Compress a JSON response in place if the client accepts it and the body is large enough."""
+    if response.mimetype != 'application/json' or response.direct_passthrough or response.is_streamed:
+        return response
+    response.vary.add('Accept-Encoding')
+    if response.status_code != 200 or 'Content-Encoding' in response.headers:
+        return response
+    encoding = negotiate_encoding()
+    if encoding is None or (response.content_length or 0) < COMPRESS_MIN_BYTES:
+        return response
+
+    etag = response.headers.get('ETag')
+    body = _compressed.get((etag, encoding)) if etag else None
+    if body is None:
+        body = compress(response.get_data(), encoding)
+        if etag:
+            _compressed.set((etag, encoding), body)
+    response.set_data(body)
+    response.headers['Content-Encoding'] = encoding
+    return response
+
+
+def init_app(app):
+    """Serialize with FastJSONProvider and compress JSON responses for every request of a Flask app."""
+    app.json = FastJSONProvider(app)
+    app.after_request(compress_response)
+    logger.info(f"JSON encoding: {'orjson' if orjson is not None else 'json'}; "
+                f"compression: {'brotli, gzip' if brotli is not None else 'gzip'}")
+
+
+def wants_columnar() -> bool:
+    """True if the request asked for ?format=columnar."""
+    return request.args.get('format', '').lower() == 'columnar'
+
+
+def records_to_columns(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """[{a: 1, b: 2}, {a: 3, b: 4}] -> {'format': 'columnar', 'a': [1, 3], 'b': [2, 4]}."""
+    keys = list(rows[0]) if rows else []
+    return {'format': 'columnar', **{key: [row.get(key) for row in rows] for key in keys}}
+
+
+def to_columnar_heatmap(rows: List[Dict[str, Any]], report_type: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Heatmap months as aligned arrays: report_dates and month_years, plus
+    values and directions per index (None where a month lacks the index).
+    """
+    indices: Dict[str, Dict[str, List[Any]]] = {}
+    for position, row in enumerate(rows):
+        for index_name, entry in row.get('indices', {}).items():
+            columns = indices.setdefault(index_name, {'values': [None] * len(rows), 'directions': [None] * len(rows)})
+            columns['values'][position] = entry.get('value')
+            columns['directions'][position] = entry.get('direction')
+    return {
+        'format': 'columnar',
+        'report_type': rows[0].get('report_type') if rows else report_type,
+        'report_dates': [row.get('report_date') for row in rows],
+        'month_years': [row.get('month_year') for row in rows],
+        'indices': indices,
+    }
+
+
+def to_columnar_industry_status(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Industry status matrix as status, category and rank arrays per industry,
+    aligned with data['dates'] (None where the industry has no entry).
+    """
+    dates = data.get('dates', [])
+    industries = {}
+    for industry, by_date in data.get('industries', {}).items():
+        entries = [by_date.get(date) or {} for date in dates]
+        industries[industry] = {
+            'status': [entry.get('status') for entry in entries],
+            'category': [entry.get('category') for entry in entries],
+            'rank': [entry.get('rank') for entry in entries],
+        }
+    columnar = {key: value for key, value in data.items() if key != 'industries'}
+    columnar.update({'format': 'columnar', 'dates': dates, 'industries': industries})
+    return columnar
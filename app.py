@@ -19,27 +19,37 @@ os.makedirs("logs", exist_ok=True)
 os.makedirs("uploads", exist_ok=True)
 
 from auth import login_required, is_authenticated
-from flask import Flask, request, render_template, redirect, url_for, flash, session, jsonify
+from flask import Flask, request, render_template, redirect, url_for, flash, session, jsonify, Response
 from werkzeug.utils import secure_filename
 from werkzeug.middleware.proxy_fix import ProxyFix
-from main import process_single_pdf, process_multiple_pdfs
-from report_handlers import ReportTypeFactory
-from google_auth import get_google_sheets_service, get_google_auth_url, finish_google_auth
-from news_utils import ClaudeWebSearchEngine, create_source_url_mapping
-
-from news_utils import fetch_comprehensive_news_guaranteed_30_enhanced
-from company_ticker_service import fast_company_ticker_service as company_ticker_service
-from configuration_and_integration import ConfigurationManager, IntegrationHelper
+from jobs import JobQueue
+# Heavy dependencies (CrewAI via main, the news pipeline with its OpenAI and
+# Anthropic clients, the Google API clients) are imported by the routes that
+# use them, so starting a worker does not pay for them; see benchmarks/bench_startup.py
 
 # Database imports
-from db_utils import initialize_database, get_pmi_data_by_month, get_index_time_series, get_industry_status_over_time, get_all_indices, get_all_report_dates, get_db_connection
+from db_utils import initialize_database, ensure_database_initialized, get_pmi_data_by_month, get_index_time_series, get_industry_status_over_time, get_all_indices, get_all_report_dates, db_connection
 from config_loader import config_loader 
+from correlation_service import CorrelationAnalysisService
+import query_metrics
+from run_store import RunStore
+import api_encoding
+from api_encoding import records_to_columns, to_columnar_heatmap, to_columnar_industry_status, wants_columnar
+from http_cache import conditional_json
+from response_cache import cached_response
 from typing import List, Dict, Optional, Tuple
 
-from openai import OpenAI
+import importlib.util
 import jwt
 
-RUN_CACHE = {}  # In-memory cache - replace with Redis for production
+# News analysis runs for /chat, bounded and optionally persisted to SQLite (see run_store.py)
+RUN_CACHE = RunStore()
+
+# Background queue for upload ingestion jobs (see jobs.py)
+job_queue = JobQueue()
+
+# Shared correlation engine for the /api/correlations/* endpoints
+correlation_service = CorrelationAnalysisService()
 
 # Configure logging
 logging.basicConfig(
@@ -83,6 +93,30 @@ logger.info(f"✅ SECRET_KEY configured (first 10 chars: {app.secret_key[:10]}..
 app.wsgi_app = ProxyFix(app.wsgi_app, x_proto=1)
 logger.info("Flask app wrapped with ProxyFix.")
 
+# Most SQL statements each read endpoint may run per request (see query_metrics)
+QUERY_BUDGETS = {
+    'index': 3,
+    'dashboard': 4,
+    'api_heatmap_data': 1,
+    'get_index_trends': 1,
+    'get_industry_status': 1,
+    'get_industry_alphabetical': 1,
+    'get_industry_numerical': 1,
+    'get_indices_list': 1,
+    'get_report_types': 1,
+    'get_correlation_between_indices': 2,
+    'get_cross_report_correlations': 2,
+    'get_correlations_for_index': 2,
+}
+query_metrics.init_app(app, QUERY_BUDGETS)
+api_encoding.init_app(app)
+
+CORRELATION_CACHE_TTL = float(os.environ.get('ISM_CORRELATION_CACHE_TTL', 3600))  # Seconds correlation responses stay in the response cache
+
+# Create the database schema once at startup (before gunicorn forks workers
+# when --preload is used) instead of on every request
+initialize_database()
+
 # Set upload folder and maximum file size
 UPLOAD_FOLDER = 'uploads'
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
@@ -123,12 +157,8 @@ def allowed_file(filename):
     return '.' in filename and \
            filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
-# Check for anthropic availability (following existing pattern from news_utils.py)
-try:
-    import anthropic
-    ANTHROPIC_AVAILABLE = True
-except ImportError:
-    ANTHROPIC_AVAILABLE = False
+# Check for anthropic availability without importing it (chat() imports it when needed)
+ANTHROPIC_AVAILABLE = importlib.util.find_spec('anthropic') is not None
 
 def _build_source_map(articles):
     """Build source map for chatbot citations from articles list."""
@@ -301,6 +331,7 @@ def login():
         return redirect(url_for('suite_landing'))
     
     try:
+        from google_auth import get_google_auth_url
         # Get the auth URL
         auth_url = get_google_auth_url()
         if not auth_url:
@@ -335,7 +366,7 @@ def index():
         # Check if database is initialized and has data
         has_data = False
         try:
-            initialize_database()
+            ensure_database_initialized()
             dates = get_all_report_dates()
             has_data = len(dates) > 0
         except Exception as e:
@@ -363,8 +394,6 @@ def index():
         return redirect(url_for('upload_view'))
     
 # News Summarizer Code
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-
 @app.route("/news")
 @login_required
 def news_form():
@@ -379,6 +408,8 @@ def get_news_summary():
     CORRECTED V3 to handle UISections object with nested citations.
     """
     try:
+        from company_ticker_service import fast_company_ticker_service as company_ticker_service
+        from news_utils import fetch_comprehensive_news_guaranteed_30_enhanced
         company = request.form.get("company", "").strip()
         days_back = int(request.form.get("days_back", 7))
         
@@ -441,6 +472,8 @@ def get_news_summary():
 def api_news_summary(company):
     """API endpoint for enhanced 30-article analysis with guaranteed AlphaVantage representation."""
     try:
+        from company_ticker_service import fast_company_ticker_service as company_ticker_service
+        from news_utils import fetch_comprehensive_news_guaranteed_30_enhanced
         days_back = request.args.get('days', 7, type=int)
         
         # Validate input
@@ -513,7 +546,7 @@ def upload_view():
     # Check if database is initialized and has data
     has_data = False
     try:
-        initialize_database()
+        ensure_database_initialized()
         dates = get_all_report_dates()
         has_data = len(dates) > 0
     except Exception as e:
@@ -522,6 +555,7 @@ def upload_view():
     return render_template('index.html',
                           google_auth_ready=google_auth_ready,
                           has_data=has_data,
+                          job_id=request.args.get('job'),
                           active_page='ism')
 
 @app.route('/upload', methods=['POST'])
@@ -547,87 +581,87 @@ def upload_file():
     }
 
     results = {}
-    processed_successfully_count = 0
-    first_processed_report_type = None
 
-    # SIMPLIFIED: Process each file individually, even if multiple files
-    for file_idx, file in enumerate(files):
+    # Save every valid upload, then hand them to a background ingestion job
+    saved_files = []
+    for file in files:
         if file and allowed_file(file.filename):
             filename = secure_filename(file.filename)
             unique_filename = f"{uuid.uuid4()}_{filename}"
             filepath = os.path.join(app.config['UPLOAD_FOLDER'], unique_filename)
-            
             try:
                 file.save(filepath)
                 logger.info(f"File {filename} saved to {filepath}")
-
-                # Determine report type for the redirect (use the first file's type)
-                if first_processed_report_type is None:
-                    try:
-                        detected_type = ReportTypeFactory.detect_report_type(filepath)
-                        first_processed_report_type = detected_type
-                        logger.info(f"Detected report type for {filename} as {first_processed_report_type}")
-                    except Exception as e:
-                        logger.error(f"Could not detect report type for {filename}: {e}")
-                        first_processed_report_type = "Manufacturing" 
-
-                # Process each file individually
-                logger.info(f"Processing file: {filename} of type {first_processed_report_type}")
-                process_result = process_single_pdf(filepath, visualization_options)
-                
-                if process_result:
-                    results[filename] = "Success"
-                    processed_successfully_count += 1
-                    logger.info(f"Successfully processed {filename}")
-                else:
-                    results[filename] = "Failed"
-                    logger.error(f"Failed to process {filename}")
-
-                # Clean up the uploaded file immediately after processing
-                try:
-                    os.remove(filepath)
-                    logger.info(f"Removed uploaded file: {filepath}")
-                except OSError as e:
-                    logger.warning(f"Could not delete uploaded file {filepath}: {e}")
-
+                saved_files.append((filename, filepath))
             except Exception as e:
-                logger.error(f"Error processing {filename}: {str(e)}")
-                logger.error(f"Traceback: {traceback.format_exc()}")
+                logger.error(f"Error saving {filename}: {str(e)}")
                 results[filename] = f"Error: {str(e)}"
-                
-                # Try to clean up on error
-                try:
-                    if os.path.exists(filepath):
-                        os.remove(filepath)
-                except:
-                    pass
-
         elif file.filename:
             results[file.filename] = "File type not allowed"
 
-    # Flash messages for overall status
-    total_files = len(results)
-    if total_files > 0:
-        if processed_successfully_count == total_files:
-            flash("All files processed successfully!", "success")
-        elif processed_successfully_count > 0:
-            flash(f"Processing complete. {processed_successfully_count} succeeded, {total_files - processed_successfully_count} failed.", "warning")
-        else:
-            flash("File processing failed for all files.", "danger")
-    else:
+    wants_json = request.accept_mimetypes.best == 'application/json'
+
+    if not saved_files:
+        if wants_json:
+            return jsonify({"error": "No valid files were uploaded.", "results": results}), 400
         flash("No valid files were processed.", "info")
-        
-    # Redirect to dashboard
-    if first_processed_report_type:
-        logger.info(f"Redirecting to dashboard with report_type: {first_processed_report_type}")
-        return redirect(url_for('dashboard', report_type=first_processed_report_type))
-    else:
-        logger.info("Redirecting to dashboard without specific report_type.")
-        return redirect(url_for('dashboard'))
+        return redirect(url_for('upload_view'))
+
+    job_id = job_queue.submit(saved_files, visualization_options)
+    logger.info(f"Queued job {job_id} for {len(saved_files)} uploaded file(s)")
+
+    if wants_json:
+        return jsonify({
+            "job_id": job_id,
+            "status_url": url_for('get_job_status', job_id=job_id),
+            "events_url": url_for('stream_job_events', job_id=job_id),
+            "results": results
+        }), 202
+
+    for filename, message in results.items():
+        flash(f"{filename}: {message}", "warning")
+    return redirect(url_for('upload_view', job=job_id))
+
+@app.route('/api/jobs/<job_id>')
+@login_required
+def get_job_status(job_id):
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(job)
+
+@app.route('/api/jobs/<job_id>/events')
+@login_required
+def stream_job_events(job_id):
+    """Server-Sent-Events stream of a job's stage progress; ends when the job finishes."""
+    if job_queue.get(job_id) is None:
+        return jsonify({"error": "Job not found"}), 404
+
+    try:
+        last_seq = int(request.headers.get('Last-Event-ID') or request.args.get('since', 0))
+    except ValueError:
+        last_seq = 0
+
+    def generate():
+        seq = last_seq
+        while True:
+            events, finished = job_queue.wait_for_events(job_id, seq)
+            for event in events:
+                seq = event['seq']
+                yield f"id: {seq}\nevent: progress\ndata: {json.dumps(event)}\n\n"
+            if finished:
+                yield f"event: end\ndata: {json.dumps(job_queue.get(job_id))}\n\n"
+                return
+            if not events:
+                yield ": keep-alive\n\n"
+
+    return Response(generate(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
 
 @app.route('/setup-google')
 def setup_google():
     try:
+        from google_auth import get_google_auth_url
         # Get the auth URL
         auth_url = get_google_auth_url()
         if not auth_url:
@@ -652,6 +686,7 @@ def oauth2callback():
             return redirect(url_for('landing'))
         
         # Complete the authentication flow
+        from google_auth import finish_google_auth
         creds, user_email = finish_google_auth(state, code)
 
         if creds:
@@ -703,17 +738,13 @@ def dashboard():
         
         # Get available report types directly from database
         try:
-            conn = get_db_connection()
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                SELECT DISTINCT report_type 
-                FROM reports 
-                ORDER BY report_type
-            """)
-            
-            available_report_types = [row['report_type'] for row in cursor.fetchall()]
-            conn.close()
+            with db_connection() as conn:
+                cursor = conn.execute("""
+                    SELECT DISTINCT report_type 
+                    FROM reports 
+                    ORDER BY report_type
+                """)
+                available_report_types = [row['report_type'] for row in cursor.fetchall()]
         except Exception as e:
             logger.error(f"Error getting report types: {str(e)}")
             available_report_types = ["Manufacturing", "Services"]  # Default fallback
@@ -733,6 +764,8 @@ def dashboard():
         return redirect(url_for('upload_view'))
     
 @app.route('/api/index_trends/<index_name>')
+@conditional_json
+@cached_response()
 def get_index_trends(index_name):
     try:
         # Get optional parameters
@@ -742,13 +775,17 @@ def get_index_trends(index_name):
         # Get time series data for the specified index
         time_series_data = get_index_time_series(index_name, months, report_type)
         
-        # Return as JSON
+        # Return as JSON (one array per column with ?format=columnar)
+        if wants_columnar():
+            return jsonify(records_to_columns(time_series_data))
         return jsonify(time_series_data)
     except Exception as e:
         logger.error(f"Error getting index trends: {str(e)}")
         return jsonify({"error": str(e)}), 500
     
 @app.route('/api/industry_status/<index_name>')
+@conditional_json
+@cached_response()
 def get_industry_status(index_name):
     try:
         # Get optional parameters
@@ -781,59 +818,10 @@ def get_industry_status(index_name):
                             'category': 'Not Reported'
                         }
         
-        # Fetch rank information for the industries from the database
-        try:
-            conn = get_db_connection()
-            cursor = conn.cursor()
-            
-            # Find most recent report date with optional report_type filter
-            query = """
-                SELECT report_date FROM reports 
-                {}
-                ORDER BY report_date DESC LIMIT 1
-            """
-            
-            params = []
-            if report_type:
-                query = query.format("WHERE report_type = ?")
-                params = [report_type]
-            else:
-                query = query.format("")
-                
-            cursor.execute(query, params)
-            latest_date_row = cursor.fetchone()
-            
-            if latest_date_row:
-                latest_date = latest_date_row['report_date']
-                
-                # Get ranks for each industry in this index
-        
-                # Base query for ranks
-                rank_query_sql = """
-                    SELECT industry_name, rank 
-                    FROM industry_status 
-                    WHERE index_name = ? AND report_date = ?
-                """
-                # Base parameters for ranks
-                rank_params_list = [index_name, latest_date]
-                
-                # Conditionally add report_type filter if it was provided
-                # This ensures the ranks are fetched for the same report_type context
-                # as the latest_date, assuming industry_status has a report_type column.
-                if report_type: 
-                    rank_query_sql += " AND report_type = ?"
-                    rank_params_list.append(report_type)
-                    
-                cursor.execute(rank_query_sql, tuple(rank_params_list)) # Use tuple for db params
-                
-                # Add rank to response
-                ranks = {row['industry_name']: row['rank'] for row in cursor.fetchall()}
-                industry_data['ranks'] = ranks
-            
-            conn.close()
-        except Exception as e:
-            logger.error(f"Error fetching ranks: {str(e)}")
-            
+        # Ranks for the most recent report are already part of industry_data,
+        # fetched in the same query as the status matrix.
+        if wants_columnar():
+            return jsonify(to_columnar_industry_status(industry_data))
         return jsonify(industry_data)
     except Exception as e:
         logger.error(f"Error getting industry status: {str(e)}")
@@ -841,6 +829,7 @@ def get_industry_status(index_name):
         return jsonify({"error": str(e), "industries": {}, "dates": []}), 500
      
 @app.route('/api/industry_alphabetical/<index_name>')
+@conditional_json
 def get_industry_alphabetical(index_name):
     try:
         # Get industry status data for the specified index (last 12 months)
@@ -853,6 +842,7 @@ def get_industry_alphabetical(index_name):
         return jsonify({"error": str(e)}), 500
 
 @app.route('/api/industry_numerical/<index_name>')
+@conditional_json
 def get_industry_numerical(index_name):
     try:
         # Get industry status data for the specified index (last 12 months)
@@ -864,16 +854,31 @@ def get_industry_numerical(index_name):
         logger.error(f"Error getting numerical industry status: {str(e)}")
         return jsonify({"error": str(e)}), 500
     
+def log_heatmap_diagnostics(report_type: Optional[str]):
+    """Log the most recent reports and the per-type report count (ISM_SQL_DEBUG only)."""
+    with query_metrics.track_queries('heatmap diagnostics'), db_connection() as conn:
+        cursor = conn.cursor()
+        
+        # Check all reports in database
+        cursor.execute("SELECT report_date, month_year, report_type FROM reports ORDER BY report_date DESC LIMIT 10")
+        logger.info(f"All reports in DB: {[dict(row) for row in cursor.fetchall()]}")
+        
+        # Check specific report type
+        if report_type:
+            cursor.execute("SELECT COUNT(*) as count FROM reports WHERE report_type = ?", (report_type,))
+            logger.info(f"Count of {report_type} reports: {cursor.fetchone()['count']}")
+
 @app.route('/api/heatmap_data', defaults={'months': 24})
 @app.route('/api/heatmap_data/<int:months>')
 @app.route('/api/heatmap_data/all')
+@conditional_json
+@cached_response()
 def api_heatmap_data(months=None):
     try:
         # Get report_type from query params (optional)
         report_type = request.args.get('report_type')
         
-        # DEBUG: Log what we're looking for
-        logger.info(f"API heatmap_data called with report_type: {report_type}, months: {months}")
+        logger.debug(f"API heatmap_data called with report_type: {report_type}, months: {months}")
         
         # Validate report_type
         if report_type and report_type not in ['Manufacturing', 'Services']:
@@ -887,28 +892,16 @@ def api_heatmap_data(months=None):
         if isinstance(months, str) and months.isdigit():
             months = int(months)
             
-        # DEBUG: Check what's actually in the database
-        from db_utils import get_db_connection
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        # Check all reports in database
-        cursor.execute("SELECT report_date, month_year, report_type FROM reports ORDER BY report_date DESC LIMIT 10")
-        all_reports = cursor.fetchall()
-        logger.info(f"All reports in DB: {[dict(row) for row in all_reports]}")
-        
-        # Check specific report type
-        if report_type:
-            cursor.execute("SELECT COUNT(*) as count FROM reports WHERE report_type = ?", (report_type,))
-            count_result = cursor.fetchone()
-            logger.info(f"Count of {report_type} reports: {count_result['count']}")
-        
-        conn.close()
+        # Diagnostic scans only run when ISM_SQL_DEBUG is set (they are not part of the budget)
+        if query_metrics.SQL_DEBUG:
+            log_heatmap_diagnostics(report_type)
             
-        logger.info(f"Fetching heatmap data for report_type: {report_type}, months: {months}")
         heatmap_data = get_pmi_data_by_month(months, report_type)
         
-        logger.info(f"Retrieved {len(heatmap_data) if heatmap_data else 0} records from get_pmi_data_by_month")
+        logger.debug(f"Retrieved {len(heatmap_data) if heatmap_data else 0} records from get_pmi_data_by_month")
+        
+        if wants_columnar():
+            return jsonify(to_columnar_heatmap(heatmap_data or [], report_type))
         
         if not heatmap_data:
             logger.warning(f"No heatmap data found for report_type: {report_type}")
@@ -922,6 +915,7 @@ def api_heatmap_data(months=None):
     
 
 @app.route('/api/all_indices')
+@conditional_json
 def get_indices_list():
     try:
         # Get optional report_type parameter
@@ -1034,25 +1028,93 @@ def get_standard_industries(report_type_str: Optional[str]) -> List[str]:
         ]
     
 @app.route('/api/report_types')
+@conditional_json
 def get_report_types():
     """Get available report types."""
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT DISTINCT report_type 
-            FROM reports 
-            ORDER BY report_type
-        """)
-        
-        report_types = [row['report_type'] for row in cursor.fetchall()]
-        conn.close()
+        with db_connection() as conn:
+            cursor = conn.execute("""
+                SELECT DISTINCT report_type 
+                FROM reports 
+                ORDER BY report_type
+            """)
+            report_types = [row['report_type'] for row in cursor.fetchall()]
         
         return jsonify(report_types)
     except Exception as e:
         logger.error(f"Error getting report types: {str(e)}")
         return jsonify(["Manufacturing", "Services"]), 500  # Default fallback
+
+# Correlation analysis endpoints (all served from one CorrelationMatrix per window)
+@app.route('/api/correlations/between_indices')
+@conditional_json
+@cached_response(ttl=CORRELATION_CACHE_TTL)
+def get_correlation_between_indices():
+    """Get correlation between two indices."""
+    try:
+        # Get parameters
+        index1 = request.args.get('index1')
+        index2 = request.args.get('index2')
+        report_type1 = request.args.get('report_type1')
+        report_type2 = request.args.get('report_type2')
+        months = request.args.get('months', 36, type=int)
+        
+        if not index1 or not index2:
+            return jsonify({"error": "Both index1 and index2 are required"}), 400
+            
+        # Get correlation
+        result = correlation_service.get_correlation_between_indices(
+            index1, index2, months, report_type1, report_type2
+        )
+        
+        return jsonify(result)
+    except Exception as e:
+        logger.error(f"Error getting correlation: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/correlations/cross_report')
+@conditional_json
+@cached_response(ttl=CORRELATION_CACHE_TTL)
+def get_cross_report_correlations():
+    """Get correlations between Manufacturing and Services indices."""
+    try:
+        # Get parameters
+        months = request.args.get('months', 36, type=int)
+        
+        # Get cross-report correlations
+        results = correlation_service.get_cross_report_correlations(months)
+        
+        return jsonify(results)
+    except Exception as e:
+        logger.error(f"Error getting cross-report correlations: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/correlations/for_index/<index_name>')
+@conditional_json
+@cached_response(ttl=CORRELATION_CACHE_TTL)
+def get_correlations_for_index(index_name):
+    """Get all significant correlations for an index."""
+    try:
+        # Get parameters
+        report_type = request.args.get('report_type')
+        months = request.args.get('months', 36, type=int)
+        min_correlation = request.args.get('min_correlation', 0.5, type=float)
+        
+        # Get correlations
+        results = correlation_service.get_all_correlations_for_index(
+            index_name, report_type, months, min_correlation
+        )
+        
+        return jsonify(results)
+    except Exception as e:
+        logger.error(f"Error getting correlations for index: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/correlations')
+@login_required
+def correlations():
+    """Display the correlation analysis page."""
+    return render_template('correlations.html')
     
 def _extract_text_from_summaries(summaries):
     """Extract plain text from UISections for backward compatibility."""
@@ -1173,6 +1235,7 @@ def chat():
         verify_note = "\n\n(User requested web verification. If the context lacks current data, note this limitation.)"
     
     # Call Claude (create client locally following existing pattern)
+    from news_utils import ClaudeWebSearchEngine
     try:
         # Use ClaudeWebSearchEngine for web search capabilities
         web_search_engine = ClaudeWebSearchEngine(anthropic_api_key)
@@ -1212,6 +1275,7 @@ def chat():
         
         # Fallback to basic Claude without web search
         try:
+            import anthropic
             anthropic_client = anthropic.Anthropic(api_key=anthropic_api_key)
             
             fallback_response = anthropic_client.messages.create(
@@ -1308,8 +1372,10 @@ def chat():
 @login_required
 def monitoring_dashboard():
     from monitoring import get_performance_dashboard
+    from response_cache import get_response_cache_stats
     dashboard_data = get_performance_dashboard()
-    return render_template('monitoring_dashboard.html', data=dashboard_data, active_page='news')
+    return render_template('monitoring_dashboard.html', data=dashboard_data,
+                           response_cache=get_response_cache_stats(), active_page='news')
 
 @app.route('/api/monitoring/performance')
 @login_required
@@ -1317,6 +1383,29 @@ def api_monitoring_performance():
     from monitoring import get_performance_dashboard
     return jsonify(get_performance_dashboard())
 
+@app.route('/api/monitoring/caches')
+@login_required
+def api_monitoring_caches():
+    """Hit/miss counters for the in-process caches and the DB connection pool."""
+    from db_utils import get_data_generation, get_pool_stats
+    from llm_cache import get_llm_cache_stats
+    from response_cache import get_response_cache_stats
+    return jsonify({
+        'data_generation': get_data_generation(),
+        'responses': get_response_cache_stats(),
+        'correlations': correlation_service.get_cache_stats(),
+        'db_pool': get_pool_stats(),
+        'llm_responses': get_llm_cache_stats(),
+        'news_runs': RUN_CACHE.stats
+    })
+
+@app.route('/api/monitoring/extraction')
+@login_required
+def api_monitoring_extraction():
+    """How often reports took the deterministic fast path instead of the CrewAI crews."""
+    from fast_path import get_fast_path_stats
+    return jsonify(get_fast_path_stats())
+
 @app.route('/health')
 def health():
     return jsonify({"status": "healthy"})
@@ -0,0 +1,4 @@
+"""Micro-benchmarks for the ISM report analysis hot paths.
+
+Run from the project root, e.g. ``python -m benchmarks.bench_industry_status``.
+"""
@@ -0,0 +1,76 @@
+# benchmarks/bench_api_encoding.py
+"""
+Benchmark serialization and compression of the large dashboard API payloads.
+
+On a synthetic database of --months reports per type (120 = ten years),
+builds the /api/heatmap_data/all and /api/industry_status/<index> payloads
+in their row shape and their ?format=columnar shape, and reports for each
+the serialization time with Flask's default provider (the json module) and
+with api_encoding.dumps (orjson when installed), the JSON size, and the
+size and time of gzip and, if installed, brotli compression.
+"""
+import argparse
+import logging
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+import api_encoding
+import db_utils
+from api_encoding import compress, dumps, to_columnar_heatmap, to_columnar_industry_status
+from benchmarks.common import temporary_database, time_call
+
+
+def payloads(index_name='New Orders', report_type='Manufacturing'):
+    heatmap = db_utils.get_pmi_data_by_month(None, report_type)
+    industry_status = db_utils.get_industry_status_over_time(index_name, 10_000, report_type)
+    return {
+        'heatmap rows': heatmap,
+        'heatmap columnar': to_columnar_heatmap(heatmap, report_type),
+        'industry rows': industry_status,
+        'industry columnar': to_columnar_industry_status(industry_status),
+    }
+
+
+def run(months=120, index_name='New Orders', report_type='Manufacturing', repeat=20):
+    flask_json = DefaultJSONProvider(Flask(__name__))
+    encodings = ['gzip'] + (['br'] if api_encoding.brotli is not None else [])
+    results = []
+    with temporary_database(num_months=months, report_types=[report_type]):
+        for name, payload in payloads(index_name, report_type).items():
+            body = dumps(payload)
+            row = {
+                'payload': name,
+                'json_bytes': len(body),
+                'flask_ms': time_call(flask_json.dumps, payload, repeat=repeat),
+                'fast_ms': time_call(dumps, payload, repeat=repeat),
+            }
+            for encoding in encodings:
+                row[f'{encoding}_bytes'] = len(compress(body, encoding))
+                row[f'{encoding}_ms'] = time_call(compress, body, encoding, repeat=repeat)
+            results.append(row)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark JSON serialization and compression of API payloads")
+    parser.add_argument('--months', type=int, default=120, help="Reports per type in the synthetic database")
+    parser.add_argument('--index', default='New Orders')
+    parser.add_argument('--report-type', default='Manufacturing')
+    parser.add_argument('--repeat', type=int, default=20, help="Runs per measurement (best is reported)")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    results = run(args.months, args.index, args.report_type, args.repeat)
+    serializer = 'orjson' if api_encoding.orjson is not None else 'json'
+    print(f"{'payload':>18} {'json B':>9} {'flask ms':>9} {serializer + ' ms':>10} "
+          f"{'gzip B':>8} {'gzip ms':>8} {'br B':>8} {'br ms':>7}")
+    for row in results:
+        brotli_columns = (f"{row['br_bytes']:>8} {row['br_ms']:>7.2f}" if 'br_bytes' in row
+                          else f"{'-':>8} {'-':>7}")
+        print(f"{row['payload']:>18} {row['json_bytes']:>9} {row['flask_ms']:>9.2f} {row['fast_ms']:>10.2f} "
+              f"{row['gzip_bytes']:>8} {row['gzip_ms']:>8.2f} {brotli_columns}")
+
+
+if __name__ == '__main__':
+    main()
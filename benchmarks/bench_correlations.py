@@ -0,0 +1,63 @@
+# benchmarks/bench_correlations.py
+"""
+Benchmark the correlation endpoints of CorrelationAnalysisService.
+
+For each month window, a fresh service answers the cross-report, per-index
+and between-indices lookups; there should be one data query (plus a
+primary-key data generation check per lookup) and the cold time is dominated
+by a single matrix computation. The warm column reuses a service whose
+matrix cache is already populated.
+"""
+import argparse
+import logging
+
+from benchmarks.common import count_queries, temporary_database, time_call
+from correlation_service import CorrelationAnalysisService
+
+
+def all_endpoints(months):
+    service = CorrelationAnalysisService()
+    service.get_cross_report_correlations(months)
+    service.get_all_correlations_for_index('New Orders', 'Manufacturing', months, 0.0)
+    service.get_correlation_between_indices('Manufacturing PMI', 'Services PMI', months,
+                                            'Manufacturing', 'Services')
+    return service
+
+
+def warm_endpoints(service, months):
+    service.get_cross_report_correlations(months)
+    service.get_all_correlations_for_index('New Orders', 'Manufacturing', months, 0.0)
+    service.get_correlation_between_indices('Manufacturing PMI', 'Services PMI', months,
+                                            'Manufacturing', 'Services')
+
+
+def run(months_list):
+    results = []
+    with temporary_database(num_months=max(months_list), report_types=('Manufacturing', 'Services')):
+        for months in months_list:
+            with count_queries() as stats:
+                service = all_endpoints(months)
+            matrix = service.get_correlation_matrix(months)
+            results.append({
+                'months': months,
+                'series': len(matrix.columns),
+                'queries': stats['count'],
+                'ms': time_call(all_endpoints, months),
+                'warm_ms': time_call(warm_endpoints, service, months),
+            })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the correlation matrix engine")
+    parser.add_argument('--months', type=int, nargs='+', default=[12, 36, 60, 120])
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    print(f"{'months':>8} {'series':>7} {'queries':>8} {'ms':>9} {'warm_ms':>9}")
+    for row in run(args.months):
+        print(f"{row['months']:>8} {row['series']:>7} {row['queries']:>8} {row['ms']:>9.2f} {row['warm_ms']:>9.2f}")
+
+
+if __name__ == '__main__':
+    main()
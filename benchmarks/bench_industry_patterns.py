@@ -0,0 +1,115 @@
+# benchmarks/bench_industry_patterns.py
+"""
+Benchmark the single-pass industry clause scanner against per-category regexes.
+
+For each report PDF, slices the index summaries (report_sections) and
+extracts every index's industry lists two ways: one search per index and
+category with the category patterns (the previous behaviour of
+IndustryExtractionStrategy), and one scan_clauses() sweep per summary via
+the report type's PatternRegistry. The per-category run is timed both with
+Python's regex cache purged (each search compiles its pattern, as a cold
+process does) and warm. Also reports how many industries each approach found.
+"""
+import argparse
+import glob
+import logging
+import re
+import statistics
+import time
+
+from extraction_strategy import IndustryExtractionStrategy
+from industry_patterns import CATEGORY_PATTERNS, clear_pattern_registries, get_pattern_registry
+from pdf_text_cache import get_pdf_text
+from report_handlers import ReportTypeFactory
+from report_sections import slice_report
+
+DEFAULT_PDFS = ['uploads/*.pdf', 'pdfs/*.pdf']
+
+
+def _summaries(pdf_path):
+    report_type = ReportTypeFactory.detect_report_type(pdf_path)
+    registry = get_pattern_registry(report_type)
+    sections = slice_report(get_pdf_text(pdf_path, 'pdfplumber'), report_type, registry.indices)
+    return report_type, {name: summary for name, summary in sections.summaries.items() if not name.endswith(' PMI')}
+
+
+def per_category(summaries, registry, cold=False):
+    """Industries found with one regex search per index and category."""
+    strategy = IndustryExtractionStrategy()
+    found = 0
+    for index_name, summary in summaries.items():
+        for category in registry.get_categories(index_name):
+            if cold:
+                re.purge()
+            for pattern in CATEGORY_PATTERNS.get(category, ()):
+                match = re.search(pattern, summary, re.IGNORECASE | re.DOTALL)
+                if match:
+                    found += len(strategy._parse_industry_list(match.group(1).strip()))
+                    break
+    return found
+
+
+def single_pass(summaries, registry):
+    """Industries found with one clause sweep per summary."""
+    return sum(len(industries) for index_name, summary in summaries.items()
+               for industries in registry.scan(index_name, summary).values())
+
+
+def _time(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return result, statistics.median(timings)
+
+
+def run(pdf_paths, repeat=20):
+    results = []
+    for pdf_path in pdf_paths:
+        report_type, summaries = _summaries(pdf_path)
+        clear_pattern_registries()
+        registry = get_pattern_registry(report_type)
+        cold_found, cold_ms = _time(lambda: per_category(summaries, registry, cold=True), repeat)
+        warm_found, warm_ms = _time(lambda: per_category(summaries, registry), repeat)
+        scan_found, scan_ms = _time(lambda: single_pass(summaries, registry), repeat)
+        results.append({
+            'pdf': pdf_path,
+            'report_type': report_type,
+            'summaries': len(summaries),
+            'per_category_cold_ms': cold_ms,
+            'per_category_ms': warm_ms,
+            'single_pass_ms': scan_ms,
+            'per_category_found': warm_found,
+            'single_pass_found': scan_found,
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the single-pass clause scanner with per-category regexes")
+    parser.add_argument('pdfs', nargs='*', help="Report PDFs (default: uploads/*.pdf and pdfs/*.pdf)")
+    parser.add_argument('--repeat', type=int, default=20, help="Runs per approach (median is reported)")
+    args = parser.parse_args()
+
+    pdf_paths = args.pdfs or sorted(path for pattern in DEFAULT_PDFS for path in glob.glob(pattern))
+    if not pdf_paths:
+        parser.error("no report PDFs found")
+
+    logging.disable(logging.WARNING)
+    results = run(pdf_paths, args.repeat)
+    print(f"{'report':>14} {'summ.':>6} {'cold ms':>8} {'warm ms':>8} {'scan ms':>8} {'found':>7} {'scanned':>8}")
+    for row in results:
+        print(f"{row['report_type']:>14} {row['summaries']:>6} {row['per_category_cold_ms']:>8.2f} "
+              f"{row['per_category_ms']:>8.2f} {row['single_pass_ms']:>8.2f} "
+              f"{row['per_category_found']:>7} {row['single_pass_found']:>8}")
+
+    warm = sum(row['per_category_ms'] for row in results) or 1
+    scan = sum(row['single_pass_ms'] for row in results)
+    print()
+    print(f"single pass: {scan:.2f} of {warm:.2f} ms ({warm / (scan or 1):.1f}x faster than warm per-category) "
+          f"over {len(results)} report(s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+# benchmarks/bench_industry_status.py
+"""
+Benchmark db_utils.get_industry_status_over_time.
+
+Reports the number of SQL statements and the wall time per call for growing
+month windows; the statement count should stay constant.
+"""
+import argparse
+import logging
+
+import db_utils
+from benchmarks.common import count_queries, temporary_database, time_call
+
+
+def run(months_list, index_name='New Orders', report_type='Manufacturing'):
+    results = []
+    with temporary_database(num_months=max(months_list)):
+        for months in months_list:
+            with count_queries() as stats:
+                data = db_utils.get_industry_status_over_time(index_name, months, report_type)
+            elapsed = time_call(db_utils.get_industry_status_over_time, index_name, months, report_type)
+            results.append({
+                'months': months,
+                'industries': len(data['industries']),
+                'queries': stats['count'],
+                'ms': elapsed,
+            })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the industry status matrix query")
+    parser.add_argument('--months', type=int, nargs='+', default=[3, 12, 24, 60, 120])
+    parser.add_argument('--index', default='New Orders')
+    parser.add_argument('--report-type', default='Manufacturing')
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    print(f"{'months':>8} {'industries':>11} {'queries':>8} {'ms':>9}")
+    for row in run(args.months, args.index, args.report_type):
+        print(f"{row['months']:>8} {row['industries']:>11} {row['queries']:>8} {row['ms']:>9.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+# benchmarks/bench_llm_sections.py
+"""
+Benchmark section-sliced extraction prompts against the full-text prompt.
+
+For each report PDF, builds the handler's extraction prompt three ways: with
+the full document text (the previous behaviour), with only the glance table
+and index summaries, and as the parallel per-index prompts. Reports prompt
+size in characters and estimated tokens for each.
+
+With --live the prompts are also sent to OpenAI (bypassing the response
+cache) and the measured latency and the prompt/completion tokens reported by
+the API are printed; this needs OPENAI_API_KEY and costs real tokens.
+"""
+import argparse
+import glob
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from pdf_text_cache import get_pdf_text
+from report_handlers import ReportTypeFactory
+from report_sections import SECTION_WORKERS, estimate_tokens, glance_prompt, slice_report, summary_prompt
+
+DEFAULT_PDFS = ['uploads/*.pdf', 'pdfs/*.pdf']
+MODEL = 'gpt-4o'
+
+
+def build_prompts(pdf_path):
+    """The full, sliced and parallel prompts for one report, or None if it can't be sliced."""
+    report_type = ReportTypeFactory.detect_report_type(pdf_path)
+    handler = ReportTypeFactory.create_handler(report_type)
+    text = get_pdf_text(pdf_path, 'pdfplumber')
+    sections = slice_report(text, report_type, handler.get_indices())
+    full = f"{handler.get_extraction_prompt()}\n\nHere is the extracted text from the PDF:\n{text}"
+    sliced = f"{handler.get_extraction_prompt()}\n\nHere is the extracted text from the PDF:\n{sections.render()}"
+    parallel = [glance_prompt(sections, handler.get_indices())]
+    parallel += [summary_prompt(sections, index_name, handler.get_index_categories(index_name))
+                 for index_name in sections.summaries if not index_name.endswith(' PMI')]
+    return report_type, sections, {'full': [full], 'sliced': [sliced], 'parallel': parallel}
+
+
+def _complete(prompt):
+    import openai
+    start = time.perf_counter()
+    response = openai.OpenAI().chat.completions.create(
+        model=MODEL,
+        messages=[{"role": "system", "content": "You are a data extraction specialist that returns only valid JSON."},
+                  {"role": "user", "content": prompt}],
+        temperature=0.0
+    )
+    usage = response.usage
+    return time.perf_counter() - start, usage.prompt_tokens, usage.completion_tokens
+
+
+def measure(prompts):
+    """Wall time and API token counts of sending a mode's prompts (concurrently)."""
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, SECTION_WORKERS)) as pool:
+        results = list(pool.map(_complete, prompts))
+    return {
+        'seconds': time.perf_counter() - start,
+        'prompt_tokens': sum(r[1] for r in results),
+        'completion_tokens': sum(r[2] for r in results),
+    }
+
+
+def run(pdf_paths, live=False):
+    results = []
+    for pdf_path in pdf_paths:
+        report_type, sections, modes = build_prompts(pdf_path)
+        for mode, prompts in modes.items():
+            row = {
+                'pdf': pdf_path,
+                'report_type': report_type,
+                'complete': sections.complete,
+                'mode': mode,
+                'calls': len(prompts),
+                'chars': sum(len(p) for p in prompts),
+                'est_tokens': sum(estimate_tokens(p) for p in prompts),
+                'max_call_tokens': max(estimate_tokens(p) for p in prompts),
+            }
+            if live:
+                row.update(measure(prompts))
+            results.append(row)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare full-text and section-sliced extraction prompts")
+    parser.add_argument('pdfs', nargs='*', help="Report PDFs (default: uploads/*.pdf and pdfs/*.pdf)")
+    parser.add_argument('--live', action='store_true', help="Send the prompts to OpenAI and time them")
+    args = parser.parse_args()
+
+    pdf_paths = args.pdfs or sorted(path for pattern in DEFAULT_PDFS for path in glob.glob(pattern))
+    if not pdf_paths:
+        parser.error("no report PDFs found")
+
+    logging.disable(logging.WARNING)
+    results = run(pdf_paths, args.live)
+    print(f"{'report':>14} {'mode':>9} {'ok':>3} {'calls':>6} {'chars':>8} {'~tokens':>8} {'max/call':>9}"
+          + (f" {'seconds':>8} {'prompt':>8} {'compl.':>7}" if args.live else ''))
+    for row in results:
+        line = (f"{row['report_type']:>14} {row['mode']:>9} {'y' if row['complete'] else 'n':>3} {row['calls']:>6} "
+                f"{row['chars']:>8} {row['est_tokens']:>8} {row['max_call_tokens']:>9}")
+        if args.live:
+            line += f" {row['seconds']:>8.1f} {row['prompt_tokens']:>8} {row['completion_tokens']:>7}"
+        print(line)
+
+    full = sum(row['est_tokens'] for row in results if row['mode'] == 'full') or 1
+    sliced = sum(row['est_tokens'] for row in results if row['mode'] == 'sliced')
+    print()
+    print(f"sliced prompt tokens: {sliced} of {full} ({100 * (1 - sliced / full):.0f}% fewer) "
+          f"over {len(pdf_paths)} report(s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+# benchmarks/bench_report_detection.py
+"""
+Benchmark early-exit report type detection against the full-document scan.
+
+For each report PDF, times EnhancedReportTypeDetector.detect_report_type
+three ways: scoring the text of every page (the previous behaviour), scoring
+page by page until the margin is decisive, and a repeat call answered from
+the per-hash verdict memo. Cold runs start from an empty text cache (no disk
+tier), so they include PDF parsing. Also reports pages read and whether the
+early verdict agrees with the full scan.
+"""
+import argparse
+import glob
+import logging
+import statistics
+import time
+
+import pdf_text_cache
+import report_detection
+from pdf_text_cache import PDFTextCache
+from report_detection import EnhancedReportTypeDetector
+
+DEFAULT_PDFS = ['uploads/*.pdf', 'pdfs/*.pdf']
+
+
+def _timed(pdf_path, early_exit, cold=True):
+    if cold:
+        pdf_text_cache.pdf_text_cache.clear()
+        report_detection.clear_detection_memo()
+    pages_before = report_detection.detection_stats['pages_read']
+    start = time.perf_counter()
+    verdict = EnhancedReportTypeDetector.detect_report_type(pdf_path, early_exit=early_exit)
+    elapsed = (time.perf_counter() - start) * 1000
+    return verdict, elapsed, report_detection.detection_stats['pages_read'] - pages_before
+
+
+def run(pdf_paths, repeat=5):
+    results = []
+    saved = pdf_text_cache.pdf_text_cache
+    pdf_text_cache.pdf_text_cache = PDFTextCache(cache_dir='')
+    try:
+        for pdf_path in pdf_paths:
+            full = [_timed(pdf_path, early_exit=False) for _ in range(repeat)]
+            early = [_timed(pdf_path, early_exit=True) for _ in range(repeat)]
+            memo = [_timed(pdf_path, early_exit=True, cold=False) for _ in range(repeat)]
+            results.append({
+                'pdf': pdf_path,
+                'pages': len(pdf_text_cache.get_pdf_pages(pdf_path)),
+                'verdict': full[0][0],
+                'agrees': all(run[0] == full[0][0] for run in early + memo),
+                'pages_read': early[0][2],
+                'full_ms': statistics.median(run[1] for run in full),
+                'early_ms': statistics.median(run[1] for run in early),
+                'memo_ms': statistics.median(run[1] for run in memo),
+            })
+    finally:
+        pdf_text_cache.pdf_text_cache = saved
+        report_detection.clear_detection_memo()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare early-exit and full-document report type detection")
+    parser.add_argument('pdfs', nargs='*', help="Report PDFs (default: uploads/*.pdf and pdfs/*.pdf)")
+    parser.add_argument('--repeat', type=int, default=5, help="Runs per mode (median is reported)")
+    args = parser.parse_args()
+
+    pdf_paths = args.pdfs or sorted(path for pattern in DEFAULT_PDFS for path in glob.glob(pattern))
+    if not pdf_paths:
+        parser.error("no report PDFs found")
+
+    logging.disable(logging.WARNING)
+    results = run(pdf_paths, args.repeat)
+    print(f"{'verdict':>14} {'ok':>3} {'pages':>6} {'read':>5} {'full ms':>9} {'early ms':>9} {'memo ms':>8}  pdf")
+    for row in results:
+        print(f"{row['verdict']:>14} {'y' if row['agrees'] else 'n':>3} {row['pages']:>6} {row['pages_read']:>5} "
+              f"{row['full_ms']:>9.1f} {row['early_ms']:>9.1f} {row['memo_ms']:>8.2f}  {row['pdf']}")
+
+    full = sum(row['full_ms'] for row in results) or 1
+    early = sum(row['early_ms'] for row in results)
+    print()
+    print(f"early exit: {early:.0f} of {full:.0f} ms ({100 * (1 - early / full):.0f}% faster) "
+          f"over {len(results)} report(s)")
+
+
+if __name__ == '__main__':
+    main()
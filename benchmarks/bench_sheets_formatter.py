@@ -0,0 +1,147 @@
+# benchmarks/bench_sheets_formatter.py
+"""
+Benchmark GoogleSheetsFormatterTool against the in-process Sheets emulator.
+
+Replays a month-by-month history of Manufacturing and Services reports into an
+empty database: each month is handed to the formatter the way the crew does
+after extraction, so every run stores the report and syncs the three tabs of
+its report type's spreadsheet. Reports the Sheets API calls, payload bytes and
+wall time per formatter run, plus the quota the whole replay would use.
+
+Needs the full application environment (crewai etc.) to import tools.py, but
+no Google credentials or network access.
+"""
+import argparse
+import logging
+import os
+import random
+import shutil
+import tempfile
+import time
+from contextlib import contextmanager
+
+import google_auth
+import sheets_client
+import sheets_metadata
+import sheets_sync
+from benchmarks.common import REPORT_TYPES, month_dates, temporary_database
+from config_loader import config_loader
+from sheets_emulator import reset_emulator
+
+# Positive/negative industry categories of the indices that don't use Growing/Declining
+CATEGORIES = {
+    'Supplier Deliveries': ('Slower', 'Faster'),
+    'Inventories': ('Higher', 'Lower'),
+    "Customers' Inventories": ('Too High', 'Too Low'),
+    'Prices': ('Increasing', 'Decreasing'),
+}
+
+
+def extraction_data(report_type, report_date, rng):
+    """Synthetic extraction result for one monthly report."""
+    industries = config_loader.get_canonical_industries(report_type)
+    data = {
+        'month_year': report_date.strftime('%B %Y'),
+        'report_type': report_type,
+        'indices': {},
+        'industry_data': {},
+    }
+    for index_name in config_loader.get_indices(report_type):
+        value = round(rng.uniform(42.0, 60.0), 1)
+        data['indices'][index_name] = {'value': value, 'direction': 'Growing' if value >= 50 else 'Contracting'}
+        positive, negative = CATEGORIES.get(index_name, ('Growing', 'Declining'))
+        shuffled = industries[:]
+        rng.shuffle(shuffled)
+        reported = shuffled[:max(1, len(shuffled) - rng.randint(0, 4))]
+        split = rng.randint(0, len(reported))
+        data['industry_data'][index_name] = {positive: reported[:split], negative: reported[split:]}
+    return data
+
+
+@contextmanager
+def emulated_sheets(quota=0):
+    """
+    Serve get_google_sheets_service() from a fresh emulator, with the sync
+    state, metadata cache and sheet_id.txt kept in a temporary directory.
+    quota=0 disables client-side pacing so wall time measures the formatter.
+    """
+    tmp_dir = tempfile.mkdtemp(prefix='ism_sheets_bench_')
+    saved = (google_auth.SHEETS_EMULATOR, sheets_sync.SHEETS_SYNC_DIR, sheets_metadata.SHEETS_METADATA_PATH,
+             sheets_client._write_bucket, sheets_client._read_bucket)
+    original_cwd = os.getcwd()
+    google_auth.SHEETS_EMULATOR = True
+    sheets_sync.SHEETS_SYNC_DIR = os.path.join(tmp_dir, 'sheets_sync')
+    sheets_metadata.SHEETS_METADATA_PATH = os.path.join(tmp_dir, 'sheets_metadata.json')
+    sheets_client._write_bucket = sheets_client.TokenBucket(quota)
+    sheets_client._read_bucket = sheets_client.TokenBucket(quota)
+    os.chdir(tmp_dir)
+    try:
+        yield reset_emulator()
+    finally:
+        os.chdir(original_cwd)
+        (google_auth.SHEETS_EMULATOR, sheets_sync.SHEETS_SYNC_DIR, sheets_metadata.SHEETS_METADATA_PATH,
+         sheets_client._write_bucket, sheets_client._read_bucket) = saved
+        shutil.rmtree(tmp_dir)
+
+
+def run(num_months=24, quota=0, seed=42):
+    from tools import GoogleSheetsFormatterTool
+
+    rng = random.Random(seed)
+    results = []
+    with temporary_database(num_months=0), emulated_sheets(quota) as emulator:
+        sheets_client.reset_sheets_api_stats()
+        formatter = GoogleSheetsFormatterTool()
+        for report_date in month_dates(num_months):
+            for report_type in REPORT_TYPES:
+                data = {
+                    'extraction_data': extraction_data(report_type, report_date, rng),
+                    'pdf_path': f"{report_type}_{report_date:%Y_%m}.pdf",
+                }
+                mark = len(emulator.calls)
+                start = time.perf_counter()
+                ok = formatter._run(data)
+                elapsed = (time.perf_counter() - start) * 1000
+                stats = emulator.stats(since=mark)
+                results.append({
+                    'month': f"{report_date:%Y-%m}",
+                    'report_type': report_type,
+                    'ok': ok,
+                    'calls': stats['calls'],
+                    'reads': stats['reads'],
+                    'writes': stats['writes'],
+                    'bytes_sent': stats['bytes_sent'],
+                    'ms': elapsed,
+                })
+        totals = emulator.stats()
+        totals['client'] = sheets_client.get_sheets_api_stats()
+    return results, totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Google Sheets formatter against the Sheets emulator")
+    parser.add_argument('--months', type=int, default=24)
+    parser.add_argument('--quota', type=int, default=0,
+                        help="Client-side requests per minute (0 = no pacing)")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    results, totals = run(args.months, args.quota)
+    print(f"{'month':>8} {'type':>14} {'ok':>3} {'calls':>6} {'reads':>6} {'writes':>7} {'bytes':>9} {'ms':>9}")
+    for row in results:
+        print(f"{row['month']:>8} {row['report_type']:>14} {'y' if row['ok'] else 'n':>3} {row['calls']:>6} "
+              f"{row['reads']:>6} {row['writes']:>7} {row['bytes_sent']:>9} {row['ms']:>9.1f}")
+
+    runs = len(results) or 1
+    print()
+    print(f"runs: {len(results)}  calls: {totals['calls']} ({totals['calls'] / runs:.1f}/run)  "
+          f"bytes sent: {totals['bytes_sent']} ({totals['bytes_sent'] / runs:.0f}/run)  "
+          f"wall: {sum(row['ms'] for row in results):.0f} ms")
+    print(f"by method: {totals['by_method']}")
+    print(f"peak writes/min: {totals['peak_writes_per_minute']}  "
+          f"minimum minutes under quota: {totals['quota_minutes']}  "
+          f"client throttled: {totals['client']['throttled_seconds']} s")
+
+
+if __name__ == '__main__':
+    main()
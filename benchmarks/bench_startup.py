@@ -0,0 +1,104 @@
+# benchmarks/bench_startup.py
+"""
+Profile the cold start of the Flask app (or any module) by import cost.
+
+Imports the module in fresh interpreters with `python -X importtime`, then
+reports the median wall time of the import, the modules with the highest
+cumulative import cost (what importing them pulled in) and the highest self
+cost, and which of the heavy optional dependencies were loaded at startup.
+Runs in a temporary working directory so app startup (which creates logs/,
+uploads/ and the SQLite file in the current directory) leaves the checkout
+untouched.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+# Dependencies that should only load when a route needs them
+HEAVY_MODULES = ['crewai', 'pandas', 'scipy', 'anthropic', 'openai', 'pdfplumber', 'PyPDF2', 'googleapiclient']
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_SCRIPT = """
+import sys, time
+start = time.perf_counter()
+import {module}
+elapsed = (time.perf_counter() - start) * 1000
+print('ELAPSED', elapsed)
+print('LOADED', ' '.join(sorted(name for name in {heavy!r} if name in sys.modules)))
+"""
+
+
+def _environment():
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [REPO_ROOT, env.get('PYTHONPATH')]))
+    env.setdefault('SECRET_KEY', 'startup-profile')  # app.py refuses to start without one
+    return env
+
+
+def parse_importtime(stderr):
+    """[(module, self_us, cumulative_us, depth)] from `python -X importtime` output."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line.split(':', 1)[1].split('|')
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return rows
+
+
+def profile_import(module='app'):
+    """Import `module` once in a fresh interpreter; returns (wall ms, loaded heavy modules, importtime rows)."""
+    with tempfile.TemporaryDirectory(prefix='ism_startup_') as work_dir:
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', _SCRIPT.format(module=module, heavy=HEAVY_MODULES)],
+            cwd=work_dir, env=_environment(), capture_output=True, text=True, timeout=300
+        )
+    if result.returncode != 0:
+        raise RuntimeError(f"importing {module} failed:\n{result.stderr[-2000:]}")
+    elapsed, loaded = None, []
+    for line in result.stdout.splitlines():
+        if line.startswith('ELAPSED '):
+            elapsed = float(line.split()[1])
+        elif line.startswith('LOADED'):
+            loaded = line.split()[1:]
+    return elapsed, loaded, parse_importtime(result.stderr)
+
+
+def run(module='app', repeat=3):
+    timings, loaded, rows = [], [], []
+    for _ in range(repeat):
+        elapsed, loaded, rows = profile_import(module)
+        timings.append(elapsed)
+    return {'module': module, 'median_ms': statistics.median(timings), 'runs_ms': timings,
+            'heavy_loaded': loaded, 'imports': rows}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report per-module import cost of the app's cold start")
+    parser.add_argument('module', nargs='?', default='app', help="Module to import (default: app)")
+    parser.add_argument('--repeat', type=int, default=3, help="Fresh interpreters to time (median is reported)")
+    parser.add_argument('--top', type=int, default=15, help="Modules to list per ranking")
+    args = parser.parse_args()
+
+    result = run(args.module, args.repeat)
+    rows = result['imports']
+    print(f"import {result['module']}: {result['median_ms']:.0f} ms median over {len(result['runs_ms'])} run(s) "
+          f"({', '.join(f'{ms:.0f}' for ms in result['runs_ms'])} ms)")
+    print(f"heavy dependencies loaded at startup: {', '.join(result['heavy_loaded']) or 'none'}")
+
+    print(f"\n{'cumulative ms':>14} {'self ms':>8}  module (by cumulative cost)")
+    for name, self_us, cumulative_us, depth in sorted(rows, key=lambda row: -row[2])[:args.top]:
+        print(f"{cumulative_us / 1000:>14.1f} {self_us / 1000:>8.1f}  {'  ' * min(depth, 6)}{name}")
+
+    print(f"\n{'self ms':>14}  module (by self cost)")
+    for name, self_us, cumulative_us, depth in sorted(rows, key=lambda row: -row[1])[:args.top]:
+        print(f"{self_us / 1000:>14.1f}  {name}")
+
+
+if __name__ == '__main__':
+    main()
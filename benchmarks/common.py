@@ -0,0 +1,152 @@
+# benchmarks/common.py
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import date, datetime
+from typing import Dict, List, Optional
+
+import db_utils
+from config_loader import config_loader
+
+REPORT_TYPES = ['Manufacturing', 'Services']
+
+
+def month_dates(num_months: int, end: Optional[date] = None) -> List[date]:
+    """Return the first day of the last ``num_months`` months, oldest first."""
+    end = end or date.today()
+    year, month = end.year, end.month
+    dates = []
+    for _ in range(num_months):
+        dates.append(date(year, month, 1))
+        month -= 1
+        if month == 0:
+            year, month = year - 1, 12
+    return list(reversed(dates))
+
+
+def seed_database(db_path: str, num_months: int = 24,
+                  report_types: Optional[List[str]] = None, seed: int = 42) -> Dict[str, int]:
+    """
+    Create an ISM database at db_path filled with synthetic monthly reports.
+
+    Every index from the report type's config gets a value per month, and every
+    canonical industry gets a Growing/Contracting status per index.
+
+    Returns:
+        Dictionary with the number of rows written per table
+    """
+    rng = random.Random(seed)
+    report_types = report_types or REPORT_TYPES
+
+    original_path = db_utils.DATABASE_PATH
+    db_utils.DATABASE_PATH = db_path
+    try:
+        db_utils.initialize_database()
+    finally:
+        db_utils.DATABASE_PATH = original_path
+
+    counts = {'reports': 0, 'pmi_indices': 0, 'industry_status': 0}
+    conn = sqlite3.connect(db_path)
+    try:
+        cursor = conn.cursor()
+        for report_type in report_types:
+            indices = config_loader.get_indices(report_type)
+            industries = config_loader.get_canonical_industries(report_type)
+            for report_date in month_dates(num_months):
+                cursor.execute(
+                    "INSERT OR REPLACE INTO reports (report_date, file_path, processing_date, month_year, report_type) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (report_date.isoformat(), f"{report_type}_{report_date:%Y_%m}.pdf",
+                     datetime.now().isoformat(), report_date.strftime('%B %Y'), report_type)
+                )
+                counts['reports'] += 1
+                for index_name in indices:
+                    value = round(rng.uniform(42.0, 60.0), 1)
+                    cursor.execute(
+                        "INSERT OR REPLACE INTO pmi_indices (report_date, index_name, index_value, direction, report_type) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        (report_date.isoformat(), index_name, value,
+                         'Growing' if value >= 50 else 'Contracting', report_type)
+                    )
+                    counts['pmi_indices'] += 1
+
+                    shuffled = industries[:]
+                    rng.shuffle(shuffled)
+                    # Leave a few industries unreported each month, like real reports
+                    reported = shuffled[:max(1, len(shuffled) - rng.randint(0, 4))]
+                    split = rng.randint(0, len(reported))
+                    for category, names in (('Growing', reported[:split]), ('Declining', reported[split:])):
+                        for rank, industry in enumerate(names):
+                            cursor.execute(
+                                "INSERT OR REPLACE INTO industry_status "
+                                "(report_date, index_name, industry_name, status, category, rank, report_type) "
+                                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                                (report_date.isoformat(), index_name, industry,
+                                 'Growing' if category == 'Growing' else 'Contracting',
+                                 category, rank, report_type)
+                            )
+                            counts['industry_status'] += 1
+        # Rows were inserted directly, so materialize the heatmap the way store_report_data_in_db would
+        counts['heatmap_summary'] = db_utils.rebuild_heatmap_summary(cursor)
+        conn.commit()
+    finally:
+        conn.close()
+    return counts
+
+
+@contextmanager
+def temporary_database(num_months: int = 24, report_types: Optional[List[str]] = None):
+    """Point db_utils at a freshly seeded temporary database for the duration of the block."""
+    tmp_dir = tempfile.mkdtemp(prefix='ism_bench_')
+    db_path = os.path.join(tmp_dir, 'bench_ism_data.db')
+    seed_database(db_path, num_months, report_types)
+    original_path = db_utils.DATABASE_PATH
+    db_utils.DATABASE_PATH = db_path
+    try:
+        yield db_path
+    finally:
+        db_utils.DATABASE_PATH = original_path
+        db_utils.close_db_connections(db_path)
+        for name in os.listdir(tmp_dir):
+            os.remove(os.path.join(tmp_dir, name))
+        os.rmdir(tmp_dir)
+
+
+@contextmanager
+def count_queries():
+    """
+    Count the SQL statements issued through db_utils.get_db_connection.
+
+    Yields a dict whose 'count' key is updated as statements run.
+    """
+    stats = {'count': 0, 'statements': []}
+    original = db_utils.get_db_connection
+
+    def traced_connection(*args, **kwargs):
+        conn = original(*args, **kwargs)
+
+        def trace(statement):
+            stats['count'] += 1
+            stats['statements'].append(statement)
+
+        conn.set_trace_callback(trace)
+        return conn
+
+    db_utils.get_db_connection = traced_connection
+    try:
+        yield stats
+    finally:
+        db_utils.get_db_connection = original
+
+
+def time_call(func, *args, repeat: int = 5, **kwargs) -> float:
+    """Return the best wall time in milliseconds over ``repeat`` calls."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args, **kwargs)
+        best = min(best, (time.perf_counter() - start) * 1000)
+    return best
@@ -0,0 +1,99 @@
+"""
+Bounded in-memory caches for values derived from the database.
+
+Entries are tagged with the data generation they were computed from (see
+db_utils.get_data_generation), so anything cached before a report was stored
+is treated as a miss instead of being served stale. A size bound (LRU) and an
+optional TTL keep long-running gunicorn workers from growing without limit.
+"""
+
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+_MISSING = object()
+
+
+class GenerationalCache:
+    """Thread-safe LRU cache with a TTL whose entries are versioned by data generation."""
+
+    def __init__(self, max_entries: int = 128, ttl: Optional[float] = None, name: str = 'cache'):
+        """
+        Args:
+            max_entries: Entries kept before the least recently used one is evicted
+            ttl: Seconds an entry stays valid (None or <= 0 for no expiry)
+            name: Label used in stats and log messages
+        """
+        self.max_entries = max(1, max_entries)
+        self.ttl = ttl if ttl and ttl > 0 else None
+        self.name = name
+        self._entries = OrderedDict()  # key -> (generation, stored_at, value)
+        self._lock = threading.Lock()
+        self._counters = {'hits': 0, 'misses': 0, 'stale': 0, 'expired': 0, 'evictions': 0}
+
+    def get(self, key: Hashable, generation: int = 0, default: Any = None) -> Any:
+        """Return the cached value if it was stored for `generation` and has not expired."""
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING:
+                self._counters['misses'] += 1
+                return default
+
+            entry_generation, stored_at, value = entry
+            if entry_generation != generation:
+                del self._entries[key]
+                self._counters['stale'] += 1
+                self._counters['misses'] += 1
+                return default
+            if self.ttl is not None and time.monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                self._counters['expired'] += 1
+                self._counters['misses'] += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self._counters['hits'] += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, generation: int = 0):
+        """Store a value computed from data at `generation`, evicting the LRU entry if full."""
+        with self._lock:
+            self._entries[key] = (generation, time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._counters['evictions'] += 1
+
+    def get_or_set(self, key: Hashable, generation: int, compute: Callable[[], Any]) -> Any:
+        """Return the cached value, computing and storing it on a miss."""
+        value = self.get(key, generation, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.set(key, value, generation)
+        return value
+
+    def clear(self):
+        """Drop every entry (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters plus current size and hit rate."""
+        with self._lock:
+            stats = dict(self._counters)
+            stats['size'] = len(self._entries)
+        lookups = stats['hits'] + stats['misses']
+        stats['max_entries'] = self.max_entries
+        stats['ttl'] = self.ttl
+        stats['hit_rate'] = round(stats['hits'] / lookups, 3) if lookups else None
+        return stats
@@ -1,6 +1,9 @@
 import os
 import json
+import time
+import hashlib
 import logging
+import threading
 import yaml
 from typing import Dict, Any, List, Optional
 from pydantic import BaseModel, Field, ValidationError # Keep ValidationError
@@ -8,6 +11,9 @@ from pydantic import BaseModel, Field, ValidationError # Keep ValidationError
 # Configure logging
 logger = logging.getLogger(__name__)
 
+CONFIG_RELOAD_INTERVAL = float(os.environ.get('ISM_CONFIG_RELOAD_INTERVAL', 2))  # Seconds between config file checks (negative disables reloading)
+CONFIG_EXTENSIONS = ('.json', '.yaml', '.yml')
+
 class IndexCategoryConfig(BaseModel): # This model seems unused directly, but keep if planned for future
     """Pydantic model for index category configuration."""
     categories: Dict[str, List[str]] = Field(default_factory=dict)
@@ -21,7 +27,14 @@ class ReportConfig(BaseModel):
     canonical_industries: List[str] = Field(default_factory=list) # Field for canonical industries
 
 class ConfigLoader:
-    """Loader for configuration files."""
+    """
+    Loader for configuration files.
+
+    Derived views (indices, categories, prompts, canonical industries) are
+    memoized per report type. The config files are re-read only when their
+    mtimes or sizes change (checked at most every CONFIG_RELOAD_INTERVAL
+    seconds), and every load bumps `generation` so other caches can key on it.
+    """
     
     def __init__(self, config_dir: Optional[str] = None): # Added type hint for config_dir
         """
@@ -38,6 +51,11 @@ class ConfigLoader:
         
         self.config_dir = config_dir
         self.configs: Dict[str, ReportConfig] = {} # Type hint for clarity
+        self.generation = 0
+        self._file_state: Dict[str, tuple] = {}
+        self._views: Dict[tuple, Any] = {}
+        self._lock = threading.RLock()
+        self._next_check = 0.0
         
         # Create config directory if it doesn't exist - good for initial setup
         try:
@@ -51,14 +69,87 @@ class ConfigLoader:
         self._load_configs()
     
     def _load_configs(self):
-        """Load all configuration files from the config directory."""
+        """Load all configuration files from the config directory and start a new generation."""
+        with self._lock:
+            file_state = self._scan_files()
+            self.configs = self._read_configs()
+            self._file_state = file_state
+            self._views.clear()
+            self.generation += 1
+            self._next_check = time.monotonic() + CONFIG_RELOAD_INTERVAL
+
+    def _scan_files(self) -> Dict[str, tuple]:
+        """(mtime, size) of every config file, to tell whether a reload is needed."""
+        state = {}
+        try:
+            for filename in os.listdir(self.config_dir):
+                if filename.endswith(CONFIG_EXTENSIONS):
+                    st = os.stat(os.path.join(self.config_dir, filename))
+                    state[filename] = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            pass
+        return state
+
+    def reload_if_changed(self, force: bool = False) -> bool:
+        """
+        Reload the configs if any config file was added, removed or modified.
+
+        Args:
+            force: Check the files now instead of waiting for CONFIG_RELOAD_INTERVAL
+
+        Returns:
+            True if the configs were reloaded
+        """
+        if not force and (CONFIG_RELOAD_INTERVAL < 0 or time.monotonic() < self._next_check):
+            return False
+        with self._lock:
+            self._next_check = time.monotonic() + CONFIG_RELOAD_INTERVAL
+            if self._scan_files() == self._file_state:
+                return False
+            logger.info(f"Configuration files in {self.config_dir} changed; reloading")
+            self._load_configs()
+            return True
+
+    def get_generation(self) -> int:
+        """Number of the current config load; changes whenever the configs are reloaded."""
+        self.reload_if_changed()
+        return self.generation
+
+    def get_fingerprint(self) -> str:
+        """
+        Digest of the loaded config files' names, mtimes and sizes.
+
+        Unlike `generation`, which counts loads in this process, it is the
+        same in every worker that loaded the same files, so caches shared
+        between processes can key on it.
+        """
+        self.reload_if_changed()
+        with self._lock:
+            return hashlib.sha1(repr(sorted(self._file_state.items())).encode('utf-8')).hexdigest()[:16]
+
+    def _view(self, key: tuple, build):
+        """Memoized derived value for the current generation."""
+        self.reload_if_changed()
+        with self._lock:
+            if key in self._views:
+                return self._views[key]
+            generation = self.generation
+        value = build()
+        with self._lock:
+            if generation == self.generation:
+                value = self._views.setdefault(key, value)
+        return value
+
+    def _read_configs(self) -> Dict[str, ReportConfig]:
+        """Parse and validate every '*_config' file in the config directory."""
+        configs: Dict[str, ReportConfig] = {}
         try:
             if not os.path.exists(self.config_dir) or not os.path.isdir(self.config_dir):
                 logger.warning(f"Config directory {self.config_dir} not found or is not a directory. No configs loaded.")
-                return
+                return configs
 
             for filename in os.listdir(self.config_dir):
-                if filename.endswith(('.json', '.yaml', '.yml')):
+                if filename.endswith(CONFIG_EXTENSIONS):
                     file_path = os.path.join(self.config_dir, filename)
                     config_name = os.path.splitext(filename)[0] # e.g., "manufacturing_config"
                     
@@ -84,7 +175,7 @@ class ConfigLoader:
                                 
                         # Validate config using Pydantic model
                         config = ReportConfig(**config_data)
-                        self.configs[report_type_str] = config
+                        configs[report_type_str] = config
                         logger.info(f"Successfully loaded and validated configuration for '{report_type_str}' from {filename}")
                     except (json.JSONDecodeError, yaml.YAMLError) as e_parse:
                         logger.error(f"Error parsing config file {file_path}: {e_parse}")
@@ -96,24 +187,44 @@ class ConfigLoader:
             logger.warning(f"Configuration directory '{self.config_dir}' was not found during scan. No configurations loaded.")
         except Exception as e: # Catch errors like permission issues with listdir
             logger.error(f"Error accessing or listing configuration directory '{self.config_dir}': {str(e)}")
+        return configs
     
     def get_config(self, report_type: str) -> Optional[ReportConfig]:
         """
         Get configuration for a specific report type.
         """
+        self.reload_if_changed()
         return self.configs.get(report_type.capitalize()) # Standardize access key
     
     def get_indices(self, report_type: str) -> List[str]:
         """
         Get indices for a specific report type.
         """
-        config = self.get_config(report_type)
-        return config.indices if config else []
+        def build():
+            config = self.get_config(report_type)
+            return config.indices if config else []
+        return self._view(('indices', report_type), build)
+
+    def get_selectable_indices(self, report_type: str) -> List[str]:
+        """
+        Indices for the UI: the configured list with the report type's main PMI first.
+        """
+        def build():
+            indices = self.get_indices(report_type)
+            main_pmi = {'manufacturing': "Manufacturing PMI", 'services': "Services PMI"}.get(report_type.lower())
+            if indices and main_pmi and main_pmi not in indices:
+                return [main_pmi] + list(indices)
+            return list(indices)
+        return self._view(('selectable_indices', report_type), build)
     
     def get_index_categories(self, report_type: str, index_name: str) -> List[str]:
         """
         Get categories for a specific index in a report type.
         """
+        return self._view(('categories', report_type, index_name),
+                          lambda: self._build_index_categories(report_type, index_name))
+
+    def _build_index_categories(self, report_type: str, index_name: str) -> List[str]:
         config = self.get_config(report_type)
         if config and index_name in config.index_categories:
             return config.index_categories[index_name]
@@ -134,26 +245,32 @@ class ConfigLoader:
         """
         Get extraction prompt for a specific report type.
         """
-        config = self.get_config(report_type)
-        return config.extraction_prompt if config else "Extract data from the report."
+        def build():
+            config = self.get_config(report_type)
+            return config.extraction_prompt if config else "Extract data from the report."
+        return self._view(('extraction_prompt', report_type), build)
     
     def get_correction_prompt(self, report_type: str) -> str:
         """
         Get correction prompt for a specific report type.
         """
-        config = self.get_config(report_type)
-        return config.correction_prompt if config else "Verify and correct the extracted data."
+        def build():
+            config = self.get_config(report_type)
+            return config.correction_prompt if config else "Verify and correct the extracted data."
+        return self._view(('correction_prompt', report_type), build)
 
     def get_canonical_industries(self, report_type: str) -> List[str]:
         """
         Get the list of canonical industries for a specific report type.
         Returns an empty list if not configured or report type not found.
         """
-        config = self.get_config(report_type)
-        if config and config.canonical_industries:
-            return config.canonical_industries
-        logger.warning(f"Canonical industries not configured or found for report type: {report_type}")
-        return []
+        def build():
+            config = self.get_config(report_type)
+            if config and config.canonical_industries:
+                return config.canonical_industries
+            logger.warning(f"Canonical industries not configured or found for report type: {report_type}")
+            return []
+        return self._view(('canonical_industries', report_type), build)
 
 # Create singleton instance
 # This will load configs when the module is imported.
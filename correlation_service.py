@@ -0,0 +1,365 @@
+# correlation_service.py
+import os
+import logging
+import numpy as np
+from typing import Dict, List, Tuple, Optional
+from db_utils import db_connection, get_data_generation
+from cache_utils import GenerationalCache
+import traceback
+
+logger = logging.getLogger(__name__)
+
+REPORT_TYPES = ('Manufacturing', 'Services')
+
+# Map of equivalent indices between Manufacturing and Services
+EQUIVALENT_INDICES = {
+    'Manufacturing PMI': 'Services PMI',
+    'Production': 'Business Activity',
+    'New Orders': 'New Orders',
+    'Employment': 'Employment',
+    'Supplier Deliveries': 'Supplier Deliveries',
+    'Inventories': 'Inventories',
+    "Customers' Inventories": 'Inventory Sentiment',
+    'Prices': 'Prices',
+    'Backlog of Orders': 'Backlog of Orders',
+    'New Export Orders': 'New Export Orders',
+    'Imports': 'Imports'
+}
+
+MIN_OBSERVATIONS = 3  # Fewest overlapping points for a correlation to be reported
+
+CORRELATION_CACHE_SIZE = int(os.environ.get('ISM_CORRELATION_CACHE_SIZE', 16))  # Month windows kept per process
+CORRELATION_CACHE_TTL = float(os.environ.get('ISM_CORRELATION_CACHE_TTL', 3600))  # Seconds before a window is recomputed
+
+
+def _pairwise_pearson(a: np.ndarray, b: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Pearson correlation of every column of `a` with every column of `b`.
+
+    Both arrays are (dates x columns) with NaN for missing values; each pair
+    uses only the rows where both columns have data.
+
+    Returns:
+        Tuple of (correlation matrix, observation count matrix)
+    """
+    mask_a = ~np.isnan(a)
+    mask_b = ~np.isnan(b)
+    a0 = np.where(mask_a, a, 0.0)
+    b0 = np.where(mask_b, b, 0.0)
+    ma = mask_a.astype(float)
+    mb = mask_b.astype(float)
+
+    n = ma.T @ mb
+    sum_a = a0.T @ mb
+    sum_b = ma.T @ b0
+    sum_aa = (a0 * a0).T @ mb
+    sum_bb = ma.T @ (b0 * b0)
+    sum_ab = a0.T @ b0
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cov = sum_ab - sum_a * sum_b / n
+        var_a = sum_aa - sum_a * sum_a / n
+        var_b = sum_bb - sum_b * sum_b / n
+        r = cov / np.sqrt(var_a * var_b)
+
+    r = np.clip(r, -1.0, 1.0)
+    r[(n < MIN_OBSERVATIONS) | (var_a <= 0) | (var_b <= 0)] = np.nan
+    return r, n
+
+
+def _pearson_p_values(r: np.ndarray, n: np.ndarray) -> np.ndarray:
+    """Two-sided p-values for Pearson coefficients (same test as scipy.stats.pearsonr)."""
+    from scipy.special import betainc  # imported on first use to keep app startup light
+    with np.errstate(divide='ignore', invalid='ignore'):
+        df = n - 2
+        p = betainc(df / 2.0, 0.5, np.clip(1.0 - r * r, 0.0, 1.0))
+    p[np.isnan(r) | (df < 1)] = np.nan
+    return p
+
+
+def _rounded(value, digits: int):
+    return None if value is None or np.isnan(value) else round(float(value), digits)
+
+
+class CorrelationMatrix:
+    """
+    Every index series of both report types aligned on one date axis, with the
+    full Pearson matrix and all lagged correlation matrices computed at once.
+    """
+
+    def __init__(self, dates: List[str], columns: List[Tuple[str, str]], values: np.ndarray, max_lag: int = 3):
+        """
+        Args:
+            dates: Report dates, oldest first (rows of values)
+            columns: (report_type, index_name) for each column of values
+            values: dates x columns array with NaN where an index was not reported
+            max_lag: Largest lead/lag (in months) to compute in each direction
+        """
+        self.dates = dates
+        self.columns = columns
+        self.values = values
+        self.max_lag = max_lag
+        self._column_index = {column: i for i, column in enumerate(columns)}
+
+        self.correlation, self.n = _pairwise_pearson(values, values)
+        self.p_values = _pearson_p_values(self.correlation, self.n)
+
+        # lagged[k][i, j]: column i leading column j by k months (negative k: j leads i)
+        self.lagged = {0: self.correlation}
+        for lag in range(1, max_lag + 1):
+            if lag >= len(dates):
+                break
+            leading, _ = _pairwise_pearson(values[:-lag], values[lag:])
+            self.lagged[lag] = leading
+            self.lagged[-lag] = leading.T
+
+    def column(self, index_name: str, report_type: Optional[str] = None) -> Optional[int]:
+        """Column position of an index; without a report type, the first type that reports it."""
+        if report_type:
+            return self._column_index.get((report_type, index_name))
+        for candidate in REPORT_TYPES:
+            if (candidate, index_name) in self._column_index:
+                return self._column_index[(candidate, index_name)]
+        return next((i for (_, name), i in self._column_index.items() if name == index_name), None)
+
+    def indices(self, report_type: Optional[str] = None) -> List[str]:
+        """Index names present for a report type (or any type), sorted."""
+        return sorted({name for rtype, name in self.columns if report_type is None or rtype == report_type})
+
+    def pair(self, i: int, j: int) -> Dict:
+        """Correlation result for columns i and j in the service's response format."""
+        report_type1, index1 = self.columns[i]
+        report_type2, index2 = self.columns[j]
+        both = ~np.isnan(self.values[:, i]) & ~np.isnan(self.values[:, j])
+        correlation = _rounded(self.correlation[i, j], 3)
+
+        if correlation is None:
+            return {
+                'correlation': None,
+                'p_value': None,
+                'error': 'Insufficient overlapping data points',
+                'index1': index1,
+                'index2': index2,
+                'report_type1': report_type1,
+                'report_type2': report_type2,
+                'n': int(both.sum())
+            }
+
+        lagged_correlations = {}
+        for lag in sorted(self.lagged):
+            value = _rounded(self.lagged[lag][i, j], 3)
+            if value is not None:
+                lagged_correlations[lag] = value
+
+        return {
+            'correlation': correlation,
+            'p_value': _rounded(self.p_values[i, j], 4),
+            'dates': [date for date, keep in zip(self.dates, both) if keep],
+            'values1': self.values[both, i].tolist(),
+            'values2': self.values[both, j].tolist(),
+            'lagged_correlations': lagged_correlations,
+            'index1': index1,
+            'index2': index2,
+            'report_type1': report_type1,
+            'report_type2': report_type2,
+            'n': int(both.sum())
+        }
+
+
+class CorrelationAnalysisService:
+    """Service for analyzing correlations between ISM indices."""
+
+    def __init__(self, max_lag: int = 3, cache_size: int = CORRELATION_CACHE_SIZE,
+                 cache_ttl: float = CORRELATION_CACHE_TTL):
+        """
+        Initialize the correlation analysis service.
+
+        Args:
+            max_lag: Largest lead/lag (in months) reported in lagged_correlations
+            cache_size: Correlation matrices (one per months window) kept in memory
+            cache_ttl: Seconds a cached matrix is served before being recomputed
+        """
+        self.max_lag = max_lag
+        self.cache = GenerationalCache(cache_size, cache_ttl, name='correlations')  # months -> CorrelationMatrix
+
+    def get_correlation_matrix(self, months: int = 36) -> CorrelationMatrix:
+        """
+        Load every index series for the last `months` report months in one
+        query and compute all correlations for them.
+
+        Matrices are cached per window and dropped as soon as a report is
+        stored (the data generation changes), so results are never stale.
+
+        Args:
+            months: Number of report months to include
+
+        Returns:
+            CorrelationMatrix shared by all correlation lookups for that window
+        """
+        generation = get_data_generation()
+        return self.cache.get_or_set(months, generation, lambda: self._load_matrix(months))
+
+    def _load_matrix(self, months: int) -> CorrelationMatrix:
+
+        query = """
+            SELECT p.report_date, p.report_type, p.index_name, p.index_value
+            FROM pmi_indices p
+            JOIN reports r ON r.report_date = p.report_date AND r.report_type = p.report_type
+            JOIN (
+                SELECT DISTINCT report_date FROM pmi_indices
+                ORDER BY report_date DESC
+                LIMIT ?
+            ) recent ON recent.report_date = p.report_date
+            ORDER BY p.report_date
+        """
+        with db_connection() as conn:
+            rows = conn.execute(query, (months,)).fetchall()
+
+        dates = sorted({row['report_date'] for row in rows})
+        columns = sorted({(row['report_type'], row['index_name']) for row in rows})
+        date_pos = {date: i for i, date in enumerate(dates)}
+        column_pos = {column: i for i, column in enumerate(columns)}
+
+        values = np.full((len(dates), len(columns)), np.nan)
+        for row in rows:
+            if row['index_value'] is not None:
+                values[date_pos[row['report_date']], column_pos[(row['report_type'], row['index_name'])]] = float(row['index_value'])
+
+        return CorrelationMatrix(dates, columns, values, max_lag=self.max_lag)
+
+    def get_cache_stats(self) -> Dict:
+        """Hit/miss/eviction counters for the correlation matrix cache."""
+        return self.cache.stats
+
+    def get_correlation_between_indices(self, index1: str, index2: str,
+                                        months: int = 36,
+                                        report_type1: Optional[str] = None,
+                                        report_type2: Optional[str] = None) -> Dict:
+        """
+        Calculate correlation between two indices.
+
+        Args:
+            index1: Name of the first index
+            index2: Name of the second index
+            months: Number of months to include in analysis
+            report_type1: Report type for the first index (optional)
+            report_type2: Report type for the second index (optional)
+
+        Returns:
+            Dictionary with correlation results
+        """
+        try:
+            matrix = self.get_correlation_matrix(months)
+            i = matrix.column(index1, report_type1)
+            j = matrix.column(index2, report_type2)
+
+            if i is None or j is None:
+                return {
+                    'correlation': None,
+                    'p_value': None,
+                    'error': 'Insufficient data'
+                }
+
+            return matrix.pair(i, j)
+        except Exception as e:
+            logger.error(f"Error calculating correlation: {str(e)}")
+            logger.error(traceback.format_exc())
+            return {
+                'correlation': None,
+                'p_value': None,
+                'error': str(e)
+            }
+
+    def get_cross_report_correlations(self, months: int = 36) -> Dict:
+        """
+        Calculate correlations between Manufacturing and Services indices.
+
+        Args:
+            months: Number of months to include in analysis
+
+        Returns:
+            Dictionary mapping index pairs to their correlation statistics
+        """
+        try:
+            matrix = self.get_correlation_matrix(months)
+            results = {}
+
+            for mfg_index in matrix.indices('Manufacturing'):
+                for svc_index in matrix.indices('Services'):
+                    # Skip comparing unlike indices
+                    if not self._are_comparable_indices(mfg_index, svc_index):
+                        continue
+
+                    key = f"{mfg_index}-{svc_index}"
+                    results[key] = matrix.pair(
+                        matrix.column(mfg_index, 'Manufacturing'),
+                        matrix.column(svc_index, 'Services')
+                    )
+
+            return results
+        except Exception as e:
+            logger.error(f"Error calculating cross-report correlations: {str(e)}")
+            logger.error(traceback.format_exc())
+            return {}
+
+    def get_all_correlations_for_index(self, index_name: str,
+                                      report_type: Optional[str] = None,
+                                      months: int = 36,
+                                      min_correlation: float = 0.5) -> Dict:
+        """
+        Find all significant correlations for a given index.
+
+        Results are keyed by the other index name; indices from the other
+        report type are keyed as "Index (Report Type)".
+
+        Args:
+            index_name: Name of the index to analyze
+            report_type: Report type for the index (optional)
+            months: Number of months to include in analysis
+            min_correlation: Minimum absolute correlation coefficient to include
+
+        Returns:
+            Dictionary with correlation results
+        """
+        try:
+            matrix = self.get_correlation_matrix(months)
+            i = matrix.column(index_name, report_type)
+            if i is None:
+                return {}
+            own_type = matrix.columns[i][0]
+
+            # Select every significant partner from the precomputed row at once
+            row = matrix.correlation[i]
+            candidates = np.flatnonzero(~np.isnan(row) & (np.abs(row) >= min_correlation))
+            candidates = candidates[candidates != i]
+
+            results = {}
+            for j in candidates[np.argsort(-np.abs(row[candidates]), kind='stable')]:
+                other_type, other_index = matrix.columns[j]
+                if other_index == index_name and other_type == own_type:
+                    continue
+                key = other_index if other_type == own_type else f"{other_index} ({other_type})"
+                results[key] = matrix.pair(i, j)
+
+            return results
+        except Exception as e:
+            logger.error(f"Error calculating correlations for {index_name}: {str(e)}")
+            return {}
+
+    def _are_comparable_indices(self, index1: str, index2: str) -> bool:
+        """
+        Determine if two indices are comparable across report types.
+
+        Args:
+            index1: First index name
+            index2: Second index name
+
+        Returns:
+            Boolean indicating if indices are comparable
+        """
+        # Check if indices are direct equivalents
+        if index1 == index2:
+            return True
+
+        # Check the mapping in both directions
+        return EQUIVALENT_INDICES.get(index1) == index2 or EQUIVALENT_INDICES.get(index2) == index1
@@ -3,7 +3,7 @@ import re
 from typing import Dict, List, Optional, Any, Union
 from datetime import datetime
 from pydantic import BaseModel, Field, validator, model_validator, ValidationError
-from config_loader import config_loader
+from industry_matcher import get_industry_matcher
 
 logger = logging.getLogger(__name__)
 
@@ -360,32 +360,11 @@ class DataTransformationPipeline:
         Standardize industry names across all indices using canonical list from config
         and deduplicate them within each category after standardization.
         """
-        canonical_industries = config_loader.get_canonical_industries(report.report_type)
-        if not canonical_industries:
+        matcher = get_industry_matcher(report.report_type)
+        if matcher is None:
             logger.warning(f"No canonical industries loaded for report type '{report.report_type}'. Skipping standardization.")
             return
 
-        # Create a mapping for quick lookups (lowercase for case-insensitivity)
-        # This map helps find the canonical name from various potential inputs.
-        # More sophisticated matching (e.g., fuzzy matching) could be added if needed.
-        industry_mapping_to_canonical: Dict[str, str] = {}
-        for canon_name in canonical_industries:
-            industry_mapping_to_canonical[canon_name.lower()] = canon_name
-            # Add common variations (e.g., without "Products", without "& Allied")
-            # This part needs to be robust based on observed LLM outputs.
-            name_no_products = re.sub(r'\s+Products$', '', canon_name, flags=re.IGNORECASE).strip()
-            if name_no_products.lower() != canon_name.lower():
-                industry_mapping_to_canonical[name_no_products.lower()] = canon_name
-            
-            name_with_and = canon_name.replace(" & ", " and ")
-            if name_with_and.lower() != canon_name.lower():
-                industry_mapping_to_canonical[name_with_and.lower()] = canon_name
-            
-            # Consider splitting by " & " or " and " and checking parts
-            parts = re.split(r'\s+&\s+|\s+and\s+', canon_name, flags=re.IGNORECASE)
-            if len(parts) > 1:
-                industry_mapping_to_canonical[parts[0].lower()] = canon_name # e.g., "Computer" -> "Computer & Electronic Products"
-
         updated_industry_data = {}
         for index_name, categories in report.industry_data.items():
             updated_categories = {}
@@ -400,31 +379,17 @@ class DataTransformationPipeline:
                         logger.debug(f"Skipping non-string industry entry: {raw_industry}")
                         continue
                     
-                    clean_raw_industry = raw_industry.strip().lower()
-                    canonical_name = industry_mapping_to_canonical.get(clean_raw_industry)
+                    # Exact/variant lookup, then the longest containment match (see industry_matcher)
+                    canonical_name = matcher.match(raw_industry)
 
                     if not canonical_name:
-                        # Try a simple "best match" if direct map fails - find a canonical name that contains the raw_industry (or vice-versa)
-                        # This is a basic attempt; more advanced matching (e.g., Levenshtein distance) could be used.
-                        best_match_score = 0
-                        potential_match = None
-                        for canon_ind in canonical_industries:
-                            if clean_raw_industry in canon_ind.lower() or canon_ind.lower() in clean_raw_industry:
-                                # Simple containment check (could be improved)
-                                current_score = len(clean_raw_industry) if clean_raw_industry in canon_ind.lower() else len(canon_ind)
-                                if current_score > best_match_score:
-                                    best_match_score = current_score
-                                    potential_match = canon_ind
-                        if potential_match:
-                            canonical_name = potential_match
-                        else:
-                            # If still no match, keep original (after basic cleaning), but log it
-                            logger.warning(f"Industry '{raw_industry}' not found in canonical list or mappings for {report.report_type}. Keeping original.")
-                            # Basic cleaning for non-standardized names
-                            cleaned_non_canonical = re.sub(r'\s*\(\d+\)$', '', raw_industry.strip()).strip() # Remove (1) type notes
-                            if len(cleaned_non_canonical) > 2: # Only keep if somewhat substantial
-                                standardized_for_this_category.append(cleaned_non_canonical)
-                            continue # Skip adding to list if it's too short or problematic
+                        # If still no match, keep original (after basic cleaning), but log it
+                        logger.warning(f"Industry '{raw_industry}' not found in canonical list or mappings for {report.report_type}. Keeping original.")
+                        # Basic cleaning for non-standardized names
+                        cleaned_non_canonical = re.sub(r'\s*\(\d+\)$', '', raw_industry.strip()).strip() # Remove (1) type notes
+                        if len(cleaned_non_canonical) > 2: # Only keep if somewhat substantial
+                            standardized_for_this_category.append(cleaned_non_canonical)
+                        continue # Skip adding to list if it's too short or problematic
 
                     if canonical_name: # Ensure we have a name
                         standardized_for_this_category.append(canonical_name)
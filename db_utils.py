@@ -1,11 +1,17 @@
 import os
 import re
+import json
+import time
 import sqlite3
 import logging
+import threading
+from contextlib import contextmanager
 from datetime import date, datetime
 from dateutil import parser
 from typing import Optional, Dict, List, Any, Tuple
 from config_loader import config_loader
+from industry_matcher import match_canonical_industry
+from query_metrics import TimedCursor
 import traceback
 
 # Configure logging
@@ -35,18 +41,178 @@ else:
     logger.info(f"Running in local environment. Using DB path: {DATABASE_PATH}")
 # --- End Path Determination ---
 
+# --- Connection pool settings ---
+# Each worker thread checks a connection out of a per-process pool instead of
+# opening (and re-configuring) a fresh sqlite3 connection for every helper call.
+DB_POOL_SIZE = int(os.environ.get('ISM_DB_POOL_SIZE', 8))  # Idle connections kept per database file
+DB_MMAP_SIZE = int(os.environ.get('ISM_DB_MMAP_SIZE', 64 * 1024 * 1024))  # Bytes of the DB file to memory-map
+DB_STATEMENT_CACHE_SIZE = int(os.environ.get('ISM_DB_STATEMENT_CACHE', 256))  # Prepared statements cached per connection
+DB_BUSY_TIMEOUT = float(os.environ.get('ISM_DB_BUSY_TIMEOUT', 10.0))  # Seconds to wait on a locked database
+DATA_GENERATION_RECHECK = float(os.environ.get('ISM_DATA_GENERATION_RECHECK', 5.0))  # Seconds peek_data_generation trusts unchanged DB files
+
+class PooledConnection(sqlite3.Connection):
+    """sqlite3 connection whose close() hands it back to its pool instead of closing it."""
+
+    _pool = None
+    _checked_out = False
+
+    # Route every statement through TimedCursor so per-request SQL metrics see it
+    def cursor(self, factory=TimedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def close(self):
+        pool = self._pool
+        if pool is not None and self._checked_out:
+            pool.release(self)
+        elif pool is None:
+            super().close()
+
+    def discard(self):
+        """Really close the underlying SQLite connection."""
+        self._pool = None
+        self._checked_out = False
+        super().close()
+
+class ConnectionPool:
+    """
+    Thread-aware pool of SQLite connections for a single database file.
+    
+    Connections are configured once when created (WAL journaling,
+    synchronous=NORMAL, mmap, busy timeout, prepared-statement cache) and are
+    used by one thread at a time. Checkout never blocks: if no idle connection
+    is available a new one is opened, and at most max_idle connections are kept
+    around once released.
+    """
+
+    def __init__(self, db_path: str, max_idle: int = DB_POOL_SIZE):
+        self.db_path = db_path
+        self.max_idle = max_idle
+        self._idle: List[PooledConnection] = []
+        self._lock = threading.Lock()
+        self.stats = {'created': 0, 'reused': 0, 'discarded': 0}
+
+        db_dir = os.path.dirname(db_path)
+        if db_dir and not os.path.exists(db_dir):
+            logger.info(f"Attempting to create database directory: {db_dir}")
+            os.makedirs(db_dir, exist_ok=True)
+
+    def _connect(self) -> PooledConnection:
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=DB_BUSY_TIMEOUT,
+            check_same_thread=False,  # Safe: a connection is only used by the thread that checked it out
+            cached_statements=DB_STATEMENT_CACHE_SIZE,
+            factory=PooledConnection
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA mmap_size={DB_MMAP_SIZE}")
+        conn._pool = self
+        self.stats['created'] += 1
+        logger.debug(f"Opened pooled database connection to {self.db_path}")
+        return conn
+
+    def acquire(self) -> PooledConnection:
+        conn = None
+        with self._lock:
+            if self._idle:
+                conn = self._idle.pop()
+                self.stats['reused'] += 1
+        if conn is None:
+            conn = self._connect()
+        conn._checked_out = True
+        return conn
+
+    def release(self, conn: PooledConnection):
+        conn._checked_out = False
+        try:
+            # Match sqlite3 close() semantics: uncommitted work is discarded
+            if conn.in_transaction:
+                conn.rollback()
+            conn.set_trace_callback(None)
+            conn.row_factory = sqlite3.Row
+        except sqlite3.Error as e:
+            logger.warning(f"Discarding broken pooled connection to {self.db_path}: {e}")
+            self._discard(conn)
+            return
+
+        with self._lock:
+            if len(self._idle) < self.max_idle:
+                self._idle.append(conn)
+                return
+        self._discard(conn)
+
+    def _discard(self, conn: PooledConnection):
+        self.stats['discarded'] += 1
+        try:
+            conn.discard()
+        except sqlite3.Error:
+            pass
+
+    def close_all(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            self._discard(conn)
+
+_pools: Dict[str, ConnectionPool] = {}
+_pools_pid = os.getpid()
+_pools_lock = threading.Lock()
+# Pools inherited across a fork (gunicorn --preload) are kept referenced but
+# never used or closed in the child, so SQLite handles are not shared.
+_inherited_pools: List[ConnectionPool] = []
+
+def get_connection_pool(db_path: Optional[str] = None) -> ConnectionPool:
+    """Get the connection pool for db_path (defaults to DATABASE_PATH) in this process."""
+    global _pools_pid
+    db_path = db_path or DATABASE_PATH
+    with _pools_lock:
+        if _pools_pid != os.getpid():
+            _inherited_pools.extend(_pools.values())
+            _pools.clear()
+            _initialized_paths.clear()
+            _pools_pid = os.getpid()
+        pool = _pools.get(db_path)
+        if pool is None:
+            pool = ConnectionPool(db_path)
+            _pools[db_path] = pool
+        return pool
+
+def close_db_connections(db_path: Optional[str] = None):
+    """Close idle pooled connections for db_path, or for every database if not given."""
+    with _pools_lock:
+        if db_path:
+            pools = [_pools.pop(db_path)] if db_path in _pools else []
+        else:
+            pools = list(_pools.values())
+            _pools.clear()
+    for pool in pools:
+        pool.close_all()
+
+def get_pool_stats() -> Dict[str, Dict[str, int]]:
+    """Get created/reused/discarded/idle connection counts per database path."""
+    with _pools_lock:
+        return {
+            path: dict(pool.stats, idle=len(pool._idle))
+            for path, pool in _pools.items()
+        }
+
+_initialized_paths = set()
+_init_lock = threading.Lock()
+
 def initialize_database():
     """Initialize the SQLite database with the required schema."""
     conn = None
     try:
-        # Check if directory exists
-        db_dir = os.path.dirname(DATABASE_PATH)
-        if not os.path.exists(db_dir):
-             logger.info(f"Attempting to create database directory: {db_dir}")
-             os.makedirs(db_dir, exist_ok=True)
-
         logger.info(f"Initializing database connection at: {DATABASE_PATH}")
-        conn = sqlite3.connect(DATABASE_PATH)
+        conn = get_db_connection()
         cursor = conn.cursor()
         logger.debug("Executing CREATE TABLE IF NOT EXISTS statements...")
         
@@ -105,7 +271,35 @@ def initialize_database():
         # Add index for report_type column for efficient filtering
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_reports_type ON reports(report_type)')
         
+        # Single-row counter bumped on every report write, used to invalidate derived caches
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS data_generation (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            generation INTEGER NOT NULL
+        )
+        ''')
+        cursor.execute('INSERT OR IGNORE INTO data_generation (id, generation) VALUES (1, 0)')
+        
+        # Materialized heatmap: one row per report month with every index as JSON,
+        # maintained by store_report_data_in_db so dashboards read it with one lookup
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS heatmap_summary (
+            report_type TEXT NOT NULL,
+            report_date DATE NOT NULL,
+            month_year TEXT NOT NULL,
+            indices TEXT NOT NULL,
+            PRIMARY KEY (report_type, report_date)
+        )
+        ''')
+        
+        # Databases created before the summary existed are backfilled once
+        if (cursor.execute('SELECT 1 FROM heatmap_summary LIMIT 1').fetchone() is None
+                and cursor.execute('SELECT 1 FROM pmi_indices LIMIT 1').fetchone() is not None):
+            rows = rebuild_heatmap_summary(cursor)
+            logger.info(f"Backfilled heatmap_summary with {rows} report months")
+        
         conn.commit()
+        _initialized_paths.add(DATABASE_PATH)
         logger.info(f"Database schema initialized successfully at {DATABASE_PATH}")
 
     except (sqlite3.Error, OSError, Exception) as e:
@@ -114,28 +308,190 @@ def initialize_database():
         if conn:
             try:
                 conn.close()
-                logger.debug("DB connection closed after initialization.")
+                logger.debug("DB connection released after initialization.")
             except sqlite3.Error as e:
                  logger.error(f"Error closing connection post-initialization: {e}")
 
-def get_db_connection():
-    """Create a connection to the SQLite database."""
-    conn = None
+def ensure_database_initialized():
+    """
+    Initialize the database schema once per process and database path.
+    
+    Cheap enough to call on every request; initialize_database() only runs
+    the first time (or again after a fork, or when DATABASE_PATH changes).
+    """
+    if DATABASE_PATH in _initialized_paths and _pools_pid == os.getpid():
+        return
+    with _init_lock:
+        if DATABASE_PATH not in _initialized_paths or _pools_pid != os.getpid():
+            initialize_database()
+
+def bump_data_generation(cursor) -> None:
+    """
+    Advance the data generation counter inside the caller's transaction.
+    
+    Call this from any code path that writes reports or indices, before it
+    commits, so caches keyed on get_data_generation() stop serving old results.
+    """
+    cursor.execute('INSERT OR IGNORE INTO data_generation (id, generation) VALUES (1, 0)')
+    cursor.execute('UPDATE data_generation SET generation = generation + 1 WHERE id = 1')
+
+def _summarize_heatmap_rows(rows) -> Dict[Tuple[str, str], Dict[str, Any]]:
+    """Group (report_type, report_date, month_year, index_name, index_value, direction) rows by month."""
+    summary = {}
+    for report_type, report_date, month_year, index_name, index_value, direction in rows:
+        entry = summary.setdefault((report_type, report_date), {'month_year': month_year, 'indices': {}})
+        entry['indices'][index_name] = {'value': index_value, 'direction': direction}
+    return summary
+
+_HEATMAP_SOURCE_QUERY = """
+    SELECT r.report_type, r.report_date, r.month_year, p.index_name, p.index_value, p.direction
+    FROM reports r
+    JOIN pmi_indices p ON r.report_date = p.report_date AND r.report_type = p.report_type
+"""
+
+def refresh_heatmap_summary(cursor, report_date: str, report_type: str) -> None:
+    """
+    Recompute the heatmap_summary row for one report month inside the caller's transaction.
+    
+    Args:
+        cursor: Cursor on the connection that wrote the report
+        report_date: ISO date of the report month
+        report_type: Type of report (Manufacturing or Services)
+    """
+    cursor.execute(
+        _HEATMAP_SOURCE_QUERY + " WHERE r.report_date = ? AND r.report_type = ? ORDER BY p.id",
+        (report_date, report_type)
+    )
+    summary = _summarize_heatmap_rows(cursor.fetchall())
+    entry = summary.get((report_type, report_date))
+    if entry is None:
+        cursor.execute("DELETE FROM heatmap_summary WHERE report_type = ? AND report_date = ?",
+                       (report_type, report_date))
+        return
+    cursor.execute(
+        "INSERT OR REPLACE INTO heatmap_summary (report_type, report_date, month_year, indices) VALUES (?, ?, ?, ?)",
+        (report_type, report_date, entry['month_year'], json.dumps(entry['indices']))
+    )
+
+def rebuild_heatmap_summary(cursor=None) -> int:
+    """
+    Rebuild heatmap_summary from the reports and pmi_indices tables.
+    
+    Needed after data is written without store_report_data_in_db (seed scripts,
+    manual imports). Runs inside the caller's transaction when a cursor is given.
+    
+    Returns:
+        Number of report months in the summary
+    """
+    if cursor is None:
+        with db_connection() as conn:
+            cursor = conn.cursor()
+            rows = rebuild_heatmap_summary(cursor)
+            bump_data_generation(cursor)
+            return rows
+
+    cursor.execute(_HEATMAP_SOURCE_QUERY + " ORDER BY r.report_date, p.id")
+    summary = _summarize_heatmap_rows(cursor.fetchall())
+    cursor.execute("DELETE FROM heatmap_summary")
+    cursor.executemany(
+        "INSERT INTO heatmap_summary (report_type, report_date, month_year, indices) VALUES (?, ?, ?, ?)",
+        [(report_type, report_date, entry['month_year'], json.dumps(entry['indices']))
+         for (report_type, report_date), entry in summary.items()]
+    )
+    return len(summary)
+
+def get_data_generation(db_path: Optional[str] = None) -> int:
+    """
+    Get the current data generation (0 if the counter table does not exist yet).
+    
+    Args:
+        db_path: Optional database file, defaults to DATABASE_PATH
+    """
     try:
-        # Ensure directory exists (might be redundant if initialize_database called first, but safe)
-        db_dir = os.path.dirname(DATABASE_PATH)
-        if not os.path.exists(db_dir):
-             os.makedirs(db_dir, exist_ok=True)
+        with db_connection(db_path) as conn:
+            row = conn.execute('SELECT generation FROM data_generation WHERE id = 1').fetchone()
+    except sqlite3.OperationalError:
+        return 0
+    return row[0] if row else 0
+
+# db_path -> (file signature, monotonic time read, generation)
+_generation_peeks: Dict[str, Tuple[tuple, float, int]] = {}
+
+def _db_file_signature(db_path: str) -> tuple:
+    """(mtime_ns, size) of the database file and its WAL; any commit changes one of them."""
+    signature = []
+    for suffix in ('', '-wal'):
+        try:
+            stat = os.stat(db_path + suffix)
+        except OSError:
+            signature.append(None)
+        else:
+            signature.append((stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
 
-        conn = sqlite3.connect(DATABASE_PATH)
-        conn.row_factory = sqlite3.Row
-        logger.debug(f"Database connection opened successfully to {DATABASE_PATH}")
-        return conn
+def peek_data_generation(db_path: Optional[str] = None) -> int:
+    """
+    Get the data generation, querying SQLite only when the database files changed.
+    
+    Two os.stat() calls answer repeated lookups (conditional GETs, see
+    http_cache); the counter is read again when the database or its WAL was
+    written, and at least every DATA_GENERATION_RECHECK seconds.
+    
+    Args:
+        db_path: Optional database file, defaults to DATABASE_PATH
+    """
+    db_path = db_path or DATABASE_PATH
+    # Stat before reading, so a commit racing the read is seen on the next call
+    signature = _db_file_signature(db_path)
+    now = time.monotonic()
+    entry = _generation_peeks.get(db_path)
+    if entry is not None and entry[0] == signature and now - entry[1] < DATA_GENERATION_RECHECK:
+        return entry[2]
+    generation = get_data_generation(db_path)
+    _generation_peeks[db_path] = (signature, now, generation)
+    return generation
+
+def get_db_connection(db_path: Optional[str] = None):
+    """
+    Check a connection out of the pool for the SQLite database.
+    
+    Calling close() on the returned connection hands it back to the pool.
+    Prefer the db_connection() context manager, which also commits or rolls back.
+    
+    Args:
+        db_path: Optional database file, defaults to DATABASE_PATH
+    """
+    try:
+        return get_connection_pool(db_path).acquire()
     except (sqlite3.Error, OSError, Exception) as e:
-        logger.error(f"Error connecting to database {DATABASE_PATH}: {e}", exc_info=True)
+        logger.error(f"Error connecting to database {db_path or DATABASE_PATH}: {e}", exc_info=True)
         # Re-raise the exception so the calling code knows connection failed
         raise
 
+@contextmanager
+def db_connection(db_path: Optional[str] = None):
+    """
+    Context manager yielding a pooled connection.
+    
+    Commits on a clean exit, rolls back if the block raises, and always
+    returns the connection to the pool.
+    
+    Example:
+        with db_connection() as conn:
+            rows = conn.execute("SELECT * FROM reports").fetchall()
+    """
+    conn = get_db_connection(db_path)
+    try:
+        yield conn
+        if conn.in_transaction:
+            conn.commit()
+    except Exception:
+        if conn.in_transaction:
+            conn.rollback()
+        raise
+    finally:
+        conn.close()
+
 def check_report_exists_in_db(month_year, report_type='Manufacturing'):
     """
     Check if a report for the given month, year and report type exists in the database.
@@ -340,35 +696,26 @@ def get_all_report_dates(report_type=None):
 
 def get_pmi_data_by_month(months=None, report_type=None):
     try:
-         # DEBUG: Log the exact parameters we received
-        logger.info(f"get_pmi_data_by_month called with months={months}, report_type='{report_type}'")
+        logger.debug(f"get_pmi_data_by_month called with months={months}, report_type='{report_type}'")
         
         # FIXED: Ensure report_type is properly validated
         if not report_type or report_type not in ['Manufacturing', 'Services']:
             logger.warning(f"Invalid or missing report_type '{report_type}', defaulting to 'Manufacturing'")
             report_type = 'Manufacturing'
         
-        # Initialize database if needed
-        initialize_database()
+        # Schema is created once per process, not on every request
+        ensure_database_initialized()
         
         conn = get_db_connection()
         cursor = conn.cursor()
         
-        # Build query with proper date range filtering
+        # One indexed range scan of the materialized summary (see refresh_heatmap_summary)
         query = """
-            SELECT r.report_date, r.month_year, r.report_type, 
-                   p.index_name, p.index_value, p.direction
-            FROM reports r
-            JOIN pmi_indices p ON r.report_date = p.report_date AND r.report_type = p.report_type
+            SELECT report_date, month_year, report_type, indices
+            FROM heatmap_summary
+            WHERE report_type = ?
         """
-        
-        params = []
-        where_clauses = []
-        
-        # FIXED: Always add report_type filter (don't make it optional)
-        where_clauses.append("r.report_type = ?")
-        params.append(report_type)
-        logger.info(f"Adding report_type filter: {report_type}")
+        params = [report_type]
         
         # Add date range filter if months is provided
         if months is not None and months > 0:
@@ -376,51 +723,21 @@ def get_pmi_data_by_month(months=None, report_type=None):
             from datetime import datetime, timedelta
             today = datetime.now()
             months_ago = today - timedelta(days=30 * months)
-            date_filter = months_ago.strftime('%Y-%m-%d')
-            
-            where_clauses.append("r.report_date >= ?")
-            params.append(date_filter)
+            query += " AND report_date >= ?"
+            params.append(months_ago.strftime('%Y-%m-%d'))
         
-        # Add WHERE clause if needed
-        if where_clauses:
-            query += " WHERE " + " AND ".join(where_clauses)
-        
-        # Add ordering 
-        query += " ORDER BY r.report_date DESC"
+        query += " ORDER BY report_date DESC"
         
         cursor.execute(query, params)
-        rows = cursor.fetchall()
-        
-        # Process results as before
-        report_data = {}
-        
-        for row in rows:
-            report_date = row['report_date']
-            month_year = row['month_year']
-            row_report_type = row['report_type']
-            index_name = row['index_name']
-            index_value = row['index_value']
-            direction = row['direction']
-            
-            # Create entry for this report date if not exists
-            key = f"{report_date}-{row_report_type}"  # Use composite key
-            if key not in report_data:
-                report_data[key] = {
-                    'report_date': report_date,
-                    'month_year': month_year,
-                    'report_type': row_report_type,
-                    'indices': {}
-                }
-            
-            # Add index data
-            report_data[key]['indices'][index_name] = {
-                'value': index_value,
-                'direction': direction
+        result = [
+            {
+                'report_date': row['report_date'],
+                'month_year': row['month_year'],
+                'report_type': row['report_type'],
+                'indices': json.loads(row['indices'])
             }
-        
-        # Convert to list and sort by date (newest first)
-        result = list(report_data.values())
-        result.sort(key=lambda x: x['report_date'], reverse=True)
+            for row in cursor.fetchall()
+        ]
         
         conn.close()
         return result
@@ -527,6 +844,11 @@ def get_industry_status_over_time(index_name, num_months=12, report_type=None):
     """
     Get industry status over time for a specific index.
     
+    The whole industry x month matrix (plus the ranks from the most recent
+    report) is fetched with a single windowed query and pivoted in Python,
+    so the number of SQLite round-trips does not grow with the number of
+    months or industries.
+    
     Args:
         index_name: Name of the index (e.g., "New Orders")
         num_months: Number of most recent months to include
@@ -540,122 +862,103 @@ def get_industry_status_over_time(index_name, num_months=12, report_type=None):
         conn = get_db_connection()
         cursor = conn.cursor()
         
-        # Get the most recent report dates with optional report_type filter
-        # This part is correct for fetching relevant dates
-        query_dates_sql = """
-            SELECT report_date, month_year 
-            FROM reports 
-            {}
-            ORDER BY report_date DESC 
-            LIMIT ?
+        # recent_reports: the N most recent report dates (optionally of one type),
+        # numbered so that recency = 1 is the latest report.
+        # report_industries: every industry ever reported for this index/type.
+        # The LEFT JOINs keep the dates even when no industries exist, and mark
+        # missing (date, industry) cells with a NULL status.
+        reports_filter = "WHERE report_type = ?" if report_type else ""
+        industries_filter = "AND i.report_type = ?" if report_type else ""
+        status_filter = "AND s.report_type = ?" if report_type else ""
+        
+        matrix_query_sql = f"""
+            WITH recent_reports AS (
+                SELECT report_date, month_year,
+                       ROW_NUMBER() OVER (ORDER BY report_date DESC) AS recency
+                FROM reports
+                {reports_filter}
+                ORDER BY report_date DESC
+                LIMIT ?
+            ),
+            report_industries AS (
+                SELECT DISTINCT i.industry_name
+                FROM industry_status i
+                JOIN reports r ON i.report_date = r.report_date AND i.report_type = r.report_type
+                WHERE i.index_name = ?
+                {industries_filter}
+            )
+            SELECT rr.report_date, rr.month_year, rr.recency,
+                   ri.industry_name, s.status, s.category, s.rank
+            FROM recent_reports rr
+            LEFT JOIN report_industries ri ON 1 = 1
+            LEFT JOIN industry_status s
+                ON s.report_date = rr.report_date
+                AND s.index_name = ?
+                AND s.industry_name = ri.industry_name
+                {status_filter}
+            ORDER BY rr.recency, ri.industry_name
         """
         
-        params_dates = []
+        params = []
         if report_type:
-            query_dates_sql = query_dates_sql.format("WHERE report_type = ?")
-            params_dates = [report_type, num_months]
-        else:
-            query_dates_sql = query_dates_sql.format("")
-            params_dates = [num_months]
-            
-        cursor.execute(query_dates_sql, tuple(params_dates)) # Use tuple
-        
-        date_records = [dict(row) for row in cursor.fetchall()]
-        if not date_records:
-            logger.warning(f"No date records found for index: {index_name}, report_type: {report_type}, months: {num_months}")
-            return {'dates': [], 'industries': {}, 'ranks': {}, 'report_type': report_type}
-            
-        # Get all unique industries for this index and report_type
-        # This query is correct
-        industries_query_sql = """
-            SELECT DISTINCT i.industry_name 
-            FROM industry_status i
-            JOIN reports r ON i.report_date = r.report_date AND i.report_type = r.report_type /* Ensure join condition is robust */
-            WHERE i.index_name = ?
-        """
-        industries_params = [index_name]
-
+            params.append(report_type)
+        params.extend([num_months, index_name])
         if report_type:
-            industries_query_sql += " AND i.report_type = ?" # Filter by i.report_type directly
-            industries_params.append(report_type)
-        
-        # Consider if ORDER BY i.rank is still needed here or if it's just for the display ranks later
-        # industries_query_sql += " ORDER BY i.industry_name" # Alphabetical might be more consistent for the list
-        
-        cursor.execute(industries_query_sql, tuple(industries_params))
-        industries = [row['industry_name'] for row in cursor.fetchall()]
-        
-        if not industries:
-            logger.warning(f"No industries found for index: {index_name}, report_type: {report_type}")
-            # Return early if no relevant industries, to avoid processing empty list
-            return {
-                'dates': [record['month_year'] for record in date_records], # Still return dates
-                'industries': {}, 
-                'ranks': {}, 
-                'report_type': report_type
-            }
-
-        # Get the most recent ranks for these industries for the specific report_type
-        # The 'ranks' fetched here are for the single most recent report_date of the specified report_type
-        most_recent_date_for_type = date_records[0]['report_date'] # This date is already filtered by report_type
-        
-        ranks_query_sql = """
-            SELECT industry_name, rank
-            FROM industry_status
-            WHERE report_date = ? AND index_name = ?
-        """
-        ranks_params = [most_recent_date_for_type, index_name]
-
+            params.append(report_type)
+        params.append(index_name)
         if report_type:
-            ranks_query_sql += " AND report_type = ?" # <<<< FIX 1
-            ranks_params.append(report_type)
+            params.append(report_type)
         
-        cursor.execute(ranks_query_sql, tuple(ranks_params))
-        ranks = {row['industry_name']: row['rank'] for row in cursor.fetchall()}
+        cursor.execute(matrix_query_sql, tuple(params))
+        rows = cursor.fetchall()
         
-        # For each industry, get status for each date (for the specified report_type)
+        if not rows:
+            logger.warning(f"No date records found for index: {index_name}, report_type: {report_type}, months: {num_months}")
+            return {'dates': [], 'industries': {}, 'ranks': {}, 'report_type': report_type}
+        
+        # Pivot the flat (date, industry) rows into the industry -> month matrix
+        dates = []
+        seen_recency = set()
         industry_data = {}
-        for industry in industries: # 'industries' list is already filtered by report_type
-            status_by_date = {}
+        ranks = {}
+        
+        for row in rows:
+            month_year = row['month_year']
+            if row['recency'] not in seen_recency:
+                seen_recency.add(row['recency'])
+                dates.append(month_year)
             
-            for date_record in date_records: # 'date_records' are already filtered by report_type
-                report_date = date_record['report_date']
-                month_year = date_record['month_year']
-                
-                # Fetch status details for this specific report_date, index, industry, AND report_type
-                status_detail_query_sql = """
-                    SELECT status, category, rank
-                    FROM industry_status
-                    WHERE report_date = ? AND index_name = ? AND industry_name = ?
-                """
-                status_detail_params = [report_date, index_name, industry]
-
-                if report_type:
-                    status_detail_query_sql += " AND report_type = ?" # <<<< FIX 2
-                    status_detail_params.append(report_type)
-                
-                cursor.execute(status_detail_query_sql, tuple(status_detail_params))
-                
-                row = cursor.fetchone()
-                if row:
-                    status_by_date[month_year] = {
-                        'status': row['status'],
-                        'category': row['category'],
-                        'rank': row['rank'] # This rank is specific to this month/index/industry/type
-                    }
-                else:
-                    status_by_date[month_year] = {
-                        'status': 'Neutral',
-                        'category': 'Not Reported',
-                        'rank': 0 
-                    }
+            industry = row['industry_name']
+            if industry is None:
+                continue
             
-            industry_data[industry] = status_by_date
+            status_by_date = industry_data.setdefault(industry, {})
+            if month_year in status_by_date and status_by_date[month_year]['category'] != 'Not Reported':
+                continue
+            
+            if row['status'] is not None:
+                status_by_date[month_year] = {
+                    'status': row['status'],
+                    'category': row['category'],
+                    'rank': row['rank'] # This rank is specific to this month/index/industry/type
+                }
+                # Ranks are reported for the most recent report date only
+                if row['recency'] == 1:
+                    ranks.setdefault(industry, row['rank'])
+            else:
+                status_by_date.setdefault(month_year, {
+                    'status': 'Neutral',
+                    'category': 'Not Reported',
+                    'rank': 0
+                })
+        
+        if not industry_data:
+            logger.warning(f"No industries found for index: {index_name}, report_type: {report_type}")
         
         return {
-            'dates': [record['month_year'] for record in date_records],
+            'dates': dates,
             'industries': industry_data,
-            'ranks': ranks, # These are ranks for the most_recent_date_for_type
+            'ranks': ranks, # These are ranks for the most recent report date of the type
             'report_type': report_type
         }
     except Exception as e:
@@ -684,9 +987,10 @@ def get_all_indices(report_type: Optional[str] = None) -> List[str]:
     indices_from_config: List[str] = []
 
     try:
-        indices_from_config = config_loader.get_indices(effective_report_type)
+        # Memoized by config_loader until the config files change
+        indices_from_config = config_loader.get_selectable_indices(effective_report_type)
     except Exception as e:
-        logger.error(f"Error calling config_loader.get_indices for {effective_report_type}: {e}. Returning empty list.")
+        logger.error(f"Error calling config_loader.get_selectable_indices for {effective_report_type}: {e}. Returning empty list.")
         return [] # Or a hardcoded fallback if absolutely necessary
 
     if not indices_from_config:
@@ -697,22 +1001,8 @@ def get_all_indices(report_type: Optional[str] = None) -> List[str]:
         # For now, let's return empty to highlight a config issue.
         return []
 
-    # Ensure the main PMI for the report type is in the list
-    main_pmi_to_ensure = ""
-    if effective_report_type.lower() == 'manufacturing':
-        main_pmi_to_ensure = "Manufacturing PMI"
-    elif effective_report_type.lower() == 'services':
-        main_pmi_to_ensure = "Services PMI"
-
-    if main_pmi_to_ensure and main_pmi_to_ensure not in indices_from_config:
-        # Add it to the beginning of the list for consistency
-        logger.debug(f"Adding '{main_pmi_to_ensure}' to indices for {effective_report_type} as it was missing.")
-        final_indices = [main_pmi_to_ensure] + [idx for idx in indices_from_config if idx != main_pmi_to_ensure]
-    else:
-        final_indices = list(indices_from_config) # Create a copy
-
-    logger.debug(f"Returning indices for report_type '{effective_report_type}': {final_indices}")
-    return final_indices
+    # A copy: the memoized list is shared by every caller
+    return list(indices_from_config)
 
 def extract_pmi_data(data: dict) -> dict or None:
         value = data.get("current", data.get("value"))
@@ -743,8 +1033,8 @@ def store_report_data_in_db(extracted_data, pdf_path, report_type="Manufacturing
         
     conn = None
     try:
-        # Ensure database is initialized
-        initialize_database()
+        # Ensure database is initialized (once per process)
+        ensure_database_initialized()
         
         conn = get_db_connection()
         cursor = conn.cursor()
@@ -1034,7 +1324,7 @@ def store_report_data_in_db(extracted_data, pdf_path, report_type="Manufacturing
                         continue
                         
                     # Clean industry name
-                    industry = clean_industry_name(industry)
+                    industry = clean_industry_name(industry, report_type)
                     if not industry:
                         continue
                         
@@ -1058,7 +1348,12 @@ def store_report_data_in_db(extracted_data, pdf_path, report_type="Manufacturing
                     except Exception as e:
                         logger.error(f"Error inserting industry_status data for {industry}: {str(e)}")
         
+        refresh_heatmap_summary(cursor, report_date.isoformat(), report_type)
+        bump_data_generation(cursor)
         conn.commit()
+        # Imported here: response_cache depends on this module
+        from response_cache import invalidate_response_cache
+        invalidate_response_cache()
         logger.info(f"Successfully stored data for report {month_year} (type: {report_type}) in database")
         return True
         
@@ -1156,8 +1451,13 @@ def standardize_direction(direction):
     # Convert first letter to uppercase for other directions
     return direction.capitalize()
 
-def clean_industry_name(industry: Optional[str]) -> Optional[str]: # Added type hints
-    """Clean industry name to remove common artifacts, but NOT canonical parts like 'Products'."""
+def clean_industry_name(industry: Optional[str], report_type: Optional[str] = None) -> Optional[str]: # Added type hints
+    """
+    Clean industry name to remove common artifacts, but NOT canonical parts like 'Products'.
+
+    With a report type the cleaned name is also mapped onto that type's
+    canonical industry list (unmatched names are returned as cleaned).
+    """
     if not industry or not isinstance(industry, str):
         return None
 
@@ -1211,4 +1511,7 @@ def clean_industry_name(industry: Optional[str]) -> Optional[str]: # Added type
         logger.debug(f"Industry '{industry}' identified as non-industry phrase ('{cleaned}'). Returning None.")
         return None
 
+    if report_type:
+        return match_canonical_industry(cleaned, report_type) or cleaned
+
     return cleaned
\ No newline at end of file
@@ -7,8 +7,26 @@ import pdfplumber
 from PyPDF2 import PdfReader
 import json
 
+from industry_patterns import PatternRegistry, get_pattern_registry
+
 logger = logging.getLogger(__name__)
 
+# Artifacts stripped from an industry list before it is split
+_LIST_ARTIFACTS = [re.compile(artifact, re.IGNORECASE) for artifact in (
+    r"in (?:January|February|March|April|May|June|July|August|September|October|November|December)(?:\s+\d{4})?(?:\s*[-—]\s*)?",
+    r"in (?:the )?following order(?:\s*[-—]\s*)?",
+    r"in order(?:\s*[-—]\s*)?",
+    r"are(?:\s*:)?",
+    r"is(?:\s*:)?",
+    r"(?:listed|in) order(?:\s*[-—]\s*)?",
+    r":",
+    r"^[,;.\s]*",  # Remove leading punctuation
+    r"(?:and|&)\s+"  # Remove "and" or "&" at beginning
+)]
+_FOOTNOTE = re.compile(r'\s*\(\d+\)\s*$')
+_TRAILING_ASTERISKS = re.compile(r'\s*\*+\s*$')
+_LEADING_DASH = re.compile(r'^\s*-\s*')
+
 class ExtractionStrategy(abc.ABC):
     """Abstract base class for all extraction strategies."""
     
@@ -224,13 +242,14 @@ class IndustryExtractionStrategy(ExtractionStrategy):
         try:
             # Extract index summaries first
             summaries = self._extract_index_summaries(text)
+            patterns = get_pattern_registry(self._detect_report_type(text))
             
             # Extract industry mentions from summaries
             industry_data = {}
             
             # Process each index summary
             for index_name, summary in summaries.items():
-                industry_categories = self._extract_industry_categories(index_name, summary)
+                industry_categories = self._extract_industry_categories(index_name, summary, patterns)
                 if industry_categories:
                     industry_data[index_name] = industry_categories
             
@@ -255,12 +274,8 @@ class IndustryExtractionStrategy(ExtractionStrategy):
         ]
         
         # Determine if this is a manufacturing or services report
-        if "MANUFACTURING AT A GLANCE" in text.upper() or "MANUFACTURING PMI" in text.upper():
-            indices = manufacturing_indices
-            report_type = "Manufacturing"
-        else:
-            indices = services_indices
-            report_type = "Services"
+        report_type = self._detect_report_type(text)
+        indices = manufacturing_indices if report_type == "Manufacturing" else services_indices
         
         # Extract summaries
         summaries = {}
@@ -315,94 +330,42 @@ class IndustryExtractionStrategy(ExtractionStrategy):
         
         return summaries
     
-    def _extract_industry_categories(self, index_name: str, summary: str) -> Dict[str, List[str]]:
+    @staticmethod
+    def _detect_report_type(text: str) -> str:
+        """Manufacturing if the text has the manufacturing glance table or PMI, else Services."""
+        text_upper = text.upper()
+        if "MANUFACTURING AT A GLANCE" in text_upper or "MANUFACTURING PMI" in text_upper:
+            return "Manufacturing"
+        return "Services"
+    
+    def _extract_industry_categories(self, index_name: str, summary: str,
+                                     patterns: Optional[PatternRegistry] = None) -> Dict[str, List[str]]:
         """Extract industry categories for a specific index."""
-        # Define category names based on index type
-        if index_name == "Supplier Deliveries":
-            categories = ["Slower", "Faster"]
-        elif index_name == "Inventories":
-            categories = ["Higher", "Lower"]
-        elif index_name == "Customers' Inventories" or index_name == "Inventory Sentiment":
-            categories = ["Too High", "Too Low"]
-        elif index_name == "Prices":
-            categories = ["Increasing", "Decreasing"]
-        else:
-            categories = ["Growing", "Declining"]
+        patterns = patterns or get_pattern_registry("Manufacturing")
+        categories = patterns.get_categories(index_name)
+        
+        # One sweep over the summary finds every "industries reporting ..." clause
+        scanned = patterns.scan(index_name, summary)
         
         result = {}
         
-        # Extract industries for each category
+        # Extract industries for each category, falling back to the per-category patterns
         for category in categories:
-            industries = self._extract_industries_for_category(index_name, category, summary)
+            industries = scanned.get(category) or self._extract_industries_for_category(
+                index_name, category, summary, patterns)
             if industries:
                 result[category] = industries
         
         return result
     
-    def _extract_industries_for_category(self, index_name: str, category: str, summary: str) -> List[str]:
+    def _extract_industries_for_category(self, index_name: str, category: str, summary: str,
+                                         patterns: Optional[PatternRegistry] = None) -> List[str]:
         """Extract industries for a specific category of an index."""
-        patterns = []
-        
-        # Build appropriate patterns based on index and category
-        if index_name == "Supplier Deliveries":
-            if category == "Slower":
-                patterns = [
-                    r"industries reporting slower (?:supplier )?deliveries(?:[^:]*?)(?:are|—|in|:|-)(?:[^:]*?)(?:order|the following order|listed in order|:)[^:]*?([^\.]+)",
-                    r"industries reporting slower (?:supplier )?deliveries(?:[^:]*?)(?:are|:|-)([^\.]+)"
-                ]
-            else:  # Faster
-                patterns = [
-                    r"industries reporting faster (?:supplier )?deliveries(?:[^:]*?)(?:are|—|in|:|-)(?:[^:]*?)(?:order|the following order|listed in order|:)[^:]*?([^\.]+)",
-                    r"industries reporting faster (?:supplier )?deliveries(?:[^:]*?)(?:are|:|-)([^\.]+)"
-                ]
-        elif index_name == "Inventories":
-            if category == "Higher":
-                patterns = [
-                    r"industries reporting (?:higher|increased|increasing|growing|growth in) inventories(?:[^:]*?)(?:listed in|—|in|:|-)(?:[^:]*?)(?:order|the following order|:)[^:]*?([^\.]+)",
-                    r"industries reporting (?:higher|increased|increasing) inventories(?:[^:]*?)(?:are|:|-)([^\.]+)"
-                ]
-            else:  # Lower
-                patterns = [
-                    r"industries reporting (?:lower|decreased|declining|lower or decreased) inventories(?:[^:]*?)(?:in the following|—|in|:|-)(?:[^:]*?)(?:order|the following order|:)[^:]*?([^\.]+)",
-                    r"industries reporting (?:lower|decreased|declining) inventories(?:[^:]*?)(?:are|:|-)([^\.]+)"
-                ]
-        elif index_name in ["Customers' Inventories", "Inventory Sentiment"]:
-            if category == "Too High":
-                patterns = [
-                    r"industries reporting (?:customers['']s?|customers) (?:inventories|inventory) as too high(?:[^:]*?)(?:are|—|in|:|-)(?:[^:]*?)(?:order|the following order|:)?[^:]*?([^\.]+)",
-                    r"(?:industries|industry) reporting (?:customers['']s?|customers) (?:inventories|inventory) as too high(?:[^:]*?)(?:are|:|-)([^\.]+)"
-                ]
-            else:  # Too Low
-                patterns = [
-                    r"industries reporting (?:customers['']s?|customers) (?:inventories|inventory) as too low(?:[^:]*?)(?:are|—|in|:|-)(?:[^:]*?)(?:order|the following order|:)?[^:]*?([^\.]+)",
-                    r"(?:industries|industry) reporting (?:customers['']s?|customers) (?:inventories|inventory) as too low(?:[^:]*?)(?:are|:|-)([^\.]+)"
-                ]
-        elif index_name == "Prices":
-            if category == "Increasing":
-                patterns = [
-                    r"(?:In (?:[\w\s]+), |The |)(?:[\w\s]+) industries (?:that |)(?:reported|reporting) (?:paying |higher |increased |increasing |price increases)(?:prices|price|prices for raw materials)?(?:[^:]*?)(?:in order|order|:|—|-)(?:[^:]*?)(?:are|:)([^\.]+)",
-                    r"industries (?:that |)(?:reported|reporting) (?:paying |higher |increased |increasing) prices(?:[^:]*?)(?:are|:|-)([^\.]+)"
-                ]
-            else:  # Decreasing
-                patterns = [
-                    r"(?:The only industry|The [\w\s]+ industries) (?:that |)(?:reported|reporting) (?:paying |lower |decreased |decreasing |price decreases)(?:prices|price|prices for raw materials)?(?:[^:]*?)(?:in order|order|:|—|-)(?:[^:]*?)(?:are|is):?([^\.]+)",
-                    r"industries (?:that |)(?:reported|reporting) (?:paying |lower |decreased |decreasing) prices(?:[^:]*?)(?:are|:|-)([^\.]+)"
-                ]
-        else:  # Default for most indices including New Orders, Production, etc.
-            if category == "Growing":
-                patterns = [
-                    r"(?:[\w\s]+) (?:industries|manufacturing industries) (?:that |)(?:reporting|reported|report) (?:growth|expansion|increase|growing|increased|an increase|higher|growth in)(?: in| of)? (?:[\w\s&]+)?(?:[^:]*?)(?:are|—|:|in|-|,)(?:.+?)?(?:order|the following order|listed in order|:)[^:]*?([^\.]+)",
-                    r"(?:[\w\s]+) industries (?:that |)(?:reporting|reported|report) growth(?:[^:]*?)(?:are|:|-)([^\.]+)"
-                ]
-            else:  # Declining
-                patterns = [
-                    r"(?:[\w\s]+) (?:industries|manufacturing industries) (?:that |)(?:reporting|reported|report) (?:a |an |)(?:decline|contraction|decrease|declining|decreased|lower)(?: in| of)? (?:[\w\s&]+)?(?:[^:]*?)(?:are|—|:|in|-|,)(?:.+?)?(?:order|the following order|listed in order|:)[^:]*?([^\.]+)",
-                    r"(?:[\w\s]+) industries (?:that |)(?:reporting|reported|report) (?:a |)(?:decline|decrease|contraction)(?:[^:]*?)(?:are|:|-)([^\.]+)"
-                ]
+        patterns = patterns or get_pattern_registry("Manufacturing")
         
         # Try each pattern
-        for pattern in patterns:
-            match = re.search(pattern, summary, re.IGNORECASE | re.DOTALL)
+        for pattern in patterns.get_category_patterns(category):
+            match = pattern.search(summary)
             if match:
                 industries_text = match.group(1).strip()
                 return self._parse_industry_list(industries_text)
@@ -418,20 +381,8 @@ class IndustryExtractionStrategy(ExtractionStrategy):
         cleaned_text = text.strip()
         
         # Remove common artifacts
-        artifacts = [
-            r"in (?:January|February|March|April|May|June|July|August|September|October|November|December)(?:\s+\d{4})?(?:\s*[-—]\s*)?",
-            r"in (?:the )?following order(?:\s*[-—]\s*)?",
-            r"in order(?:\s*[-—]\s*)?",
-            r"are(?:\s*:)?",
-            r"is(?:\s*:)?",
-            r"(?:listed|in) order(?:\s*[-—]\s*)?",
-            r":",
-            r"^[,;.\s]*",  # Remove leading punctuation
-            r"(?:and|&)\s+"  # Remove "and" or "&" at beginning
-        ]
-        
-        for artifact in artifacts:
-            cleaned_text = re.sub(artifact, '', cleaned_text, flags=re.IGNORECASE)
+        for artifact in _LIST_ARTIFACTS:
+            cleaned_text = artifact.sub('', cleaned_text)
         
         # Split by delimiters
         if ';' in cleaned_text:
@@ -446,9 +397,9 @@ class IndustryExtractionStrategy(ExtractionStrategy):
                 continue
                 
             # Clean up each industry name
-            item = re.sub(r'\s*\(\d+\)\s*$', '', item)  # Remove footnote numbers
-            item = re.sub(r'\s*\*+\s*$', '', item)      # Remove trailing asterisks
-            item = re.sub(r'^\s*-\s*', '', item)        # Remove leading dashes
+            item = _FOOTNOTE.sub('', item)         # Remove footnote numbers
+            item = _TRAILING_ASTERISKS.sub('', item)  # Remove trailing asterisks
+            item = _LEADING_DASH.sub('', item)        # Remove leading dashes
             item = item.strip()
             
             if len(item) > 1:
@@ -0,0 +1,289 @@
+"""
+Deterministic extraction fast path for ISM report PDFs.
+
+ISM reports are written to a fixed template: every index summary states its
+reading ("registered 54.4 percent") and lists the industries on each side in
+one sentence that also says how many there are ("The nine industries
+reporting an increase ... are: A; B; ...; and I."). extract_deterministic()
+parses those sentences from the sliced report sections and scores the result:
+a section only counts as covered when its index value also appears in the
+glance table and every industry list has exactly as many entries as the
+sentence announces.
+
+When every section is covered and the result survives
+DataTransformationPipeline unchanged in coverage, main.process_single_pdf
+stores it directly and skips the CrewAI crews. Uncovered sections can be
+filled with the per-section LLM prompts (report_sections) before giving up
+and running the crews.
+"""
+
+import os
+import re
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from industry_patterns import scan_clauses
+from report_sections import ReportSections, slice_report
+
+logger = logging.getLogger(__name__)
+
+FAST_PATH_ENABLED = os.environ.get('ISM_FAST_PATH', '1').lower() not in ('0', 'false', 'no')  # Skip the crews for fully parsed reports
+FAST_PATH_LLM_SECTIONS = os.environ.get('ISM_FAST_PATH_LLM_SECTIONS', '1').lower() not in ('0', 'false', 'no')  # Fill uncovered sections with per-section LLM calls
+
+PATHS = ('deterministic', 'llm_sections', 'crew')
+
+_VALUE = re.compile(r"(?:registered|registering|reading of|index of|was|at)\s+(\d{2}(?:\.\d)?)\s*(?:percent|%)", re.IGNORECASE)
+_MONTH_YEAR = re.compile(r"\b(January|February|March|April|May|June|July|August|September|October|November|December)\s+(\d{4})\b",
+                         re.IGNORECASE)
+
+_DIRECTIONS = 'Growing|Contracting|Slowing|Faster|Increasing|Decreasing|Too High|Too Low'
+
+_lock = threading.Lock()
+_path_counts = {path: 0 for path in PATHS}
+
+
+def record_path(path: str):
+    """Count which extraction path a report took."""
+    with _lock:
+        _path_counts[path] = _path_counts.get(path, 0) + 1
+
+
+def get_fast_path_stats() -> Dict[str, Any]:
+    """How often each extraction path was taken in this process."""
+    with _lock:
+        counts = dict(_path_counts)
+    total = sum(counts.values())
+    return {
+        'enabled': FAST_PATH_ENABLED,
+        'paths': counts,
+        'total': total,
+        'crew_skipped_rate': round((total - counts['crew']) / total, 3) if total else None,
+    }
+
+
+def reset_fast_path_stats():
+    with _lock:
+        for path in _path_counts:
+            _path_counts[path] = 0
+
+
+def _direction(index_name: str, value: str, glance: str) -> str:
+    """The direction printed next to the value in the glance table, else the one implied by 50."""
+    match = re.search(rf"(?<![\d.]){re.escape(value)}\s+[\d.]+\s+[+-]?\s*[\d.]+\s+({_DIRECTIONS})", glance)
+    if match:
+        return match.group(1).title()
+    above = float(value) >= 50
+    if index_name == 'Supplier Deliveries':
+        return 'Slowing' if above else 'Faster'
+    if index_name == 'Prices':
+        return 'Increasing' if above else 'Decreasing'
+    if index_name in ("Customers' Inventories", 'Inventory Sentiment'):
+        return 'Too High' if above else 'Too Low'
+    return 'Growing' if above else 'Contracting'
+
+
+def parse_industry_sentences(summary: str, categories: List[str]) -> Tuple[Dict[str, List[str]], List[str]]:
+    """
+    Industry lists of one index summary by category.
+
+    Returns:
+        (category -> industries, problems) where problems describes every
+        sentence that could not be classified or whose list length does not
+        match the announced count
+    """
+    result = {category: [] for category in categories[:2]}
+    problems = []
+    for clause in scan_clauses(summary):
+        if clause.side is None or len(categories) < 2:
+            problems.append(f"unclassified: {clause.sentence[:60]}")
+            continue
+        category = categories[clause.side]
+
+        if clause.announced is not None and clause.announced != len(clause.industries):
+            problems.append(f"{category}: announced {clause.announced}, parsed {len(clause.industries)}")
+        if result.get(category):
+            problems.append(f"{category}: listed twice")
+        result[category] = clause.industries
+    return result, problems
+
+
+def extract_deterministic(text: str, report_type: str, handler,
+                          sections: Optional[ReportSections] = None) -> Dict[str, Any]:
+    """
+    Parse a report without an LLM.
+
+    Returns:
+        {'data': extraction dict, 'covered': [...], 'uncovered': {section: reason},
+         'sections': ReportSections, 'confidence': covered fraction}.
+        Section names are the index names plus 'glance' (month and values).
+    """
+    indices = handler.get_indices()
+    if sections is None:
+        sections = slice_report(text, report_type, indices)
+
+    data = {
+        'month_year': None,
+        'report_type': report_type,
+        'indices': {},
+        'industry_data': {},
+        'index_summaries': dict(sections.summaries),
+    }
+    uncovered = {}
+
+    header_match = _MONTH_YEAR.search(sections.glance or '') or _MONTH_YEAR.search(sections.header)
+    if header_match:
+        data['month_year'] = f"{header_match.group(1).title()} {header_match.group(2)}"
+    else:
+        uncovered['glance'] = 'month not found'
+
+    for index_name in indices:
+        summary = sections.summaries.get(index_name)
+        if summary is None:
+            uncovered[index_name] = 'summary not found'
+            continue
+        problems = []
+
+        value_match = _VALUE.search(' '.join(summary.split()))
+        # Summaries round whole readings ("49 percent"); the glance table prints 49.0
+        value = f"{float(value_match.group(1)):.1f}" if value_match else None
+        if value is None:
+            problems.append('value not found')
+        elif not sections.glance or not re.search(rf"(?<![\d.]){re.escape(value)}(?![\d])", sections.glance):
+            problems.append(f"value {value} not in glance table")
+        else:
+            data['indices'][index_name] = {
+                'current': value,
+                'value': float(value),
+                'series_index': value,
+                'direction': _direction(index_name, value, sections.glance),
+            }
+
+        if not index_name.endswith(' PMI'):
+            categories = handler.get_index_categories(index_name) or ['Growing', 'Declining']
+            industries, industry_problems = parse_industry_sentences(summary, categories)
+            if not industry_problems and not any(industries.values()):
+                industry_problems = ['no industry lists']
+            if industry_problems:
+                problems.extend(industry_problems)
+            else:
+                data['industry_data'][index_name] = industries
+
+        if problems:
+            uncovered[index_name] = '; '.join(problems)
+
+    covered = [name for name in ['glance'] + list(indices) if name not in uncovered]
+    return {
+        'data': data,
+        'covered': covered,
+        'uncovered': uncovered,
+        'sections': sections,
+        'confidence': round(len(covered) / (len(indices) + 1), 3) if indices else 0.0,
+    }
+
+
+def count_industries(industry_data: Dict[str, Dict[str, List[str]]]) -> int:
+    return sum(len(industries) for categories in (industry_data or {}).values() if isinstance(categories, dict)
+               for industries in categories.values() if isinstance(industries, list))
+
+
+def validate_complete(data: Dict[str, Any], report_type: str, handler) -> Optional[Dict[str, Any]]:
+    """
+    Run the data through DataTransformationPipeline and return the validated
+    dict only if every index and every industry survived; None otherwise.
+    """
+    from data_validation import DataTransformationPipeline
+
+    expected_industries = count_industries(data.get('industry_data'))
+    validated = DataTransformationPipeline.process(dict(data), report_type)
+    if not validated or not validated.get('month_year'):
+        return None
+    missing = [name for name in handler.get_indices() if name not in validated.get('indices', {})]
+    industry_indices = [name for name in handler.get_indices() if not name.endswith(' PMI')]
+    missing += [name for name in industry_indices if name not in validated.get('industry_data', {})]
+    if missing:
+        logger.info(f"Fast path validation dropped {missing}")
+        return None
+    if count_industries(validated.get('industry_data')) != expected_industries:
+        logger.info("Fast path validation changed the industry count")
+        return None
+    return validated
+
+
+def _fill_with_llm(pdf_path: str, result: Dict[str, Any], report_type: str, handler) -> bool:
+    """
+    Fill uncovered sections with the per-section LLM prompts. Returns False
+    when a section can't be filled this way (no summary found, or a call failed).
+    """
+    from tools import SimplePDFExtractionTool
+    from pdf_text_cache import document_hash
+    from report_sections import glance_prompt, summary_prompt
+
+    sections, data = result['sections'], result['data']
+    indices = handler.get_indices()
+    if not sections.glance or any(reason == 'summary not found' for reason in result['uncovered'].values()):
+        return False
+
+    tool = SimplePDFExtractionTool()
+    pdf_hash = document_hash(pdf_path)
+    if 'glance' in result['uncovered'] or any(name not in data['indices'] for name in indices):
+        glance = tool._complete_json(pdf_hash, glance_prompt(sections, indices))
+        if not glance:
+            return False
+        data['month_year'] = data['month_year'] or glance.get('month_year')
+        for name, values in (glance.get('indices') or {}).items():
+            if name in indices and name not in data['indices']:
+                data['indices'][name] = values
+
+    for name in indices:
+        if name.endswith(' PMI') or name in data['industry_data']:
+            continue
+        categories = handler.get_index_categories(name)
+        answer = tool._complete_json(pdf_hash, summary_prompt(sections, name, categories))
+        if not answer:
+            return False
+        industries = answer.get(name, answer)
+        if not isinstance(industries, dict):
+            return False
+        data['industry_data'][name] = {category: list(industries.get(category) or []) for category in categories}
+    return True
+
+
+def run_fast_path(pdf_path: str, report_type: str) -> Optional[Dict[str, Any]]:
+    """
+    Validated extraction data for a report without running the crews, or
+    None when the crews are needed. Records which path was taken; the caller
+    records 'crew' when it falls back.
+    """
+    from pdf_text_cache import get_pdf_text
+    from report_handlers import ReportTypeFactory
+
+    try:
+        handler = ReportTypeFactory.create_handler(report_type)
+        text = get_pdf_text(pdf_path, 'pdfplumber')
+        result = extract_deterministic(text, report_type, handler)
+    except Exception as e:
+        logger.warning(f"Deterministic extraction failed for {pdf_path}: {str(e)}")
+        return None
+
+    path = 'deterministic'
+    if result['uncovered']:
+        logger.info(f"Deterministic extraction covered {result['confidence']:.0%} of {pdf_path}; "
+                    f"uncovered: {result['uncovered']}")
+        if not FAST_PATH_LLM_SECTIONS:
+            return None
+        try:
+            if not _fill_with_llm(pdf_path, result, report_type, handler):
+                return None
+        except Exception as e:
+            logger.warning(f"Per-section LLM extraction failed for {pdf_path}: {str(e)}")
+            return None
+        path = 'llm_sections'
+
+    validated = validate_complete(result['data'], report_type, handler)
+    if validated is None:
+        return None
+    record_path(path)
+    logger.info(f"Fast path ({path}) extracted {pdf_path}: {len(validated['indices'])} indices, "
+                f"{count_industries(validated['industry_data'])} industries")
+    return validated
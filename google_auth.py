@@ -5,9 +5,12 @@ from google.auth.transport.requests import Request
 from googleapiclient.discovery import build
 import logging
 from flask import url_for, session, redirect
+from sheets_client import SheetsClient
 
 logger = logging.getLogger(__name__)
 
+SHEETS_EMULATOR = os.environ.get('ISM_SHEETS_EMULATOR', '').lower() in ('1', 'true', 'yes')  # Serve Sheets calls from the in-process emulator (offline runs, benchmarks)
+
 SCOPES = [
     'https://www.googleapis.com/auth/spreadsheets',
     'https://www.googleapis.com/auth/userinfo.email',
@@ -98,6 +101,10 @@ def finish_google_auth(state, code):
 
 def get_google_sheets_service():
     """Get a Google Sheets API service."""
+    if SHEETS_EMULATOR:
+        from sheets_emulator import get_emulator
+        return SheetsClient(get_emulator())
+    
     creds = None
     # The file token.pickle stores the user's access and refresh tokens
     if os.path.exists('token.pickle'):
@@ -114,5 +121,5 @@ def get_google_sheets_service():
         else:
             return None
     
-    # Return the Google Sheets API service
-    return build('sheets', 'v4', credentials=creds)
\ No newline at end of file
+    # Return the Google Sheets API service, rate limited and retrying (see sheets_client)
+    return SheetsClient(build('sheets', 'v4', credentials=creds))
\ No newline at end of file
@@ -0,0 +1,83 @@
+"""
+Conditional GET support for the dashboard JSON APIs.
+
+The heatmap, trend, industry, index-list and correlation endpoints only change
+when a report is stored (which bumps the data generation, see
+db_utils.bump_data_generation) or a config file is reloaded. The
+conditional_json decorator gives their responses a strong ETag built from
+the data generation, the config fingerprint, the endpoint and its arguments,
+and answers a matching If-None-Match with 304 Not Modified before the view
+runs, so a dashboard poll that finds nothing new costs two os.stat() calls
+instead of SQL and JSON serialization.
+"""
+
+import os
+import hashlib
+import logging
+from functools import wraps
+
+from flask import Response, request
+
+import query_metrics
+from api_encoding import negotiate_encoding
+from config_loader import config_loader
+from db_utils import peek_data_generation
+
+logger = logging.getLogger(__name__)
+
+API_CACHE_MAX_AGE = int(os.environ.get('ISM_API_CACHE_MAX_AGE', 0))  # Seconds clients may reuse a response without revalidating
+
+
+def cache_control_header(max_age: int = None) -> str:
+    """Cache-Control for the ETagged responses (0 means revalidate on every use)."""
+    max_age = API_CACHE_MAX_AGE if max_age is None else max_age
+    if max_age <= 0:
+        return 'public, no-cache'
+    return f'public, max-age={max_age}, must-revalidate'
+
+
+def compute_etag() -> str:
+    """ETag of the current request: data generation, config fingerprint, endpoint, arguments and encoding."""
+    # Read outside the request's collector so revalidation does not count against its query budget
+    with query_metrics.track_queries('data generation'):
+        generation = peek_data_generation()
+    parts = [
+        str(generation),
+        config_loader.get_fingerprint(),
+        request.endpoint or request.path,
+        repr(sorted((request.view_args or {}).items())),
+        repr(sorted(request.args.items(multi=True))),
+        negotiate_encoding() or 'identity',  # each Content-Encoding is its own representation
+    ]
+    return hashlib.sha1('\x1f'.join(parts).encode('utf-8')).hexdigest()
+
+
+def conditional_json(view):
+    """
+    Add ETag and Cache-Control to a view's successful responses and answer
+    If-None-Match with 304 Not Modified without calling the view.
+
+    Example:
+        @app.route('/api/all_indices')
+        @conditional_json
+        def get_indices_list():
+            ...
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return view(*args, **kwargs)
+
+        etag = compute_etag()
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+        else:
+            response = view(*args, **kwargs)
+            if isinstance(response, tuple) or not isinstance(response, Response) or response.status_code != 200:
+                return response  # error responses are not cached
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = cache_control_header()
+        response.vary.add('Accept-Encoding')  # the ETag, like the body, differs per negotiated encoding
+        return response
+
+    return wrapper
@@ -0,0 +1,188 @@
+"""
+Map raw industry names from extracted reports onto the canonical list.
+
+The canonical industries of each report type come from config_loader. A
+CanonicalIndustryMatcher is built once per report type (and config
+generation) and answers in constant time for names it has seen before:
+
+1. an exact map of normalized canonical names and their common variants
+   ("Chemical" / "chemical products" / "Food, Beverage and Tobacco Products");
+2. a token index and a word-prefix trie, which narrow the containment match
+   ("Computer" -> "Computer & Electronic Products") to the few canonical
+   names that share a word with the raw name; only names matching none of
+   those (e.g. a fragment starting mid-word) fall back to scanning them all;
+3. optionally (ISM_INDUSTRY_FUZZY=1) a close-match fallback for misspellings.
+
+DataTransformationPipeline, db_utils.clean_industry_name and the report
+handlers all resolve names through match_canonical_industry().
+"""
+
+import os
+import re
+import difflib
+import logging
+import threading
+from typing import Dict, List, Optional, Set, Tuple
+
+from config_loader import config_loader
+
+logger = logging.getLogger(__name__)
+
+INDUSTRY_FUZZY_MATCH = os.environ.get('ISM_INDUSTRY_FUZZY', '').lower() in ('1', 'true', 'yes')  # Close-match fallback for misspelled names
+INDUSTRY_FUZZY_CUTOFF = float(os.environ.get('ISM_INDUSTRY_FUZZY_CUTOFF', 0.88))  # Minimum similarity ratio for the fallback
+
+_MAX_MEMO = 4096
+_STOP_TOKENS = {'and', 'of', 'the'}
+_PRODUCTS_SUFFIX = re.compile(r'\s+Products$', re.IGNORECASE)
+_AND_SPLIT = re.compile(r'\s+&\s+|\s+and\s+', re.IGNORECASE)
+_WORD = re.compile(r"[a-z0-9']+")
+
+
+def normalize_industry(name: str) -> str:
+    """Lowercase, '&' spelled 'and', punctuation and repeated spaces removed."""
+    name = name.lower().replace('&', ' and ')
+    return ' '.join(_WORD.findall(name))
+
+
+class CanonicalIndustryMatcher:
+    """Resolve raw industry names to the canonical names of one report type."""
+
+    def __init__(self, canonical_industries: List[str], fuzzy: Optional[bool] = None):
+        """
+        Args:
+            canonical_industries: Canonical names in config order (earlier wins ties)
+            fuzzy: Use the close-match fallback (None for ISM_INDUSTRY_FUZZY)
+        """
+        self.canonical = list(canonical_industries)
+        self.fuzzy = INDUSTRY_FUZZY_MATCH if fuzzy is None else fuzzy
+        self._order = {name: position for position, name in enumerate(self.canonical)}
+        self._exact: Dict[str, str] = {}
+        self._normalized: Dict[str, str] = {}  # canonical -> normalized form
+        self._tokens: Dict[str, Set[str]] = {}
+        self._trie: Dict[str, dict] = {}
+        self._memo: Dict[str, Optional[str]] = {}
+        self._lock = threading.Lock()
+
+        for canon_name in self.canonical:
+            self._add_variants(canon_name)
+            normalized = normalize_industry(canon_name)
+            self._normalized[canon_name] = normalized
+            words = normalized.split()
+            for word in words:
+                if word not in _STOP_TOKENS:
+                    self._tokens.setdefault(word, set()).add(canon_name)
+            # Every word-start suffix, so a raw name matching the start of any word is found
+            for start in range(len(words)):
+                self._insert(' '.join(words[start:]), canon_name)
+
+    def _add_variants(self, canon_name: str):
+        # The variants the pipeline has always accepted; the first canonical name wins a shared key
+        variants = [canon_name, _PRODUCTS_SUFFIX.sub('', canon_name).strip(), canon_name.replace(' & ', ' and ')]
+        parts = _AND_SPLIT.split(canon_name)
+        if len(parts) > 1:
+            variants.append(parts[0])  # e.g. "Computer" -> "Computer & Electronic Products"
+        for variant in variants:
+            self._exact.setdefault(variant.lower(), canon_name)
+            self._exact.setdefault(normalize_industry(variant), canon_name)
+
+    def _insert(self, text: str, canon_name: str):
+        node = self._trie
+        for char in text:
+            node = node.setdefault(char, {})
+            node.setdefault('$', set()).add(canon_name)
+
+    def _prefix_candidates(self, text: str) -> Set[str]:
+        node = self._trie
+        for char in text:
+            node = node.get(char)
+            if node is None:
+                return set()
+        return set(node.get('$', ()))
+
+    def match(self, raw_industry: str) -> Optional[str]:
+        """The canonical name for a raw industry name, or None if nothing matches."""
+        if not raw_industry or not isinstance(raw_industry, str):
+            return None
+        key = raw_industry.strip().lower()
+        with self._lock:
+            if key in self._memo:
+                return self._memo[key]
+
+        canonical_name = self._exact.get(key) or self._lookup(key)
+
+        with self._lock:
+            if len(self._memo) >= _MAX_MEMO:
+                self._memo.clear()
+            self._memo[key] = canonical_name
+        return canonical_name
+
+    def _lookup(self, key: str) -> Optional[str]:
+        normalized = normalize_industry(key)
+        if not normalized:
+            return None
+        canonical_name = self._exact.get(normalized)
+        if canonical_name:
+            return canonical_name
+
+        # Containment: narrowed to the names sharing a word (start) with the raw name,
+        # then all names, so a fragment starting mid-word ("lectronic") still matches
+        candidates = self._prefix_candidates(normalized)
+        for word in normalized.split():
+            candidates |= self._tokens.get(word, set())
+        best_match = (self._best_containment(key, normalized, sorted(candidates, key=self._order.get))
+                      or self._best_containment(key, normalized, self.canonical))
+        if best_match or not self.fuzzy:
+            return best_match
+
+        close = difflib.get_close_matches(normalized, list(self._exact), n=1, cutoff=INDUSTRY_FUZZY_CUTOFF)
+        return self._exact[close[0]] if close else None
+
+    def _best_containment(self, key: str, normalized: str, names: List[str]) -> Optional[str]:
+        """The longest containment overlap among names (in config order); ties go to the earlier name."""
+        best_score, best_match = 0, None
+        for canon_name in names:
+            canon_lower = canon_name.lower()
+            canon_normalized = self._normalized[canon_name]
+            if key in canon_lower or normalized in canon_normalized:
+                score = len(key)
+            elif canon_lower in key or canon_normalized in normalized:
+                score = len(canon_name)
+            else:
+                continue
+            if score > best_score:
+                best_score, best_match = score, canon_name
+        return best_match
+
+
+_matchers_lock = threading.Lock()
+_matchers: Dict[str, Tuple[int, CanonicalIndustryMatcher]] = {}  # report type -> (config generation, matcher)
+
+
+def get_industry_matcher(report_type: str) -> Optional[CanonicalIndustryMatcher]:
+    """The shared matcher of a report type, or None if it has no canonical industries."""
+    report_type = (report_type or '').strip().capitalize()
+    generation = config_loader.get_generation()
+    with _matchers_lock:
+        entry = _matchers.get(report_type)
+    if entry is not None and entry[0] == generation:
+        return entry[1]
+
+    canonical_industries = config_loader.get_canonical_industries(report_type)
+    if not canonical_industries:
+        return None
+    matcher = CanonicalIndustryMatcher(canonical_industries)
+    with _matchers_lock:
+        _matchers[report_type] = (generation, matcher)
+    return matcher
+
+
+def match_canonical_industry(raw_industry: str, report_type: str) -> Optional[str]:
+    """Canonical name of a raw industry name for a report type, or None."""
+    matcher = get_industry_matcher(report_type)
+    return matcher.match(raw_industry) if matcher else None
+
+
+def clear_industry_matchers():
+    """Rebuild the matchers on next use (they are also rebuilt when the config generation changes)."""
+    with _matchers_lock:
+        _matchers.clear()
@@ -0,0 +1,204 @@
+"""
+Precompiled industry-list patterns and a single-pass clause scanner.
+
+Every index summary of an ISM report names its industries in one sentence
+per side ("The N industries reporting <growth|a decline|slower deliveries|
+...> ... are: A; B; and C."). scan_clauses() finds all of those sentences in
+one sweep over the summary and decides the side of each from a keyword
+table, instead of running a separate search per index and category.
+
+get_pattern_registry() builds, once per report type and config generation,
+the categories of each index (from config_loader) and the compiled
+per-category patterns the extraction strategy falls back to when the
+scanner does not find a clause.
+"""
+
+import re
+import threading
+from typing import Dict, List, NamedTuple, Optional, Pattern, Tuple
+
+from config_loader import config_loader
+
+_NUMBER_WORDS = {
+    'only': 1, 'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5, 'six': 6, 'seven': 7, 'eight': 8,
+    'nine': 9, 'ten': 10, 'eleven': 11, 'twelve': 12, 'thirteen': 13, 'fourteen': 14, 'fifteen': 15,
+    'sixteen': 16, 'seventeen': 17, 'eighteen': 18
+}
+
+# Earliest keyword in the part of the sentence before the list decides the side
+POLARITY_KEYWORDS = (
+    ('too high', 0), ('too low', 1), ('slower', 0), ('faster', 1),
+    ('increas', 0), ('growth', 0), ('expan', 0), ('higher', 0), ('paying more', 0),
+    ('decreas', 1), ('declin', 1), ('contract', 1), ('lower', 1), ('paying less', 1),
+)
+
+# Sentences end at '.' or, for respondent quotes, at '.”'
+_SENTENCE_SPLIT = re.compile(r"(?:(?<=[A-Za-z0-9\)”\"])\.|(?<=\.)[”\"])\s+(?=[A-Z“\"])")
+_LIST_VERB = re.compile(r"^(.*\b(?:is|was|are))\s+(.+)$")
+_COUNT = re.compile(r"\b(?:the\s+)?(\d+|[a-z]+)(?:\s+of\s+the\s+\d+)?(?:\s+[a-z]+)?\s+industr(?:y|ies)\b", re.IGNORECASE)
+_LEADING_AND = re.compile(r"^\s*(?:and\s+)")
+
+# Fallback patterns per category (formerly rebuilt by IndustryExtractionStrategy on every call)
+CATEGORY_PATTERNS = {
+    'Slower': [
+        r"industries reporting slower (?:supplier )?deliveries(?:[^:]*?)(?:are|—|in|:|-)(?:[^:]*?)(?:order|the following order|listed in order|:)[^:]*?([^\.]+)",
+        r"industries reporting slower (?:supplier )?deliveries(?:[^:]*?)(?:are|:|-)([^\.]+)"
+    ],
+    'Faster': [
+        r"industries reporting faster (?:supplier )?deliveries(?:[^:]*?)(?:are|—|in|:|-)(?:[^:]*?)(?:order|the following order|listed in order|:)[^:]*?([^\.]+)",
+        r"industries reporting faster (?:supplier )?deliveries(?:[^:]*?)(?:are|:|-)([^\.]+)"
+    ],
+    'Higher': [
+        r"industries reporting (?:higher|increased|increasing|growing|growth in) inventories(?:[^:]*?)(?:listed in|—|in|:|-)(?:[^:]*?)(?:order|the following order|:)[^:]*?([^\.]+)",
+        r"industries reporting (?:higher|increased|increasing) inventories(?:[^:]*?)(?:are|:|-)([^\.]+)"
+    ],
+    'Lower': [
+        r"industries reporting (?:lower|decreased|declining|lower or decreased) inventories(?:[^:]*?)(?:in the following|—|in|:|-)(?:[^:]*?)(?:order|the following order|:)[^:]*?([^\.]+)",
+        r"industries reporting (?:lower|decreased|declining) inventories(?:[^:]*?)(?:are|:|-)([^\.]+)"
+    ],
+    'Too High': [
+        r"industries reporting (?:customers['']s?|customers) (?:inventories|inventory) as too high(?:[^:]*?)(?:are|—|in|:|-)(?:[^:]*?)(?:order|the following order|:)?[^:]*?([^\.]+)",
+        r"(?:industries|industry) reporting (?:customers['']s?|customers) (?:inventories|inventory) as too high(?:[^:]*?)(?:are|:|-)([^\.]+)"
+    ],
+    'Too Low': [
+        r"industries reporting (?:customers['']s?|customers) (?:inventories|inventory) as too low(?:[^:]*?)(?:are|—|in|:|-)(?:[^:]*?)(?:order|the following order|:)?[^:]*?([^\.]+)",
+        r"(?:industries|industry) reporting (?:customers['']s?|customers) (?:inventories|inventory) as too low(?:[^:]*?)(?:are|:|-)([^\.]+)"
+    ],
+    'Increasing': [
+        r"(?:In (?:[\w\s]+), |The |)(?:[\w\s]+) industries (?:that |)(?:reported|reporting) (?:paying |higher |increased |increasing |price increases)(?:prices|price|prices for raw materials)?(?:[^:]*?)(?:in order|order|:|—|-)(?:[^:]*?)(?:are|:)([^\.]+)",
+        r"industries (?:that |)(?:reported|reporting) (?:paying |higher |increased |increasing) prices(?:[^:]*?)(?:are|:|-)([^\.]+)"
+    ],
+    'Decreasing': [
+        r"(?:The only industry|The [\w\s]+ industries) (?:that |)(?:reported|reporting) (?:paying |lower |decreased |decreasing |price decreases)(?:prices|price|prices for raw materials)?(?:[^:]*?)(?:in order|order|:|—|-)(?:[^:]*?)(?:are|is):?([^\.]+)",
+        r"industries (?:that |)(?:reported|reporting) (?:paying |lower |decreased |decreasing) prices(?:[^:]*?)(?:are|:|-)([^\.]+)"
+    ],
+    'Growing': [
+        r"(?:[\w\s]+) (?:industries|manufacturing industries) (?:that |)(?:reporting|reported|report) (?:growth|expansion|increase|growing|increased|an increase|higher|growth in)(?: in| of)? (?:[\w\s&]+)?(?:[^:]*?)(?:are|—|:|in|-|,)(?:.+?)?(?:order|the following order|listed in order|:)[^:]*?([^\.]+)",
+        r"(?:[\w\s]+) industries (?:that |)(?:reporting|reported|report) growth(?:[^:]*?)(?:are|:|-)([^\.]+)"
+    ],
+    'Declining': [
+        r"(?:[\w\s]+) (?:industries|manufacturing industries) (?:that |)(?:reporting|reported|report) (?:a |an |)(?:decline|contraction|decrease|declining|decreased|lower)(?: in| of)? (?:[\w\s&]+)?(?:[^:]*?)(?:are|—|:|in|-|,)(?:.+?)?(?:order|the following order|listed in order|:)[^:]*?([^\.]+)",
+        r"(?:[\w\s]+) industries (?:that |)(?:reporting|reported|report) (?:a |)(?:decline|decrease|contraction)(?:[^:]*?)(?:are|:|-)([^\.]+)"
+    ],
+}
+
+_FLAGS = re.IGNORECASE | re.DOTALL
+_COMPILED_CATEGORY_PATTERNS = {
+    category: tuple(re.compile(pattern, _FLAGS) for pattern in patterns)
+    for category, patterns in CATEGORY_PATTERNS.items()
+}
+
+
+class IndustryClause(NamedTuple):
+    """One "N industries reporting ... are: A; B; and C." sentence."""
+    side: Optional[int]  # 0 = first category of the index, 1 = second, None = unclassified
+    industries: List[str]
+    announced: Optional[int]  # count stated in the sentence, if any
+    sentence: str
+
+
+def announced_count(lead: str) -> Optional[int]:
+    """The number of industries a clause says it lists ('The nine industries ...' -> 9)."""
+    match = _COUNT.search(lead)
+    if not match:
+        return None
+    word = match.group(1).lower()
+    return int(word) if word.isdigit() else _NUMBER_WORDS.get(word)
+
+
+def split_industry_list(text: str) -> List[str]:
+    """Split a ';' separated industry list, dropping the 'and' before the last entry."""
+    text = text.strip().rstrip('.')
+    parts = text.split(';') if ';' in text else [text]
+    industries = []
+    for part in parts:
+        part = _LEADING_AND.sub('', part.strip())
+        if part:
+            industries.append(part)
+    return industries
+
+
+def clause_side(lead: str) -> Optional[int]:
+    """Side of a clause from the earliest polarity keyword in its lead."""
+    lowered = lead.lower()
+    hits = [(lowered.find(keyword), side) for keyword, side in POLARITY_KEYWORDS if keyword in lowered]
+    return min(hits)[1] if hits else None
+
+
+def scan_clauses(summary: str) -> List[IndustryClause]:
+    """Every industry-list clause of a summary, in order, from a single sweep over its sentences."""
+    text = ' '.join(summary.split())
+    clauses = []
+    for sentence in _SENTENCE_SPLIT.split(text):
+        lowered = sentence.lower()
+        if 'industr' not in lowered or 'report' not in lowered or 'no change' in lowered:
+            continue
+        if ':' in sentence:
+            lead, listed = sentence.rsplit(':', 1)
+        else:
+            match = _LIST_VERB.search(sentence)
+            if not match:
+                continue
+            lead, listed = match.groups()
+        clauses.append(IndustryClause(clause_side(lead), split_industry_list(listed), announced_count(lead), sentence))
+    return clauses
+
+
+class PatternRegistry:
+    """Index categories and compiled fallback patterns of one report type."""
+
+    def __init__(self, report_type: str):
+        self.report_type = report_type
+        self.indices = config_loader.get_indices(report_type)
+        self.categories = {index_name: config_loader.get_index_categories(report_type, index_name)
+                           for index_name in self.indices}
+
+    def get_categories(self, index_name: str) -> List[str]:
+        """Categories of an index (config first, then the built-in defaults)."""
+        categories = self.categories.get(index_name)
+        if categories is None:
+            categories = self.categories[index_name] = config_loader.get_index_categories(self.report_type, index_name)
+        return categories
+
+    def get_category_patterns(self, category: str) -> Tuple[Pattern, ...]:
+        """Compiled fallback patterns for one category (empty for categories without any)."""
+        return _COMPILED_CATEGORY_PATTERNS.get(category, ())
+
+    def scan(self, index_name: str, summary: str) -> Dict[str, List[str]]:
+        """
+        Category -> industries of one index summary from scan_clauses().
+
+        Only clauses whose list length matches the count they announce are
+        used; categories without such a clause are left out.
+        """
+        categories = self.get_categories(index_name)
+        result = {}
+        if len(categories) < 2:
+            return result
+        for clause in scan_clauses(summary):
+            if clause.side is None or not clause.industries:
+                continue
+            if clause.announced is not None and clause.announced != len(clause.industries):
+                continue
+            result.setdefault(categories[clause.side], clause.industries)
+        return result
+
+
+_registry_lock = threading.Lock()
+_registries: Dict[str, Tuple[int, PatternRegistry]] = {}  # report type -> (config generation, registry)
+
+
+def get_pattern_registry(report_type: str) -> PatternRegistry:
+    """The shared PatternRegistry of a report type, rebuilt when the config generation changes."""
+    generation = config_loader.get_generation()
+    with _registry_lock:
+        entry = _registries.get(report_type)
+        if entry is None or entry[0] != generation:
+            entry = _registries[report_type] = (generation, PatternRegistry(report_type))
+        return entry[1]
+
+
+def clear_pattern_registries():
+    """Rebuild the registries on next use."""
+    with _registry_lock:
+        _registries.clear()
@@ -0,0 +1,297 @@
+"""
+Parallel batch ingestion of ISM report PDFs.
+
+A batch moves through three stages:
+
+1. Preparation (process pool): report type detection, PDF text extraction and
+   the report month for progress labels. These are CPU-bound pure-Python work,
+   so they run one process per core. Extracted pages land in the on-disk PDF text cache, so the
+   later stages read them back instead of re-parsing the file.
+2. LLM pipeline (bounded thread pool): the CrewAI/OpenAI pipeline in
+   ``main.process_single_pdf``. It is I/O-bound, so at most
+   ``ISM_LLM_CONCURRENCY`` files are in flight at once to stay inside the API
+   rate limits.
+3. Storage (single writer thread): every SQLite write of the batch is funnelled
+   through one ``DatabaseWriter`` so concurrent files never contend for the
+   database write lock.
+
+Each file gets a status dict that is updated as it moves through the stages.
+Its ``stage`` follows the report pipeline (detection, extraction, store,
+validation, sheets) and ``timings`` records the seconds spent in each stage.
+"""
+
+import os
+import time
+import queue
+import logging
+import threading
+import traceback
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from db_utils import store_report_data_in_db
+
+logger = logging.getLogger(__name__)
+
+INGEST_WORKERS = int(os.environ.get('ISM_INGEST_WORKERS', os.cpu_count() or 1))  # Preparation processes
+LLM_CONCURRENCY = int(os.environ.get('ISM_LLM_CONCURRENCY', 4))  # Files in the LLM stage at once
+# 'spawn' keeps worker processes independent of the web server's threads and open DB handles
+INGEST_START_METHOD = os.environ.get('ISM_INGEST_START_METHOD', 'spawn')
+
+DEFAULT_VISUALIZATION_OPTIONS = {
+    'basic': True,
+    'heatmap': True,
+    'timeseries': True,
+    'industry': True
+}
+
+def prepare_pdf(pdf_path: str, report_type: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Stage 1: detect the report type, extract the text and read the report month.
+
+    Runs inside a worker process, so it must not touch the database. The text
+    lands in the PDF text cache, where the LLM stage reads it back; the full
+    pattern-based parsing is left to that stage, which is the only one that
+    uses its results.
+
+    Returns:
+        Dict with report_type, month_year, text_chars and the elapsed time in seconds
+    """
+    from report_handlers import ReportTypeFactory
+    from pdf_utils import extract_text_from_pdf, extract_month_year
+
+    started = time.time()
+    if not report_type:
+        report_type = ReportTypeFactory.detect_report_type(pdf_path)
+
+    text = extract_text_from_pdf(pdf_path) or ""
+    month_year = None
+    if text:
+        try:
+            month_year = extract_month_year(text)
+        except Exception as e:
+            logger.warning(f"Month/year extraction failed for {pdf_path}: {str(e)}")
+
+    return {
+        "report_type": report_type,
+        "month_year": month_year,
+        "text_chars": len(text),
+        "elapsed": time.time() - started
+    }
+
+class DatabaseWriter:
+    """Runs every database write of a batch on one dedicated thread."""
+
+    def __init__(self, store_fn: Callable = store_report_data_in_db):
+        self._store_fn = store_fn
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name='ism-db-writer', daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        """Queue fn(*args, **kwargs) for the writer thread."""
+        future = Future()
+        self._queue.put((future, fn, args, kwargs))
+        return future
+
+    def store_report(self, extraction_data, pdf_path, report_type):
+        """Store one report through the writer thread and wait for the result."""
+        return self.submit(self._store_fn, extraction_data, pdf_path, report_type).result()
+
+    def close(self):
+        """Finish the queued writes and stop the writer thread."""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            future, fn, args, kwargs = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+
+class IngestionPipeline:
+    """Processes a batch of PDFs through the preparation, LLM and storage stages."""
+
+    def __init__(self,
+                 workers: Optional[int] = None,
+                 llm_concurrency: Optional[int] = None,
+                 process_fn: Optional[Callable] = None,
+                 prepare_fn: Callable = prepare_pdf,
+                 store_fn: Callable = store_report_data_in_db,
+                 visualization_options: Optional[Dict[str, bool]] = None,
+                 on_update: Optional[Callable[[Dict[str, Any]], None]] = None):
+        """
+        Args:
+            workers: Preparation processes (1 runs stage 1 in-process)
+            llm_concurrency: Maximum files in the LLM stage at once
+            process_fn: LLM pipeline, called as process_fn(pdf_path, visualization_options,
+                report_type=..., store_fn=..., progress=...); defaults to main.process_single_pdf
+            prepare_fn: Stage 1 function; must be picklable when workers > 1
+            store_fn: Function the writer thread uses to store a report
+            visualization_options: Passed through to process_fn
+            on_update: Called with a copy of a file's status whenever it changes
+        """
+        self.workers = max(1, workers or INGEST_WORKERS)
+        self.llm_concurrency = max(1, llm_concurrency or LLM_CONCURRENCY)
+        self.process_fn = process_fn
+        self.prepare_fn = prepare_fn
+        self.store_fn = store_fn
+        self.visualization_options = visualization_options or dict(DEFAULT_VISUALIZATION_OPTIONS)
+        self.on_update = on_update
+        self._lock = threading.Lock()
+
+    def run(self, pdf_paths: Iterable[str], report_type: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Ingest every PDF in pdf_paths.
+
+        Args:
+            pdf_paths: Paths of the PDFs to process
+            report_type: Force a report type instead of detecting it per file
+
+        Returns:
+            OrderedDict mapping each path to its final status
+        """
+        pdf_paths = list(pdf_paths)
+        statuses = OrderedDict((path, self._new_status(path)) for path in pdf_paths)
+        if not pdf_paths:
+            return statuses
+
+        process_fn = self.process_fn
+        if process_fn is None:
+            from main import process_single_pdf
+            process_fn = process_single_pdf
+
+        batch_started = time.time()
+        writer = DatabaseWriter(self.store_fn).start()
+        try:
+            with ThreadPoolExecutor(max_workers=self.llm_concurrency, thread_name_prefix='ism-llm') as llm_pool:
+                llm_futures = []
+                for path, prepared, error in self._prepare_all(pdf_paths, report_type, statuses):
+                    status = statuses[path]
+                    if error:
+                        self._update(status, state='failed', error=f"Preparation failed: {error}")
+                        continue
+                    status['timings']['detection'] = round(prepared.get('elapsed', 0.0), 3)
+                    self._update(status,
+                                 state='queued',
+                                 stage=None,
+                                 report_type=prepared['report_type'],
+                                 month_year=prepared.get('month_year'))
+                    llm_futures.append(llm_pool.submit(self._process_one, process_fn, writer, status))
+                for future in llm_futures:
+                    future.result()
+        finally:
+            writer.close()
+
+        succeeded = sum(1 for s in statuses.values() if s['success'])
+        logger.info(f"Ingested {len(pdf_paths)} PDFs in {time.time() - batch_started:.1f}s "
+                    f"({succeeded} succeeded, workers={self.workers}, llm_concurrency={self.llm_concurrency})")
+        return statuses
+
+    def _prepare_all(self, pdf_paths: List[str], report_type: Optional[str],
+                     statuses: Dict[str, Dict[str, Any]]) -> Iterable[Tuple[str, Optional[Dict], Optional[str]]]:
+        """Yield (path, prepared, error) as each file finishes stage 1."""
+        for path in pdf_paths:
+            self._update(statuses[path], state='running', stage='detection')
+
+        workers = min(self.workers, len(pdf_paths))
+        if workers <= 1:
+            for path in pdf_paths:
+                try:
+                    yield path, self.prepare_fn(path, report_type), None
+                except Exception as e:
+                    logger.error(f"Error preparing {path}: {str(e)}")
+                    yield path, None, str(e)
+            return
+
+        context = multiprocessing.get_context(INGEST_START_METHOD)
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            futures = {pool.submit(self.prepare_fn, path, report_type): path for path in pdf_paths}
+            for future in as_completed(futures):
+                path = futures[future]
+                try:
+                    yield path, future.result(), None
+                except BrokenProcessPool:
+                    # A worker died (e.g. killed for memory); prepare this file in-process instead
+                    logger.warning(f"Preparation pool broke, preparing {path} in-process")
+                    try:
+                        yield path, self.prepare_fn(path, report_type), None
+                    except Exception as e:
+                        logger.error(f"Error preparing {path}: {str(e)}")
+                        yield path, None, str(e)
+                except Exception as e:
+                    logger.error(f"Error preparing {path}: {str(e)}")
+                    yield path, None, str(e)
+
+    def _process_one(self, process_fn: Callable, writer: DatabaseWriter, status: Dict[str, Any]):
+        """Stages 2 and 3 for one file, storing through the shared writer."""
+        path = status['path']
+        stage_started = [time.time()]
+
+        def close_stage():
+            if status['stage']:
+                status['timings'][status['stage']] = round(time.time() - stage_started[0], 3)
+
+        def progress(stage):
+            close_stage()
+            stage_started[0] = time.time()
+            self._update(status, stage=stage)
+
+        def store(extraction_data, pdf_path, report_type):
+            stored = writer.store_report(extraction_data, pdf_path, report_type)
+            self._update(status, stored=bool(stored))
+            return stored
+
+        self._update(status, state='running')
+        try:
+            result = process_fn(path, self.visualization_options,
+                                report_type=status['report_type'], store_fn=store, progress=progress)
+            close_stage()
+            if result:
+                self._update(status, state='done', stage=None, success=True, result=result)
+            else:
+                self._update(status, state='failed', result=result)
+        except Exception as e:
+            close_stage()
+            logger.error(f"Error processing {path}: {str(e)}")
+            logger.error(f"Traceback: {traceback.format_exc()}")
+            self._update(status, state='failed', error=str(e))
+
+    def _new_status(self, path: str) -> Dict[str, Any]:
+        return {
+            'file': os.path.basename(path),
+            'path': path,
+            'state': 'pending',
+            'stage': None,
+            'report_type': None,
+            'month_year': None,
+            'stored': False,
+            'success': False,
+            'result': None,
+            'error': None,
+            'timings': {}
+        }
+
+    def _update(self, status: Dict[str, Any], **changes):
+        with self._lock:
+            status.update(changes)
+            snapshot = dict(status, timings=dict(status['timings']))
+        if self.on_update:
+            try:
+                self.on_update(snapshot)
+            except Exception as e:
+                logger.warning(f"Ingestion status callback failed: {str(e)}")
@@ -0,0 +1,315 @@
+"""
+Background job queue for PDF uploads.
+
+/upload saves the files and enqueues an ingestion job instead of running the
+extraction + Google Sheets pipeline inside the request thread. Jobs run on a
+small in-process thread pool (the "local" backend, no broker required). Their
+progress is kept in memory for live Server-Sent-Events streams and mirrored to
+the ``ingest_jobs`` table so job status survives gunicorn worker restarts.
+"""
+
+import os
+import json
+import time
+import uuid
+import logging
+import threading
+import traceback
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from db_utils import db_connection
+from ingestion import IngestionPipeline
+
+logger = logging.getLogger(__name__)
+
+JOB_BACKEND = os.environ.get('ISM_JOB_BACKEND', 'local')
+JOB_WORKERS = int(os.environ.get('ISM_JOB_WORKERS', 1))  # Upload jobs processed at once
+JOB_HISTORY = int(os.environ.get('ISM_JOB_HISTORY', 100))  # Finished jobs kept in memory
+JOB_PERSIST_INTERVAL = float(os.environ.get('ISM_JOB_PERSIST_INTERVAL', 2.0))  # Min seconds between saves of stage-only progress
+JOB_RETENTION_DAYS = float(os.environ.get('ISM_JOB_RETENTION_DAYS', 7))  # Days a job stays in ingest_jobs after its last update
+
+TERMINAL_STATES = ('done', 'failed', 'interrupted')
+
+def _now() -> str:
+    return datetime.now().isoformat(timespec='seconds')
+
+def _pid_alive(pid: Optional[int]) -> bool:
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+class JobQueue:
+    """Runs upload ingestion jobs in the background and tracks their progress."""
+
+    def __init__(self, max_workers: int = JOB_WORKERS,
+                 pipeline_factory: Callable[..., IngestionPipeline] = IngestionPipeline,
+                 db_path: Optional[str] = None):
+        """
+        Args:
+            max_workers: Jobs processed concurrently
+            pipeline_factory: Builds the pipeline for a job; called with
+                visualization_options and on_update keyword arguments
+            db_path: Database holding the ingest_jobs table (defaults to the main database)
+        """
+        if JOB_BACKEND != 'local':
+            raise ValueError(f"Unsupported job backend: {JOB_BACKEND}")
+        self.max_workers = max(1, max_workers)
+        self.pipeline_factory = pipeline_factory
+        self.db_path = db_path
+        self._jobs = OrderedDict()
+        self._cond = threading.Condition()
+        self._executor = None
+        self._executor_pid = None
+        self._table_ready = False
+        self._persisted_at = {}  # job id -> time of its last save
+
+    def submit(self, files: List[Tuple[str, str]], visualization_options: Optional[Dict[str, bool]] = None,
+               cleanup: bool = True) -> str:
+        """
+        Enqueue an ingestion job.
+
+        Args:
+            files: (original filename, saved path) for each uploaded PDF
+            visualization_options: Passed through to the pipeline
+            cleanup: Delete the saved files once the job finishes
+
+        Returns:
+            The new job id
+        """
+        job_id = uuid.uuid4().hex
+        job = {
+            'id': job_id,
+            'state': 'queued',
+            'pid': os.getpid(),
+            'created_at': _now(),
+            'started_at': None,
+            'finished_at': None,
+            'report_type': None,
+            'summary': None,
+            'error': None,
+            # Keyed by position: uploads (or files in different --dir folders) can share a name
+            'files': OrderedDict(
+                (index, {'index': index, 'file': filename, 'state': 'queued', 'stage': None, 'report_type': None,
+                         'success': False, 'error': None, 'timings': {}})
+                for index, (filename, _) in enumerate(files)
+            ),
+            'events': []
+        }
+        with self._cond:
+            self._jobs[job_id] = job
+            self._add_event(job, state='queued')
+        self._publish(job)
+
+        self._get_executor().submit(self._run, job_id, list(files), visualization_options, cleanup)
+        logger.info(f"Queued ingestion job {job_id} with {len(files)} file(s)")
+        return job_id
+
+    def get(self, job_id: str, include_events: bool = False) -> Optional[Dict[str, Any]]:
+        """Return a snapshot of the job, or None if it is unknown."""
+        with self._cond:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                return self._snapshot(job, include_events)
+
+        job = self._load(job_id)
+        if job is None:
+            return None
+        # A job left unfinished by a worker that has since exited will never finish
+        if job['state'] not in TERMINAL_STATES and job.get('pid') != os.getpid() and not _pid_alive(job.get('pid')):
+            job['state'] = 'interrupted'
+            job['error'] = 'The worker processing this job exited before it finished'
+        return self._snapshot(job, include_events)
+
+    def wait_for_events(self, job_id: str, after_seq: int = 0,
+                        timeout: float = 15.0) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Block until the job has events newer than after_seq (or timeout expires).
+
+        Returns:
+            (new events, whether the job has finished)
+        """
+        deadline = time.time() + timeout
+        with self._cond:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                while True:
+                    events = [e for e in job['events'] if e['seq'] > after_seq]
+                    finished = job['state'] in TERMINAL_STATES
+                    remaining = deadline - time.time()
+                    if events or finished or remaining <= 0:
+                        return [dict(e) for e in events], finished
+                    self._cond.wait(remaining)
+
+        # Job is owned by another worker process: poll the database
+        while True:
+            job = self.get(job_id, include_events=True)
+            if job is None:
+                return [], True
+            events = [e for e in job['events'] if e['seq'] > after_seq]
+            finished = job['state'] in TERMINAL_STATES
+            remaining = deadline - time.time()
+            if events or finished or remaining <= 0:
+                return events, finished
+            time.sleep(min(1.0, remaining))
+
+    def _run(self, job_id: str, files: List[Tuple[str, str]], visualization_options, cleanup: bool):
+        job = self._jobs[job_id]
+        positions = {path: (index, filename) for index, (filename, path) in enumerate(files)}
+        self._update_job(job, state='running', started_at=_now())
+
+        def on_update(status):
+            index, filename = positions.get(status['path'], (status['path'], status['file']))
+            self._update_file(job, index, filename, status)
+
+        final = {}
+        try:
+            pipeline = self.pipeline_factory(visualization_options=visualization_options, on_update=on_update)
+            statuses = pipeline.run([path for _, path in files])
+            succeeded = sum(1 for status in statuses.values() if status['success'])
+            final = {
+                'state': 'done',
+                'report_type': next((s['report_type'] for s in statuses.values() if s['report_type']), None),
+                'summary': {'total': len(files), 'succeeded': succeeded, 'failed': len(files) - succeeded}
+            }
+        except Exception as e:
+            logger.error(f"Ingestion job {job_id} failed: {str(e)}")
+            logger.error(f"Traceback: {traceback.format_exc()}")
+            final = {'state': 'failed', 'error': str(e)}
+        finally:
+            if cleanup:
+                for _, path in files:
+                    try:
+                        if os.path.exists(path):
+                            os.remove(path)
+                    except OSError as e:
+                        logger.warning(f"Could not delete uploaded file {path}: {e}")
+            self._update_job(job, finished_at=_now(), **(final or {'state': 'failed'}))
+            self._prune()
+
+    def _update_file(self, job: Dict[str, Any], index: Any, filename: str, status: Dict[str, Any]):
+        with self._cond:
+            entry = job['files'].setdefault(index, {'index': index, 'file': filename})
+            state_changed = entry.get('state') != status['state']
+            changed = state_changed or entry.get('stage') != status['stage']
+            entry.update({
+                'state': status['state'],
+                'stage': status['stage'],
+                'report_type': status['report_type'],
+                'success': status['success'],
+                'error': status['error'],
+                'timings': dict(status['timings'])
+            })
+            if changed:
+                self._add_event(job, index=index, file=filename, state=status['state'], stage=status['stage'],
+                                timings=dict(status['timings']), error=status['error'])
+        if changed:
+            self._publish(job, force=state_changed)
+
+    def _update_job(self, job: Dict[str, Any], **changes):
+        with self._cond:
+            job.update(changes)
+            self._add_event(job, state=job['state'], summary=job['summary'], error=job['error'])
+        self._publish(job)
+
+    def _add_event(self, job: Dict[str, Any], **fields):
+        """Append a progress event. Caller holds self._cond."""
+        event = {'seq': len(job['events']) + 1, 'time': _now(), 'index': None, 'file': None}
+        event.update(fields)
+        job['events'].append(event)
+
+    def _publish(self, job: Dict[str, Any], force: bool = True):
+        """
+        Persist the job, then wake stream listeners so they never see unsaved state.
+
+        Stage-only progress (force=False) is saved at most every
+        JOB_PERSIST_INTERVAL seconds; state changes are always saved.
+        """
+        if force or time.time() - self._persisted_at.get(job['id'], 0) >= JOB_PERSIST_INTERVAL:
+            self._persist(job)
+        with self._cond:
+            self._cond.notify_all()
+
+    def _snapshot(self, job: Dict[str, Any], include_events: bool) -> Dict[str, Any]:
+        snapshot = {key: value for key, value in job.items() if key != 'events'}
+        snapshot['files'] = [dict(entry) for entry in job['files'].values()]
+        snapshot['last_event'] = job['events'][-1]['seq'] if job['events'] else 0
+        if include_events:
+            snapshot['events'] = [dict(e) for e in job['events']]
+        return snapshot
+
+    def _prune(self):
+        with self._cond:
+            finished = [job_id for job_id, job in self._jobs.items() if job['state'] in TERMINAL_STATES]
+            for job_id in finished[:max(0, len(finished) - JOB_HISTORY)]:
+                del self._jobs[job_id]
+                self._persisted_at.pop(job_id, None)
+
+        # A row not updated within the retention window is finished, or was left by a worker that exited
+        cutoff = (datetime.now() - timedelta(days=JOB_RETENTION_DAYS)).isoformat(timespec='seconds')
+        try:
+            with db_connection(self.db_path) as conn:
+                self._ensure_table(conn)
+                deleted = conn.execute("DELETE FROM ingest_jobs WHERE updated_at < ?", (cutoff,)).rowcount
+            if deleted:
+                logger.info(f"Pruned {deleted} ingestion job(s) older than {JOB_RETENTION_DAYS:g} days")
+        except Exception as e:
+            logger.warning(f"Could not prune ingestion jobs: {str(e)}")
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        # Threads do not survive a fork (gunicorn --preload), so build the pool in the serving process
+        if self._executor is None or self._executor_pid != os.getpid():
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='ism-job')
+            self._executor_pid = os.getpid()
+        return self._executor
+
+    def _ensure_table(self, conn):
+        if self._table_ready:
+            return
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS ingest_jobs (
+                id TEXT PRIMARY KEY,
+                state TEXT NOT NULL,
+                created_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL,
+                payload TEXT NOT NULL
+            )
+        ''')
+        self._table_ready = True
+
+    def _persist(self, job: Dict[str, Any]):
+        with self._cond:
+            payload = json.dumps(job, default=str)
+            state, created_at = job['state'], job['created_at']
+        self._persisted_at[job['id']] = time.time()
+        try:
+            with db_connection(self.db_path) as conn:
+                self._ensure_table(conn)
+                conn.execute(
+                    "INSERT OR REPLACE INTO ingest_jobs (id, state, created_at, updated_at, payload) VALUES (?, ?, ?, ?, ?)",
+                    (job['id'], state, created_at, _now(), payload)
+                )
+        except Exception as e:
+            logger.warning(f"Could not persist ingestion job {job['id']}: {str(e)}")
+
+    def _load(self, job_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            with db_connection(self.db_path) as conn:
+                self._ensure_table(conn)
+                row = conn.execute("SELECT payload FROM ingest_jobs WHERE id = ?", (job_id,)).fetchone()
+        except Exception as e:
+            logger.warning(f"Could not load ingestion job {job_id}: {str(e)}")
+            return None
+        if not row:
+            return None
+        job = json.loads(row['payload'])
+        job['files'] = OrderedDict((entry.get('index', entry['file']), entry) for entry in job.get('files', {}).values())
+        return job
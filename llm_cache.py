@@ -0,0 +1,167 @@
+"""
+Persistent cache of LLM extraction responses.
+
+Extracting a report with OpenAI sends the full PDF text plus the handler's
+extraction prompt, and the extraction/correction/validation agents can ask for
+the same document several times. Completions are cached on disk under the
+(document hash, prompt hash, model) they were produced from, so re-processing
+a report, or re-running it after an unrelated code change, reuses the earlier
+completion instead of paying for an identical one. Changing the prompt or the
+model changes the key, so edited prompts are never answered from the cache.
+
+Set ISM_LLM_CACHE_BYPASS=1 (or pass bypass=True) to always call the API; the
+fresh response still replaces the cached one.
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from db_utils import DB_DIR
+
+logger = logging.getLogger(__name__)
+
+# Bump when the stored layout or the request parameters change so old entries are ignored
+LLM_CACHE_FORMAT_VERSION = 1
+
+# Directory for cached completions; set ISM_LLM_CACHE_DIR to an empty string to disable the cache
+LLM_CACHE_DIR = os.environ.get('ISM_LLM_CACHE_DIR', os.path.join(DB_DIR, 'cache', 'llm'))
+LLM_CACHE_BYPASS = os.environ.get('ISM_LLM_CACHE_BYPASS', '').lower() in ('1', 'true', 'yes')  # Always call the API
+
+
+def prompt_hash(messages: List[Dict[str, str]], temperature: Optional[float] = None) -> str:
+    """SHA-256 of the chat messages (and sampling temperature) sent to the model."""
+    payload = json.dumps({'messages': messages, 'temperature': temperature}, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class LLMResponseCache:
+    """Completion text keyed by (document hash, prompt hash, model), one JSON file per entry."""
+
+    def __init__(self, cache_dir: Optional[str] = None, bypass: Optional[bool] = None):
+        """
+        Args:
+            cache_dir: Directory holding the entries (None for ISM_LLM_CACHE_DIR, '' to disable)
+            bypass: Ignore cached entries (None for ISM_LLM_CACHE_BYPASS)
+        """
+        self.cache_dir = LLM_CACHE_DIR if cache_dir is None else cache_dir
+        self.bypass = LLM_CACHE_BYPASS if bypass is None else bypass
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'bypassed': 0, 'stores': 0, 'errors': 0}
+
+    def get(self, document_hash: str, prompt_digest: str, model: str, bypass: bool = False) -> Optional[str]:
+        """Cached completion text, or None on a miss or when bypassing."""
+        if not self.cache_dir:
+            return None
+        if bypass or self.bypass:
+            self._count('bypassed')
+            return None
+
+        path = self._path(document_hash, prompt_digest, model)
+        entry = None
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    entry = json.load(f)
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable LLM cache file {path}: {str(e)}")
+                self._count('errors')
+
+        if not entry or not isinstance(entry.get('response'), str):
+            self._count('misses')
+            return None
+        self._count('hits')
+        logger.info(f"LLM response cache hit for document {document_hash[:12]} ({model})")
+        return entry['response']
+
+    def set(self, document_hash: str, prompt_digest: str, model: str, response: str):
+        """Store a completion that was parsed successfully."""
+        if not self.cache_dir:
+            return
+        path = self._path(document_hash, prompt_digest, model)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'document_sha256': document_hash,
+                    'prompt_sha256': prompt_digest,
+                    'model': model,
+                    'stored_at': time.time(),
+                    'response': response
+                }, f)
+            os.replace(tmp_path, path)
+            self._count('stores')
+        except Exception as e:
+            logger.warning(f"Could not write LLM cache file {path}: {str(e)}")
+            self._count('errors')
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    def complete(self, document_hash: str, messages: List[Dict[str, str]], model: str,
+                 create: Callable[[], str], temperature: Optional[float] = None,
+                 bypass: bool = False) -> Tuple[str, Callable[[], None]]:
+        """
+        Return (response_text, store) for a chat completion.
+
+        `create` is only called on a miss. The caller invokes `store()` once
+        the response has been parsed, so malformed completions are never
+        cached; on a hit `store` does nothing.
+        """
+        digest = prompt_hash(messages, temperature)
+        cached = self.get(document_hash, digest, model, bypass=bypass)
+        if cached is not None:
+            return cached, lambda: None
+        response = create()
+        return response, lambda: self.set(document_hash, digest, model, response)
+
+    def invalidate(self, document_hash: str):
+        """Drop every cached completion of one document."""
+        self._remove(lambda name: name.startswith(f"{document_hash}."))
+
+    def clear(self):
+        """Drop every cached completion."""
+        self._remove(lambda name: True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups, 3) if lookups else None
+        stats['bypass'] = self.bypass
+        stats['enabled'] = bool(self.cache_dir)
+        return stats
+
+    def _count(self, counter: str):
+        with self._lock:
+            self.stats[counter] += 1
+
+    def _path(self, document_hash: str, prompt_digest: str, model: str) -> str:
+        model_key = hashlib.sha256(model.encode('utf-8')).hexdigest()[:16]
+        return os.path.join(self.cache_dir,
+                            f"{document_hash}.{prompt_digest[:32]}.{model_key}.v{LLM_CACHE_FORMAT_VERSION}.json")
+
+    def _remove(self, matches: Callable[[str], bool]):
+        if not self.cache_dir or not os.path.isdir(self.cache_dir):
+            return
+        for name in os.listdir(self.cache_dir):
+            if name.endswith('.json') and matches(name):
+                try:
+                    os.remove(os.path.join(self.cache_dir, name))
+                except OSError:
+                    pass
+
+
+# Shared process-wide cache
+llm_response_cache = LLMResponseCache()
+
+
+def get_llm_cache_stats() -> Dict[str, Any]:
+    """Hit/miss counters of the shared LLM response cache."""
+    return llm_response_cache.get_stats()
@@ -17,13 +17,13 @@ os.makedirs("uploads", exist_ok=True)
 from crewai import Crew, Process, Task
 from agents import (
     create_extractor_agent,
-    create_structurer_agent,
     create_validator_agent,
     create_formatter_agent,
-    create_orchestrator_agent,
     create_data_correction_agent
 )
 from db_utils import store_report_data_in_db
+from ingestion import IngestionPipeline
+from fast_path import FAST_PATH_ENABLED, record_path, run_fast_path
 
 # Configure logging
 logging.basicConfig(
@@ -455,9 +455,17 @@ def fallback_regex_parsing(text):
             "industry_data": {}
         }
 
-def process_single_pdf(pdf_path, visualization_options=None, report_type=None):
-    """Process a single PDF file with optional visualization selections."""
+def process_single_pdf(pdf_path, visualization_options=None, report_type=None, store_fn=None, progress=None):
+    """
+    Process a single PDF file with optional visualization selections.
+
+    store_fn replaces store_report_data_in_db when given; the batch ingestion
+    pipeline passes its serialized database writer here. progress, when given,
+    is called with the name of each stage (detection, extraction, store,
+    validation, sheets) as it starts.
+    """
     logger.info(f"Processing PDF: {pdf_path}")
+    report_progress = progress or (lambda stage: None)
 
     # If visualization_options is None, use default settings
     if visualization_options is None:
@@ -482,12 +490,22 @@ def process_single_pdf(pdf_path, visualization_options=None, report_type=None):
 
         # Detect report type
         if not report_type:
+            report_progress('detection')
             from report_handlers import ReportTypeFactory
             report_type = ReportTypeFactory.detect_report_type(pdf_path)
             logger.info(f"Detected report type: {report_type}")
         else:
             logger.info(f"Using provided report type: {report_type}")
 
+        # Reports whose pattern extraction validates with full coverage skip the crews
+        if FAST_PATH_ENABLED:
+            report_progress('extraction')
+            fast_data = run_fast_path(pdf_path, report_type)
+            if fast_data is not None:
+                return store_and_format_fast_path(fast_data, pdf_path, report_type, visualization_options,
+                                                  store_fn, report_progress)
+        record_path('crew')
+
         # Create agents
         extractor_agent = create_extractor_agent()
         data_correction_agent = create_data_correction_agent()
@@ -495,6 +513,7 @@ def process_single_pdf(pdf_path, visualization_options=None, report_type=None):
         formatter_agent = create_formatter_agent()
 
         # Execute extraction
+        report_progress('extraction')
         logger.info(f"Starting data extraction for {report_type} report...")
 
         # Always attempt direct PDF parsing first to get baseline data
@@ -719,8 +738,9 @@ def process_single_pdf(pdf_path, visualization_options=None, report_type=None):
         if 'report_type' not in extraction_data:
             extraction_data['report_type'] = report_type
 
+        report_progress('store')
         try:
-            store_result = store_report_data_in_db(extraction_data, pdf_path, extraction_data.get('report_type', report_type))
+            store_result = (store_fn or store_report_data_in_db)(extraction_data, pdf_path, extraction_data.get('report_type', report_type))
             if store_result:
                 logger.info(f"Successfully stored data from {pdf_path} in database")
             else:
@@ -915,6 +935,7 @@ def process_single_pdf(pdf_path, visualization_options=None, report_type=None):
                             structured_data[index]["categories"][category] = []
 
             # Execute validation
+            report_progress('validation')
             logger.info("Starting data validation...")
             validation_task = Task(
                 description=f"""
@@ -980,6 +1001,7 @@ def process_single_pdf(pdf_path, visualization_options=None, report_type=None):
                     logger.error(f"Error extracting PMI values: {str(e)}")
 
             # Fix the formatting task to ensure proper data structure
+            report_progress('sheets')
             from tools import GoogleSheetsFormatterTool
             formatter_tool = GoogleSheetsFormatterTool()
             formatting_result = formatter_tool._run({
@@ -998,6 +1020,35 @@ def process_single_pdf(pdf_path, visualization_options=None, report_type=None):
         logger.error(f"Traceback: {traceback.format_exc()}")
         return False
     
+def store_and_format_fast_path(extraction_data, pdf_path, report_type, visualization_options, store_fn, report_progress):
+    """Store fast-path extraction data and update Google Sheets, as the crew path does after validation."""
+    report_progress('store')
+    try:
+        stored = (store_fn or store_report_data_in_db)(extraction_data, pdf_path, report_type)
+    except Exception as e:
+        logger.error(f"Error storing data in database: {str(e)}")
+        stored = False
+    if not stored:
+        logger.warning(f"Failed to store data from {pdf_path} in database")
+        return False
+    logger.info(f"Successfully stored data from {pdf_path} in database (fast path)")
+
+    structured_data = SimpleDataStructurerTool()._run(extraction_data) or {}
+    # Every index passed DataTransformationPipeline with full coverage
+    validation_dict = {index: True for index in structured_data}
+
+    report_progress('sheets')
+    from tools import GoogleSheetsFormatterTool
+    formatting_result = GoogleSheetsFormatterTool()._run({
+        'structured_data': structured_data,
+        'validation_results': validation_dict,
+        'extraction_data': extraction_data,
+        'verification_result': None,
+        'visualization_options': visualization_options
+    })
+    logger.info("Google Sheets formatting completed")
+    return formatting_result
+
 def validate_and_preserve_indices(extraction_data, report_type):
     """
     Validate that all expected indices are present in the extraction data.
@@ -1103,74 +1154,26 @@ def merge_industry_data(primary_data, secondary_data):
     
     return merged
 
-def process_multiple_pdfs(pdf_directory):
-    """Process all PDF files in a directory using the Orchestrator agent."""
+def process_multiple_pdfs(pdf_directory, workers=None, llm_concurrency=None):
+    """Process all PDF files in a directory with the parallel ingestion pipeline."""
     logger.info(f"Processing all PDFs in directory: {pdf_directory}")
     
     try:
-        # Create orchestrator agent
-        orchestrator_agent = create_orchestrator_agent()
-        
-        # Create orchestration task without using context
-        orchestration_task = Task(
-            description=f"""
-            Orchestrate the processing of all ISM Manufacturing Report PDFs in the directory {pdf_directory}.
-            
-            Steps:
-            1. For each PDF file:
-               a. Extract data using the Extractor Agent
-               b. Structure data using the Structurer Agent
-               c. Validate data using the Validator Agent
-               d. Format and update Google Sheets using the Formatter Agent
-            
-            2. Track the success/failure of each PDF processing
-            
-            3. Ensure no duplications or overwrites in the Google Sheet
-            
-            4. Handle errors gracefully and report any issues
-            
-            The PDF directory is: {pdf_directory}
-            """,
-            expected_output="""
-            A dictionary containing the processing results for each PDF file.
-            """,
-            agent=orchestrator_agent
-        )
+        pdf_files = sorted(f for f in os.listdir(pdf_directory) if f.lower().endswith('.pdf'))
+        pdf_paths = [os.path.join(pdf_directory, pdf_file) for pdf_file in pdf_files]
         
-        # Execute orchestration
-        orchestration_crew = Crew(
-            agents=[
-                orchestrator_agent,
-                create_extractor_agent(),
-                create_structurer_agent(),
-                create_validator_agent(),
-                create_formatter_agent(),
-                create_data_correction_agent()
-            ],
-            tasks=[orchestration_task],
-            verbose=True,
-            process=Process.sequential
+        pipeline = IngestionPipeline(
+            workers=workers,
+            llm_concurrency=llm_concurrency,
+            process_fn=process_single_pdf,
+            on_update=lambda status: logger.info(f"{status['file']}: {status['state']}")
         )
+        statuses = pipeline.run(pdf_paths)
         
-        result = orchestration_crew.kickoff()
-        result_data = safely_parse_agent_output(result)
-        
-        # If result_data is None or doesn't contain results, try processing each PDF directly
-        if not result_data or not result_data.get('success'):
-            logger.warning("Orchestration failed or returned invalid results. Trying direct processing.")
-            result_data = {'success': True, 'results': {}}
-            
-            # Get all PDF files in the directory
-            pdf_files = [f for f in os.listdir(pdf_directory) if f.lower().endswith('.pdf')]
-            
-            for pdf_file in pdf_files:
-                pdf_path = os.path.join(pdf_directory, pdf_file)
-                logger.info(f"Direct processing of {pdf_file}")
-                processing_result = process_single_pdf(pdf_path)
-                result_data['results'][pdf_file] = processing_result
-        
-        logger.info("Completed processing all PDFs")
-        return result_data if result_data else {"success": False, "message": "Failed to parse orchestration result"}
+        results = {os.path.basename(path): status for path, status in statuses.items()}
+        succeeded = sum(1 for status in results.values() if status['success'])
+        logger.info(f"Completed processing all PDFs: {succeeded} of {len(results)} succeeded")
+        return {"success": True, "results": results}
     
     except Exception as e:
         logger.error(f"Error in batch processing: {str(e)}")
@@ -1195,6 +1198,8 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Process ISM Manufacturing Report PDFs")
     parser.add_argument("--pdf", help="Path to a single PDF file to process")
     parser.add_argument("--dir", help="Directory containing multiple PDF files to process")
+    parser.add_argument("--workers", type=int, help="Processes for PDF extraction and parsing (default: CPU count)")
+    parser.add_argument("--llm-concurrency", type=int, help="PDFs in the LLM stage at once (default: 4)")
     args = parser.parse_args()
     
     if args.pdf:
@@ -1203,7 +1208,7 @@ if __name__ == "__main__":
         print(f"Result: {result}")
     elif args.dir:
         print(f"Processing all PDFs in directory: {args.dir}")
-        result = process_multiple_pdfs(args.dir)
+        result = process_multiple_pdfs(args.dir, workers=args.workers, llm_concurrency=args.llm_concurrency)
         print(f"Result: {result}")
     else:
         print("Please provide either --pdf or --dir argument")
@@ -0,0 +1,286 @@
+"""
+Content-addressed cache of text extracted from ISM report PDFs.
+
+Report type detection, pattern extraction and LLM extraction all need the
+text of the same uploaded PDF. Instead of each of them re-opening the file
+with pdfplumber/PyPDF2, pages are extracted once per engine and cached under
+the SHA-256 of the file bytes: in memory for the life of the process and on
+disk so that re-uploading (or re-processing) the same report skips parsing.
+"""
+
+import os
+import json
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterator, List, Optional
+
+import pdfplumber
+import PyPDF2
+
+from db_utils import DB_DIR
+
+logger = logging.getLogger(__name__)
+
+ENGINES = ('pdfplumber', 'pypdf2')
+
+# Bump when extraction parameters change so stale disk entries are ignored
+CACHE_FORMAT_VERSION = 1
+
+PDF_TEXT_CACHE_SIZE = int(os.environ.get('ISM_PDF_CACHE_SIZE', 32))  # Documents kept in memory
+# Directory for the on-disk tier; set ISM_PDF_CACHE_DIR to an empty string to disable it
+PDF_TEXT_CACHE_DIR = os.environ.get('ISM_PDF_CACHE_DIR', os.path.join(DB_DIR, 'cache', 'pdf_text'))
+
+_HASH_CHUNK_SIZE = 1024 * 1024
+_MAX_HASH_MEMO = 1024
+
+
+def _extract_pages(pdf_path: str, engine: str) -> List[str]:
+    """Run a single extraction engine over every page of the PDF."""
+    if engine == 'pdfplumber':
+        with pdfplumber.open(pdf_path) as pdf:
+            return [page.extract_text(x_tolerance=3, y_tolerance=3) or '' for page in pdf.pages]
+    if engine == 'pypdf2':
+        with open(pdf_path, 'rb') as file:
+            reader = PyPDF2.PdfReader(file)
+            return [page.extract_text() or '' for page in reader.pages]
+    raise ValueError(f"Unknown PDF text engine: {engine}")
+
+
+def _iter_page_texts(pdf_path: str, engine: str, start: int = 0) -> Iterator[str]:
+    """Extract the pages of the PDF one at a time, from page index `start` on."""
+    if engine == 'pdfplumber':
+        with pdfplumber.open(pdf_path) as pdf:
+            for page in pdf.pages[start:]:
+                yield page.extract_text(x_tolerance=3, y_tolerance=3) or ''
+        return
+    if engine == 'pypdf2':
+        with open(pdf_path, 'rb') as file:
+            reader = PyPDF2.PdfReader(file)
+            for page in reader.pages[start:]:
+                yield page.extract_text() or ''
+        return
+    raise ValueError(f"Unknown PDF text engine: {engine}")
+
+
+class PDFTextCache:
+    """Two-tier (memory LRU + JSON files) cache of per-page PDF text keyed by content hash."""
+
+    def __init__(self, cache_dir: Optional[str] = PDF_TEXT_CACHE_DIR, max_entries: int = PDF_TEXT_CACHE_SIZE):
+        self.cache_dir = cache_dir or None
+        self.max_entries = max(1, max_entries)
+        self._entries = OrderedDict()  # digest -> {engine: [page text, ...]}
+        self._hashes = {}  # (path, size, mtime) -> digest
+        self._partial = OrderedDict()  # (digest, engine) -> leading pages read by an iter_pages() stopped early
+        self._lock = threading.Lock()
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'errors': 0}
+
+    def document_hash(self, pdf_path: str) -> str:
+        """SHA-256 of the file contents, memoized per (path, size, mtime)."""
+        st = os.stat(pdf_path)
+        key = (os.path.abspath(pdf_path), st.st_size, st.st_mtime_ns)
+        with self._lock:
+            digest = self._hashes.get(key)
+        if digest:
+            return digest
+
+        sha = hashlib.sha256()
+        with open(pdf_path, 'rb') as file:
+            for chunk in iter(lambda: file.read(_HASH_CHUNK_SIZE), b''):
+                sha.update(chunk)
+        digest = sha.hexdigest()
+
+        with self._lock:
+            if len(self._hashes) >= _MAX_HASH_MEMO:
+                self._hashes.clear()
+            self._hashes[key] = digest
+        return digest
+
+    def get_pages(self, pdf_path: str, engine: str = 'pdfplumber') -> List[str]:
+        """
+        Return the text of every page of the PDF as extracted by `engine`.
+
+        Extraction errors propagate to the caller (and are not cached) so the
+        existing fallback logic at each call site keeps working.
+        """
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown PDF text engine: {engine}")
+
+        digest = self.document_hash(pdf_path)
+
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is not None:
+                self._entries.move_to_end(digest)
+                if engine in entry:
+                    self.stats['memory_hits'] += 1
+                    return list(entry[engine])
+
+        if entry is None:
+            entry = self._load_from_disk(digest)
+            if entry is not None:
+                self._remember(digest, entry)
+                if engine in entry:
+                    with self._lock:
+                        self.stats['disk_hits'] += 1
+                    return list(entry[engine])
+
+        with self._lock:
+            self.stats['misses'] += 1
+            prefix = self._partial.pop((digest, engine), None)
+        try:
+            if prefix:
+                # Pages an early-exit scan already read are not parsed again
+                pages = prefix + list(_iter_page_texts(pdf_path, engine, start=len(prefix)))
+            else:
+                pages = _extract_pages(pdf_path, engine)
+        except Exception:
+            with self._lock:
+                self.stats['errors'] += 1
+            raise
+
+        entry = self._remember(digest, {engine: pages})
+        self._save_to_disk(digest, entry)
+        logger.debug(f"Cached {len(pages)} {engine} pages for {pdf_path} ({digest[:12]})")
+        return list(pages)
+
+    def peek_pages(self, pdf_path: str, engine: str = 'pdfplumber') -> Optional[List[str]]:
+        """Cached pages of the PDF, or None if `engine` has not extracted it yet (never parses the file)."""
+        digest = self.document_hash(pdf_path)
+        with self._lock:
+            entry = self._entries.get(digest)
+        if entry is None:
+            entry = self._load_from_disk(digest)
+            if entry:
+                entry = self._remember(digest, entry)
+        if entry and engine in entry:
+            return list(entry[engine])
+        return None
+
+    def iter_pages(self, pdf_path: str, engine: str = 'pdfplumber') -> Iterator[str]:
+        """
+        Page texts in order, parsing the PDF lazily on a cache miss.
+
+        A caller that stops early (e.g. report type detection once it is
+        confident) leaves the pages it read in memory, and get_pages() then
+        parses only the rest. Reading to the end caches the document as
+        get_pages() would.
+        """
+        cached = self.peek_pages(pdf_path, engine)
+        if cached is not None:
+            yield from cached
+            return
+
+        digest = self.document_hash(pdf_path)
+        with self._lock:
+            pages = list(self._partial.get((digest, engine), ()))
+        yield from list(pages)
+
+        complete = False
+        try:
+            for page in _iter_page_texts(pdf_path, engine, start=len(pages)):
+                pages.append(page)
+                yield page
+            complete = True
+        finally:
+            with self._lock:
+                if complete:
+                    self._partial.pop((digest, engine), None)
+                elif len(pages) > len(self._partial.get((digest, engine), ())):
+                    self._partial[(digest, engine)] = pages
+                    self._partial.move_to_end((digest, engine))
+                    while len(self._partial) > self.max_entries:
+                        self._partial.popitem(last=False)
+            if complete:
+                self._save_to_disk(digest, self._remember(digest, {engine: pages}))
+
+    def get_text(self, pdf_path: str, engine: str = 'pdfplumber', separator: str = '\n\n') -> str:
+        """Concatenate the non-empty pages, each followed by `separator`."""
+        return ''.join(page + separator for page in self.get_pages(pdf_path, engine) if page)
+
+    def clear(self, disk: bool = False):
+        """Drop the in-memory tier (and optionally the on-disk files)."""
+        with self._lock:
+            self._entries.clear()
+            self._hashes.clear()
+            self._partial.clear()
+        if disk and self.cache_dir and os.path.isdir(self.cache_dir):
+            for name in os.listdir(self.cache_dir):
+                if name.endswith('.json'):
+                    try:
+                        os.remove(os.path.join(self.cache_dir, name))
+                    except OSError:
+                        pass
+
+    def _remember(self, digest: str, pages_by_engine: Dict[str, List[str]]) -> Dict[str, List[str]]:
+        with self._lock:
+            entry = self._entries.setdefault(digest, {})
+            entry.update(pages_by_engine)
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return dict(entry)
+
+    def _disk_path(self, digest: str) -> str:
+        return os.path.join(self.cache_dir, f"{digest}.v{CACHE_FORMAT_VERSION}.json")
+
+    def _load_from_disk(self, digest: str) -> Optional[Dict[str, List[str]]]:
+        if not self.cache_dir:
+            return None
+        path = self._disk_path(digest)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return {engine: pages for engine, pages in data.get('engines', {}).items() if engine in ENGINES}
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable PDF text cache file {path}: {str(e)}")
+            return None
+
+    def _save_to_disk(self, digest: str, entry: Dict[str, List[str]]):
+        if not self.cache_dir:
+            return
+        path = self._disk_path(digest)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'sha256': digest, 'engines': entry}, f)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"Could not write PDF text cache file {path}: {str(e)}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+
+# Shared process-wide cache
+pdf_text_cache = PDFTextCache()
+
+
+def document_hash(pdf_path: str) -> str:
+    """SHA-256 of a PDF's contents (the key used by the text cache)."""
+    return pdf_text_cache.document_hash(pdf_path)
+
+
+def get_pdf_pages(pdf_path: str, engine: str = 'pdfplumber') -> List[str]:
+    """Per-page text of a PDF, extracted once per engine and document."""
+    return pdf_text_cache.get_pages(pdf_path, engine)
+
+
+def get_cached_pdf_pages(pdf_path: str, engine: str = 'pdfplumber') -> Optional[List[str]]:
+    """Per-page text of a PDF if it is already cached, else None."""
+    return pdf_text_cache.peek_pages(pdf_path, engine)
+
+
+def iter_pdf_pages(pdf_path: str, engine: str = 'pdfplumber') -> Iterator[str]:
+    """Per-page text of a PDF, parsed lazily; pages read before stopping are reused by get_pdf_pages."""
+    return pdf_text_cache.iter_pages(pdf_path, engine)
+
+
+def get_pdf_text(pdf_path: str, engine: str = 'pdfplumber', separator: str = '\n\n') -> str:
+    """Full text of a PDF, built from the cached pages."""
+    return pdf_text_cache.get_text(pdf_path, engine, separator)
@@ -1,4 +1,3 @@
-import PyPDF2
 import re
 import json
 import logging
@@ -6,7 +5,8 @@ import os
 import sqlite3
 import traceback
 from datetime import datetime
-from db_utils import get_db_connection, parse_date, initialize_database
+from db_utils import get_db_connection, parse_date, ensure_database_initialized, bump_data_generation, refresh_heatmap_summary
+from pdf_text_cache import get_pdf_text
 
 # Create logs directory first
 os.makedirs("logs", exist_ok=True)
@@ -19,15 +19,27 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Summary clean-up and industry-list patterns used by extract_industry_mentions, compiled once
+_WHITESPACE = re.compile(r'\s+')
+_FOOTNOTE_MARKER = re.compile(r'\(\d+\)')
+_PUNCTUATION_SPACING = re.compile(r'\s*([,;:.])\s*')
+_CONTROL_CHARS = re.compile(r'[\t\r\n\f\v]+')
+_SENTENCE_END = re.compile(r'(?<=[.!?])\s+')
+_GROWTH_LIST_PATTERNS = [re.compile(pattern, re.IGNORECASE) for pattern in (
+    r"(?:industries|manufacturing industries).{0,30}(?:growth|expansion|growing|increase).{0,50}(?:are|:)([^\.;]+)",
+    r"reporting growth.{0,30}(?:are|:)([^\.;]+)",
+    r"industries reporting.{0,30}growth.{0,30}(?:are|:)([^\.;]+)"
+)]
+_DECLINE_LIST_PATTERNS = [re.compile(pattern, re.IGNORECASE) for pattern in (
+    r"(?:industries|manufacturing industries).{0,30}(?:decline|contraction|declining|decrease).{0,50}(?:are|:)([^\.;]+)",
+    r"reporting (?:a |)decline.{0,30}(?:are|:)([^\.;]+)",
+    r"industries reporting.{0,30}(?:decrease|contraction).{0,30}(?:are|:)([^\.;]+)"
+)]
+
 def extract_text_from_pdf(pdf_path):
     """Extract all text from a PDF file."""
     try:
-        with open(pdf_path, 'rb') as file:
-            reader = PyPDF2.PdfReader(file)
-            text = ""
-            for page in reader.pages:
-                text += page.extract_text()
-            return text
+        return get_pdf_text(pdf_path, 'pypdf2', separator='')
     except Exception as e:
         logger.error(f"Error extracting text from PDF {pdf_path}: {str(e)}")
         return None
@@ -166,16 +178,16 @@ def extract_industry_mentions(text, indices):
     def preprocess_summary(summary_text):
         """Clean up summary text by removing common artifacts that can interfere with pattern matching."""
         # Replace line breaks and excess whitespace
-        cleaned = re.sub(r'\s+', ' ', summary_text)
+        cleaned = _WHITESPACE.sub(' ', summary_text)
         
         # Remove footnote markers and similar artifacts
-        cleaned = re.sub(r'\(\d+\)', '', cleaned)
+        cleaned = _FOOTNOTE_MARKER.sub('', cleaned)
         
         # Fix spacing around punctuation
-        cleaned = re.sub(r'\s*([,;:.])\s*', r'\1 ', cleaned)
+        cleaned = _PUNCTUATION_SPACING.sub(r'\1 ', cleaned)
         
         # Remove tab characters and other control characters
-        cleaned = re.sub(r'[\t\r\n\f\v]+', ' ', cleaned)
+        cleaned = _CONTROL_CHARS.sub(' ', cleaned)
         
         return cleaned.strip()
     
@@ -192,14 +204,8 @@ def extract_industry_mentions(text, indices):
             # Broader patterns to catch industry lists
             if "Growing" in industry_data.get(index, {}) or index not in industry_data:
                 # Extract industries reporting growth
-                growth_patterns = [
-                    r"(?:industries|manufacturing industries).{0,30}(?:growth|expansion|growing|increase).{0,50}(?:are|:)([^\.;]+)",
-                    r"reporting growth.{0,30}(?:are|:)([^\.;]+)",
-                    r"industries reporting.{0,30}growth.{0,30}(?:are|:)([^\.;]+)"
-                ]
-                
-                for pattern in growth_patterns:
-                    growth_match = re.search(pattern, summary, re.IGNORECASE)
+                for pattern in _GROWTH_LIST_PATTERNS:
+                    growth_match = pattern.search(summary)
                     if growth_match:
                         growth_text = growth_match.group(1).strip()
                         growing = preserve_order_industry_list(growth_text)
@@ -211,14 +217,8 @@ def extract_industry_mentions(text, indices):
             
             if "Declining" in industry_data.get(index, {}) or index not in industry_data:
                 # Extract industries reporting decline
-                decline_patterns = [
-                    r"(?:industries|manufacturing industries).{0,30}(?:decline|contraction|declining|decrease).{0,50}(?:are|:)([^\.;]+)",
-                    r"reporting (?:a |)decline.{0,30}(?:are|:)([^\.;]+)",
-                    r"industries reporting.{0,30}(?:decrease|contraction).{0,30}(?:are|:)([^\.;]+)"
-                ]
-                
-                for pattern in decline_patterns:
-                    decline_match = re.search(pattern, summary, re.IGNORECASE)
+                for pattern in _DECLINE_LIST_PATTERNS:
+                    decline_match = pattern.search(summary)
                     if decline_match:
                         decline_text = decline_match.group(1).strip()
                         declining = preserve_order_industry_list(decline_text)
@@ -244,7 +244,7 @@ def extract_industry_mentions(text, indices):
             # Try sentence-level extraction if industry lists are still empty
             if not any(categories.values() for categories in industry_data.values()):
                 # Try to extract from individual sentences
-                sentences = re.split(r'(?<=[.!?])\s+', summary)
+                sentences = _SENTENCE_END.split(summary)
                 
                 for sentence in sentences:
                     if "growth" in sentence.lower() or "growing" in sentence.lower() or "increased" in sentence.lower():
@@ -1094,8 +1094,8 @@ def store_report_data_in_db(extracted_data, pdf_path, report_type="Manufacturing
         
     conn = None
     try:
-        # Ensure database is initialized
-        initialize_database()
+        # Ensure database is initialized (once per process)
+        ensure_database_initialized()
         
         conn = get_db_connection()
         cursor = conn.cursor()
@@ -1230,6 +1230,8 @@ def store_report_data_in_db(extracted_data, pdf_path, report_type="Manufacturing
                     except Exception as e:
                         logger.error(f"Error inserting industry_status data for {industry}: {str(e)}")
         
+        refresh_heatmap_summary(cursor, report_date.isoformat(), report_type)
+        bump_data_generation(cursor)
         conn.commit()
         logger.info(f"Successfully stored data for report {month_year} in database")
         return True
@@ -0,0 +1,154 @@
+"""
+Per-request SQL instrumentation.
+
+Pooled connections (see db_utils.PooledConnection) hand out TimedCursor
+objects, which record every statement into the QueryStats collector active in
+the current context. init_app() opens a collector for each Flask request,
+reports it in a Server-Timing header and checks it against a per-endpoint
+query budget: over-budget requests are logged, or raise QueryBudgetExceeded
+when ISM_QUERY_BUDGET_MODE=raise (used by the tests).
+"""
+
+import os
+import time
+import logging
+import sqlite3
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+QUERY_BUDGET_MODE = os.environ.get('ISM_QUERY_BUDGET_MODE', 'warn')  # off, warn or raise
+SLOW_REQUEST_MS = float(os.environ.get('ISM_SLOW_REQUEST_MS', 500))  # Log requests spending longer than this in SQL
+SQL_DEBUG = os.environ.get('ISM_SQL_DEBUG', '').lower() in ('1', 'true', 'yes')  # Run diagnostic queries and log every statement
+
+_current_stats: ContextVar[Optional['QueryStats']] = ContextVar('ism_query_stats', default=None)
+
+
+class QueryBudgetExceeded(RuntimeError):
+    """Raised when a request runs more SQL statements than its endpoint's budget."""
+
+
+class QueryStats:
+    """Statement count, total time and slowest statement for one unit of work."""
+
+    def __init__(self, label: str = ''):
+        self.label = label
+        self.count = 0
+        self.total_ms = 0.0
+        self.slowest_ms = 0.0
+        self.slowest_sql = None
+
+    def record(self, sql: str, elapsed_ms: float):
+        self.count += 1
+        self.total_ms += elapsed_ms
+        if elapsed_ms >= self.slowest_ms:
+            self.slowest_ms = elapsed_ms
+            self.slowest_sql = ' '.join(sql.split())
+        if SQL_DEBUG:
+            logger.info(f"[{self.label}] {elapsed_ms:.2f} ms: {' '.join(sql.split())}")
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            'label': self.label,
+            'count': self.count,
+            'total_ms': round(self.total_ms, 3),
+            'slowest_ms': round(self.slowest_ms, 3),
+            'slowest_sql': self.slowest_sql
+        }
+
+
+def current_stats() -> Optional[QueryStats]:
+    """The collector recording statements in this context, if any."""
+    return _current_stats.get()
+
+
+@contextmanager
+def track_queries(label: str = '') -> Iterator[QueryStats]:
+    """
+    Record every pooled-connection statement run inside the block.
+
+    Example:
+        with track_queries('dashboard') as stats:
+            get_pmi_data_by_month(24, 'Manufacturing')
+        assert stats.count == 1
+    """
+    stats = QueryStats(label)
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+class TimedCursor(sqlite3.Cursor):
+    """Cursor that reports each statement and its execution time to the active QueryStats."""
+
+    def execute(self, sql, parameters=()):
+        stats = _current_stats.get()
+        if stats is None:
+            return super().execute(sql, parameters)
+        start = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            stats.record(sql, (time.perf_counter() - start) * 1000)
+
+    def executemany(self, sql, seq_of_parameters):
+        stats = _current_stats.get()
+        if stats is None:
+            return super().executemany(sql, seq_of_parameters)
+        start = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            stats.record(sql, (time.perf_counter() - start) * 1000)
+
+
+def check_budget(stats: QueryStats, budget: Optional[int], mode: str = QUERY_BUDGET_MODE):
+    """Log or raise if stats.count exceeds budget (None means unlimited)."""
+    if budget is None or mode == 'off' or stats.count <= budget:
+        return
+    message = (f"{stats.label} ran {stats.count} SQL statements (budget {budget}); "
+               f"slowest {stats.slowest_ms:.2f} ms: {stats.slowest_sql}")
+    if mode == 'raise':
+        raise QueryBudgetExceeded(message)
+    logger.warning(message)
+
+
+def init_app(app, budgets: Optional[Dict[str, int]] = None):
+    """
+    Track SQL for every request of a Flask app.
+
+    Budgets map endpoint names to the most statements a request may run; they
+    are read from app.config['QUERY_BUDGETS'] so tests can tighten them, and
+    the mode from app.config['QUERY_BUDGET_MODE'].
+    """
+    from flask import g, request
+
+    app.config.setdefault('QUERY_BUDGETS', dict(budgets or {}))
+    app.config.setdefault('QUERY_BUDGET_MODE', QUERY_BUDGET_MODE)
+
+    @app.before_request
+    def _start_query_tracking():
+        g._query_stats = QueryStats(request.endpoint or request.path)
+        g._query_stats_token = _current_stats.set(g._query_stats)
+
+    @app.after_request
+    def _finish_query_tracking(response):
+        stats = g.pop('_query_stats', None)
+        if stats is None:
+            return response
+        response.headers.add('Server-Timing', f'db;dur={stats.total_ms:.2f};desc="{stats.count} queries"')
+        if stats.total_ms > SLOW_REQUEST_MS:
+            logger.warning(f"Slow SQL in {stats.label}: {stats.count} statements, {stats.total_ms:.1f} ms; "
+                           f"slowest {stats.slowest_ms:.1f} ms: {stats.slowest_sql}")
+        check_budget(stats, app.config['QUERY_BUDGETS'].get(request.endpoint), app.config['QUERY_BUDGET_MODE'])
+        return response
+
+    @app.teardown_request
+    def _reset_query_tracking(exc=None):
+        token = g.pop('_query_stats_token', None)
+        if token is not None:
+            _current_stats.reset(token)
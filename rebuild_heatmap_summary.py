@@ -0,0 +1,28 @@
+import sys
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+import db_utils
+
+def rebuild(db_path=None):
+    """Rebuild the materialized heatmap_summary table from reports and pmi_indices."""
+    if db_path:
+        db_utils.DATABASE_PATH = db_path
+    try:
+        db_utils.ensure_database_initialized()
+        rows = db_utils.rebuild_heatmap_summary()
+        logger.info(f"Rebuilt heatmap_summary for {db_utils.DATABASE_PATH}: {rows} report months")
+        return True
+    except Exception as e:
+        logger.error(f"Error rebuilding heatmap_summary: {str(e)}")
+        return False
+    finally:
+        db_utils.close_db_connections()
+
+if __name__ == "__main__":
+    # Usage: python rebuild_heatmap_summary.py [path/to/ism_data.db]
+    if not rebuild(sys.argv[1] if len(sys.argv) > 1 else None):
+        sys.exit(1)
@@ -1,12 +1,37 @@
 # report_detection.py
+import os
 import re
 import logging
-from typing import Dict, List, Tuple, Optional, Union
-import pdfplumber
-import PyPDF2
+import threading
+from collections import OrderedDict
+from typing import Iterator, Tuple, Optional
+
+from pdf_text_cache import document_hash, get_pdf_text, iter_pdf_pages
 
 logger = logging.getLogger(__name__)
 
+DETECTION_EARLY_EXIT = os.environ.get('ISM_DETECTION_EARLY_EXIT', '1').lower() not in ('0', 'false', 'no')  # Stop reading pages once the verdict is clear
+DETECTION_MARGIN = float(os.environ.get('ISM_DETECTION_MARGIN', 25))  # Combined-score lead (0-100) that ends the scan
+DETECTION_MEMO_SIZE = int(os.environ.get('ISM_DETECTION_MEMO_SIZE', 256))  # Verdicts remembered by file hash
+
+# Text needed before an early verdict is trusted (same threshold as the full-scan fallback)
+_MIN_TEXT_CHARS = 500
+
+_verdict_lock = threading.Lock()
+_verdicts = OrderedDict()  # document sha256 -> report type
+detection_stats = {'memo_hits': 0, 'early_exits': 0, 'full_scans': 0, 'pages_read': 0}
+
+
+def _count(counter: str, amount: int = 1):
+    with _verdict_lock:
+        detection_stats[counter] += amount
+
+
+def clear_detection_memo():
+    """Forget memoized verdicts (e.g. after the detection rules change)."""
+    with _verdict_lock:
+        _verdicts.clear()
+
 class EnhancedReportTypeDetector:
     """Enhanced detection of report types using multiple strategies."""
     
@@ -71,59 +96,142 @@ class EnhancedReportTypeDetector:
     ]
     
     @classmethod
-    def detect_report_type(cls, pdf_path: str) -> str:
+    def detect_report_type(cls, pdf_path: str, early_exit: Optional[bool] = None) -> str:
         """
         Detect report type using multiple strategies and weighted scoring.
         
+        The verdict is memoized by file hash. With early exit the pages are
+        scored one at a time and reading stops as soon as one type leads by
+        DETECTION_MARGIN, which for ISM reports is usually after page 1.
+        
         Args:
             pdf_path: Path to the PDF file
+            early_exit: Score pages incrementally (None for ISM_DETECTION_EARLY_EXIT)
             
         Returns:
             Report type as a string ('Manufacturing' or 'Services')
         """
         try:
-            # Extract text using multiple methods for better coverage
-            text = cls._extract_text_with_fallbacks(pdf_path)
-            
-            if not text:
-                logger.error(f"Failed to extract text from {pdf_path}")
-                # Default to Manufacturing if text extraction fails
-                return 'Manufacturing'
-            
-            # Apply multiple detection strategies
-            keyword_score = cls._calculate_keyword_score(text)
-            structure_score = cls._analyze_document_structure(text)
-            industry_score = cls._analyze_industry_mentions(text)
+            digest = document_hash(pdf_path)
+            with _verdict_lock:
+                verdict = _verdicts.get(digest)
+                if verdict:
+                    _verdicts.move_to_end(digest)
+                    detection_stats['memo_hits'] += 1
+            if verdict:
+                logger.info(f"Report type of {pdf_path} already detected: {verdict}")
+                return verdict
             
-            # Log the scores for debugging
-            logger.info(f"Detection scores - Keyword: {keyword_score}, Structure: {structure_score}, Industry: {industry_score}")
+            early_exit = DETECTION_EARLY_EXIT if early_exit is None else early_exit
+            scores = cls._scan_pages(pdf_path) if early_exit else None
             
-            # Combine scores - each returns a tuple (manufacturing_score, services_score)
-            combined_mfg_score = (
-                keyword_score[0] * 0.5 + 
-                structure_score[0] * 0.3 + 
-                industry_score[0] * 0.2
-            )
-            
-            combined_svc_score = (
-                keyword_score[1] * 0.5 + 
-                structure_score[1] * 0.3 + 
-                industry_score[1] * 0.2
-            )
+            if scores is None:
+                # Extract text using multiple methods for better coverage
+                text = cls._extract_text_with_fallbacks(pdf_path)
+                
+                if not text:
+                    logger.error(f"Failed to extract text from {pdf_path}")
+                    # Default to Manufacturing if text extraction fails
+                    return 'Manufacturing'
+                
+                _count('full_scans')
+                scores = cls._combined_scores(text)
             
+            combined_mfg_score, combined_svc_score = scores
             logger.info(f"Combined scores - Manufacturing: {combined_mfg_score}, Services: {combined_svc_score}")
             
             # Determine report type based on higher score
-            if combined_mfg_score > combined_svc_score:
-                return 'Manufacturing'
-            else:
-                return 'Services'
+            verdict = 'Manufacturing' if combined_mfg_score > combined_svc_score else 'Services'
+            
+            with _verdict_lock:
+                _verdicts[digest] = verdict
+                while len(_verdicts) > max(1, DETECTION_MEMO_SIZE):
+                    _verdicts.popitem(last=False)
+            return verdict
                 
         except Exception as e:
             logger.error(f"Error detecting report type: {str(e)}")
             # Default to Manufacturing if error occurs
             return 'Manufacturing'
     
+    @classmethod
+    def _combined_scores(cls, text: str) -> Tuple[float, float]:
+        """
+        Weighted keyword, structure and industry scores of the text.
+        
+        Args:
+            text: Extracted text from the PDF
+            
+        Returns:
+            Tuple of (manufacturing_score, services_score)
+        """
+        # Apply multiple detection strategies
+        keyword_score = cls._calculate_keyword_score(text)
+        structure_score = cls._analyze_document_structure(text)
+        industry_score = cls._analyze_industry_mentions(text)
+        
+        # Log the scores for debugging
+        logger.debug(f"Detection scores - Keyword: {keyword_score}, Structure: {structure_score}, Industry: {industry_score}")
+        
+        # Combine scores - each returns a tuple (manufacturing_score, services_score)
+        combined_mfg_score = (
+            keyword_score[0] * 0.5 + 
+            structure_score[0] * 0.3 + 
+            industry_score[0] * 0.2
+        )
+        
+        combined_svc_score = (
+            keyword_score[1] * 0.5 + 
+            structure_score[1] * 0.3 + 
+            industry_score[1] * 0.2
+        )
+        
+        return (combined_mfg_score, combined_svc_score)
+    
+    @classmethod
+    def _scan_pages(cls, pdf_path: str) -> Optional[Tuple[float, float]]:
+        """
+        Score the report page by page until one type leads by DETECTION_MARGIN.
+        
+        Args:
+            pdf_path: Path to the PDF file
+            
+        Returns:
+            Tuple of (manufacturing_score, services_score) for the pages read,
+            or None if they held too little text (the caller falls back to the
+            full-document scan)
+        """
+        text = ""
+        scores = None
+        pages_read = 0
+        try:
+            for page in cls._iter_pages(pdf_path):
+                pages_read += 1
+                if not page:
+                    continue
+                text += page + "\n\n"
+                if len(text) < _MIN_TEXT_CHARS:
+                    continue
+                
+                scores = cls._combined_scores(text)
+                if abs(scores[0] - scores[1]) >= DETECTION_MARGIN:
+                    logger.info(f"Report type of {pdf_path} decided after {pages_read} page(s)")
+                    _count('early_exits')
+                    break
+        except Exception as e:
+            logger.warning(f"Incremental detection failed for {pdf_path}: {str(e)}")
+            scores = None
+        finally:
+            _count('pages_read', pages_read)
+        
+        return scores
+    
+    @staticmethod
+    def _iter_pages(pdf_path: str) -> Iterator[str]:
+        """Page texts in order, from the text cache if present, else extracted lazily with pdfplumber."""
+        # Pages read before an early exit stay in the text cache, so full extraction skips them
+        yield from iter_pdf_pages(pdf_path, 'pdfplumber')
+    
     @classmethod
     def _extract_text_with_fallbacks(cls, pdf_path: str) -> str:
         """
@@ -139,11 +247,7 @@ class EnhancedReportTypeDetector:
         
         # Try pdfplumber first (better for maintaining structure)
         try:
-            with pdfplumber.open(pdf_path) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text(x_tolerance=3, y_tolerance=3)
-                    if page_text:
-                        text += page_text + "\n\n"
+            text = get_pdf_text(pdf_path, 'pdfplumber')
                         
             if len(text) >= 500:  # Consider it successful if we got a reasonable amount of text
                 return text
@@ -152,12 +256,7 @@ class EnhancedReportTypeDetector:
         
         # Fallback to PyPDF2
         try:
-            with open(pdf_path, 'rb') as file:
-                reader = PyPDF2.PdfReader(file)
-                for page in reader.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n\n"
+            text += get_pdf_text(pdf_path, 'pypdf2')
         except Exception as e:
             logger.warning(f"PyPDF2 extraction failed: {str(e)}")
         
@@ -6,6 +6,7 @@ from abc import ABC, abstractmethod
 from typing import Dict, Any, Optional, List, Union
 import re
 from extraction_strategy import StrategyRegistry
+from industry_matcher import match_canonical_industry
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -215,7 +216,9 @@ class ReportTypeHandler(ABC):
         if len(industry) < 3:
             return None
         
-        return industry
+        # Map onto the canonical list of this handler's report type ("Chemical" -> "Chemical Products")
+        report_type = self.__class__.__name__.replace('ReportHandler', '')
+        return match_canonical_industry(industry, report_type) or industry
 
 
 class ManufacturingReportHandler(ReportTypeHandler):
@@ -0,0 +1,171 @@
+"""
+Slice ISM report text into the sections the LLM extraction needs.
+
+Everything the extraction returns lives in two parts of a report: the
+"<Type> at a Glance" table (index values and directions) and the index
+summaries (industry lists per index). slice_report() locates both so the
+prompt can carry them instead of the whole document; respondent quotes,
+commodity lists, history tables and the methodology pages are left out.
+
+If the glance table or any index summary cannot be found the sections are
+marked incomplete and callers fall back to the full text.
+"""
+
+import os
+import re
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+SECTION_PROMPTS = os.environ.get('ISM_LLM_SECTION_PROMPTS', '1').lower() not in ('0', 'false', 'no')  # Send sections instead of the full text
+PARALLEL_SECTIONS = os.environ.get('ISM_LLM_PARALLEL_SECTIONS', '').lower() in ('1', 'true', 'yes')  # One LLM call per index summary
+SECTION_WORKERS = int(os.environ.get('ISM_LLM_SECTION_WORKERS', 4))  # Concurrent per-index calls
+
+# Headings that end a glance table or index summary block
+_STOP_HEADING = re.compile(
+    r"^[ \t]*(?:ABOUT THIS REPORT|WHAT RESPONDENTS ARE SAYING|COMMODITIES REPORTED|BUYING POLICY|"
+    r"DATA AND METHOD OF PRESENTATION|INDUSTRY PERFORMANCE|[A-Z0-9 ®]+ HISTORY|[A-Z0-9 ]*INDEX SUMMARIES)\b",
+    re.MULTILINE
+)
+_SUMMARIES_START = re.compile(r"INDEX SUMMARIES", re.IGNORECASE)
+_GLANCE = re.compile(r"AT A GLANCE", re.IGNORECASE)
+
+# Bold headings are overprinted, so PDF text repeats each glyph four times ('SSSSeeeerrrr')
+_OVERPRINTED_TOKEN = re.compile(r"(?<!\S)(?:(\S)\1{3})+(?!\S)")
+_OVERPRINTED_RUN = re.compile(r"(\S)\1{3}")
+
+_MAX_GLANCE_CHARS = 6000
+_HEADER_CHARS = 300
+
+
+def collapse_overprint(text: str) -> str:
+    """Turn overprinted tokens ('PPPPMMMMIIII', '2222000022225555') back into 'PMI', '2025'."""
+    return _OVERPRINTED_TOKEN.sub(lambda m: m.group(0)[::4], text)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough prompt size in tokens (about four characters per token for English text)."""
+    return (len(text) + 3) // 4
+
+
+def _heading_pattern(index_name: str) -> re.Pattern:
+    words = re.escape(index_name.upper()).replace("'", "['’]").replace(r"\ ", r"\s+")
+    return re.compile(rf"^[ \t]*{words}[ \t]*®?[ \t]*$", re.MULTILINE)
+
+
+def _clean_summary(block: str) -> str:
+    # Drop the overprinted monthly % tables and stray registered marks
+    lines = [line for line in block.splitlines()
+             if line.strip() not in ('', '®') and not _OVERPRINTED_RUN.search(line)]
+    return '\n'.join(lines).strip()
+
+
+class ReportSections:
+    """The glance table and per-index summaries of one report."""
+
+    def __init__(self, report_type: str, header: str, glance: Optional[str],
+                 summaries: 'OrderedDict[str, str]', missing: List[str], full_length: int):
+        self.report_type = report_type
+        self.header = header
+        self.glance = glance
+        self.summaries = summaries
+        self.missing = missing
+        self.full_length = full_length
+
+    @property
+    def complete(self) -> bool:
+        """True when the glance table and every index summary were found."""
+        return bool(self.glance) and not self.missing
+
+    def render(self) -> str:
+        """The sections as prompt text, in report order."""
+        parts = [self.header.strip(), f"=== {self.report_type.upper()} AT A GLANCE ===", self.glance or '',
+                 "=== INDEX SUMMARIES ==="]
+        for index_name, summary in self.summaries.items():
+            parts.append(f"--- {index_name} ---\n{summary}")
+        return '\n\n'.join(parts)
+
+    def stats(self) -> Dict[str, int]:
+        rendered = self.render()
+        return {
+            'full_chars': self.full_length,
+            'section_chars': len(rendered),
+            'full_tokens': (self.full_length + 3) // 4,
+            'section_tokens': estimate_tokens(rendered),
+            'summaries': len(self.summaries),
+            'missing': len(self.missing),
+        }
+
+
+def slice_report(text: str, report_type: str, indices: Iterable[str]) -> ReportSections:
+    """
+    Locate the glance table and the summary of each index in the report text.
+
+    Args:
+        text: Full report text (all pages)
+        report_type: 'Manufacturing' or 'Services'
+        indices: Index names in report order (the handler's get_indices())
+    """
+    indices = list(indices or [])
+
+    glance = None
+    glance_match = _GLANCE.search(text)
+    if glance_match:
+        line_start = text.rfind('\n', 0, glance_match.start()) + 1
+        stop = _STOP_HEADING.search(text, glance_match.end())
+        end = stop.start() if stop else len(text)
+        glance = collapse_overprint(text[line_start:min(end, line_start + _MAX_GLANCE_CHARS)]).strip()
+
+    summaries_match = _SUMMARIES_START.search(text)
+    start = summaries_match.start() if summaries_match else 0
+
+    positions: List[Tuple[int, int, str]] = []
+    missing = []
+    for index_name in indices:
+        heading = _heading_pattern(index_name).search(text, start)
+        if heading:
+            positions.append((heading.start(), heading.end(), index_name))
+        else:
+            missing.append(index_name)
+    positions.sort()
+
+    summaries = OrderedDict()
+    heading_starts = [position[0] for position in positions]
+    for i, (heading_start, heading_end, index_name) in enumerate(positions):
+        end = heading_starts[i + 1] if i + 1 < len(positions) else len(text)
+        stop = _STOP_HEADING.search(text, heading_end, end)
+        if stop:
+            end = stop.start()
+        summaries[index_name] = _clean_summary(text[heading_end:end])
+
+    return ReportSections(report_type, text[:_HEADER_CHARS], glance, summaries, missing, len(text))
+
+
+def glance_prompt(sections: ReportSections, indices: List[str]) -> str:
+    """Prompt for the index values of the glance table (parallel mode)."""
+    return f"""
+    From this ISM {sections.report_type} report "At a Glance" table, extract the report month and, for
+    each of these indices: {', '.join(indices)}, the "Series Index" value for the current month
+    (NOT the Percent Point Change) and its direction. Also give the direction of the overall economy
+    and of the {sections.report_type} sector. Return ONLY a JSON object:
+    {{"month_year": "Month Year",
+      "indices": {{"<index name>": {{"current": "52.1", "direction": "Growing", "series_index": "52.1"}},
+                  "OVERALL ECONOMY": {{"direction": "Growing"}},
+                  "{sections.report_type} Sector": {{"direction": "Growing"}}}}}}
+
+    {sections.header.strip()}
+
+    {sections.glance}
+    """
+
+
+def summary_prompt(sections: ReportSections, index_name: str, categories: List[str]) -> str:
+    """Prompt for the industry lists of one index summary (parallel mode)."""
+    template = ', '.join(f'"{category}": ["Industry", ...]' for category in categories)
+    return f"""
+    Below is the {index_name} summary of the ISM {sections.report_type} report. List the industries
+    it reports in each category ({', '.join(categories)}), in the order they are listed, using the
+    industry names exactly as written. Use an empty list for a category with no industries.
+    Return ONLY a JSON object: {{"{index_name}": {{{template}}}}}
+
+    {sections.summaries[index_name]}
+    """
@@ -0,0 +1,247 @@
+"""
+Server-side cache of rendered JSON responses for the expensive dashboard APIs.
+
+The correlation, heatmap, industry status and index trend endpoints rebuild
+the same JSON until a new report is stored. cached_response keeps the body of
+each successful response under (endpoint, view arguments, query arguments) in
+two tiers:
+
+1. an in-process LRU (cache_utils.GenerationalCache) answering repeat polls
+   without SQL or serialization;
+2. optionally a SQLite file (ISM_RESPONSE_CACHE_DB) shared by every worker,
+   so the entries survive gunicorn recycling workers (--max-requests) and a
+   fresh worker starts warm.
+
+Entries are tagged with the data generation and config fingerprint they were
+rendered from and expire after the route's TTL. store_report_data_in_db calls
+invalidate_response_cache() after a commit to drop them all at once.
+"""
+
+import os
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Dict, Optional, Tuple
+
+from flask import Response, request
+
+import query_metrics
+from cache_utils import GenerationalCache
+from config_loader import config_loader
+from db_utils import DB_DIR, peek_data_generation
+
+logger = logging.getLogger(__name__)
+
+RESPONSE_CACHE_SIZE = int(os.environ.get('ISM_RESPONSE_CACHE_SIZE', 256))  # Responses kept in each worker's memory tier
+RESPONSE_CACHE_TTL = float(os.environ.get('ISM_RESPONSE_CACHE_TTL', 900))  # Default seconds a cached response stays valid
+RESPONSE_CACHE_MAX_BYTES = int(os.environ.get('ISM_RESPONSE_CACHE_MAX_BYTES', 4 * 1024 * 1024))  # Larger bodies are not cached
+
+# SQLite file of the shared tier; set ISM_RESPONSE_CACHE_DB to an empty string to keep responses in memory only
+RESPONSE_CACHE_DB = os.environ.get('ISM_RESPONSE_CACHE_DB', os.path.join(DB_DIR, 'cache', 'responses.db'))
+
+
+class ResponseCache:
+    """Response bodies keyed by route and arguments, in memory and optionally on disk."""
+
+    def __init__(self, max_entries: int = RESPONSE_CACHE_SIZE, db_path: Optional[str] = None):
+        """
+        Args:
+            max_entries: Entries kept in the memory tier
+            db_path: SQLite file of the disk tier (None for ISM_RESPONSE_CACHE_DB, '' to disable)
+        """
+        self.memory = GenerationalCache(max_entries, name='responses')
+        self.db_path = RESPONSE_CACHE_DB if db_path is None else db_path
+        self._lock = threading.Lock()
+        self._disk_ready = False
+        self._counters = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'stores': 0,
+                          'invalidations': 0, 'errors': 0}
+        self._routes: Dict[str, Dict[str, int]] = {}
+
+    def get(self, key: str, generation: Tuple[int, str], route: str = '') -> Optional[Tuple[bytes, str]]:
+        """(body, mimetype) cached for `generation`, or None on a miss."""
+        entry = self.memory.get(key, generation)
+        if entry is not None and entry[0] > time.time():
+            self._count(route, 'memory_hits')
+            return entry[1], entry[2]
+
+        entry = self._disk_get(key, generation)
+        if entry is not None:
+            self.memory.set(key, entry, generation)
+            self._count(route, 'disk_hits')
+            return entry[1], entry[2]
+
+        self._count(route, 'misses')
+        return None
+
+    def set(self, key: str, generation: Tuple[int, str], body: bytes, mimetype: str, ttl: float):
+        """Store a response body rendered from data at `generation`."""
+        entry = (time.time() + ttl, body, mimetype)
+        self.memory.set(key, entry, generation)
+        self._disk_set(key, generation, entry)
+        self._count(None, 'stores')
+
+    def invalidate(self):
+        """Drop every cached response in this worker and on disk."""
+        self.memory.clear()
+        self._count(None, 'invalidations')
+        if not self.db_path or not os.path.exists(self.db_path):
+            return
+        try:
+            with self._connect() as conn:
+                conn.execute('DELETE FROM responses')
+        except (sqlite3.Error, OSError) as e:
+            self._error('invalidate', e)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Tier hit counters, overall and per-route hit rates, and the memory tier's size."""
+        with self._lock:
+            stats = dict(self._counters)
+            routes = {route: dict(counters) for route, counters in self._routes.items()}
+        stats['hit_rate'] = _hit_rate(stats)
+        for counters in routes.values():
+            counters['hit_rate'] = _hit_rate(counters)
+        stats['routes'] = routes
+        stats['memory_size'] = len(self.memory)
+        stats['disk_enabled'] = bool(self.db_path)
+        return stats
+
+    def _count(self, route: Optional[str], counter: str):
+        with self._lock:
+            self._counters[counter] += 1
+            if route is not None:
+                counters = self._routes.setdefault(route, {'memory_hits': 0, 'disk_hits': 0, 'misses': 0})
+                counters[counter] += 1
+
+    def _error(self, action: str, error: Exception):
+        logger.warning(f"Response cache {action} failed on {self.db_path}: {str(error)}")
+        self._count(None, 'errors')
+
+    @contextmanager
+    def _connect(self):
+        """Short-lived connection to the disk tier, committed and closed on exit."""
+        if not self._disk_ready:
+            os.makedirs(os.path.dirname(self.db_path) or '.', exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=2.0)
+        try:
+            if not self._disk_ready:
+                self._create_table(conn)
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _create_table(self, conn: sqlite3.Connection):
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS responses (
+                cache_key TEXT PRIMARY KEY,
+                data_generation INTEGER NOT NULL,
+                config_fingerprint TEXT NOT NULL,
+                expires_at REAL NOT NULL,
+                mimetype TEXT NOT NULL,
+                body BLOB NOT NULL
+            )
+        ''')
+        self._disk_ready = True
+
+    def _disk_get(self, key: str, generation: Tuple[int, str]):
+        if not self.db_path:
+            return None
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    'SELECT expires_at, body, mimetype FROM responses '
+                    'WHERE cache_key = ? AND data_generation = ? AND config_fingerprint = ? AND expires_at > ?',
+                    (key, generation[0], generation[1], time.time())
+                ).fetchone()
+        except (sqlite3.Error, OSError) as e:
+            self._error('read', e)
+            return None
+        return (row[0], bytes(row[1]), row[2]) if row else None
+
+    def _disk_set(self, key: str, generation: Tuple[int, str], entry: Tuple[float, bytes, str]):
+        if not self.db_path:
+            return
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)',
+                    (key, generation[0], generation[1], entry[0], entry[2], sqlite3.Binary(entry[1]))
+                )
+                # Entries of earlier generations can never be served again
+                conn.execute('DELETE FROM responses WHERE data_generation < ? OR expires_at <= ?',
+                             (generation[0], time.time()))
+        except (sqlite3.Error, OSError) as e:
+            self._error('write', e)
+
+
+def _hit_rate(counters: Dict[str, int]) -> Optional[float]:
+    hits = counters['memory_hits'] + counters['disk_hits']
+    lookups = hits + counters['misses']
+    return round(hits / lookups, 3) if lookups else None
+
+
+# Shared process-wide cache
+response_cache = ResponseCache()
+
+
+def _request_key() -> str:
+    parts = [
+        request.endpoint or request.path,
+        repr(sorted((request.view_args or {}).items())),
+        repr(sorted(request.args.items(multi=True))),
+    ]
+    return hashlib.sha1('\x1f'.join(parts).encode('utf-8')).hexdigest()
+
+
+def cached_response(ttl: Optional[float] = None):
+    """
+    Serve a view's successful responses from response_cache for `ttl` seconds
+    (None for ISM_RESPONSE_CACHE_TTL) or until the data or configs change.
+
+    Example:
+        @app.route('/api/correlations/cross_report')
+        @cached_response(ttl=3600)
+        def get_cross_report_correlations():
+            ...
+    """
+    ttl = RESPONSE_CACHE_TTL if ttl is None else ttl
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if request.method != 'GET' or ttl <= 0:
+                return view(*args, **kwargs)
+
+            with query_metrics.track_queries('data generation'):
+                generation = (peek_data_generation(), config_loader.get_fingerprint())
+            key = _request_key()
+            route = request.endpoint or request.path
+            cached = response_cache.get(key, generation, route)
+            if cached is not None:
+                return Response(cached[0], status=200, mimetype=cached[1])
+
+            response = view(*args, **kwargs)
+            if (isinstance(response, Response) and response.status_code == 200
+                    and not response.direct_passthrough):
+                body = response.get_data()
+                if len(body) <= RESPONSE_CACHE_MAX_BYTES:
+                    response_cache.set(key, generation, body, response.mimetype, ttl)
+            return response
+
+        return wrapper
+    return decorator
+
+
+def invalidate_response_cache():
+    """Drop every cached response (called after a report is stored)."""
+    response_cache.invalidate()
+
+
+def get_response_cache_stats() -> Dict[str, Any]:
+    """Hit/miss counters of the shared response cache."""
+    return response_cache.get_stats()
@@ -0,0 +1,210 @@
+"""
+Bounded store for news analysis runs, looked up by /chat.
+
+/news/summary keeps each run's articles, summaries and source map under a
+run_id so follow-up chat questions can be answered from it. RunStore holds
+them in an LRU bounded by entry count, total size and age, instead of a dict
+that grows for the life of the worker. Each entry's size is the length of its
+pickled form, which is also what the optional SQLite tier (ISM_RUN_STORE_DB)
+keeps, so a chat session outlives gunicorn recycling the worker that ran the
+analysis. No external service is needed.
+"""
+
+import os
+import time
+import pickle
+import sqlite3
+import logging
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+
+from db_utils import DB_DIR
+
+logger = logging.getLogger(__name__)
+
+RUN_STORE_MAX_ENTRIES = int(os.environ.get('ISM_RUN_STORE_MAX_ENTRIES', 200))  # Runs kept in each worker's memory
+RUN_STORE_MAX_BYTES = int(os.environ.get('ISM_RUN_STORE_MAX_BYTES', 64 * 1024 * 1024))  # Pickled bytes kept in each worker's memory
+RUN_STORE_TTL = float(os.environ.get('ISM_RUN_STORE_TTL', 12 * 3600))  # Seconds a run can be chatted with
+
+# SQLite file shared by all workers; set ISM_RUN_STORE_DB to an empty string to keep runs in memory only
+RUN_STORE_DB = os.environ.get('ISM_RUN_STORE_DB', os.path.join(DB_DIR, 'cache', 'runs.db'))
+
+_MISSING = object()
+
+
+class RunStore:
+    """Size- and TTL-bounded LRU of analysis runs with an optional SQLite tier."""
+
+    def __init__(self, max_entries: int = RUN_STORE_MAX_ENTRIES, max_bytes: int = RUN_STORE_MAX_BYTES,
+                 ttl: float = RUN_STORE_TTL, db_path: Optional[str] = None):
+        """
+        Args:
+            max_entries: Runs kept in memory before the least recently used one is evicted
+            max_bytes: Total pickled size of the runs kept in memory
+            ttl: Seconds after which a run expires
+            db_path: SQLite file of the disk tier (None for ISM_RUN_STORE_DB, '' to disable)
+        """
+        self.max_entries = max(1, max_entries)
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.db_path = RUN_STORE_DB if db_path is None else db_path
+        self._entries = OrderedDict()  # run_id -> (expires_at, size, run)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._disk_ready = False
+        self._counters = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'expired': 0,
+                          'evictions': 0, 'errors': 0}
+
+    def __setitem__(self, run_id: str, run: Dict[str, Any]):
+        expires_at = time.time() + self.ttl
+        try:
+            payload = pickle.dumps(run, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError) as e:
+            # Kept in this worker only, sized by its repr
+            logger.warning(f"Run {run_id[:8]} cannot be pickled, not writing it to disk: {str(e)}")
+            payload = None
+        with self._lock:
+            self._store(run_id, (expires_at, len(payload) if payload is not None else len(repr(run)), run))
+        if payload is not None:
+            self._disk_set(run_id, expires_at, payload)
+
+    def get(self, run_id: str, default: Any = None) -> Any:
+        """The run stored under run_id, or default if it is unknown or expired."""
+        with self._lock:
+            entry = self._entries.get(run_id, _MISSING)
+            if entry is not _MISSING:
+                if entry[0] > time.time():
+                    self._entries.move_to_end(run_id)
+                    self._counters['memory_hits'] += 1
+                    return entry[2]
+                self._drop(run_id)
+                self._counters['expired'] += 1
+
+        entry = self._disk_get(run_id)
+        with self._lock:
+            if entry is None:
+                self._counters['misses'] += 1
+                return default
+            self._store(run_id, entry)
+            self._counters['disk_hits'] += 1
+        return entry[2]
+
+    def __getitem__(self, run_id: str) -> Dict[str, Any]:
+        run = self.get(run_id, _MISSING)
+        if run is _MISSING:
+            raise KeyError(run_id)
+        return run
+
+    def __contains__(self, run_id: str) -> bool:
+        return self.get(run_id, _MISSING) is not _MISSING
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def pop(self, run_id: str, default: Any = None) -> Any:
+        """Remove a run from memory and disk, returning it (or default)."""
+        run = self.get(run_id, default)
+        with self._lock:
+            if run_id in self._entries:
+                self._drop(run_id)
+        if self.db_path and os.path.exists(self.db_path):
+            try:
+                with self._connect() as conn:
+                    conn.execute('DELETE FROM runs WHERE run_id = ?', (run_id,))
+            except (sqlite3.Error, OSError) as e:
+                self._error('delete', e)
+        return run
+
+    def clear(self):
+        """Drop every run held in this worker's memory (the disk tier is kept)."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters, memory use and bounds."""
+        with self._lock:
+            stats = dict(self._counters)
+            stats['size'] = len(self._entries)
+            stats['bytes'] = self._bytes
+        hits = stats['memory_hits'] + stats['disk_hits']
+        lookups = hits + stats['misses'] + stats['expired']
+        stats['hit_rate'] = round(hits / lookups, 3) if lookups else None
+        stats['max_entries'] = self.max_entries
+        stats['max_bytes'] = self.max_bytes
+        stats['ttl'] = self.ttl
+        stats['disk_enabled'] = bool(self.db_path)
+        return stats
+
+    def _store(self, run_id: str, entry: tuple):
+        # Caller holds the lock; the newest run is kept even if it alone exceeds max_bytes
+        if run_id in self._entries:
+            self._drop(run_id)
+        self._entries[run_id] = entry
+        self._bytes += entry[1]
+        now = time.time()
+        while len(self._entries) > 1 and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            oldest_id, oldest = next(iter(self._entries.items()))
+            self._drop(oldest_id)
+            self._counters['expired' if oldest[0] <= now else 'evictions'] += 1
+
+    def _drop(self, run_id: str):
+        expires_at, size, run = self._entries.pop(run_id)
+        self._bytes -= size
+
+    def _error(self, action: str, error: Exception):
+        logger.warning(f"Run store {action} failed on {self.db_path}: {str(error)}")
+        with self._lock:
+            self._counters['errors'] += 1
+
+    @contextmanager
+    def _connect(self):
+        """Short-lived connection to the disk tier, committed and closed on exit."""
+        if not self._disk_ready:
+            os.makedirs(os.path.dirname(self.db_path) or '.', exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=2.0)
+        try:
+            if not self._disk_ready:
+                conn.execute('PRAGMA journal_mode=WAL')
+                conn.execute('''
+                    CREATE TABLE IF NOT EXISTS runs (
+                        run_id TEXT PRIMARY KEY,
+                        expires_at REAL NOT NULL,
+                        payload BLOB NOT NULL
+                    )
+                ''')
+                self._disk_ready = True
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _disk_get(self, run_id: str) -> Optional[tuple]:
+        if not self.db_path or not os.path.exists(self.db_path):
+            return None
+        try:
+            with self._connect() as conn:
+                row = conn.execute('SELECT expires_at, payload FROM runs WHERE run_id = ? AND expires_at > ?',
+                                   (run_id, time.time())).fetchone()
+            if row is None:
+                return None
+            payload = bytes(row[1])
+            return row[0], len(payload), pickle.loads(payload)
+        except Exception as e:  # unreadable file or a payload pickled by incompatible code
+            self._error('read', e)
+            return None
+
+    def _disk_set(self, run_id: str, expires_at: float, payload: bytes):
+        if not self.db_path:
+            return
+        try:
+            with self._connect() as conn:
+                conn.execute('INSERT OR REPLACE INTO runs (run_id, expires_at, payload) VALUES (?, ?, ?)',
+                             (run_id, expires_at, sqlite3.Binary(payload)))
+                conn.execute('DELETE FROM runs WHERE expires_at <= ?', (time.time(),))
+        except (sqlite3.Error, OSError) as e:
+            self._error('write', e)
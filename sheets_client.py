@@ -0,0 +1,346 @@
+"""
+Rate-limited, retrying wrapper around the Google Sheets API service.
+
+google_auth.get_google_sheets_service() returns a SheetsClient, so every
+spreadsheets()/values() call made by the formatter goes through:
+
+- a process-wide token bucket per quota (reads and writes are counted
+  separately, like the per-minute quotas of the Sheets API);
+- payload-size-aware batching: spreadsheets.batchUpdate and
+  values.batchUpdate bodies larger than ISM_SHEETS_MAX_PAYLOAD_BYTES are
+  split into as few sequential calls as fit, and the replies merged. A run
+  of conditional format rule requests for one sheet is never split, since
+  their indices only hold if the whole run is applied together;
+- jittered exponential backoff on retryable HTTP status codes (429, 5xx),
+  honouring Retry-After when the API sends it.
+
+Time spent waiting on the limiter and in backoff is counted in
+get_sheets_api_stats().
+"""
+
+import os
+import json
+import time
+import random
+import logging
+import threading
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+SHEETS_WRITE_QUOTA = int(os.environ.get('ISM_SHEETS_WRITE_QUOTA', 60))  # Write requests per minute (0 disables limiting)
+SHEETS_READ_QUOTA = int(os.environ.get('ISM_SHEETS_READ_QUOTA', 60))  # Read requests per minute (0 disables limiting)
+SHEETS_BURST = int(os.environ.get('ISM_SHEETS_BURST', 10))  # Requests that may be sent back to back before pacing starts
+SHEETS_MAX_PAYLOAD_BYTES = int(os.environ.get('ISM_SHEETS_MAX_PAYLOAD_BYTES', 2 * 1024 * 1024))  # Largest request body sent in one call
+SHEETS_MAX_RETRIES = int(os.environ.get('ISM_SHEETS_MAX_RETRIES', 5))  # Retries of a throttled or failed call
+SHEETS_MAX_BACKOFF = float(os.environ.get('ISM_SHEETS_MAX_BACKOFF', 64))  # Longest single backoff delay in seconds
+
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+
+# Methods that count against the read quota; everything else is a write
+_READ_METHODS = {'get', 'batchGet', 'getByDataFilter', 'batchGetByDataFilter'}
+
+# Set while a with_backoff() loop is running, so nested calls don't retry on their own
+_in_backoff: ContextVar[bool] = ContextVar('ism_sheets_in_backoff', default=False)
+
+_stats_lock = threading.Lock()
+_stats = {
+    'calls': 0, 'read_calls': 0, 'write_calls': 0, 'split_calls': 0, 'bytes_sent': 0,
+    'retries': 0, 'rate_limited': 0, 'throttled_seconds': 0.0, 'backoff_seconds': 0.0
+}
+
+
+def _add_stats(**counts):
+    with _stats_lock:
+        for key, value in counts.items():
+            _stats[key] += value
+
+
+def get_sheets_api_stats() -> Dict[str, Any]:
+    """Process-wide Sheets API call counters."""
+    with _stats_lock:
+        stats = dict(_stats)
+    stats['throttled_seconds'] = round(stats['throttled_seconds'], 3)
+    stats['backoff_seconds'] = round(stats['backoff_seconds'], 3)
+    return stats
+
+
+def reset_sheets_api_stats():
+    """Zero the counters (used by benchmarks between runs)."""
+    with _stats_lock:
+        for key in _stats:
+            _stats[key] = 0.0 if isinstance(_stats[key], float) else 0
+
+
+class TokenBucket:
+    """Thread-safe token bucket that paces calls to a per-minute quota."""
+
+    def __init__(self, per_minute: int, burst: int = SHEETS_BURST):
+        """
+        Args:
+            per_minute: Calls allowed per minute (<= 0 for no limit)
+            burst: Tokens available up front. The refill rate is
+                (per_minute - burst) / 60 per second, so a full burst plus a
+                minute of refill never exceeds the quota.
+        """
+        self.per_minute = per_minute
+        self.capacity = max(1, min(burst, per_minute - 1)) if per_minute > 1 else 1
+        self.rate = (per_minute - self.capacity) / 60.0 if per_minute > 1 else per_minute / 60.0
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take one token, sleeping until it is available. Returns the seconds waited."""
+        if self.per_minute <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # Reserve the token now; a negative balance is the queue of waiting callers
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait:
+            time.sleep(wait)
+        return wait
+
+
+_write_bucket = TokenBucket(SHEETS_WRITE_QUOTA)
+_read_bucket = TokenBucket(SHEETS_READ_QUOTA)
+
+
+def http_status(error: Exception) -> Optional[int]:
+    """HTTP status of a googleapiclient HttpError (None for other exceptions)."""
+    status = getattr(error, 'status_code', None) or getattr(getattr(error, 'resp', None), 'status', None)
+    try:
+        return int(status) if status is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    resp = getattr(error, 'resp', None)
+    value = resp.get('retry-after') if hasattr(resp, 'get') else None
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def is_retryable(error: Exception) -> bool:
+    """Throttling, server errors and dropped connections are worth retrying."""
+    if http_status(error) in RETRYABLE_STATUS:
+        return True
+    return isinstance(error, (ConnectionError, TimeoutError))
+
+
+def with_backoff(request_func: Callable[[], Any], max_retries: int = SHEETS_MAX_RETRIES,
+                 initial_delay: float = 1.0, max_delay: float = SHEETS_MAX_BACKOFF) -> Any:
+    """
+    Call request_func, retrying retryable errors with jittered exponential backoff
+    (initial_delay * 2**n plus up to a second of jitter, capped at max_delay).
+
+    Calls made inside request_func through a SheetsClient run once each and
+    leave retrying to this loop.
+    """
+    if _in_backoff.get():
+        return request_func()
+
+    token = _in_backoff.set(True)
+    try:
+        attempt = 0
+        while True:
+            try:
+                return request_func()
+            except Exception as e:
+                if attempt >= max_retries or not is_retryable(e):
+                    raise
+                status = http_status(e)
+                delay = _retry_after(e)
+                if delay is None:
+                    delay = min(initial_delay * (2 ** attempt) + random.uniform(0, 1), max_delay)
+                logger.warning(f"Sheets API call failed ({status or type(e).__name__}), "
+                               f"retry {attempt + 1}/{max_retries} in {delay:.1f}s: {str(e)}")
+                _add_stats(retries=1, rate_limited=1 if status == 429 else 0, backoff_seconds=delay)
+                time.sleep(delay)
+                attempt += 1
+    finally:
+        _in_backoff.reset(token)
+
+
+def _payload_size(body: Any) -> int:
+    return len(json.dumps(body, separators=(',', ':'), default=str).encode('utf-8'))
+
+
+def pack_by_size(items: List[Any], max_bytes: int, overhead: int = 0) -> List[List[Any]]:
+    """
+    Split items into consecutive chunks whose JSON size (plus overhead) stays
+    under max_bytes. An item too large on its own gets a chunk to itself.
+    """
+    chunks, current, size = [], [], overhead
+    for item in items:
+        item_size = _payload_size(item) + 1  # separating comma
+        if current and size + item_size > max_bytes:
+            chunks.append(current)
+            current, size = [], overhead
+        current.append(item)
+        size += item_size
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+# Requests addressing conditional format rules by index, which every earlier delete or add shifts
+_RULE_REQUESTS = ('addConditionalFormatRule', 'deleteConditionalFormatRule', 'updateConditionalFormatRule')
+
+
+def _rule_sheet(request: Any) -> Any:
+    """Sheet id a conditional format rule request indexes into, or None for other requests."""
+    if not isinstance(request, dict):
+        return None
+    for kind in _RULE_REQUESTS:
+        if kind in request:
+            params = request[kind] or {}
+            if 'sheetId' in params:
+                return params['sheetId']
+            ranges = (params.get('rule') or {}).get('ranges') or [{}]
+            return ranges[0].get('sheetId', kind)
+    return None
+
+
+def atomic_units(requests: List[Any]) -> List[List[Any]]:
+    """
+    Group spreadsheets.batchUpdate requests into units that must go in one
+    call: each run of consecutive rule requests for the same sheet, and every
+    other request on its own.
+    """
+    units, run_sheet = [], None
+    for request in requests:
+        sheet = _rule_sheet(request)
+        if sheet is not None and sheet == run_sheet:
+            units[-1].append(request)
+        else:
+            units.append([request])
+        run_sheet = sheet
+    return units
+
+
+def _merge_responses(list_key: str, responses: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Combine the replies of a split batch call into what one call would have returned."""
+    merged = dict(responses[0]) if responses else {}
+    merged[list_key] = []
+    for response in responses:
+        merged[list_key].extend(response.get(list_key, []))
+        for key, value in response.items():
+            if key.startswith('total') and response is not responses[0] and isinstance(value, int):
+                merged[key] = merged.get(key, 0) + value
+    return merged
+
+
+class _Request:
+    """A pending API call; execute() applies limiting, batching and backoff."""
+
+    def __init__(self, client: 'SheetsClient', method: Callable, method_name: str, kwargs: Dict[str, Any]):
+        self._client = client
+        self._method = method
+        self._method_name = method_name
+        self._kwargs = kwargs
+
+    def execute(self, **execute_kwargs) -> Any:
+        return self._client._execute(self._method, self._method_name, self._kwargs, execute_kwargs)
+
+
+class _Resource:
+    """Proxy for a googleapiclient resource (spreadsheets(), values(), ...)."""
+
+    def __init__(self, client: 'SheetsClient', resource: Any):
+        self._client = client
+        self._resource = resource
+
+    def __getattr__(self, name: str):
+        target = getattr(self._resource, name)
+        if not callable(target):
+            return target
+
+        def call(**kwargs):
+            # API methods are keyword-only, sub-resource accessors take no arguments
+            if name in self._client.SUB_RESOURCES:
+                return _Resource(self._client, target(**kwargs))
+            return _Request(self._client, target, name, kwargs)
+        return call
+
+
+class SheetsClient:
+    """Google Sheets service wrapper shared by the formatter and the sync engine."""
+
+    SUB_RESOURCES = {'spreadsheets', 'values', 'sheets', 'developerMetadata'}
+
+    def __init__(self, service: Any, write_bucket: Optional[TokenBucket] = None,
+                 read_bucket: Optional[TokenBucket] = None,
+                 max_payload_bytes: int = SHEETS_MAX_PAYLOAD_BYTES,
+                 max_retries: int = SHEETS_MAX_RETRIES):
+        """
+        Args:
+            service: googleapiclient Sheets v4 resource (or a compatible fake)
+            write_bucket / read_bucket: Limiters, shared process-wide by default
+            max_payload_bytes: Body size above which batch calls are split
+            max_retries: Retries per call for retryable errors
+        """
+        self.service = service
+        self.write_bucket = write_bucket or _write_bucket
+        self.read_bucket = read_bucket or _read_bucket
+        self.max_payload_bytes = max_payload_bytes
+        self.max_retries = max_retries
+
+    @classmethod
+    def wrap(cls, service: Any) -> Any:
+        """Wrap a raw service; clients and None are returned unchanged."""
+        if service is None or isinstance(service, cls):
+            return service
+        return cls(service)
+
+    def spreadsheets(self) -> _Resource:
+        return _Resource(self, self.service.spreadsheets())
+
+    def __getattr__(self, name: str):
+        return getattr(self.service, name)
+
+    def _execute(self, method: Callable, method_name: str, kwargs: Dict[str, Any],
+                 execute_kwargs: Dict[str, Any]) -> Any:
+        body = kwargs.get('body')
+        list_key = None
+        if method_name == 'batchUpdate' and isinstance(body, dict):
+            list_key = 'data' if 'data' in body else 'requests'
+
+        if list_key is None or _payload_size(body) <= self.max_payload_bytes:
+            return self._send(method, method_name, kwargs, execute_kwargs)
+
+        overhead = _payload_size(dict(body, **{list_key: []}))
+        if list_key == 'requests':
+            # A batchUpdate is all-or-nothing; keep index-dependent rule sequences inside one call
+            chunks = [[request for unit in chunk for request in unit]
+                      for chunk in pack_by_size(atomic_units(body[list_key]), self.max_payload_bytes, overhead)]
+        else:
+            chunks = pack_by_size(body[list_key], self.max_payload_bytes, overhead)
+        logger.info(f"Splitting {method_name} of {len(body[list_key])} items into {len(chunks)} calls")
+        _add_stats(split_calls=len(chunks) - 1)
+        responses = [self._send(method, method_name, dict(kwargs, body=dict(body, **{list_key: chunk})),
+                                execute_kwargs)
+                     for chunk in chunks]
+        return _merge_responses('responses' if list_key == 'data' else 'replies', responses)
+
+    def _send(self, method: Callable, method_name: str, kwargs: Dict[str, Any],
+              execute_kwargs: Dict[str, Any]) -> Any:
+        read = method_name in _READ_METHODS
+        bucket = self.read_bucket if read else self.write_bucket
+        size = _payload_size(kwargs['body']) if 'body' in kwargs else 0
+
+        def attempt():
+            waited = bucket.acquire()
+            _add_stats(calls=1, read_calls=1 if read else 0, write_calls=0 if read else 1,
+                       bytes_sent=size, throttled_seconds=waited)
+            return method(**kwargs).execute(**execute_kwargs)
+
+        return with_backoff(attempt, self.max_retries)
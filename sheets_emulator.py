@@ -0,0 +1,471 @@
+"""
+In-process emulator of the Google Sheets v4 API surface used by the formatter.
+
+SheetsEmulator implements spreadsheets().create/get/batchUpdate and
+values().get/update/batchUpdate/batchClear/clear against in-memory
+spreadsheets, and records every call with its payload size and whether it
+counts against the read or the write quota. It validates what the real API
+rejects and the formatter depends on (unknown spreadsheets -> 404, unknown
+tabs, writes outside the grid, deleting missing conditional format rules ->
+400), so a formatter run against it exercises the same code paths.
+
+Set ISM_SHEETS_EMULATOR=1 (or google_auth.SHEETS_EMULATOR = True) to make
+google_auth.get_google_sheets_service() return the shared emulator; see
+benchmarks/bench_sheets_formatter.py.
+"""
+
+import re
+import json
+import time
+import threading
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    from googleapiclient.errors import HttpError as _GoogleHttpError
+    import httplib2
+except ImportError:  # the emulator also runs without the Google client libraries
+    _GoogleHttpError = None
+    httplib2 = None
+
+DEFAULT_ROWS = 1000
+DEFAULT_COLUMNS = 26
+QUOTA_WINDOW_SECONDS = 60
+
+_READ_METHODS = {'spreadsheets.get', 'values.get', 'values.batchGet'}
+
+_A1_CELL = re.compile(r'^([A-Z]*)(\d*)$')
+
+
+class EmulatorHttpError(Exception):
+    """Stand-in for googleapiclient's HttpError: the status is on .resp.status."""
+
+    class _Response(dict):
+        def __init__(self, status: int):
+            super().__init__({'status': str(status)})
+            self.status = status
+            self.reason = 'Emulated error'
+
+    def __init__(self, status: int, message: str):
+        super().__init__(f"<HttpError {status}: {message}>")
+        self.resp = self._Response(status)
+        self.content = message.encode('utf-8')
+
+
+def _http_error(status: int, message: str) -> Exception:
+    if _GoogleHttpError is not None:
+        return _GoogleHttpError(httplib2.Response({'status': status}), message.encode('utf-8'))
+    return EmulatorHttpError(status, message)
+
+
+def _size(body: Any) -> int:
+    return len(json.dumps(body, separators=(',', ':'), default=str).encode('utf-8')) if body is not None else 0
+
+
+def _column_index(letters: str) -> int:
+    index = 0
+    for letter in letters:
+        index = index * 26 + ord(letter) - 64
+    return index - 1
+
+
+def parse_a1(a1: str) -> Tuple[str, Optional[Tuple[int, int]], Optional[Tuple[Optional[int], Optional[int]]]]:
+    """
+    Split an A1 range into (tab title, start (row, col), end (row, col)), 0-based.
+
+    'Tab' -> whole tab (start and end None); 'Tab'!B2 -> start only;
+    'Tab'!B2:D9 -> start and inclusive end. Open-ended parts (A:A) are None.
+    """
+    if '!' in a1:
+        title, cells = a1.rsplit('!', 1)
+    else:
+        title, cells = a1, ''
+    if title.startswith("'") and title.endswith("'"):
+        title = title[1:-1].replace("''", "'")
+    if not cells:
+        return title, None, None
+
+    def cell(part):
+        match = _A1_CELL.match(part.upper())
+        if not match:
+            raise _http_error(400, f"Unable to parse range: {a1}")
+        letters, digits = match.groups()
+        return (int(digits) - 1 if digits else None, _column_index(letters) if letters else None)
+
+    parts = cells.split(':')
+    start = cell(parts[0])
+    start = (start[0] or 0, start[1] or 0)
+    end = cell(parts[1]) if len(parts) > 1 else None
+    return title, start, end
+
+
+class _Sheet:
+    def __init__(self, sheet_id: int, title: str, rows: int = DEFAULT_ROWS, columns: int = DEFAULT_COLUMNS):
+        self.sheet_id = sheet_id
+        self.title = title
+        self.rows = rows
+        self.columns = columns
+        self.cells = {}  # (row, col) -> value
+        self.conditional_formats = []
+        self.frozen = (0, 0)
+
+    def resource(self) -> Dict[str, Any]:
+        return {
+            'properties': {
+                'sheetId': self.sheet_id,
+                'title': self.title,
+                'gridProperties': {'rowCount': self.rows, 'columnCount': self.columns,
+                                   'frozenRowCount': self.frozen[0], 'frozenColumnCount': self.frozen[1]}
+            },
+            'conditionalFormats': [dict(rule) for rule in self.conditional_formats]
+        }
+
+    def values(self, start=None, end=None) -> List[List[Any]]:
+        if not self.cells:
+            return []
+        top, left = start or (0, 0)
+        bottom = end[0] if end and end[0] is not None else max(r for r, _ in self.cells)
+        right = end[1] if end and end[1] is not None else max(c for _, c in self.cells)
+        grid = [[self.cells.get((r, c), '') for c in range(left, right + 1)] for r in range(top, bottom + 1)]
+        # Like the API, drop trailing empty cells and rows
+        for row in grid:
+            while row and row[-1] == '':
+                row.pop()
+        while grid and not grid[-1]:
+            grid.pop()
+        return grid
+
+
+class _Spreadsheet:
+    def __init__(self, spreadsheet_id: str, title: str):
+        self.spreadsheet_id = spreadsheet_id
+        self.title = title
+        self.sheets = []  # type: List[_Sheet]
+        self.next_sheet_id = 0
+
+    def add_sheet(self, title: Optional[str] = None, sheet_id: Optional[int] = None,
+                  rows: int = DEFAULT_ROWS, columns: int = DEFAULT_COLUMNS) -> _Sheet:
+        title = title or f"Sheet{len(self.sheets) + 1}"
+        if self.by_title(title) is not None:
+            raise _http_error(400, f'A sheet with the name "{title}" already exists')
+        if sheet_id is None:
+            sheet_id = self.next_sheet_id
+        self.next_sheet_id = max(self.next_sheet_id, sheet_id) + 1
+        sheet = _Sheet(sheet_id, title, rows, columns)
+        self.sheets.append(sheet)
+        return sheet
+
+    def by_title(self, title: str) -> Optional[_Sheet]:
+        return next((sheet for sheet in self.sheets if sheet.title == title), None)
+
+    def by_id(self, sheet_id: int) -> _Sheet:
+        sheet = next((sheet for sheet in self.sheets if sheet.sheet_id == sheet_id), None)
+        if sheet is None:
+            raise _http_error(400, f"No grid with id: {sheet_id}")
+        return sheet
+
+    def resource(self) -> Dict[str, Any]:
+        return {
+            'spreadsheetId': self.spreadsheet_id,
+            'properties': {'title': self.title},
+            'sheets': [sheet.resource() for sheet in self.sheets]
+        }
+
+
+class _Request:
+    def __init__(self, emulator: 'SheetsEmulator', method: str, handler, kwargs: Dict[str, Any]):
+        self._emulator = emulator
+        self._method = method
+        self._handler = handler
+        self._kwargs = kwargs
+
+    def execute(self, **_execute_kwargs) -> Dict[str, Any]:
+        return self._emulator._call(self._method, self._handler, self._kwargs)
+
+
+class _Values:
+    def __init__(self, emulator: 'SheetsEmulator'):
+        self._emulator = emulator
+
+    def get(self, **kwargs):
+        return _Request(self._emulator, 'values.get', self._emulator._values_get, kwargs)
+
+    def update(self, **kwargs):
+        return _Request(self._emulator, 'values.update', self._emulator._values_update, kwargs)
+
+    def batchUpdate(self, **kwargs):
+        return _Request(self._emulator, 'values.batchUpdate', self._emulator._values_batch_update, kwargs)
+
+    def clear(self, **kwargs):
+        return _Request(self._emulator, 'values.clear', self._emulator._values_clear, kwargs)
+
+    def batchClear(self, **kwargs):
+        return _Request(self._emulator, 'values.batchClear', self._emulator._values_batch_clear, kwargs)
+
+
+class _Spreadsheets:
+    def __init__(self, emulator: 'SheetsEmulator'):
+        self._emulator = emulator
+
+    def create(self, **kwargs):
+        return _Request(self._emulator, 'spreadsheets.create', self._emulator._create, kwargs)
+
+    def get(self, **kwargs):
+        return _Request(self._emulator, 'spreadsheets.get', self._emulator._get, kwargs)
+
+    def batchUpdate(self, **kwargs):
+        return _Request(self._emulator, 'spreadsheets.batchUpdate', self._emulator._batch_update, kwargs)
+
+    def values(self):
+        return _Values(self._emulator)
+
+
+class SheetsEmulator:
+    """In-memory Sheets v4 service that records calls, payload sizes and quota use."""
+
+    def __init__(self, read_quota: int = 60, write_quota: int = 60, enforce_quota: bool = False):
+        """
+        Args:
+            read_quota / write_quota: Requests per minute, as on the real project
+            enforce_quota: Answer 429 when a call would exceed a quota in the
+                trailing minute (otherwise overruns are only counted)
+        """
+        self.read_quota = read_quota
+        self.write_quota = write_quota
+        self.enforce_quota = enforce_quota
+        self.spreadsheets_by_id = {}  # type: Dict[str, _Spreadsheet]
+        self.calls = []  # (method, request bytes, response bytes, monotonic time)
+        self._lock = threading.RLock()
+        self._next_id = 1
+
+    def spreadsheets(self) -> _Spreadsheets:
+        return _Spreadsheets(self)
+
+    # Inspection
+
+    def stats(self, since: int = 0) -> Dict[str, Any]:
+        """Calls per method, bytes each way and simulated quota usage (from call number `since`)."""
+        with self._lock:
+            calls = self.calls[since:]
+        reads = [t for method, _, _, t in calls if method in _READ_METHODS]
+        writes = [t for method, _, _, t in calls if method not in _READ_METHODS]
+        return {
+            'calls': len(calls),
+            'by_method': dict(Counter(method for method, _, _, _ in calls)),
+            'reads': len(reads),
+            'writes': len(writes),
+            'bytes_sent': sum(sent for _, sent, _, _ in calls),
+            'bytes_received': sum(received for _, _, received, _ in calls),
+            'peak_reads_per_minute': self._peak(reads),
+            'peak_writes_per_minute': self._peak(writes),
+            # Minutes the same calls need at minimum when paced to the quotas
+            'quota_minutes': round(max(len(reads) / self.read_quota if self.read_quota else 0,
+                                       len(writes) / self.write_quota if self.write_quota else 0), 3)
+        }
+
+    def reset_stats(self):
+        with self._lock:
+            self.calls = []
+
+    def tab_values(self, spreadsheet_id: str, title: str) -> List[List[Any]]:
+        """Current values of a tab (for assertions)."""
+        sheet = self._spreadsheet(spreadsheet_id).by_title(title)
+        return sheet.values() if sheet else []
+
+    def tab(self, spreadsheet_id: str, title: str) -> Optional[Dict[str, Any]]:
+        """Sheet resource of a tab, including its conditional formats."""
+        sheet = self._spreadsheet(spreadsheet_id).by_title(title)
+        return sheet.resource() if sheet else None
+
+    @staticmethod
+    def _peak(times: List[float]) -> int:
+        peak, start = 0, 0
+        for end in range(len(times)):
+            while times[end] - times[start] >= QUOTA_WINDOW_SECONDS:
+                start += 1
+            peak = max(peak, end - start + 1)
+        return peak
+
+    # Dispatch
+
+    def _call(self, method: str, handler, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            now = time.monotonic()
+            if self.enforce_quota:
+                quota = self.read_quota if method in _READ_METHODS else self.write_quota
+                recent = sum(1 for m, _, _, t in self.calls
+                             if (m in _READ_METHODS) == (method in _READ_METHODS) and now - t < QUOTA_WINDOW_SECONDS)
+                if quota and recent >= quota:
+                    raise _http_error(429, "Quota exceeded for quota metric 'Write requests' (emulated)")
+            response = handler(**kwargs)
+            self.calls.append((method, _size(kwargs.get('body')), _size(response), now))
+            return response
+
+    def _spreadsheet(self, spreadsheet_id: str) -> _Spreadsheet:
+        spreadsheet = self.spreadsheets_by_id.get(spreadsheet_id)
+        if spreadsheet is None:
+            raise _http_error(404, f"Requested entity was not found: {spreadsheet_id}")
+        return spreadsheet
+
+    def _sheet_for_range(self, spreadsheet_id: str, a1: str):
+        title, start, end = parse_a1(a1)
+        sheet = self._spreadsheet(spreadsheet_id).by_title(title)
+        if sheet is None:
+            raise _http_error(400, f"Unable to parse range: {a1}")
+        return sheet, start, end
+
+    # spreadsheets()
+
+    def _create(self, body: Optional[Dict[str, Any]] = None, **_):
+        body = body or {}
+        spreadsheet_id = f"emulated-{self._next_id:04d}"
+        self._next_id += 1
+        spreadsheet = _Spreadsheet(spreadsheet_id, body.get('properties', {}).get('title', 'Untitled spreadsheet'))
+        for sheet in body.get('sheets') or [{'properties': {'title': 'Sheet1'}}]:
+            properties = sheet.get('properties', {})
+            grid = properties.get('gridProperties', {})
+            spreadsheet.add_sheet(properties.get('title'), properties.get('sheetId'),
+                                  grid.get('rowCount', DEFAULT_ROWS), grid.get('columnCount', DEFAULT_COLUMNS))
+        self.spreadsheets_by_id[spreadsheet_id] = spreadsheet
+        return spreadsheet.resource()
+
+    def _get(self, spreadsheetId: str, **_):
+        # Field masks are accepted but the full resource is returned
+        return self._spreadsheet(spreadsheetId).resource()
+
+    def _batch_update(self, spreadsheetId: str, body: Dict[str, Any], **_):
+        spreadsheet = self._spreadsheet(spreadsheetId)
+        replies = []
+        for request in body.get('requests', []):
+            (kind, params), = request.items()
+            reply = {}
+            if kind == 'addSheet':
+                properties = params.get('properties', {})
+                grid = properties.get('gridProperties', {})
+                sheet = spreadsheet.add_sheet(properties.get('title'), properties.get('sheetId'),
+                                              grid.get('rowCount', DEFAULT_ROWS),
+                                              grid.get('columnCount', DEFAULT_COLUMNS))
+                reply = {'addSheet': {'properties': sheet.resource()['properties']}}
+            elif kind == 'deleteSheet':
+                spreadsheet.sheets.remove(spreadsheet.by_id(params['sheetId']))
+            elif kind == 'updateSheetProperties':
+                properties = params.get('properties', {})
+                sheet = spreadsheet.by_id(properties.get('sheetId'))
+                grid = properties.get('gridProperties', {})
+                sheet.rows = grid.get('rowCount', sheet.rows)
+                sheet.columns = grid.get('columnCount', sheet.columns)
+                sheet.frozen = (grid.get('frozenRowCount', sheet.frozen[0]),
+                                grid.get('frozenColumnCount', sheet.frozen[1]))
+                if 'title' in properties:
+                    sheet.title = properties['title']
+            elif kind == 'addConditionalFormatRule':
+                rule = params.get('rule', {})
+                ranges = rule.get('ranges') or [{}]
+                sheet = spreadsheet.by_id(ranges[0].get('sheetId'))
+                index = params.get('index', len(sheet.conditional_formats))
+                sheet.conditional_formats.insert(min(index, len(sheet.conditional_formats)), rule)
+            elif kind == 'deleteConditionalFormatRule':
+                sheet = spreadsheet.by_id(params.get('sheetId'))
+                index = params.get('index', 0)
+                if index >= len(sheet.conditional_formats):
+                    raise _http_error(400, f"Invalid index {index} for conditional format rules of sheet {sheet.sheet_id}")
+                sheet.conditional_formats.pop(index)
+            else:
+                # Formatting requests (repeatCell, updateBorders, autoResizeDimensions, ...) only need a valid sheet
+                sheet_id = self._find_sheet_id(params)
+                if sheet_id is not None:
+                    spreadsheet.by_id(sheet_id)
+            replies.append(reply)
+        return {'spreadsheetId': spreadsheetId, 'replies': replies}
+
+    @staticmethod
+    def _find_sheet_id(params: Any) -> Optional[int]:
+        if isinstance(params, dict):
+            if 'sheetId' in params:
+                return params['sheetId']
+            for value in params.values():
+                found = SheetsEmulator._find_sheet_id(value)
+                if found is not None:
+                    return found
+        elif isinstance(params, list):
+            for value in params:
+                found = SheetsEmulator._find_sheet_id(value)
+                if found is not None:
+                    return found
+        return None
+
+    # values()
+
+    def _write(self, spreadsheet_id: str, a1: str, values: List[List[Any]]) -> Dict[str, Any]:
+        sheet, start, _ = self._sheet_for_range(spreadsheet_id, a1)
+        top, left = start or (0, 0)
+        height = len(values)
+        width = max((len(row) for row in values), default=0)
+        if top + height > sheet.rows or left + width > sheet.columns:
+            raise _http_error(400, f"Range ({a1}) exceeds grid limits. Max rows: {sheet.rows}, max columns: {sheet.columns}")
+        for r, row in enumerate(values):
+            for c, value in enumerate(row):
+                if value is None:
+                    continue
+                if value == '':
+                    sheet.cells.pop((top + r, left + c), None)
+                else:
+                    sheet.cells[(top + r, left + c)] = value
+        return {'spreadsheetId': spreadsheet_id, 'updatedRange': a1, 'updatedRows': height,
+                'updatedColumns': width, 'updatedCells': sum(len(row) for row in values)}
+
+    def _clear(self, spreadsheet_id: str, a1: str):
+        sheet, start, end = self._sheet_for_range(spreadsheet_id, a1)
+        if start is None:
+            sheet.cells.clear()
+            return
+        top, left = start
+        bottom = end[0] if end and end[0] is not None else (top if end is None else sheet.rows - 1)
+        right = end[1] if end and end[1] is not None else (left if end is None else sheet.columns - 1)
+        for cell in [cell for cell in sheet.cells if top <= cell[0] <= bottom and left <= cell[1] <= right]:
+            del sheet.cells[cell]
+
+    def _values_get(self, spreadsheetId: str, range: str, **_):
+        sheet, start, end = self._sheet_for_range(spreadsheetId, range)
+        if start is not None and end is None:
+            end = start
+        return {'range': range, 'majorDimension': 'ROWS', 'values': sheet.values(start, end)}
+
+    def _values_update(self, spreadsheetId: str, range: str, body: Dict[str, Any], **_):
+        return self._write(spreadsheetId, range, body.get('values', []))
+
+    def _values_batch_update(self, spreadsheetId: str, body: Dict[str, Any], **_):
+        responses = [self._write(spreadsheetId, item['range'], item.get('values', []))
+                     for item in body.get('data', [])]
+        return {'spreadsheetId': spreadsheetId, 'totalUpdatedCells': sum(r['updatedCells'] for r in responses),
+                'responses': responses}
+
+    def _values_clear(self, spreadsheetId: str, range: str, **_):
+        self._clear(spreadsheetId, range)
+        return {'spreadsheetId': spreadsheetId, 'clearedRange': range}
+
+    def _values_batch_clear(self, spreadsheetId: str, body: Dict[str, Any], **_):
+        for a1 in body.get('ranges', []):
+            self._clear(spreadsheetId, a1)
+        return {'spreadsheetId': spreadsheetId, 'clearedRanges': body.get('ranges', [])}
+
+
+_emulator = None
+_emulator_lock = threading.Lock()
+
+
+def get_emulator() -> SheetsEmulator:
+    """The process-wide emulator served by google_auth when ISM_SHEETS_EMULATOR is set."""
+    global _emulator
+    with _emulator_lock:
+        if _emulator is None:
+            _emulator = SheetsEmulator()
+        return _emulator
+
+
+def reset_emulator(**kwargs) -> SheetsEmulator:
+    """Replace the process-wide emulator with a fresh one."""
+    global _emulator
+    with _emulator_lock:
+        _emulator = SheetsEmulator(**kwargs)
+        return _emulator
@@ -0,0 +1,204 @@
+"""
+Locally persisted Google Sheets metadata.
+
+The formatter needs three things from spreadsheet metadata: which spreadsheet
+belongs to a report type (by title), the sheetId of each tab and each tab's
+grid size. SheetsMetadataCache keeps them in a JSON file under
+<DB_DIR>/cache, fills them from at most one spreadsheets.get per instance and
+updates them from the replies of the calls that change them (create,
+addSheet, grid growth), so a formatter run normally needs no metadata GET.
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+from typing import Any, Dict, Iterable, Optional
+
+from db_utils import DB_DIR
+
+logger = logging.getLogger(__name__)
+
+# Bump when the stored layout changes so old files are ignored
+METADATA_FORMAT_VERSION = 1
+
+SHEETS_METADATA_PATH = os.environ.get(
+    'ISM_SHEETS_METADATA_PATH',
+    os.path.join(DB_DIR, 'cache', f'sheets_metadata.v{METADATA_FORMAT_VERSION}.json')
+)  # Spreadsheet/tab metadata file ('' keeps it in memory only)
+SHEETS_METADATA_TTL = float(os.environ.get('ISM_SHEETS_METADATA_TTL', 24 * 3600))  # Seconds before tab metadata is fetched again
+
+# Only what the cache stores; conditional format ranges are fetched to count existing rules
+METADATA_FIELDS = ('spreadsheetId,properties.title,'
+                   'sheets(properties(sheetId,title,gridProperties(rowCount,columnCount)),'
+                   'conditionalFormats(ranges(sheetId)))')
+
+DEFAULT_TAB_TITLE = 'Sheet1'
+
+
+def _tab_entry(sheet: Dict[str, Any]) -> Dict[str, Any]:
+    properties = sheet.get('properties', {})
+    grid = properties.get('gridProperties', {})
+    return {
+        'sheet_id': properties.get('sheetId'),
+        'rows': grid.get('rowCount', 1000),
+        'columns': grid.get('columnCount', 26),
+        'rule_count': len(sheet.get('conditionalFormats', []))
+    }
+
+
+class SheetsMetadataCache:
+    """Spreadsheet ids by title and tab metadata by spreadsheet, persisted as JSON."""
+
+    def __init__(self, path: Optional[str] = None, ttl: Optional[float] = None):
+        """
+        Args:
+            path: JSON file holding the metadata (None for ISM_SHEETS_METADATA_PATH, '' for memory only)
+            ttl: Seconds after which cached tab metadata is fetched again (None for ISM_SHEETS_METADATA_TTL)
+        """
+        self.path = SHEETS_METADATA_PATH if path is None else path
+        self.ttl = SHEETS_METADATA_TTL if ttl is None else ttl
+        self.gets = 0  # metadata GETs made by this instance
+        self._fetched = set()  # spreadsheets fetched by this instance
+        self._lock = threading.RLock()
+        self._data = self._load()
+
+    # Spreadsheets
+
+    def get_spreadsheet_id(self, title: str) -> Optional[str]:
+        return self._data['spreadsheets'].get(title)
+
+    def set_spreadsheet_id(self, title: str, spreadsheet_id: str):
+        with self._lock:
+            self._data['spreadsheets'][title] = spreadsheet_id
+            self._save()
+
+    def spreadsheet_title(self, spreadsheet_id: str) -> Optional[str]:
+        """Title of a spreadsheet whose tabs are cached."""
+        return self._data['tabs'].get(spreadsheet_id, {}).get('title')
+
+    def forget_spreadsheet(self, title: str):
+        """Drop a spreadsheet (e.g. deleted remotely) and its tabs."""
+        with self._lock:
+            spreadsheet_id = self._data['spreadsheets'].pop(title, None)
+            self._data['tabs'].pop(spreadsheet_id, None)
+            self._save()
+
+    # Tabs
+
+    def tabs(self, service, spreadsheet_id: str, refresh: bool = False) -> Dict[str, Dict[str, Any]]:
+        """
+        Tab title -> {'sheet_id', 'rows', 'columns', 'rule_count'}.
+
+        Fetched with one spreadsheets.get when missing, older than the TTL or
+        when refresh is requested; never more than once per instance.
+        """
+        with self._lock:
+            cached = self._data['tabs'].get(spreadsheet_id)
+            stale = cached is None or refresh or time.time() - cached.get('fetched_at', 0) > self.ttl
+            if stale and spreadsheet_id not in self._fetched:
+                metadata = service.spreadsheets().get(spreadsheetId=spreadsheet_id, fields=METADATA_FIELDS).execute()
+                self.gets += 1
+                self.record(metadata, spreadsheet_id)
+                cached = self._data['tabs'][spreadsheet_id]
+            return dict(cached['sheets']) if cached else {}
+
+    def sheet_ids(self, service, spreadsheet_id: str) -> Dict[str, int]:
+        """Tab title -> sheetId."""
+        return {title: tab['sheet_id'] for title, tab in self.tabs(service, spreadsheet_id).items()}
+
+    def record(self, spreadsheet: Dict[str, Any], spreadsheet_id: Optional[str] = None):
+        """Store the tabs of a spreadsheet resource (a get or create response)."""
+        spreadsheet_id = spreadsheet_id or spreadsheet.get('spreadsheetId')
+        with self._lock:
+            self._data['tabs'][spreadsheet_id] = {
+                'title': spreadsheet.get('properties', {}).get('title'),
+                'fetched_at': time.time(),
+                'sheets': {sheet.get('properties', {}).get('title'): _tab_entry(sheet)
+                           for sheet in spreadsheet.get('sheets', [])}
+            }
+            self._fetched.add(spreadsheet_id)
+            self._save()
+
+    def record_replies(self, spreadsheet_id: str, requests: Iterable[Dict[str, Any]], response: Dict[str, Any]):
+        """Apply a batchUpdate's addSheet replies and deleteSheet requests to the cache."""
+        with self._lock:
+            cached = self._data['tabs'].setdefault(spreadsheet_id, {'fetched_at': time.time(), 'sheets': {}})
+            for request in requests:
+                deleted = request.get('deleteSheet', {}).get('sheetId')
+                if deleted is not None:
+                    cached['sheets'] = {title: tab for title, tab in cached['sheets'].items()
+                                        if tab['sheet_id'] != deleted}
+            for reply in response.get('replies', []):
+                if 'addSheet' in reply:
+                    sheet = reply['addSheet']
+                    cached['sheets'][sheet.get('properties', {}).get('title')] = _tab_entry(sheet)
+            self._save()
+
+    def ensure_tabs(self, service, spreadsheet_id: str, titles: Iterable[str]) -> Dict[str, int]:
+        """
+        Create the missing tabs in one batchUpdate (removing the default
+        'Sheet1' at the same time) and return the updated title -> sheetId map.
+        """
+        titles = list(titles)
+        tabs = self.tabs(service, spreadsheet_id)
+        missing = [title for title in titles if title not in tabs]
+        if missing:
+            requests = [{'addSheet': {'properties': {'title': title}}} for title in missing]
+            default_tab = tabs.get(DEFAULT_TAB_TITLE)
+            if default_tab is not None and DEFAULT_TAB_TITLE not in titles:
+                requests.append({'deleteSheet': {'sheetId': default_tab['sheet_id']}})
+            response = service.spreadsheets().batchUpdate(
+                spreadsheetId=spreadsheet_id,
+                body={'requests': requests}
+            ).execute()
+            self.record_replies(spreadsheet_id, requests, response)
+            logger.info(f"Created tabs {missing} in spreadsheet {spreadsheet_id}")
+        return self.sheet_ids(service, spreadsheet_id)
+
+    def set_grid(self, spreadsheet_id: str, title: str, rows: int, columns: int):
+        """Record a tab's grid size after it was resized."""
+        with self._lock:
+            tab = self._data['tabs'].get(spreadsheet_id, {}).get('sheets', {}).get(title)
+            if tab is not None and (tab['rows'], tab['columns']) != (rows, columns):
+                tab['rows'], tab['columns'] = rows, columns
+                self._save()
+
+    def invalidate(self, spreadsheet_id: str):
+        """Forget a spreadsheet's tabs so the next lookup fetches them again."""
+        with self._lock:
+            self._data['tabs'].pop(spreadsheet_id, None)
+            self._fetched.discard(spreadsheet_id)
+            self._save()
+
+    # Persistence
+
+    def _load(self) -> Dict[str, Any]:
+        empty = {'spreadsheets': {}, 'tabs': {}}
+        if not self.path or not os.path.exists(self.path):
+            return empty
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if isinstance(data.get('spreadsheets'), dict) and isinstance(data.get('tabs'), dict):
+                return data
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable Sheets metadata {self.path}: {str(e)}")
+        return empty
+
+    def _save(self):
+        if not self.path:
+            return
+        tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._data, f)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.warning(f"Could not write Sheets metadata {self.path}: {str(e)}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
@@ -0,0 +1,354 @@
+"""
+Diff-based synchronization of formatter tabs to Google Sheets.
+
+GoogleSheetsFormatterTool builds each tab (heatmap, alphabetical growth,
+numerical growth) as a full grid of values plus its formatting requests.
+Instead of rewriting every tab on every processed PDF, SheetsSyncEngine
+compares each grid cell by cell with the last state it pushed (stored locally
+per spreadsheet) and sends only the changed ranges in one values.batchUpdate,
+followed by one spreadsheets.batchUpdate carrying the formatting of the tabs
+that actually changed.
+"""
+
+import os
+import json
+import logging
+import threading
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from db_utils import DB_DIR
+from sheets_metadata import SheetsMetadataCache
+
+logger = logging.getLogger(__name__)
+
+# Bump when the stored state layout changes so old state files are ignored
+STATE_FORMAT_VERSION = 1
+
+SHEETS_SYNC_DIR = os.environ.get('ISM_SHEETS_SYNC_DIR', os.path.join(DB_DIR, 'cache', 'sheets_sync'))  # Last pushed tab state ('' keeps it in memory only)
+SHEETS_GRID_HEADROOM = int(os.environ.get('ISM_SHEETS_GRID_HEADROOM', 24))  # Spare rows/columns added when a tab grid must grow
+
+# Unchanged cells between two changed ones that are still sent in the same range
+_MAX_GAP = 2
+
+_SHEETS_EPOCH = date(1899, 12, 30)
+
+
+def sheets_date_serial(value) -> int:
+    """Google Sheets serial number for a date (shown as a date by a DATE number format)."""
+    if isinstance(value, datetime):
+        value = value.date()
+    return (value - _SHEETS_EPOCH).days
+
+
+def column_letter(column_index: int) -> str:
+    """Convert a 0-based column index to A1 letters (0 -> A, 26 -> AA)."""
+    letters = ''
+    column_index += 1
+    while column_index:
+        column_index, remainder = divmod(column_index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+def a1_range(tab_name: str, start_row: int, start_col: int, end_row: int, end_col: int) -> str:
+    """A1 range for 0-based, end-exclusive row/column bounds on a tab."""
+    quoted = tab_name.replace("'", "''")
+    return (f"'{quoted}'!{column_letter(start_col)}{start_row + 1}:"
+            f"{column_letter(end_col - 1)}{end_row}")
+
+
+def _cell(rows: List[List[Any]], r: int, c: int) -> Any:
+    if r < len(rows) and c < len(rows[r]):
+        value = rows[r][c]
+        return '' if value is None else value
+    return ''
+
+
+def diff_grid(old_rows: List[List[Any]], new_rows: List[List[Any]]) -> List[Tuple[int, int, int, int]]:
+    """
+    Rectangles (start_row, start_col, end_row, end_col; end-exclusive) covering
+    every cell that differs between two grids. Cells missing from the new grid
+    count as '' so that shrinking a tab clears what it used to show.
+    """
+    spans_by_row = []
+    for r in range(max(len(old_rows), len(new_rows))):
+        width = max(len(old_rows[r]) if r < len(old_rows) else 0,
+                    len(new_rows[r]) if r < len(new_rows) else 0)
+        spans = []
+        for c in range(width):
+            if _cell(old_rows, r, c) == _cell(new_rows, r, c):
+                continue
+            if spans and c - spans[-1][1] <= _MAX_GAP:
+                spans[-1][1] = c + 1
+            else:
+                spans.append([c, c + 1])
+        spans_by_row.append([tuple(span) for span in spans])
+
+    # Merge identical column spans on consecutive rows into one rectangle
+    rectangles = []
+    open_rects = {}  # (start_col, end_col) -> [start_row, end_row]
+    for r, spans in enumerate(spans_by_row):
+        next_open = {}
+        for span in spans:
+            rect = open_rects.pop(span, None)
+            if rect is not None and rect[1] == r:
+                rect[1] = r + 1
+            else:
+                if rect is not None:
+                    rectangles.append((rect[0], span[0], rect[1], span[1]))
+                rect = [r, r + 1]
+            next_open[span] = rect
+        for span, rect in open_rects.items():
+            rectangles.append((rect[0], span[0], rect[1], span[1]))
+        open_rects = next_open
+    for span, rect in open_rects.items():
+        rectangles.append((rect[0], span[0], rect[1], span[1]))
+    return sorted(rectangles)
+
+
+def _payload_size(body: Any) -> int:
+    return len(json.dumps(body, separators=(',', ':'), default=str).encode('utf-8'))
+
+
+def _sequence_rule_indices(requests: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Renumber addConditionalFormatRule indices 0..n-1 per sheet, keeping their order."""
+    counters = {}
+    sequenced = []
+    for request in requests:
+        rule = request.get('addConditionalFormatRule')
+        if rule is None:
+            sequenced.append(request)
+            continue
+        ranges = rule.get('rule', {}).get('ranges') or [{}]
+        sheet_id = ranges[0].get('sheetId')
+        index = counters.get(sheet_id, 0)
+        counters[sheet_id] = index + 1
+        sequenced.append({'addConditionalFormatRule': dict(rule, index=index)})
+    return sequenced
+
+
+class SheetsSyncEngine:
+    """Stages full tab grids and pushes only what changed since the last sync."""
+
+    def __init__(self, service, spreadsheet_id: str, state_dir: Optional[str] = None,
+                 metadata=None):
+        """
+        Args:
+            service: Google Sheets API service (googleapiclient resource)
+            spreadsheet_id: Spreadsheet to synchronize
+            state_dir: Directory holding the last pushed state per spreadsheet
+                (None for ISM_SHEETS_SYNC_DIR; '' keeps no state, so every push is a full write)
+            metadata: SheetsMetadataCache supplying (and receiving) tab grid sizes
+                and rule counts; by default an in-memory one that fetches them once
+        """
+        self.service = service
+        self.spreadsheet_id = spreadsheet_id
+        self.state_dir = SHEETS_SYNC_DIR if state_dir is None else state_dir
+        self.metadata = metadata if metadata is not None else SheetsMetadataCache(path='')
+        self._state = self._load_state()
+        self._staged = {}  # tab name -> staged tab
+        self._remote = None  # tab title -> properties, looked up only when no state exists
+
+    def stage(self, tab_name: str, sheet_id: int, rows: List[List[Any]],
+              formatting: Optional[List[Dict[str, Any]]] = None, force: bool = False):
+        """
+        Queue the desired contents of a tab.
+
+        Args:
+            tab_name: Tab title
+            sheet_id: Numeric sheetId of the tab
+            rows: Full grid of values (RAW input: numbers, strings, date serials)
+            formatting: spreadsheets.batchUpdate requests that format the tab
+            force: Ignore the stored state and rewrite the whole tab
+        """
+        self._staged[tab_name] = {
+            'sheet_id': sheet_id,
+            'rows': [list(row) for row in rows],
+            'formatting': _sequence_rule_indices(formatting or []),
+            'force': force
+        }
+
+    def push(self) -> Dict[str, Any]:
+        """
+        Send the changes for every staged tab.
+
+        Returns:
+            Sync statistics: cells and ranges sent, API requests and payload
+            bytes actually used versus a full rewrite of the staged tabs
+        """
+        stats = {'tabs': len(self._staged), 'tabs_changed': 0, 'cells_changed': 0, 'ranges': 0,
+                 'requests': 0, 'bytes_sent': 0, 'requests_full': 0, 'bytes_full': 0}
+        if not self._staged:
+            return self._finish_stats(stats)
+
+        tabs_state = self._state.setdefault('tabs', {})
+        value_data, format_requests, grid_requests, clear_ranges = [], [], [], []
+        new_state = {}
+
+        for tab_name, staged in self._staged.items():
+            rows, formatting, sheet_id = staged['rows'], staged['formatting'], staged['sheet_id']
+            stored = tabs_state.get(tab_name)
+            if stored and stored.get('sheet_id') != sheet_id:
+                stored = None
+            previous = None if staged['force'] else stored
+
+            # What a full rewrite of this tab would have cost
+            stats['requests_full'] += 1 + (1 if formatting else 0)
+            stats['bytes_full'] += _payload_size({'range': f"'{tab_name}'!A1", 'values': rows})
+            if formatting:
+                stats['bytes_full'] += _payload_size({'requests': formatting})
+
+            old_rows = previous['rows'] if previous else []
+            rectangles = diff_grid(old_rows, rows)
+            for top, left, bottom, right in rectangles:
+                block = [[_cell(rows, r, c) for c in range(left, right)] for r in range(top, bottom)]
+                value_data.append({'range': a1_range(tab_name, top, left, bottom, right), 'values': block})
+                stats['cells_changed'] += (bottom - top) * (right - left)
+            stats['ranges'] += len(rectangles)
+
+            if previous is None:
+                # First sync of this tab: drop whatever an earlier full rewrite left behind
+                clear_ranges.append(f"'{tab_name.replace(chr(39), chr(39) * 2)}'")
+
+            format_digest = json.dumps(formatting, sort_keys=True, default=str)
+            formatting_changed = previous is None or previous.get('format_digest') != format_digest
+            if rectangles or formatting_changed:
+                stats['tabs_changed'] += 1
+                # Conditional format rules accumulate, so remove the ones we added last time
+                stale_rules = stored.get('rule_count', 0) if stored else self._remote_rule_count(sheet_id)
+                format_requests.extend({'deleteConditionalFormatRule': {'sheetId': sheet_id, 'index': 0}}
+                                       for _ in range(stale_rules))
+                format_requests.extend(formatting)
+
+            grid, growth = self._grid_growth(tab_name, sheet_id, rows, previous)
+            grid_requests.extend(growth)
+            new_state[tab_name] = {
+                'sheet_id': sheet_id,
+                'rows': rows,
+                'format_digest': format_digest,
+                'rule_count': sum(1 for request in formatting if 'addConditionalFormatRule' in request),
+                'grid': grid
+            }
+
+        spreadsheets = self.service.spreadsheets()
+        if grid_requests:
+            body = {'requests': grid_requests}
+            spreadsheets.batchUpdate(spreadsheetId=self.spreadsheet_id, body=body).execute()
+            self._count(stats, body)
+            for tab_name, tab_state in new_state.items():
+                self.metadata.set_grid(self.spreadsheet_id, tab_name, tab_state['grid']['rows'],
+                                       tab_state['grid']['columns'])
+        if clear_ranges:
+            body = {'ranges': clear_ranges}
+            spreadsheets.values().batchClear(spreadsheetId=self.spreadsheet_id, body=body).execute()
+            self._count(stats, body)
+        if value_data:
+            body = {'valueInputOption': 'RAW', 'data': value_data}
+            spreadsheets.values().batchUpdate(spreadsheetId=self.spreadsheet_id, body=body).execute()
+            self._count(stats, body)
+        if format_requests:
+            body = {'requests': format_requests}
+            spreadsheets.batchUpdate(spreadsheetId=self.spreadsheet_id, body=body).execute()
+            self._count(stats, body)
+
+        tabs_state.update(new_state)
+        self._staged = {}
+        self._save_state()
+        stats = self._finish_stats(stats)
+        logger.info(f"Sheets sync for {self.spreadsheet_id}: {stats['cells_changed']} cells in "
+                    f"{stats['ranges']} ranges, {stats['requests']} requests / {stats['bytes_sent']} bytes "
+                    f"(saved {stats['requests_saved']} requests / {stats['bytes_saved']} bytes)")
+        return stats
+
+    def forget(self, tab_name: Optional[str] = None):
+        """Drop the stored state for one tab (or all tabs) so the next push rewrites it."""
+        if tab_name is None:
+            self._state['tabs'] = {}
+        else:
+            self._state.setdefault('tabs', {}).pop(tab_name, None)
+        self._save_state()
+
+    @staticmethod
+    def _count(stats: Dict[str, Any], body: Dict[str, Any]):
+        stats['requests'] += 1
+        stats['bytes_sent'] += _payload_size(body)
+
+    @staticmethod
+    def _finish_stats(stats: Dict[str, Any]) -> Dict[str, Any]:
+        stats['requests_saved'] = max(0, stats['requests_full'] - stats['requests'])
+        stats['bytes_saved'] = max(0, stats['bytes_full'] - stats['bytes_sent'])
+        return stats
+
+    def _grid_growth(self, tab_name: str, sheet_id: int, rows: List[List[Any]],
+                     previous: Optional[Dict[str, Any]]) -> Tuple[Dict[str, int], List[Dict[str, Any]]]:
+        """
+        Grid size the tab will have after this push, plus the updateSheetProperties
+        request needed to get there (values outside the grid are rejected by the API).
+        """
+        current = (previous or {}).get('grid') or self._remote_grid(tab_name)
+        needed_rows = len(rows)
+        needed_cols = max((len(row) for row in rows), default=0)
+        target = {
+            'rows': current['rows'] if needed_rows <= current['rows'] else needed_rows + SHEETS_GRID_HEADROOM,
+            'columns': current['columns'] if needed_cols <= current['columns'] else needed_cols + SHEETS_GRID_HEADROOM
+        }
+        if target == current:
+            return target, []
+        return target, [{
+            'updateSheetProperties': {
+                'properties': {
+                    'sheetId': sheet_id,
+                    'gridProperties': {'rowCount': target['rows'], 'columnCount': target['columns']}
+                },
+                'fields': 'gridProperties.rowCount,gridProperties.columnCount'
+            }
+        }]
+
+    def _remote_sheets(self) -> Dict[str, Dict[str, Any]]:
+        """Tab properties and conditional format counts, looked up at most once per engine."""
+        if self._remote is None:
+            self._remote = self.metadata.tabs(self.service, self.spreadsheet_id)
+        return self._remote
+
+    def _remote_grid(self, tab_name: str) -> Dict[str, int]:
+        sheet = self._remote_sheets().get(tab_name, {})
+        return {'rows': sheet.get('rows', 1000), 'columns': sheet.get('columns', 26)}
+
+    def _remote_rule_count(self, sheet_id: int) -> int:
+        return next((sheet['rule_count'] for sheet in self._remote_sheets().values()
+                     if sheet['sheet_id'] == sheet_id), 0)
+
+    def _state_path(self) -> Optional[str]:
+        if not self.state_dir:
+            return None
+        return os.path.join(self.state_dir, f"{self.spreadsheet_id}.v{STATE_FORMAT_VERSION}.json")
+
+    def _load_state(self) -> Dict[str, Any]:
+        path = self._state_path()
+        if not path or not os.path.exists(path):
+            return {'tabs': {}}
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            return state if isinstance(state.get('tabs'), dict) else {'tabs': {}}
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable Sheets sync state {path}: {str(e)}")
+            return {'tabs': {}}
+
+    def _save_state(self):
+        path = self._state_path()
+        if not path:
+            return
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.state_dir, exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._state, f, default=str)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"Could not write Sheets sync state {path}: {str(e)}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
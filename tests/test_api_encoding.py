@@ -0,0 +1,92 @@
+import unittest
+import gzip
+import json
+from unittest import mock
+
+from flask import Flask, jsonify
+
+import api_encoding
+from api_encoding import dumps, records_to_columns, to_columnar_heatmap, to_columnar_industry_status
+
+HEATMAP = [
+    {'report_date': '2025-02-01', 'month_year': 'February 2025', 'report_type': 'Services',
+     'indices': {'Services PMI': {'value': 53.5, 'direction': 'Growing'},
+                 'Prices': {'value': 62.6, 'direction': 'Increasing'}}},
+    {'report_date': '2025-01-01', 'month_year': 'January 2025', 'report_type': 'Services',
+     'indices': {'Services PMI': {'value': 52.8, 'direction': 'Growing'}}},
+]
+
+class TestApiEncoding(unittest.TestCase):
+    """Test fast serialization, columnar shapes and response compression."""
+
+    def test_dumps_matches_json(self):
+        """Test that the fast serializer produces the same JSON document as the json module."""
+        self.assertEqual(json.loads(dumps(HEATMAP)), HEATMAP)
+        self.assertEqual(dumps({'b': 1, 'a': 'é'}), '{"a":"é","b":1}'.encode('utf-8'))
+
+    def test_dumps_orders_integer_keys_like_json(self):
+        """Test that integer-keyed dicts (lagged correlations) keep json's numeric key order."""
+        payload = {'lagged_correlations': {lag: lag / 10 for lag in (10, 2, -1, 0, -12, 1)}}
+        expected = json.dumps(payload, sort_keys=True, separators=(',', ':')).encode('utf-8')
+        self.assertEqual(dumps(payload), expected)
+        self.assertTrue(dumps(payload).startswith(b'{"lagged_correlations":{"-12":'))
+
+    def test_columnar_shapes(self):
+        """Test that columnar payloads hold one array per field aligned with the dates."""
+        heatmap = to_columnar_heatmap(HEATMAP)
+        self.assertEqual(heatmap['report_dates'], ['2025-02-01', '2025-01-01'])
+        self.assertEqual(heatmap['indices']['Prices'], {'values': [62.6, None], 'directions': ['Increasing', None]})
+
+        status = to_columnar_industry_status({
+            'dates': ['February 2025', 'January 2025'],
+            'industries': {'Mining': {'January 2025': {'status': 'Growing', 'category': 'Growing', 'rank': 2}}},
+            'ranks': {'Mining': 2}, 'report_type': 'Services'})
+        self.assertEqual(status['industries']['Mining']['status'], [None, 'Growing'])
+        self.assertEqual(status['ranks'], {'Mining': 2})
+
+        self.assertEqual(records_to_columns([{'a': 1, 'b': 2}, {'a': 3, 'b': 4}]),
+                         {'format': 'columnar', 'a': [1, 3], 'b': [2, 4]})
+
+    def test_gzip_negotiation(self):
+        """Test that large JSON responses are gzipped only for clients that accept it."""
+        app = Flask(__name__)
+        api_encoding.init_app(app)
+        payload = {'rows': HEATMAP * 50}
+
+        @app.route('/data')
+        def data():
+            return jsonify(payload)
+
+        client = app.test_client()
+        plain = client.get('/data')
+        self.assertNotIn('Content-Encoding', plain.headers)
+        self.assertIn('Accept-Encoding', plain.headers['Vary'])
+
+        compressed = client.get('/data', headers={'Accept-Encoding': 'gzip, deflate'})
+        self.assertEqual(compressed.headers['Content-Encoding'], 'gzip')
+        self.assertLess(len(compressed.data), len(plain.data))
+        self.assertEqual(json.loads(gzip.decompress(compressed.data)), payload)
+
+    def test_not_modified_varies_on_encoding(self):
+        """Test that 304 responses carry the same Vary header as the compressed 200s."""
+        from http_cache import conditional_json
+
+        app = Flask(__name__)
+        api_encoding.init_app(app)
+
+        @app.route('/data')
+        @conditional_json
+        def data():
+            return jsonify({'rows': HEATMAP * 50})
+
+        client = app.test_client()
+        # A fixed data generation keeps the ETag off the real database
+        with mock.patch('http_cache.peek_data_generation', return_value=1):
+            first = client.get('/data', headers={'Accept-Encoding': 'gzip'})
+            revalidated = client.get('/data', headers={'Accept-Encoding': 'gzip',
+                                                       'If-None-Match': first.headers['ETag']})
+        self.assertEqual(revalidated.status_code, 304)
+        self.assertIn('Accept-Encoding', revalidated.headers['Vary'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+from unittest import mock
+
+from cache_utils import GenerationalCache
+
+class TestGenerationalCache(unittest.TestCase):
+    """Test the bounded, generation-versioned cache."""
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted when full."""
+        cache = GenerationalCache(max_entries=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        self.assertEqual(cache.get('a'), 1)
+        cache.set('c', 3)
+
+        self.assertNotIn('b', cache)
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.stats['evictions'], 1)
+        self.assertEqual(len(cache), 2)
+
+    def test_generation_and_ttl(self):
+        """Test that entries from an older generation or past their TTL are misses."""
+        cache = GenerationalCache(max_entries=4, ttl=60)
+        cache.set('a', 1, generation=1)
+        self.assertEqual(cache.get('a', generation=1), 1)
+        self.assertIsNone(cache.get('a', generation=2))
+        self.assertNotIn('a', cache)
+
+        with mock.patch('cache_utils.time.monotonic', return_value=0):
+            cache.set('b', 2, generation=2)
+        with mock.patch('cache_utils.time.monotonic', return_value=61):
+            self.assertIsNone(cache.get('b', generation=2))
+
+        stats = cache.stats
+        self.assertEqual((stats['hits'], stats['misses'], stats['stale'], stats['expired']), (1, 2, 1, 1))
+
+    def test_get_or_set_computes_once(self):
+        """Test that get_or_set only calls compute on a miss."""
+        cache = GenerationalCache()
+        calls = []
+        compute = lambda: calls.append(1) or len(calls)
+        self.assertEqual(cache.get_or_set('k', 0, compute), 1)
+        self.assertEqual(cache.get_or_set('k', 0, compute), 1)
+        self.assertEqual(cache.get_or_set('k', 1, compute), 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,6 +3,7 @@ import os
 import tempfile
 import shutil
 import json
+from unittest import mock
 
 # Import modules to test
 from config_loader import ConfigLoader, ReportConfig
@@ -137,5 +138,37 @@ class TestConfigLoader(unittest.TestCase):
         none_correction = loader.get_correction_prompt('NonExistent')
         self.assertEqual(none_correction, "Verify and correct the extracted data.")
 
+    def test_reload_on_file_change(self):
+        """Test that views are memoized until a config file changes."""
+        loader = ConfigLoader(self.config_dir)
+        generation = loader.get_generation()
+        indices = loader.get_indices('Manufacturing')
+        self.assertIs(loader.get_indices('Manufacturing'), indices)
+        self.assertFalse(loader.reload_if_changed(force=True))
+
+        # Rewrite the file with a different size and a later mtime
+        self.mfg_config["indices"] = ["New Orders", "Production"]
+        path = os.path.join(self.config_dir, 'manufacturing_config.json')
+        with open(path, 'w') as f:
+            json.dump(self.mfg_config, f)
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+        self.assertTrue(loader.reload_if_changed(force=True))
+        self.assertEqual(loader.generation, generation + 1)
+        self.assertEqual(loader.get_indices('Manufacturing'), ["New Orders", "Production"])
+        self.assertEqual(loader.get_selectable_indices('Manufacturing'),
+                         ["Manufacturing PMI", "New Orders", "Production"])
+
+    def test_all_indices_returns_a_copy(self):
+        """Test that callers changing get_all_indices' list do not change the memoized view."""
+        import db_utils
+        loader = ConfigLoader(self.config_dir)
+        with mock.patch.object(db_utils, 'config_loader', loader):
+            indices = db_utils.get_all_indices('Manufacturing')
+            indices.append('Production')
+            indices.sort(reverse=True)
+            self.assertEqual(db_utils.get_all_indices('Manufacturing'), ["Manufacturing PMI", "New Orders"])
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,146 @@
+import unittest
+import os
+import random
+import shutil
+import sqlite3
+import tempfile
+from datetime import datetime
+
+import scipy.stats as stats
+
+import db_utils
+from db_utils import initialize_database, close_db_connections
+from correlation_service import CorrelationAnalysisService
+
+MONTHS = ['2022-%02d-01' % m for m in range(1, 13)] + ['2023-%02d-01' % m for m in range(1, 13)]
+SERIES = [
+    ('Manufacturing', 'Manufacturing PMI'),
+    ('Manufacturing', 'New Orders'),
+    ('Manufacturing', 'Production'),
+    ('Services', 'Services PMI'),
+    ('Services', 'New Orders'),
+    ('Services', 'Business Activity'),
+]
+
+class TestCorrelationAnalysisService(unittest.TestCase):
+    """Test the vectorized correlation matrix engine."""
+
+    def setUp(self):
+        """Seed both report types over the same months, with a gap in one series."""
+        self.test_dir = tempfile.mkdtemp()
+        self.original_db_path = db_utils.DATABASE_PATH
+        db_utils.DATABASE_PATH = os.path.join(self.test_dir, 'test_ism_data.db')
+        initialize_database()
+
+        rng = random.Random(7)
+        self.values = {}
+        conn = sqlite3.connect(db_utils.DATABASE_PATH)
+        for report_type, index_name in SERIES:
+            for report_date in MONTHS:
+                # Services New Orders skips two months to exercise pairwise alignment
+                if (report_type, index_name) == ('Services', 'New Orders') and report_date in ('2023-02-01', '2023-07-01'):
+                    continue
+                value = round(rng.uniform(42, 60), 1)
+                self.values[(report_type, index_name, report_date)] = value
+                conn.execute(
+                    "INSERT INTO pmi_indices (report_date, index_name, index_value, direction, report_type) VALUES (?, ?, ?, ?, ?)",
+                    (report_date, index_name, value, 'Growing', report_type)
+                )
+        for report_type in ('Manufacturing', 'Services'):
+            for report_date in MONTHS:
+                conn.execute(
+                    "INSERT INTO reports (report_date, file_path, processing_date, month_year, report_type) VALUES (?, ?, ?, ?, ?)",
+                    (report_date, 'test.pdf', datetime.now().isoformat(), report_date[:7], report_type)
+                )
+        conn.commit()
+        conn.close()
+        self.service = CorrelationAnalysisService()
+
+    def tearDown(self):
+        close_db_connections(db_utils.DATABASE_PATH)
+        db_utils.DATABASE_PATH = self.original_db_path
+        shutil.rmtree(self.test_dir)
+
+    def _aligned(self, key1, key2, months):
+        dates = [d for d in MONTHS[-months:]
+                 if (key1 + (d,)) in self.values and (key2 + (d,)) in self.values]
+        return dates, [self.values[key1 + (d,)] for d in dates], [self.values[key2 + (d,)] for d in dates]
+
+    def test_matches_scipy_pearsonr(self):
+        """Test correlation, p-value and lags against scipy on the aligned series."""
+        key1, key2 = ('Manufacturing', 'New Orders'), ('Services', 'New Orders')
+        result = self.service.get_correlation_between_indices('New Orders', 'New Orders', 18,
+                                                              'Manufacturing', 'Services')
+        dates, values1, values2 = self._aligned(key1, key2, 18)
+        expected_r, expected_p = stats.pearsonr(values1, values2)
+
+        self.assertEqual(result['dates'], dates)
+        self.assertEqual(result['n'], 16)
+        self.assertAlmostEqual(result['correlation'], round(expected_r, 3))
+        self.assertAlmostEqual(result['p_value'], round(expected_p, 4))
+        self.assertEqual(sorted(result['lagged_correlations']), [-3, -2, -1, 0, 1, 2, 3])
+
+        # Without gaps, lag k correlates values1[:-k] with values2[k:]
+        result = self.service.get_correlation_between_indices('Production', 'Business Activity', 24,
+                                                              'Manufacturing', 'Services')
+        _, values1, values2 = self._aligned(('Manufacturing', 'Production'), ('Services', 'Business Activity'), 24)
+        self.assertAlmostEqual(result['lagged_correlations'][2], round(stats.pearsonr(values1[:-2], values2[2:])[0], 3))
+        self.assertAlmostEqual(result['lagged_correlations'][-1], round(stats.pearsonr(values1[1:], values2[:-1])[0], 3))
+
+    def test_cross_report_pairs(self):
+        """Test that only equivalent Manufacturing/Services indices are paired."""
+        results = self.service.get_cross_report_correlations(24)
+        self.assertEqual(set(results), {'Manufacturing PMI-Services PMI',
+                                        'New Orders-New Orders',
+                                        'Production-Business Activity'})
+
+    def test_for_index_filters_and_labels(self):
+        """Test the threshold and the labelling of other-report-type partners."""
+        results = self.service.get_all_correlations_for_index('New Orders', 'Manufacturing', 24, 0.0)
+        self.assertEqual(set(results), {'Manufacturing PMI', 'Production', 'Services PMI (Services)',
+                                        'New Orders (Services)', 'Business Activity (Services)'})
+        self.assertEqual(results['New Orders (Services)']['report_type2'], 'Services')
+        self.assertEqual(self.service.get_all_correlations_for_index('New Orders', 'Manufacturing', 24, 1.01), {})
+
+    def test_single_query_serves_all_endpoints(self):
+        """Test that one SQL statement serves every correlation lookup for a window."""
+        original_get_db_connection = db_utils.get_db_connection
+        statements = []
+
+        def traced_connection(db_path=None):
+            conn = original_get_db_connection(db_path)
+            conn.set_trace_callback(statements.append)
+            return conn
+
+        db_utils.get_db_connection = traced_connection
+        try:
+            self.service.get_cross_report_correlations(24)
+            self.service.get_all_correlations_for_index('Production', 'Manufacturing', 24)
+            self.service.get_correlation_between_indices('Manufacturing PMI', 'Services PMI', 24,
+                                                         'Manufacturing', 'Services')
+        finally:
+            db_utils.get_db_connection = original_get_db_connection
+
+        data_queries = [s for s in statements
+                        if s.lstrip().upper().startswith('SELECT') and 'data_generation' not in s]
+        self.assertEqual(len(data_queries), 1)
+
+    def test_cache_invalidated_by_stored_report(self):
+        """Test that storing a report drops cached matrices instead of serving stale ones."""
+        before = self.service.get_correlation_matrix(24)
+        self.assertIs(self.service.get_correlation_matrix(24), before)
+
+        stored = db_utils.store_report_data_in_db(
+            {'month_year': 'January 2024', 'indices': {'Manufacturing PMI': {'value': 49.1, 'direction': 'Contracting'}}},
+            'test.pdf', 'Manufacturing'
+        )
+        self.assertTrue(stored)
+
+        after = self.service.get_correlation_matrix(24)
+        self.assertIsNot(after, before)
+        self.assertEqual(after.dates[-1], '2024-01-01')
+        stats = self.service.get_cache_stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['stale']), (1, 2, 1))
+
+if __name__ == '__main__':
+    unittest.main()
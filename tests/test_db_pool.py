@@ -0,0 +1,103 @@
+import unittest
+import os
+import tempfile
+import shutil
+import threading
+from datetime import datetime
+from unittest.mock import patch
+
+import db_utils
+from db_utils import (
+    initialize_database,
+    ensure_database_initialized,
+    get_db_connection,
+    db_connection,
+    get_connection_pool,
+    close_db_connections
+)
+
+class TestConnectionPool(unittest.TestCase):
+    """Test the pooled SQLite connection manager."""
+    
+    def setUp(self):
+        """Point db_utils at a fresh test database."""
+        self.test_dir = tempfile.mkdtemp()
+        self.original_db_path = db_utils.DATABASE_PATH
+        db_utils.DATABASE_PATH = os.path.join(self.test_dir, 'test_ism_data.db')
+        initialize_database()
+    
+    def tearDown(self):
+        """Close pooled connections and clean up."""
+        close_db_connections(db_utils.DATABASE_PATH)
+        db_utils.DATABASE_PATH = self.original_db_path
+        shutil.rmtree(self.test_dir)
+    
+    def test_connection_pragmas(self):
+        """Test that pooled connections use WAL journaling and synchronous=NORMAL."""
+        with db_connection() as conn:
+            self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], 'wal')
+            self.assertEqual(conn.execute("PRAGMA synchronous").fetchone()[0], 1)  # NORMAL
+    
+    def test_close_returns_connection_to_pool(self):
+        """Test that close() hands the connection back for reuse."""
+        conn = get_db_connection()
+        conn.close()
+        conn.close()  # A second close must not add it to the pool twice
+        
+        pool = get_connection_pool()
+        self.assertEqual(len(pool._idle), 1)
+        
+        again = get_db_connection()
+        self.assertIs(again, conn)
+        self.assertEqual(len(pool._idle), 0)
+        again.close()
+    
+    def test_context_manager_commits_and_rolls_back(self):
+        """Test that db_connection commits on success and rolls back on error."""
+        insert = ("INSERT INTO reports (report_date, file_path, processing_date, month_year, report_type) "
+                  "VALUES (?, ?, ?, ?, ?)")
+        with db_connection() as conn:
+            conn.execute(insert, ('2023-01-01', 'a.pdf', datetime.now().isoformat(), 'January 2023', 'Manufacturing'))
+        
+        with self.assertRaises(RuntimeError):
+            with db_connection() as conn:
+                conn.execute(insert, ('2023-02-01', 'b.pdf', datetime.now().isoformat(), 'February 2023', 'Manufacturing'))
+                raise RuntimeError("boom")
+        
+        with db_connection() as conn:
+            count = conn.execute("SELECT COUNT(*) FROM reports").fetchone()[0]
+        self.assertEqual(count, 1)
+    
+    def test_concurrent_threads_get_distinct_connections(self):
+        """Test that threads holding connections at the same time never share one."""
+        barrier = threading.Barrier(4)
+        seen = []
+        errors = []
+        
+        def worker():
+            try:
+                with db_connection() as conn:
+                    seen.append(id(conn))
+                    barrier.wait(timeout=5)
+                    conn.execute("SELECT COUNT(*) FROM reports").fetchone()
+            except Exception as e:
+                errors.append(e)
+        
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        self.assertEqual(errors, [])
+        self.assertEqual(len(set(seen)), 4)
+    
+    def test_schema_initialized_once(self):
+        """Test that ensure_database_initialized only creates the schema once per path."""
+        with patch('db_utils.initialize_database') as mock_init:
+            ensure_database_initialized()
+            ensure_database_initialized()
+        mock_init.assert_not_called()
+
+if __name__ == '__main__':
+    unittest.main()
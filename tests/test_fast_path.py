@@ -0,0 +1,61 @@
+import unittest
+
+from fast_path import extract_deterministic, parse_industry_sentences
+
+REPORT = """MANUFACTURING AT A GLANCE
+MARCH 2025
+Manufacturing PMI 49.0 50.3 -1.3 Contracting From Growing 1
+New Orders 45.2 48.6 -3.4 Contracting Faster 2
+Prices 69.4 62.4 +7.0 Increasing Faster 3
+MARCH 2025 MANUFACTURING INDEX SUMMARIES
+MANUFACTURING PMI®
+The Manufacturing PMI registered 49 percent in March.
+NEW ORDERS
+The New Orders Index registered 45.2 percent in March. The three manufacturing industries that reported
+growth in new orders in March are: Chemical Products; Food, Beverage & Tobacco Products; and Paper Products.
+The two industries reporting a decline in new orders in March are: Furniture & Related Products; and Textile Mills.
+PRICES
+The Prices Index registered 69.4 percent. The only industry that reported paying decreased prices in March
+was Petroleum & Coal Products. The four industries that reported paying increased prices are: Apparel;
+Machinery; and Primary Metals.
+ABOUT THIS REPORT
+"""
+
+
+class FakeHandler:
+    def get_indices(self):
+        return ['Manufacturing PMI', 'New Orders', 'Prices']
+
+    def get_index_categories(self, index_name):
+        return ['Increasing', 'Decreasing'] if index_name == 'Prices' else ['Growing', 'Declining']
+
+
+class TestFastPath(unittest.TestCase):
+    """Test the deterministic extraction and its coverage checks."""
+
+    def test_parse_industry_sentences(self):
+        summary = ("The nine industries reporting slower deliveries in February — in the following order — are: "
+                   "A; B; C; D; E; F; G; H; and I. The only industry reporting faster supplier deliveries "
+                   "for the month of February is Construction. Eight industries reported no change.")
+        industries, problems = parse_industry_sentences(summary, ['Slower', 'Faster'])
+        self.assertEqual(problems, [])
+        self.assertEqual(len(industries['Slower']), 9)
+        self.assertEqual(industries['Slower'][-1], 'I')
+        self.assertEqual(industries['Faster'], ['Construction'])
+
+    def test_extract_deterministic(self):
+        result = extract_deterministic(REPORT, 'Manufacturing', FakeHandler())
+        data = result['data']
+        self.assertEqual(data['month_year'], 'March 2025')
+        self.assertEqual(data['indices']['New Orders']['direction'], 'Contracting')
+        self.assertEqual(data['industry_data']['New Orders']['Declining'],
+                         ['Furniture & Related Products', 'Textile Mills'])
+        self.assertEqual(data['indices']['Manufacturing PMI']['current'], '49.0')
+        # "four industries" but only three listed: Prices is not trusted
+        self.assertEqual(list(result['uncovered']), ['Prices'])
+        self.assertNotIn('Prices', data['industry_data'])
+        self.assertLess(result['confidence'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
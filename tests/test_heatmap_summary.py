@@ -0,0 +1,75 @@
+import unittest
+import os
+import shutil
+import sqlite3
+import tempfile
+
+import db_utils
+from db_utils import (initialize_database, close_db_connections, store_report_data_in_db,
+                      get_pmi_data_by_month, rebuild_heatmap_summary)
+
+def report(month_year, **values):
+    return {
+        'month_year': month_year,
+        'indices': {name.replace('_', ' '): {'value': value, 'direction': 'Growing' if value >= 50 else 'Contracting'}
+                    for name, value in values.items()}
+    }
+
+class TestHeatmapSummary(unittest.TestCase):
+    """Test the materialized heatmap_summary table."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.original_db_path = db_utils.DATABASE_PATH
+        db_utils.DATABASE_PATH = os.path.join(self.test_dir, 'test_ism_data.db')
+        initialize_database()
+
+    def tearDown(self):
+        close_db_connections(db_utils.DATABASE_PATH)
+        db_utils.DATABASE_PATH = self.original_db_path
+        shutil.rmtree(self.test_dir)
+
+    def test_store_updates_summary(self):
+        """Test that storing a report (and re-storing it) keeps the summary current."""
+        self.assertTrue(store_report_data_in_db(report('January 2024', New_Orders=51.2, Production=48.0),
+                                                'jan.pdf', 'Manufacturing'))
+        self.assertTrue(store_report_data_in_db(report('February 2024', New_Orders=49.5),
+                                                'feb.pdf', 'Manufacturing'))
+        self.assertTrue(store_report_data_in_db(report('February 2024', Business_Activity=55.0),
+                                                'feb_services.pdf', 'Services'))
+
+        data = get_pmi_data_by_month(None, 'Manufacturing')
+        self.assertEqual([row['month_year'] for row in data], ['February 2024', 'January 2024'])
+        self.assertEqual(data[1]['indices']['Production'], {'value': 48.0, 'direction': 'Contracting'})
+        self.assertEqual(data[0]['report_type'], 'Manufacturing')
+
+        self.assertTrue(store_report_data_in_db(report('January 2024', New_Orders=52.0),
+                                                'jan_revised.pdf', 'Manufacturing'))
+        january = get_pmi_data_by_month(None, 'Manufacturing')[1]
+        self.assertEqual(january['indices']['New Orders']['value'], 52.0)
+        self.assertIn('Production', january['indices'])
+
+    def test_rebuild_and_backfill(self):
+        """Test that rows written outside store_report_data_in_db are picked up by a rebuild."""
+        conn = sqlite3.connect(db_utils.DATABASE_PATH)
+        conn.execute("INSERT INTO reports (report_date, file_path, processing_date, month_year, report_type) "
+                     "VALUES ('2024-03-01', 'x.pdf', '2024-04-01', 'March 2024', 'Services')")
+        conn.execute("INSERT INTO pmi_indices (report_date, index_name, index_value, direction, report_type) "
+                     "VALUES ('2024-03-01', 'Services PMI', 53.4, 'Growing', 'Services')")
+        conn.commit()
+        conn.close()
+
+        self.assertEqual(get_pmi_data_by_month(None, 'Services'), [])
+        self.assertEqual(rebuild_heatmap_summary(), 1)
+        self.assertEqual(get_pmi_data_by_month(None, 'Services')[0]['indices']['Services PMI']['value'], 53.4)
+
+        # A database that predates the summary table is backfilled on initialization
+        conn = sqlite3.connect(db_utils.DATABASE_PATH)
+        conn.execute("DROP TABLE heatmap_summary")
+        conn.commit()
+        conn.close()
+        initialize_database()
+        self.assertEqual(len(get_pmi_data_by_month(None, 'Services')), 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+import os
+import shutil
+import tempfile
+
+from flask import Flask, jsonify
+
+import db_utils
+import query_metrics
+from db_utils import initialize_database, close_db_connections, db_connection, bump_data_generation, get_all_report_dates
+from http_cache import conditional_json
+
+class TestConditionalJson(unittest.TestCase):
+    """Test ETag revalidation of the dashboard JSON endpoints."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.original_db_path = db_utils.DATABASE_PATH
+        db_utils.DATABASE_PATH = os.path.join(self.test_dir, 'test_ism_data.db')
+        initialize_database()
+
+        self.app = Flask(__name__)
+        self.app.testing = True
+        query_metrics.init_app(self.app, {'reports': 1})
+        self.app.config['QUERY_BUDGET_MODE'] = 'raise'
+        self.calls = 0
+
+        @self.app.route('/reports/<report_type>')
+        @conditional_json
+        def reports(report_type):
+            self.calls += 1
+            return jsonify(get_all_report_dates(report_type))
+
+        self.client = self.app.test_client()
+
+    def tearDown(self):
+        close_db_connections(db_utils.DATABASE_PATH)
+        db_utils.DATABASE_PATH = self.original_db_path
+        shutil.rmtree(self.test_dir)
+
+    def test_not_modified_until_generation_changes(self):
+        """Test that a matching If-None-Match skips the view and SQL until a report is stored."""
+        response = self.client.get('/reports/Services?months=12')
+        self.assertEqual(response.status_code, 200)
+        etag = response.headers['ETag']
+        self.assertIn('no-cache', response.headers['Cache-Control'])
+
+        response = self.client.get('/reports/Services?months=12', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.headers['ETag'], etag)
+        self.assertIn('desc="0 queries"', response.headers['Server-Timing'])
+        self.assertEqual(self.calls, 1)
+
+        # Other arguments get their own tag
+        response = self.client.get('/reports/Manufacturing?months=12', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+
+        with db_connection() as conn:
+            bump_data_generation(conn.cursor())
+        response = self.client.get('/reports/Services?months=12', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers['ETag'], etag)
+
+if __name__ == '__main__':
+    unittest.main()
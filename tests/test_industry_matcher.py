@@ -0,0 +1,30 @@
+import unittest
+
+from industry_matcher import CanonicalIndustryMatcher
+
+CANONICAL = [
+    'Chemical Products',
+    'Computer & Electronic Products',
+    'Food, Beverage & Tobacco Products',
+    'Primary Metals',
+    'Fabricated Metal Products',
+]
+
+
+class TestCanonicalIndustryMatcher(unittest.TestCase):
+    def test_variants_and_containment(self):
+        matcher = CanonicalIndustryMatcher(CANONICAL, fuzzy=False)
+        self.assertEqual(matcher.match('chemical'), 'Chemical Products')
+        self.assertEqual(matcher.match('Food, Beverage and Tobacco Products'), 'Food, Beverage & Tobacco Products')
+        self.assertEqual(matcher.match('Computer'), 'Computer & Electronic Products')
+        self.assertEqual(matcher.match('Electronic Products'), 'Computer & Electronic Products')
+        self.assertEqual(matcher.match('Fabricated Metal Products (4)'), 'Fabricated Metal Products')
+        self.assertEqual(matcher.match('lectronic'), 'Computer & Electronic Products')  # starts mid-word
+        self.assertIsNone(matcher.match('Textile Mills'))
+
+    def test_fuzzy_fallback_is_optional(self):
+        self.assertIsNone(CanonicalIndustryMatcher(CANONICAL, fuzzy=False).match('Chemcial Products'))
+        self.assertEqual(CanonicalIndustryMatcher(CANONICAL, fuzzy=True).match('Chemcial Products'), 'Chemical Products')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,31 @@
+import unittest
+
+from industry_patterns import get_pattern_registry, scan_clauses
+
+SUMMARY = """The Prices Index registered 62.4 percent in February. Respondent comments include:
+"Costs keep going up.” The 12 industries reporting an increase in prices paid in February — in the
+following order — are: Information; Retail Trade; Utilities; Construction; Mining; Finance & Insurance;
+Health Care & Social Assistance; Wholesale Trade; Public Administration; Educational Services;
+Management of Companies & Support Services; and Other Services. The only industry reporting a
+decrease in prices paid in February is Agriculture, Forestry, Fishing & Hunting. Five industries
+reported no change in prices paid in February."""
+
+
+class TestIndustryPatterns(unittest.TestCase):
+    def test_scan_clauses(self):
+        clauses = scan_clauses(SUMMARY)
+        self.assertEqual([clause.side for clause in clauses], [0, 1])
+        self.assertEqual(clauses[0].announced, 12)
+        self.assertEqual(len(clauses[0].industries), 12)
+        self.assertEqual(clauses[0].industries[-1], "Other Services")
+        self.assertEqual(clauses[1].industries, ["Agriculture, Forestry, Fishing & Hunting"])
+
+    def test_registry_scan_uses_config_categories(self):
+        registry = get_pattern_registry("Services")
+        self.assertIs(registry, get_pattern_registry("Services"))
+        result = registry.scan("Prices", SUMMARY)
+        self.assertEqual(set(result), {"Increasing", "Decreasing"})
+        self.assertEqual(result["Decreasing"], ["Agriculture, Forestry, Fishing & Hunting"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import unittest
+import os
+import sqlite3
+import tempfile
+import shutil
+from datetime import datetime
+
+import db_utils
+from db_utils import initialize_database, get_industry_status_over_time
+
+class TestIndustryStatusOverTime(unittest.TestCase):
+    """Test the single-query industry status matrix."""
+    
+    def setUp(self):
+        """Set up a test database with three Manufacturing reports."""
+        self.test_dir = tempfile.mkdtemp()
+        self.original_db_path = db_utils.DATABASE_PATH
+        db_utils.DATABASE_PATH = os.path.join(self.test_dir, 'test_ism_data.db')
+        initialize_database()
+        
+        conn = sqlite3.connect(db_utils.DATABASE_PATH)
+        cursor = conn.cursor()
+        for report_date, month_year in [('2023-01-01', 'January 2023'),
+                                        ('2023-02-01', 'February 2023'),
+                                        ('2023-03-01', 'March 2023')]:
+            cursor.execute(
+                "INSERT INTO reports (report_date, file_path, processing_date, month_year, report_type) VALUES (?, ?, ?, ?, ?)",
+                (report_date, 'test.pdf', datetime.now().isoformat(), month_year, 'Manufacturing')
+            )
+        rows = [
+            ('2023-03-01', 'New Orders', 'Machinery', 'Growing', 'Growing', 0),
+            ('2023-03-01', 'New Orders', 'Textile Mills', 'Contracting', 'Declining', 0),
+            ('2023-02-01', 'New Orders', 'Machinery', 'Contracting', 'Declining', 1),
+            ('2023-01-01', 'New Orders', 'Wood Products', 'Growing', 'Growing', 0),
+            ('2023-03-01', 'Prices', 'Machinery', 'Increasing', 'Increasing', 0),
+        ]
+        for report_date, index_name, industry, status, category, rank in rows:
+            cursor.execute(
+                "INSERT INTO industry_status (report_date, index_name, industry_name, status, category, rank, report_type) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (report_date, index_name, industry, status, category, rank, 'Manufacturing')
+            )
+        conn.commit()
+        conn.close()
+    
+    def tearDown(self):
+        """Clean up after the test."""
+        db_utils.DATABASE_PATH = self.original_db_path
+        shutil.rmtree(self.test_dir)
+    
+    def test_matrix_contents(self):
+        """Test that statuses, placeholders and latest ranks are pivoted correctly."""
+        result = get_industry_status_over_time('New Orders', 2, 'Manufacturing')
+        
+        self.assertEqual(result['dates'], ['March 2023', 'February 2023'])
+        self.assertEqual(set(result['industries']), {'Machinery', 'Textile Mills', 'Wood Products'})
+        self.assertEqual(result['industries']['Machinery']['February 2023']['category'], 'Declining')
+        self.assertEqual(result['industries']['Textile Mills']['February 2023'],
+                         {'status': 'Neutral', 'category': 'Not Reported', 'rank': 0})
+        # Wood Products only appears outside the window, so it is all placeholders
+        self.assertEqual(result['industries']['Wood Products']['March 2023']['status'], 'Neutral')
+        self.assertEqual(result['ranks'], {'Machinery': 0, 'Textile Mills': 0})
+    
+    def test_no_industries_keeps_dates(self):
+        """Test that an index without industries still returns the report dates."""
+        result = get_industry_status_over_time('Imports', 12, 'Manufacturing')
+        
+        self.assertEqual(result['dates'], ['March 2023', 'February 2023', 'January 2023'])
+        self.assertEqual(result['industries'], {})
+        self.assertEqual(result['ranks'], {})
+    
+    def test_query_count_is_constant(self):
+        """Test that the number of queries does not depend on months or industries."""
+        original_get_db_connection = db_utils.get_db_connection
+        statements = []
+        
+        def traced_connection():
+            conn = original_get_db_connection()
+            conn.set_trace_callback(statements.append)
+            return conn
+        
+        db_utils.get_db_connection = traced_connection
+        try:
+            counts = []
+            for months in (1, 2, 3, 12):
+                statements.clear()
+                get_industry_status_over_time('New Orders', months, 'Manufacturing')
+                counts.append(len(statements))
+        finally:
+            db_utils.get_db_connection = original_get_db_connection
+        
+        self.assertEqual(counts, [1, 1, 1, 1])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import unittest
+import threading
+
+from ingestion import IngestionPipeline, DatabaseWriter
+
+def fake_prepare(pdf_path, report_type=None):
+    """Stage 1 stand-in that 'detects' the type from the file name."""
+    if 'broken' in pdf_path:
+        raise ValueError("unreadable PDF")
+    detected = report_type or ('Services' if 'services' in pdf_path else 'Manufacturing')
+    return {
+        "report_type": detected,
+        "month_year": "January 2025",
+        "text_chars": 1000,
+        "elapsed": 0.01
+    }
+
+class TestIngestionPipeline(unittest.TestCase):
+    """Test the batch ingestion pipeline."""
+
+    def setUp(self):
+        self.store_threads = set()
+        self.stored = []
+
+    def _store(self, extraction_data, pdf_path, report_type):
+        self.store_threads.add(threading.current_thread().name)
+        self.stored.append((pdf_path, report_type))
+        return True
+
+    def _process(self, pdf_path, visualization_options, report_type=None, store_fn=None, progress=None):
+        progress('extraction')
+        progress('store')
+        stored = store_fn({"month_year": "January 2025"}, pdf_path, report_type)
+        progress('sheets')
+        return 'failed' not in pdf_path and stored
+
+    def test_statuses_and_single_writer(self):
+        """Test per-file statuses and that every write happens on the writer thread."""
+        updates = []
+        pipeline = IngestionPipeline(
+            workers=1,
+            llm_concurrency=4,
+            process_fn=self._process,
+            prepare_fn=fake_prepare,
+            store_fn=self._store,
+            on_update=lambda status: updates.append((status['file'], status['state'], status['stage']))
+        )
+        paths = ['/in/ism_services.pdf', '/in/ism_mfg.pdf', '/in/broken.pdf', '/in/failed.pdf']
+        statuses = pipeline.run(paths)
+
+        self.assertEqual(list(statuses), paths)
+        self.assertEqual(statuses['/in/ism_services.pdf']['report_type'], 'Services')
+        self.assertEqual(statuses['/in/ism_mfg.pdf']['report_type'], 'Manufacturing')
+        self.assertTrue(statuses['/in/ism_mfg.pdf']['success'])
+        self.assertTrue(statuses['/in/ism_mfg.pdf']['stored'])
+        self.assertEqual(set(statuses['/in/ism_mfg.pdf']['timings']),
+                         {'detection', 'extraction', 'store', 'sheets'})
+
+        self.assertEqual(statuses['/in/broken.pdf']['state'], 'failed')
+        self.assertIn('unreadable PDF', statuses['/in/broken.pdf']['error'])
+        self.assertEqual(statuses['/in/failed.pdf']['state'], 'failed')
+        self.assertEqual(statuses['/in/failed.pdf']['stage'], 'sheets')
+        self.assertTrue(statuses['/in/failed.pdf']['stored'])
+
+        self.assertEqual(len(self.stored), 3)
+        self.assertEqual(self.store_threads, {'ism-db-writer'})
+        self.assertIn(('ism_mfg.pdf', 'running', 'store'), updates)
+        mfg_updates = [update for update in updates if update[0] == 'ism_mfg.pdf']
+        self.assertEqual(mfg_updates[-1], ('ism_mfg.pdf', 'done', None))
+
+    def test_forced_report_type(self):
+        """Test that a batch-wide report type overrides detection."""
+        pipeline = IngestionPipeline(workers=1, process_fn=self._process,
+                                     prepare_fn=fake_prepare, store_fn=self._store)
+        statuses = pipeline.run(['/in/ism_services.pdf'], report_type='Manufacturing')
+        self.assertEqual(statuses['/in/ism_services.pdf']['report_type'], 'Manufacturing')
+        self.assertEqual(self.stored, [('/in/ism_services.pdf', 'Manufacturing')])
+
+    def test_writer_propagates_errors(self):
+        """Test that exceptions raised on the writer thread reach the caller."""
+        def failing_store(*args):
+            raise RuntimeError("database is locked")
+
+        writer = DatabaseWriter(failing_store).start()
+        try:
+            with self.assertRaises(RuntimeError):
+                writer.store_report({}, 'report.pdf', 'Manufacturing')
+        finally:
+            writer.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+import unittest
+import os
+import shutil
+import tempfile
+import threading
+
+from db_utils import close_db_connections, db_connection
+from ingestion import IngestionPipeline
+from jobs import JobQueue
+
+def fake_prepare(pdf_path, report_type=None):
+    return {"report_type": "Services", "month_year": "March 2025", "elapsed": 0.01}
+
+class TestJobQueue(unittest.TestCase):
+    """Test background ingestion jobs and their progress events."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.test_dir, 'jobs.db')
+        self.release = threading.Event()
+
+    def tearDown(self):
+        close_db_connections(self.db_path)
+        shutil.rmtree(self.test_dir)
+
+    def _process(self, pdf_path, visualization_options, report_type=None, store_fn=None, progress=None):
+        for stage in ('extraction', 'store', 'validation', 'sheets'):
+            progress(stage)
+        self.release.wait(5)
+        return True
+
+    def _pipeline(self, **kwargs):
+        return IngestionPipeline(workers=1, process_fn=self._process, prepare_fn=fake_prepare,
+                                 store_fn=lambda *args: True, **kwargs)
+
+    def _upload(self, name):
+        path = os.path.join(self.test_dir, name)
+        with open(path, 'wb') as f:
+            f.write(b'%PDF-1.4')
+        return name, path
+
+    def test_job_runs_in_background_and_reports_stages(self):
+        """Test that submit returns immediately and progress events cover every stage."""
+        queue = JobQueue(pipeline_factory=self._pipeline, db_path=self.db_path)
+        upload = self._upload('services.pdf')
+        job_id = queue.submit([upload])
+
+        self.assertIn(queue.get(job_id)['state'], ('queued', 'running'))
+        self.release.set()
+
+        events, seq, finished = [], 0, False
+        while not finished:
+            new_events, finished = queue.wait_for_events(job_id, seq, timeout=5)
+            events.extend(new_events)
+            seq = events[-1]['seq'] if events else seq
+
+        stages = [e['stage'] for e in events if e['file'] == 'services.pdf']
+        for stage in ('detection', 'extraction', 'store', 'validation', 'sheets'):
+            self.assertIn(stage, stages)
+
+        job = queue.get(job_id)
+        self.assertEqual(job['state'], 'done')
+        self.assertEqual(job['report_type'], 'Services')
+        self.assertEqual(job['summary'], {'total': 1, 'succeeded': 1, 'failed': 0})
+        self.assertIn('sheets', job['files'][0]['timings'])
+        self.assertFalse(os.path.exists(upload[1]))
+
+        # Another worker process can read the finished job from the database
+        other = JobQueue(pipeline_factory=self._pipeline, db_path=self.db_path)
+        self.assertEqual(other.get(job_id)['state'], 'done')
+        self.assertIsNone(other.get('missing'))
+
+    def test_interrupted_job_detected(self):
+        """Test that an unfinished job owned by a dead process reads as interrupted."""
+        queue = JobQueue(pipeline_factory=self._pipeline, db_path=self.db_path)
+        job_id = queue.submit([self._upload('manufacturing.pdf')])
+
+        with queue._cond:
+            queue._jobs[job_id]['pid'] = 2 ** 22 + 1  # no such process
+        queue._persist(queue._jobs[job_id])
+
+        other = JobQueue(pipeline_factory=self._pipeline, db_path=self.db_path)
+        self.assertEqual(other.get(job_id)['state'], 'interrupted')
+
+        self.release.set()
+        finished = False
+        while not finished:
+            _, finished = queue.wait_for_events(job_id, 10 ** 6, timeout=5)
+
+    def _finish(self, queue, job_id):
+        finished = False
+        while not finished:
+            _, finished = queue.wait_for_events(job_id, 10 ** 6, timeout=5)
+        return queue.get(job_id)
+
+    def test_files_with_the_same_name_tracked_separately(self):
+        """Test that two uploads sharing a filename each get their own progress entry."""
+        queue = JobQueue(pipeline_factory=self._pipeline, db_path=self.db_path)
+        first = self._upload('report.pdf')
+        os.makedirs(os.path.join(self.test_dir, 'other'))
+        second = ('report.pdf', os.path.join(self.test_dir, 'other', 'report.pdf'))
+        shutil.copy(first[1], second[1])
+        self.release.set()
+        job_id = queue.submit([first, second])
+
+        job = self._finish(queue, job_id)
+        self.assertEqual([entry['index'] for entry in job['files']], [0, 1])
+        self.assertTrue(all(entry['state'] == 'done' for entry in job['files']))
+        other = JobQueue(pipeline_factory=self._pipeline, db_path=self.db_path)
+        self.assertEqual(len(other.get(job_id)['files']), 2)
+
+    def test_stage_progress_saves_are_throttled_and_old_jobs_pruned(self):
+        """Test that stage-only events do not each rewrite the job row, and expired rows are deleted."""
+        queue = JobQueue(pipeline_factory=self._pipeline, db_path=self.db_path)
+        saves = []
+        persist = queue._persist
+        queue._persist = lambda job: (saves.append(job['state']), persist(job))
+        self.release.set()
+        job_id = queue.submit([self._upload('services.pdf')])
+        self._finish(queue, job_id)
+
+        events = queue.get(job_id, include_events=True)['events']
+        self.assertLess(len(saves), len(events))
+        self.assertEqual(saves[-1], 'done')
+
+        with db_connection(self.db_path) as conn:
+            conn.execute("UPDATE ingest_jobs SET updated_at = '2000-01-01T00:00:00'")
+        queue._prune()
+        queue._jobs.clear()
+        self.assertIsNone(queue.get(job_id))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+import os
+import shutil
+import tempfile
+
+from llm_cache import LLMResponseCache
+
+
+class TestLLMResponseCache(unittest.TestCase):
+    """Test that identical extraction requests reuse the stored completion."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.test_dir, 'cache', 'llm')
+        self.messages = [{'role': 'system', 'content': 'Return JSON.'},
+                         {'role': 'user', 'content': 'Extract the Manufacturing at a Glance table.'}]
+        self.calls = []
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def _create(self):
+        self.calls.append(1)
+        return '{"month_year": "March 2025", "indices": {}}'
+
+    def test_hit_after_store(self):
+        """Test that only parsed (stored) completions are reused, across instances."""
+        cache = LLMResponseCache(self.cache_dir, bypass=False)
+        text, store = cache.complete('doc', self.messages, 'gpt-4o', self._create, temperature=0.0)
+        # Not stored yet (e.g. the response failed to parse): the next request calls the API again
+        cache.complete('doc', self.messages, 'gpt-4o', self._create, temperature=0.0)
+        self.assertEqual(len(self.calls), 2)
+        store()
+
+        cache = LLMResponseCache(self.cache_dir, bypass=False)
+        cached, _ = cache.complete('doc', self.messages, 'gpt-4o', self._create, temperature=0.0)
+        self.assertEqual(cached, text)
+        self.assertEqual(len(self.calls), 2)
+        self.assertEqual(cache.get_stats()['hits'], 1)
+
+        # A different prompt, model or document is a miss
+        edited = [self.messages[0], {'role': 'user', 'content': 'Extract the Services at a Glance table.'}]
+        cache.complete('doc', edited, 'gpt-4o', self._create, temperature=0.0)
+        cache.complete('doc', self.messages, 'gpt-4o-mini', self._create, temperature=0.0)
+        cache.complete('other', self.messages, 'gpt-4o', self._create, temperature=0.0)
+        self.assertEqual(len(self.calls), 5)
+        self.assertEqual(cache.get_stats()['misses'], 3)
+
+        cache.invalidate('doc')
+        cache.complete('doc', self.messages, 'gpt-4o', self._create, temperature=0.0)
+        self.assertEqual(len(self.calls), 6)
+
+    def test_bypass(self):
+        """Test that bypassing always calls the API and counts it."""
+        cache = LLMResponseCache(self.cache_dir, bypass=False)
+        _, store = cache.complete('doc', self.messages, 'gpt-4o', self._create)
+        store()
+        cache.complete('doc', self.messages, 'gpt-4o', self._create, bypass=True)
+        LLMResponseCache(self.cache_dir, bypass=True).complete('doc', self.messages, 'gpt-4o', self._create)
+        self.assertEqual(len(self.calls), 3)
+        self.assertEqual(cache.get_stats()['bypassed'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import unittest
+import os
+import shutil
+import tempfile
+from unittest.mock import patch
+
+import pdf_text_cache
+from pdf_text_cache import PDFTextCache
+
+FAKE_PAGES = ["MANUFACTURING AT A GLANCE", "", "INDEX SUMMARIES"]
+
+class TestPDFTextCache(unittest.TestCase):
+    """Test the content-hash keyed PDF text cache."""
+
+    def setUp(self):
+        """Create a fake PDF and an isolated cache directory."""
+        self.test_dir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.test_dir, 'cache')
+        self.pdf_path = os.path.join(self.test_dir, 'report.pdf')
+        with open(self.pdf_path, 'wb') as f:
+            f.write(b'%PDF-1.4 fake report body')
+        self.cache = PDFTextCache(cache_dir=self.cache_dir, max_entries=4)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_pages_extracted_once_per_engine(self):
+        """Test that repeated requests for the same document reuse the first parse."""
+        with patch.object(pdf_text_cache, '_extract_pages', return_value=list(FAKE_PAGES)) as extract:
+            self.assertEqual(self.cache.get_pages(self.pdf_path), FAKE_PAGES)
+            self.assertEqual(self.cache.get_text(self.pdf_path),
+                             "MANUFACTURING AT A GLANCE\n\nINDEX SUMMARIES\n\n")
+            self.assertEqual(self.cache.get_text(self.pdf_path, separator=''),
+                             "MANUFACTURING AT A GLANCEINDEX SUMMARIES")
+            self.assertEqual(extract.call_count, 1)
+
+            self.cache.get_pages(self.pdf_path, 'pypdf2')
+            self.assertEqual(extract.call_count, 2)
+
+    def test_same_content_different_path_hits_cache(self):
+        """Test that the cache is keyed by file content rather than path."""
+        copy_path = os.path.join(self.test_dir, 'copy_of_report.pdf')
+        shutil.copy(self.pdf_path, copy_path)
+        with patch.object(pdf_text_cache, '_extract_pages', return_value=list(FAKE_PAGES)) as extract:
+            self.cache.get_pages(self.pdf_path)
+            self.cache.get_pages(copy_path)
+            self.assertEqual(extract.call_count, 1)
+
+    def test_disk_tier_survives_new_process(self):
+        """Test that a fresh cache instance reads pages back from disk."""
+        with patch.object(pdf_text_cache, '_extract_pages', return_value=list(FAKE_PAGES)):
+            self.cache.get_pages(self.pdf_path)
+
+        fresh = PDFTextCache(cache_dir=self.cache_dir)
+        with patch.object(pdf_text_cache, '_extract_pages', side_effect=AssertionError("re-parsed")):
+            self.assertEqual(fresh.get_pages(self.pdf_path), FAKE_PAGES)
+        self.assertEqual(fresh.stats['disk_hits'], 1)
+
+    def test_pages_read_before_early_exit_are_reused(self):
+        """Test that a lazy scan stopped after page 1 leaves it for the full extraction."""
+        parsed = []
+
+        def pages(pdf_path, engine, start=0):
+            for index in range(start, len(FAKE_PAGES)):
+                parsed.append(index)
+                yield FAKE_PAGES[index]
+
+        with patch.object(pdf_text_cache, '_iter_page_texts', side_effect=pages):
+            for page in self.cache.iter_pages(self.pdf_path):
+                break
+            self.assertEqual(self.cache.get_pages(self.pdf_path), FAKE_PAGES)
+            self.assertEqual(parsed, [0, 1, 2])
+            self.assertEqual(list(self.cache.iter_pages(self.pdf_path)), FAKE_PAGES)
+            self.assertEqual(parsed, [0, 1, 2])
+
+    def test_extraction_errors_are_not_cached(self):
+        """Test that failures propagate so callers can fall back to another engine."""
+        with patch.object(pdf_text_cache, '_extract_pages', side_effect=ValueError("bad pdf")):
+            with self.assertRaises(ValueError):
+                self.cache.get_pages(self.pdf_path)
+        with patch.object(pdf_text_cache, '_extract_pages', return_value=list(FAKE_PAGES)):
+            self.assertEqual(self.cache.get_pages(self.pdf_path), FAKE_PAGES)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+import os
+import shutil
+import tempfile
+
+from flask import Flask, jsonify
+
+import db_utils
+import query_metrics
+from db_utils import initialize_database, close_db_connections, db_connection, get_pmi_data_by_month
+from query_metrics import QueryBudgetExceeded, track_queries
+
+class TestQueryMetrics(unittest.TestCase):
+    """Test per-request SQL instrumentation and query budgets."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.original_db_path = db_utils.DATABASE_PATH
+        db_utils.DATABASE_PATH = os.path.join(self.test_dir, 'test_ism_data.db')
+        initialize_database()
+
+        self.app = Flask(__name__)
+        self.app.testing = True
+        query_metrics.init_app(self.app, {'heatmap': 1, 'chatty': 1})
+        self.app.config['QUERY_BUDGET_MODE'] = 'raise'
+
+        @self.app.route('/heatmap')
+        def heatmap():
+            return jsonify(get_pmi_data_by_month(24, 'Manufacturing'))
+
+        @self.app.route('/chatty')
+        def chatty():
+            with db_connection() as conn:
+                conn.execute("SELECT COUNT(*) FROM reports").fetchone()
+                conn.cursor().execute("SELECT COUNT(*) FROM pmi_indices").fetchone()
+            return jsonify([])
+
+        self.client = self.app.test_client()
+
+    def tearDown(self):
+        close_db_connections(db_utils.DATABASE_PATH)
+        db_utils.DATABASE_PATH = self.original_db_path
+        shutil.rmtree(self.test_dir)
+
+    def test_within_budget(self):
+        """Test that the heatmap endpoint runs one statement and reports it in Server-Timing."""
+        response = self.client.get('/heatmap')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('desc="1 queries"', response.headers['Server-Timing'])
+
+    def test_over_budget_raises(self):
+        """Test that connection- and cursor-level statements both count against the budget."""
+        with self.assertRaises(QueryBudgetExceeded):
+            self.client.get('/chatty')
+
+        self.app.config['QUERY_BUDGETS']['chatty'] = 2
+        self.assertEqual(self.client.get('/chatty').status_code, 200)
+
+    def test_track_queries(self):
+        """Test the collector outside of a request, including the slowest statement."""
+        with track_queries('unit') as stats:
+            with db_connection() as conn:
+                conn.executemany("INSERT INTO data_generation (id, generation) VALUES (?, ?) "
+                                 "ON CONFLICT(id) DO UPDATE SET generation = excluded.generation", [(1, 5)])
+            self.assertEqual(db_utils.get_data_generation(), 5)
+        self.assertEqual(stats.count, 2)
+        self.assertIsNotNone(stats.slowest_sql)
+        self.assertIsNone(query_metrics.current_stats())
+
+if __name__ == '__main__':
+    unittest.main()
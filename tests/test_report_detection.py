@@ -1,6 +1,8 @@
 # test_report_detection.py
 import unittest
 import os
+from unittest.mock import patch
+import report_detection
 from report_detection import EnhancedReportTypeDetector
 
 class TestReportDetection(unittest.TestCase):
@@ -64,5 +66,28 @@ class TestReportDetection(unittest.TestCase):
             # Clean up
             os.remove("temp_services.txt")
 
+    def test_early_exit_and_memo(self):
+        # A decisive first page should end the scan, and the verdict should be memoized by content
+        first_page = "SERVICES AT A GLANCE\nSERVICES INDEX SUMMARIES\n" + "The Services PMI® registered 54.2 percent. " * 20
+        pages_read = []
+
+        def pages(pdf_path):
+            for page in (first_page, "MANUFACTURING PMI " * 200):
+                pages_read.append(page)
+                yield page
+
+        with open("temp_early_exit.pdf", "w") as f:
+            f.write("early exit fixture")
+        report_detection.clear_detection_memo()
+        try:
+            with patch.object(EnhancedReportTypeDetector, '_iter_pages', side_effect=pages) as iter_pages:
+                self.assertEqual(EnhancedReportTypeDetector.detect_report_type("temp_early_exit.pdf", early_exit=True), "Services")
+                self.assertEqual(len(pages_read), 1)
+                self.assertEqual(EnhancedReportTypeDetector.detect_report_type("temp_early_exit.pdf", early_exit=True), "Services")
+                self.assertEqual(iter_pages.call_count, 1)
+        finally:
+            report_detection.clear_detection_memo()
+            os.remove("temp_early_exit.pdf")
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,57 @@
+import unittest
+
+from report_sections import collapse_overprint, slice_report
+
+INDICES = ['Manufacturing PMI', 'New Orders', "Customers' Inventories"]
+
+REPORT = """ISM Report On Business® March 2025
+WHAT RESPONDENTS ARE SAYING
+“Business is steady.” [Chemical Products]
+MANUFACTURING AT A GLANCE
+MARCH 2025
+IIIInnnnddddeeeexxxx SSSSeeeerrrriiiieeeessss
+NNNNeeeewwww OOOOrrrrddddeeeerrrrssss 45.2 48.6 -3.4 Contracting
+COMMODITIES REPORTED UP IN PRICE
+Aluminum; Steel
+MARCH 2025 MANUFACTURING INDEX SUMMARIES
+MANUFACTURING PMI®
+The Manufacturing PMI registered 49 percent in March.
+MANUFACTURING PMI® HISTORY
+MMMMoooonnnntttthhhh 49.0
+NEW ORDERS
+The three industries reporting growth in new orders in March are: Chemical Products; Food; and Paper.
+NNNNeeeewwww OOOOrrrrddddeeeerrrrssss %%%% HHHHiiiigggghhhheeeerrrr
+CUSTOMERS’ INVENTORIES
+The two industries reporting customers' inventories as too high are: Food; and Paper.
+ABOUT THIS REPORT
+Methodology text that the extraction does not need.
+"""
+
+
+class TestReportSections(unittest.TestCase):
+    """Test slicing a report into its glance table and index summaries."""
+
+    def test_collapse_overprint(self):
+        self.assertEqual(collapse_overprint("PPPPMMMMIIII 2222000022225555 52.5 Feb"), "PMI 2025 52.5 Feb")
+
+    def test_slice_report(self):
+        sections = slice_report(REPORT, 'Manufacturing', INDICES)
+        self.assertTrue(sections.complete)
+        self.assertIn('New Orders 45.2 48.6', sections.glance)
+        self.assertNotIn('Aluminum', sections.glance)
+        self.assertEqual(list(sections.summaries), INDICES)
+        self.assertEqual(sections.summaries['Manufacturing PMI'],
+                         'The Manufacturing PMI registered 49 percent in March.')
+        # Overprinted history tables and everything after the last summary are dropped
+        self.assertTrue(sections.summaries['New Orders'].endswith('and Paper.'))
+        self.assertNotIn('Methodology', sections.render())
+        self.assertLess(sections.stats()['section_chars'], sections.stats()['full_chars'])
+
+    def test_missing_section_is_incomplete(self):
+        sections = slice_report(REPORT.replace('NEW ORDERS\n', ''), 'Manufacturing', INDICES)
+        self.assertFalse(sections.complete)
+        self.assertEqual(sections.missing, ['New Orders'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+import os
+import shutil
+import tempfile
+
+from flask import Flask, jsonify
+
+import db_utils
+import response_cache
+from db_utils import initialize_database, close_db_connections, db_connection, bump_data_generation
+from response_cache import ResponseCache, cached_response
+
+class TestResponseCache(unittest.TestCase):
+    """Test the two-tier API response cache."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.cache_db = os.path.join(self.test_dir, 'cache', 'responses.db')
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_disk_tier_survives_worker_restart(self):
+        """Test that a new cache instance (a recycled worker) is served from disk."""
+        cache = ResponseCache(db_path=self.cache_db)
+        cache.set('key', (3, 'cfg'), b'[1, 2]', 'application/json', ttl=60)
+        self.assertEqual(cache.get('key', (3, 'cfg'), 'route'), (b'[1, 2]', 'application/json'))
+
+        restarted = ResponseCache(db_path=self.cache_db)
+        self.assertEqual(restarted.get('key', (3, 'cfg'), 'route'), (b'[1, 2]', 'application/json'))
+        self.assertIsNone(restarted.get('key', (4, 'cfg'), 'route'))
+        self.assertEqual(restarted.get_stats()['routes']['route'],
+                         {'memory_hits': 0, 'disk_hits': 1, 'misses': 1, 'hit_rate': 0.5})
+
+        restarted.invalidate()
+        self.assertIsNone(ResponseCache(db_path=self.cache_db).get('key', (3, 'cfg')))
+
+    def test_expired_entries_are_misses(self):
+        """Test that entries past the route TTL are not served from either tier."""
+        cache = ResponseCache(db_path=self.cache_db)
+        cache.set('key', (1, 'cfg'), b'{}', 'application/json', ttl=-1)
+        self.assertIsNone(cache.get('key', (1, 'cfg')))
+
+    def test_decorated_view(self):
+        """Test that a cached view runs once per data generation."""
+        original_db_path = db_utils.DATABASE_PATH
+        original_cache = response_cache.response_cache
+        db_utils.DATABASE_PATH = os.path.join(self.test_dir, 'test_ism_data.db')
+        response_cache.response_cache = ResponseCache(db_path='')
+        try:
+            initialize_database()
+            app = Flask(__name__)
+            calls = []
+
+            @app.route('/data')
+            @cached_response(ttl=60)
+            def data():
+                calls.append(1)
+                return jsonify({'calls': len(calls)})
+
+            client = app.test_client()
+            self.assertEqual(client.get('/data').get_json(), {'calls': 1})
+            self.assertEqual(client.get('/data').get_json(), {'calls': 1})
+            self.assertEqual(client.get('/data?months=12').get_json(), {'calls': 2})
+
+            with db_connection() as conn:
+                bump_data_generation(conn.cursor())
+            self.assertEqual(client.get('/data').get_json(), {'calls': 3})
+        finally:
+            response_cache.response_cache = original_cache
+            close_db_connections(db_utils.DATABASE_PATH)
+            db_utils.DATABASE_PATH = original_db_path
+
+if __name__ == '__main__':
+    unittest.main()
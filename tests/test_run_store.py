@@ -0,0 +1,53 @@
+import unittest
+import os
+import shutil
+import tempfile
+
+from run_store import RunStore
+
+def _run(company, articles=3):
+    return {'company': company, 'summaries': {'executive': []},
+            'articles': [{'title': f'{company} {i}', 'text': f'{company} article {i}. ' * 100} for i in range(articles)]}
+
+class TestRunStore(unittest.TestCase):
+    """Test the bounded news run store."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.test_dir, 'cache', 'runs.db')
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_lru_bounds(self):
+        """Test that the least recently used runs are evicted by count and by size."""
+        store = RunStore(max_entries=2, db_path='')
+        store['a'] = _run('A')
+        store['b'] = _run('B')
+        self.assertEqual(store.get('a')['company'], 'A')  # 'b' is now the oldest
+        store['c'] = _run('C')
+        self.assertIsNone(store.get('b'))
+        self.assertEqual(len(store), 2)
+
+        small = RunStore(max_entries=10, max_bytes=5000, db_path='')
+        small['a'] = _run('A')
+        small['b'] = _run('B')
+        self.assertNotIn('a', small)
+        self.assertLessEqual(small.stats['bytes'], 5000)
+        self.assertEqual(small.stats['evictions'], 1)
+
+    def test_ttl_and_disk_tier(self):
+        """Test that runs survive a worker restart through SQLite until they expire."""
+        store = RunStore(db_path=self.db_path)
+        store['run'] = _run('Apple')
+        restarted = RunStore(db_path=self.db_path)
+        self.assertEqual(restarted.get('run'), _run('Apple'))
+        self.assertEqual(restarted.stats['disk_hits'], 1)
+
+        expired = RunStore(ttl=-1, db_path=self.db_path)
+        expired['old'] = _run('Old')
+        self.assertIsNone(expired.get('old'))
+        self.assertIsNone(RunStore(db_path=self.db_path).get('old'))
+
+if __name__ == '__main__':
+    unittest.main()
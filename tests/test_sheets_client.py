@@ -0,0 +1,145 @@
+import unittest
+from unittest import mock
+
+import sheets_client
+from sheets_client import SheetsClient, TokenBucket, atomic_units, pack_by_size, with_backoff
+
+
+class FakeHttpError(Exception):
+    """Shaped like googleapiclient.errors.HttpError: status on .resp."""
+
+    class _Resp(dict):
+        def __init__(self, status, headers=None):
+            super().__init__(headers or {})
+            self.status = status
+
+    def __init__(self, status, headers=None):
+        super().__init__(f"<HttpError {status}>")
+        self.resp = self._Resp(status, headers)
+
+
+class _Call:
+    def __init__(self, service, name, kwargs):
+        self.service, self.name, self.kwargs = service, name, kwargs
+
+    def execute(self):
+        if self.service.failures:
+            raise self.service.failures.pop(0)
+        self.service.calls.append((self.name, self.kwargs))
+        requests = self.kwargs.get('body', {}).get('requests', [])
+        return {'spreadsheetId': 'abc', 'replies': [{} for _ in requests]}
+
+
+class RecordingService:
+    def __init__(self, failures=None):
+        self.calls = []
+        self.failures = list(failures or [])
+
+    def spreadsheets(self):
+        return self
+
+    def get(self, **kwargs):
+        return _Call(self, 'get', kwargs)
+
+    def batchUpdate(self, **kwargs):
+        return _Call(self, 'batchUpdate', kwargs)
+
+
+class TestSheetsClient(unittest.TestCase):
+    """Test limiting, payload-sized batching and backoff of the Sheets client."""
+
+    def setUp(self):
+        self.unlimited = TokenBucket(0)
+        sleep_patch = mock.patch('sheets_client.time.sleep')
+        self.sleep = sleep_patch.start()
+        self.addCleanup(sleep_patch.stop)
+
+    def _client(self, service, **kwargs):
+        return SheetsClient(service, write_bucket=self.unlimited, read_bucket=self.unlimited, **kwargs)
+
+    def test_pack_by_size(self):
+        """Test that items are packed greedily under the byte limit."""
+        items = ['x' * 8] * 10  # 10 bytes of JSON + 1 separator each
+        self.assertEqual([len(chunk) for chunk in pack_by_size(items, 45)], [4, 4, 2])
+        self.assertEqual([len(chunk) for chunk in pack_by_size(items, 45, overhead=20)], [2, 2, 2, 2, 2])
+        self.assertEqual(pack_by_size(['x' * 100], 10), [['x' * 100]])
+
+    def test_large_batch_is_split_and_replies_merged(self):
+        """Test that an oversized batchUpdate is sent as several calls with one merged reply."""
+        service = RecordingService()
+        client = self._client(service, max_payload_bytes=2000)
+        requests = [{'repeatCell': {'range': {'sheetId': 1, 'startRowIndex': i}}} for i in range(100)]
+
+        response = client.spreadsheets().batchUpdate(spreadsheetId='abc', body={'requests': requests}).execute()
+
+        self.assertGreater(len(service.calls), 1)
+        sent = [r for _, kwargs in service.calls for r in kwargs['body']['requests']]
+        self.assertEqual(sent, requests)
+        self.assertEqual(len(response['replies']), 100)
+        self.assertIs(SheetsClient.wrap(client), client)
+
+    def test_rule_sequences_are_not_split(self):
+        """Test that a sheet's conditional format deletes and adds always share one call."""
+        service = RecordingService()
+        client = self._client(service, max_payload_bytes=600)
+        rule = {'ranges': [{'sheetId': 7}], 'booleanRule': {'condition': {'type': 'NUMBER_GREATER'}}}
+        requests = ([{'repeatCell': {'range': {'sheetId': 1, 'startRowIndex': i}}} for i in range(5)]
+                    + [{'deleteConditionalFormatRule': {'sheetId': 7, 'index': 0}}] * 4
+                    + [{'addConditionalFormatRule': {'rule': rule, 'index': i}} for i in range(4)]
+                    + [{'repeatCell': {'range': {'sheetId': 1, 'startRowIndex': i}}} for i in range(5)])
+
+        self.assertEqual([len(unit) for unit in atomic_units(requests)], [1] * 5 + [8] + [1] * 5)
+        client.spreadsheets().batchUpdate(spreadsheetId='abc', body={'requests': requests}).execute()
+
+        self.assertGreater(len(service.calls), 1)
+        rule_calls = [kwargs['body']['requests'] for _, kwargs in service.calls
+                      if any('ConditionalFormatRule' in next(iter(r)) for r in kwargs['body']['requests'])]
+        self.assertEqual(len(rule_calls), 1)
+        self.assertEqual(sum(1 for r in rule_calls[0] if 'ConditionalFormatRule' in next(iter(r))), 8)
+        self.assertEqual([r for _, kwargs in service.calls for r in kwargs['body']['requests']], requests)
+
+    def test_backoff_on_status_codes(self):
+        """Test retries on 429/503 (honouring Retry-After) but not on 400."""
+        service = RecordingService([FakeHttpError(429, {'retry-after': '7'}), FakeHttpError(503)])
+        before = sheets_client.get_sheets_api_stats()
+        self._client(service).spreadsheets().get(spreadsheetId='abc').execute()
+
+        self.assertEqual(len(service.calls), 1)
+        delays = [call.args[0] for call in self.sleep.call_args_list]
+        self.assertEqual(delays[0], 7.0)
+        self.assertTrue(2.0 <= delays[1] <= 3.0)
+        after = sheets_client.get_sheets_api_stats()
+        self.assertEqual(after['retries'] - before['retries'], 2)
+        self.assertEqual(after['rate_limited'] - before['rate_limited'], 1)
+
+        service = RecordingService([FakeHttpError(400)])
+        with self.assertRaises(FakeHttpError):
+            self._client(service).spreadsheets().get(spreadsheetId='abc').execute()
+
+        # An outer backoff loop owns the retries of calls made inside it
+        attempts = []
+
+        def flaky():
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise FakeHttpError(500)
+            return 'ok'
+        self.assertEqual(with_backoff(flaky), 'ok')
+        self.assertEqual(len(attempts), 3)
+
+    @mock.patch('sheets_client.time.monotonic')
+    def test_token_bucket_paces_to_quota(self, monotonic):
+        """Test that calls beyond the burst wait for refilled tokens."""
+        monotonic.return_value = 100.0
+        bucket = TokenBucket(per_minute=70, burst=10)  # refills one token per second
+        waits = [bucket.acquire() for _ in range(12)]
+        self.assertEqual(waits[:10], [0.0] * 10)
+        self.assertAlmostEqual(waits[10], 1.0)
+        self.assertAlmostEqual(waits[11], 2.0)
+
+        monotonic.return_value = 120.0
+        self.assertEqual(bucket.acquire(), 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+
+from sheets_client import SheetsClient, TokenBucket
+from sheets_emulator import SheetsEmulator, parse_a1
+from sheets_metadata import SheetsMetadataCache
+from sheets_sync import SheetsSyncEngine
+
+
+class TestSheetsEmulator(unittest.TestCase):
+    """Test the in-process Sheets emulator against the sync engine."""
+
+    def setUp(self):
+        self.emulator = SheetsEmulator()
+        unlimited = TokenBucket(0)
+        self.service = SheetsClient(self.emulator, write_bucket=unlimited, read_bucket=unlimited)
+        created = self.service.spreadsheets().create(body={
+            'properties': {'title': 'ISM Services Report Analysis'},
+            'sheets': [{'properties': {'title': 'Services Growth Numerical'}}]
+        }).execute()
+        self.spreadsheet_id = created['spreadsheetId']
+        self.sheet_id = created['sheets'][0]['properties']['sheetId']
+        self.emulator.reset_stats()
+
+    def _formatting(self):
+        return [{'addConditionalFormatRule': {'rule': {'ranges': [{'sheetId': self.sheet_id}]}, 'index': 0}},
+                {'addConditionalFormatRule': {'rule': {'ranges': [{'sheetId': self.sheet_id}]}, 'index': 1}},
+                {'autoResizeDimensions': {'dimensions': {'sheetId': self.sheet_id, 'dimension': 'COLUMNS'}}}]
+
+    def test_parse_a1(self):
+        self.assertEqual(parse_a1("'Bob''s'!B2:D9"), ("Bob's", (1, 1), (8, 3)))
+        self.assertEqual(parse_a1("'Tab'"), ('Tab', None, None))
+        self.assertEqual(parse_a1("Tab!A:A"), ('Tab', (0, 0), (None, 0)))
+
+    def test_sync_engine_round_trip(self):
+        """Test grid growth, rule replacement and recorded traffic over two syncs."""
+        metadata = SheetsMetadataCache(path='')
+        rows = [['REFERENCE'] + [f'M{i}' for i in range(48)]] + [[f'Industry {r}'] + list(range(48)) for r in range(18)]
+
+        engine = SheetsSyncEngine(self.service, self.spreadsheet_id, state_dir='', metadata=metadata)
+        engine.stage('Services Growth Numerical', self.sheet_id, rows, self._formatting())
+        engine.push()
+
+        self.assertEqual(self.emulator.tab_values(self.spreadsheet_id, 'Services Growth Numerical'), rows)
+        tab = self.emulator.tab(self.spreadsheet_id, 'Services Growth Numerical')
+        self.assertGreaterEqual(tab['properties']['gridProperties']['columnCount'], 49)
+        self.assertEqual(len(tab['conditionalFormats']), 2)
+        self.assertEqual(metadata.tabs(self.service, self.spreadsheet_id)['Services Growth Numerical']['columns'],
+                         tab['properties']['gridProperties']['columnCount'])
+
+        # Second sync (same engine state) changes one cell; rules are replaced, not added
+        self.emulator.reset_stats()
+        rows[5][10] = 'changed'
+        engine.stage('Services Growth Numerical', self.sheet_id, rows, self._formatting())
+        engine.push()
+
+        stats = self.emulator.stats()
+        self.assertEqual(stats['by_method'], {'values.batchUpdate': 1, 'spreadsheets.batchUpdate': 1})
+        self.assertEqual(self.emulator.tab_values(self.spreadsheet_id, 'Services Growth Numerical')[5][10], 'changed')
+        self.assertEqual(len(self.emulator.tab(self.spreadsheet_id, 'Services Growth Numerical')['conditionalFormats']), 2)
+        self.assertEqual(stats['writes'], 2)
+        self.assertGreater(stats['bytes_sent'], 0)
+
+    def test_api_errors(self):
+        """Test the errors the formatter relies on: missing spreadsheet, writes past the grid."""
+        with self.assertRaises(Exception) as missing:
+            self.service.spreadsheets().get(spreadsheetId='nope').execute()
+        self.assertEqual(missing.exception.resp.status, 404)
+
+        with self.assertRaises(Exception) as outside:
+            self.service.spreadsheets().values().update(
+                spreadsheetId=self.spreadsheet_id, range="'Services Growth Numerical'!Z1",
+                valueInputOption='RAW', body={'values': [[1, 2]]}
+            ).execute()
+        self.assertEqual(outside.exception.resp.status, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
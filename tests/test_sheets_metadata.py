@@ -0,0 +1,86 @@
+import unittest
+import os
+import shutil
+import tempfile
+
+from sheets_metadata import SheetsMetadataCache
+
+
+class _Call:
+    def __init__(self, service, name, kwargs):
+        self.service, self.name, self.kwargs = service, name, kwargs
+
+    def execute(self):
+        self.service.calls.append(self.name)
+        if self.name == 'get':
+            return {'spreadsheetId': 'abc', 'properties': {'title': 'ISM Manufacturing Report Analysis'},
+                    'sheets': [{'properties': {'sheetId': 0, 'title': 'Sheet1',
+                                               'gridProperties': {'rowCount': 1000, 'columnCount': 26}}}]}
+        requests = self.kwargs['body']['requests']
+        return {'replies': [{'addSheet': {'properties': {'sheetId': 100 + i, 'title': r['addSheet']['properties']['title'],
+                                                         'gridProperties': {'rowCount': 1000, 'columnCount': 26}}}}
+                            if 'addSheet' in r else {} for i, r in enumerate(requests)]}
+
+
+class RecordingService:
+    def __init__(self):
+        self.calls = []
+
+    def spreadsheets(self):
+        return self
+
+    def get(self, **kwargs):
+        return _Call(self, 'get', kwargs)
+
+    def batchUpdate(self, **kwargs):
+        return _Call(self, 'batchUpdate', kwargs)
+
+
+class TestSheetsMetadataCache(unittest.TestCase):
+    """Test that spreadsheet metadata is fetched once and kept up to date locally."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.test_dir, 'cache', 'sheets_metadata.v1.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_one_get_then_replies_and_persistence(self):
+        """Test one GET per sync, addSheet replies recorded and reuse across instances."""
+        service = RecordingService()
+        metadata = SheetsMetadataCache(self.path)
+        metadata.set_spreadsheet_id('ISM Manufacturing Report Analysis', 'abc')
+
+        tabs = ['Manufacturing PMI Heatmap Summary', 'Manufacturing Growth Alphabetical']
+        sheet_ids = metadata.ensure_tabs(service, 'abc', tabs)
+        self.assertEqual(sheet_ids, {tabs[0]: 100, tabs[1]: 101})  # Sheet1 was deleted with the same call
+        self.assertEqual(metadata.ensure_tabs(service, 'abc', tabs), sheet_ids)
+        self.assertEqual(metadata.sheet_ids(service, 'abc'), sheet_ids)
+        self.assertEqual(service.calls, ['get', 'batchUpdate'])
+
+        metadata.set_grid('abc', tabs[0], 2000, 30)
+
+        # A later run reads everything from disk
+        service.calls.clear()
+        metadata = SheetsMetadataCache(self.path)
+        self.assertEqual(metadata.get_spreadsheet_id('ISM Manufacturing Report Analysis'), 'abc')
+        self.assertEqual(metadata.sheet_ids(service, 'abc'), sheet_ids)
+        self.assertEqual(metadata.tabs(service, 'abc')[tabs[0]]['rows'], 2000)
+        self.assertEqual(service.calls, [])
+
+        # Invalidated or expired metadata is fetched again, once
+        metadata.invalidate('abc')
+        metadata.sheet_ids(service, 'abc')
+        metadata.sheet_ids(service, 'abc')
+        self.assertEqual(service.calls, ['get'])
+        self.assertEqual(metadata.spreadsheet_title('abc'), 'ISM Manufacturing Report Analysis')
+
+        service.calls.clear()
+        expired = SheetsMetadataCache(self.path, ttl=-1)
+        expired.sheet_ids(service, 'abc')
+        self.assertEqual(service.calls, ['get'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import unittest
+import shutil
+import tempfile
+from datetime import date
+
+from sheets_sync import SheetsSyncEngine, a1_range, column_letter, diff_grid, sheets_date_serial
+
+
+class _Call:
+    def __init__(self, calls, name, kwargs):
+        self.calls, self.name, self.kwargs = calls, name, kwargs
+
+    def execute(self):
+        self.calls.append((self.name, self.kwargs))
+        if self.name == 'get':
+            return {'sheets': [{'properties': {'sheetId': 7, 'title': 'Heatmap',
+                                               'gridProperties': {'rowCount': 1000, 'columnCount': 26}},
+                                'conditionalFormats': [{}, {}]}]}
+        return {}
+
+
+class RecordingService:
+    """Minimal stand-in for the Sheets resource that records every executed call."""
+
+    def __init__(self):
+        self.calls = []
+
+    def spreadsheets(self):
+        return self
+
+    def values(self):
+        return self
+
+    def get(self, **kwargs):
+        return _Call(self.calls, 'get', kwargs)
+
+    def batchUpdate(self, **kwargs):
+        name = 'values.batchUpdate' if 'valueInputOption' in kwargs['body'] else 'batchUpdate'
+        return _Call(self.calls, name, kwargs)
+
+    def batchClear(self, **kwargs):
+        return _Call(self.calls, 'values.batchClear', kwargs)
+
+
+class TestSheetsSync(unittest.TestCase):
+    """Test the diff-based Google Sheets sync engine."""
+
+    def setUp(self):
+        self.state_dir = tempfile.mkdtemp()
+        self.rows = [['Month', 'PMI', 'New Orders']] + [[45000 + m, 50.0 + m, 48.5] for m in range(12)]
+        self.formatting = [{'addConditionalFormatRule': {'rule': {'ranges': [{'sheetId': 7}]}, 'index': 5}}]
+
+    def tearDown(self):
+        shutil.rmtree(self.state_dir)
+
+    def test_helpers(self):
+        """Test A1 notation, date serials and rectangle merging."""
+        self.assertEqual([column_letter(i) for i in (0, 25, 26, 51)], ['A', 'Z', 'AA', 'AZ'])
+        self.assertEqual(a1_range("Bob's Tab", 0, 1, 3, 4), "'Bob''s Tab'!B1:D3")
+        self.assertEqual(sheets_date_serial(date(2024, 1, 1)), 45292)
+
+        old = [['a', 'b', 'c', 'd'], ['e', 'f', 'g', 'h']]
+        new = [['a', 'X', 'c', 'd'], ['e', 'Y', 'g', 'h'], ['i']]
+        self.assertEqual(diff_grid(old, new), [(0, 1, 2, 2), (2, 0, 3, 1)])
+        self.assertEqual(diff_grid(new, new), [])
+        # Cells dropped from the grid are cleared
+        self.assertEqual(diff_grid(old, old[:1]), [(1, 0, 2, 4)])
+
+    def test_push_sends_only_changes(self):
+        """Test that a second push sends one changed cell and skips unchanged formatting."""
+        service = RecordingService()
+        engine = SheetsSyncEngine(service, 'sheet-1', self.state_dir)
+        engine.stage('Heatmap', 7, self.rows, self.formatting)
+        first = engine.push()
+
+        names = [name for name, _ in service.calls]
+        self.assertEqual(names, ['get', 'values.batchClear', 'values.batchUpdate', 'batchUpdate'])
+        formatting_body = service.calls[-1][1]['body']['requests']
+        # The two rules already on the tab are removed before ours is added at index 0
+        self.assertEqual(len(formatting_body), 3)
+        self.assertEqual(formatting_body[-1]['addConditionalFormatRule']['index'], 0)
+        self.assertEqual(first['cells_changed'], 39)
+
+        # A new engine picks up the stored state; only one value changed
+        service.calls.clear()
+        rows = [list(row) for row in self.rows]
+        rows[12][1] = 99.9
+        engine = SheetsSyncEngine(service, 'sheet-1', self.state_dir)
+        engine.stage('Heatmap', 7, rows, self.formatting)
+        second = engine.push()
+
+        self.assertEqual(len(service.calls), 2)
+        self.assertEqual(service.calls[0][1]['body']['data'], [{'range': "'Heatmap'!B13:B13", 'values': [[99.9]]}])
+        self.assertEqual(service.calls[1][1]['body']['requests'][0],
+                         {'deleteConditionalFormatRule': {'sheetId': 7, 'index': 0}})
+        self.assertEqual((second['cells_changed'], second['ranges'], second['requests']), (1, 1, 2))
+        self.assertGreater(second['bytes_saved'], 0)
+
+        # Nothing changed: nothing is sent
+        service.calls.clear()
+        engine.stage('Heatmap', 7, rows, self.formatting)
+        third = engine.push()
+        self.assertEqual(service.calls, [])
+        self.assertEqual(third['requests_saved'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,24 @@
+import unittest
+
+from benchmarks.bench_startup import profile_import
+
+# Most milliseconds `import app` may take in a fresh interpreter (about 0.4 s
+# with the heavy dependencies deferred, over 1 s when they load at startup)
+COLD_START_BUDGET_MS = 2500
+
+class TestStartup(unittest.TestCase):
+    """Test that the app starts without loading its heavy dependencies."""
+
+    def test_cold_start(self):
+        try:
+            elapsed, heavy_loaded, imports = profile_import('app')
+        except RuntimeError as e:
+            if 'ModuleNotFoundError' in str(e):
+                self.skipTest(f"app dependencies are not installed: {str(e).splitlines()[-1]}")
+            raise
+        self.assertEqual(heavy_loaded, [])
+        self.assertLess(elapsed, COLD_START_BUDGET_MS)
+        self.assertIn('app', [name for name, self_us, cumulative_us, depth in imports])
+
+if __name__ == '__main__':
+    unittest.main()
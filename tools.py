@@ -5,7 +5,6 @@ import traceback
 from typing import Dict, Any, Optional, List, Union, Tuple
 import pandas as pd
 from google_auth import get_google_sheets_service
-import pdfplumber
 import openai
 from dotenv import load_dotenv
 import re
@@ -15,7 +14,8 @@ from db_utils import (
     get_index_time_series, 
     get_industry_status_over_time,
     get_all_indices,
-    initialize_database,
+    ensure_database_initialized,
+    db_connection,
     check_report_exists_in_db,
     get_all_report_dates
 )
@@ -25,6 +25,12 @@ from crewai.tools import BaseTool
 from pydantic import Field
 from googleapiclient.errors import HttpError
 from report_detection import EnhancedReportTypeDetector
+from pdf_text_cache import get_pdf_pages, document_hash
+from llm_cache import llm_response_cache
+from report_sections import PARALLEL_SECTIONS, SECTION_PROMPTS, SECTION_WORKERS, slice_report, glance_prompt, summary_prompt
+from sheets_sync import SheetsSyncEngine, sheets_date_serial
+from sheets_client import SheetsClient, with_backoff
+from sheets_metadata import SheetsMetadataCache
 from extraction_strategy import StrategyRegistry
 from data_validation import DataTransformationPipeline
 
@@ -126,29 +132,19 @@ class SimplePDFExtractionTool(BaseTool):
             logger.info(f"Initial month_year from filename: {month_year}")
             
             # Extract text from ALL pages
+            # (pages are cached by content hash, so detection and repeat runs share one parse)
             extracted_text = ""
             try:
-                with pdfplumber.open(pdf_path) as pdf:
-                    page_count = len(pdf.pages)
-                    logger.info(f"Extracting all {page_count} pages from PDF")
-                    
-                    for i in range(page_count):
-                        page_text = pdf.pages[i].extract_text()
-                        if page_text:
-                            extracted_text += page_text + "\n\n"
+                pages = get_pdf_pages(pdf_path, 'pdfplumber')
+                logger.info(f"Extracting all {len(pages)} pages from PDF")
+                extracted_text = "".join(page_text + "\n\n" for page_text in pages if page_text)
             except Exception as e:
                 logger.warning(f"Error extracting text with pdfplumber: {str(e)}")
                 # Fallback to PyPDF2
                 try:
-                    from PyPDF2 import PdfReader
-                    reader = PdfReader(pdf_path)
-                    page_count = len(reader.pages)
-                    logger.info(f"Fallback: Extracting all {page_count} pages with PyPDF2")
-                    
-                    for i in range(page_count):
-                        page_text = reader.pages[i].extract_text()
-                        if page_text:
-                            extracted_text += page_text + "\n\n"
+                    pages = get_pdf_pages(pdf_path, 'pypdf2')
+                    logger.info(f"Fallback: Extracting all {len(pages)} pages with PyPDF2")
+                    extracted_text = "".join(page_text + "\n\n" for page_text in pages if page_text)
                 except Exception as e2:
                     logger.error(f"Both PDF extraction methods failed: {str(e2)}")
             
@@ -170,6 +166,15 @@ class SimplePDFExtractionTool(BaseTool):
                 except Exception as e:
                     logger.warning(f"Failed to extract month_year from text: {str(e)}")
 
+            # Send only the glance table and index summaries when both can be located
+            pdf_hash = document_hash(pdf_path)
+            sections = self._report_sections(extracted_text, report_type)
+            if sections is not None and PARALLEL_SECTIONS:
+                parallel_data = self._extract_sections_in_parallel(pdf_hash, sections, report_type)
+                if parallel_data:
+                    return self._finalize_extraction(parallel_data, month_year, report_type)
+            document_text = sections.render() if sections is not None else extracted_text[:80000]
+
             # Report-type specific variables
             if report_type == "Manufacturing":
                 prompt_title = "Manufacturing"
@@ -284,7 +289,7 @@ class SimplePDFExtractionTool(BaseTool):
             REMINDER: Use ONLY the Series Index column values, NOT the Percent Point Change values!
 
             Here is the extracted text from the PDF:
-            {extracted_text[:80000]}  # Limit text length to 80,000 chars to avoid token limits
+            {document_text}
             """
             
             # Call OpenAI API with robust error handling and retries
@@ -292,21 +297,24 @@ class SimplePDFExtractionTool(BaseTool):
             retry_delay = 2  # seconds
             
             extraction_data = None  # Initialize extraction_data to avoid reference errors
+            model = "gpt-4o"
+            messages = [
+                {"role": "system", "content": "You are a data extraction specialist that returns only valid JSON."},
+                {"role": "user", "content": prompt}
+            ]
             
             for retry_count in range(max_retries):
                 try:
-                    client = openai.OpenAI()
-                    response = client.chat.completions.create(
-                        model="gpt-4o",
-                        messages=[
-                            {"role": "system", "content": "You are a data extraction specialist that returns only valid JSON."},
-                            {"role": "user", "content": prompt}
-                        ],
-                        temperature=0.0
+                    # Identical (document, prompt, model) requests are answered from the response cache
+                    response_text, cache_response = llm_response_cache.complete(
+                        pdf_hash, messages, model,
+                        lambda: openai.OpenAI().chat.completions.create(
+                            model=model, messages=messages, temperature=0.0
+                        ).choices[0].message.content,
+                        temperature=0.0,
+                        bypass=normalized_input.get('bypass_llm_cache', False)
                     )
                     
-                    response_text = response.choices[0].message.content
-                    
                     # Try to parse the JSON
                     try:
                         json_text = response_text
@@ -321,42 +329,9 @@ class SimplePDFExtractionTool(BaseTool):
                                 json_text = json_match.group(1)
                         
                         json_data = json.loads(json_text)
+                        cache_response()
                         
-                        # Ensure required fields exist
-                        if "month_year" not in json_data:
-                            json_data["month_year"] = month_year
-                        if "indices" not in json_data:
-                            json_data["indices"] = {}
-                        if "industry_data" not in json_data:
-                            json_data["industry_data"] = {}
-                        if "index_summaries" not in json_data:
-                            json_data["index_summaries"] = {}
-                        
-                        # CRITICAL FIX: Always set report_type
-                        json_data["report_type"] = report_type
-
-                        extraction_data = json_data
-                        
-                        # FIXED: Apply Services-specific corrections BEFORE other processing
-                        if report_type == "Services":
-                            extraction_data = self._fix_services_indices(extraction_data)
-                            logger.info("Applied Services-specific index corrections")
-                        
-                        # FIXED: Ensure correct PMI index names with better error handling
-                        try:
-                            extraction_data = self._ensure_correct_pmi_index(extraction_data, report_type)
-                        except Exception as e:
-                            logger.error(f"Error in _ensure_correct_pmi_index: {str(e)}")
-                            # Continue with processing even if this fails
-                        
-                        # FIXED: Validate PMI values
-                        try:
-                            extraction_data = self._validate_and_fix_pmi_values(extraction_data, report_type)
-                        except Exception as e:
-                            logger.error(f"Error in _validate_and_fix_pmi_values: {str(e)}")
-                            # Continue with processing even if this fails
-
-                        return extraction_data
+                        return self._finalize_extraction(json_data, month_year, report_type)
 
                     except Exception as e:
                         logger.error(f"Error in PDF extraction: {str(e)}")
@@ -438,6 +413,138 @@ class SimplePDFExtractionTool(BaseTool):
                 "report_type": "Manufacturing"
             }
     
+    def _finalize_extraction(self, json_data, month_year, report_type):
+        """Fill in missing fields and apply the report-type corrections to parsed LLM output."""
+        # Ensure required fields exist
+        if not json_data.get("month_year"):
+            json_data["month_year"] = month_year
+        if "indices" not in json_data:
+            json_data["indices"] = {}
+        if "industry_data" not in json_data:
+            json_data["industry_data"] = {}
+        if "index_summaries" not in json_data:
+            json_data["index_summaries"] = {}
+
+        # CRITICAL FIX: Always set report_type
+        json_data["report_type"] = report_type
+
+        extraction_data = json_data
+
+        # FIXED: Apply Services-specific corrections BEFORE other processing
+        if report_type == "Services":
+            extraction_data = self._fix_services_indices(extraction_data)
+            logger.info("Applied Services-specific index corrections")
+
+        # FIXED: Ensure correct PMI index names with better error handling
+        try:
+            extraction_data = self._ensure_correct_pmi_index(extraction_data, report_type)
+        except Exception as e:
+            logger.error(f"Error in _ensure_correct_pmi_index: {str(e)}")
+            # Continue with processing even if this fails
+
+        # FIXED: Validate PMI values
+        try:
+            extraction_data = self._validate_and_fix_pmi_values(extraction_data, report_type)
+        except Exception as e:
+            logger.error(f"Error in _validate_and_fix_pmi_values: {str(e)}")
+            # Continue with processing even if this fails
+
+        return extraction_data
+
+    def _report_sections(self, extracted_text, report_type, handler=None):
+        """
+        The report's glance table and index summaries, or None when section
+        prompts are disabled or a section could not be located (the caller
+        then sends the full text).
+        """
+        if not SECTION_PROMPTS:
+            return None
+        try:
+            if handler is None:
+                from report_handlers import ReportTypeFactory
+                handler = ReportTypeFactory.create_handler(report_type)
+            sections = slice_report(extracted_text, report_type, handler.get_indices())
+        except Exception as e:
+            logger.warning(f"Could not slice report into sections: {str(e)}")
+            return None
+
+        stats = sections.stats()
+        if not sections.complete:
+            logger.info(f"Report sections incomplete (missing {sections.missing}, glance table "
+                        f"{'found' if sections.glance else 'not found'}), sending the full text")
+            return None
+        logger.info(f"Sending report sections instead of the full text: ~{stats['section_tokens']} "
+                    f"instead of ~{stats['full_tokens']} tokens")
+        return sections
+
+    def _complete_json(self, pdf_hash, prompt, model="gpt-4o", max_retries=3, retry_delay=2):
+        """One cached chat completion parsed as JSON; None if every attempt fails."""
+        messages = [
+            {"role": "system", "content": "You are a data extraction specialist that returns only valid JSON."},
+            {"role": "user", "content": prompt}
+        ]
+        for retry_count in range(max_retries):
+            try:
+                response_text, cache_response = llm_response_cache.complete(
+                    pdf_hash, messages, model,
+                    lambda: openai.OpenAI().chat.completions.create(
+                        model=model, messages=messages, temperature=0.0
+                    ).choices[0].message.content,
+                    temperature=0.0
+                )
+                json_match = re.search(r'```(?:json)?\n?(.*?)\n?```', response_text, re.DOTALL)
+                json_data = json.loads(json_match.group(1) if json_match else response_text)
+                if isinstance(json_data, dict):
+                    cache_response()
+                    return json_data
+            except Exception as e:
+                logger.warning(f"Section extraction failed on retry {retry_count}: {str(e)}")
+                if retry_count < max_retries - 1:
+                    import time
+                    time.sleep(retry_delay * (retry_count + 1))
+        return None
+
+    def _extract_sections_in_parallel(self, pdf_hash, sections, report_type, handler=None):
+        """
+        Extract with one call for the glance table and one per index summary,
+        run concurrently. Summaries are taken from the sliced text rather than
+        echoed back by the model. Returns None if any call fails.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        if handler is None:
+            from report_handlers import ReportTypeFactory
+            handler = ReportTypeFactory.create_handler(report_type)
+        indices = handler.get_indices()
+        # The headline PMI summary lists no industries
+        industry_indices = [index_name for index_name in sections.summaries if not index_name.endswith(' PMI')]
+
+        prompts = {None: glance_prompt(sections, indices)}
+        for index_name in industry_indices:
+            prompts[index_name] = summary_prompt(sections, index_name, handler.get_index_categories(index_name))
+
+        with ThreadPoolExecutor(max_workers=max(1, SECTION_WORKERS), thread_name_prefix='ism-section') as pool:
+            futures = {key: pool.submit(self._complete_json, pdf_hash, prompt) for key, prompt in prompts.items()}
+            results = {key: future.result() for key, future in futures.items()}
+
+        if any(result is None for result in results.values()):
+            logger.warning("Parallel section extraction incomplete, falling back to a single prompt")
+            return None
+
+        glance = results.pop(None)
+        industry_data = {}
+        for index_name, result in results.items():
+            categories = result.get(index_name, result)
+            if isinstance(categories, dict):
+                industry_data[index_name] = categories
+        return {
+            "month_year": glance.get("month_year"),
+            "indices": glance.get("indices", {}),
+            "industry_data": industry_data,
+            "index_summaries": dict(sections.summaries),
+            "report_type": report_type
+        }
+
     def _fix_services_indices(self, extraction_data):
         """ENHANCED: Fix Services reports with comprehensive index name mapping."""
         if not extraction_data or 'indices' not in extraction_data:
@@ -548,8 +655,10 @@ class SimplePDFExtractionTool(BaseTool):
             # Return original data on error to avoid cascading failures
             return extracted_data
 
-    def _extract_data_with_llm(self, pdf_path: str, month_year_context: str, handler: Any, report_type_str: str) -> Dict[str, Any]:
+    def _extract_data_with_llm(self, pdf_path: str, month_year_context: str, handler: Any = None, report_type_str: Optional[str] = None) -> Dict[str, Any]:
         """Extract data from PDF using LLM with the appropriate report handler."""
+        month_year = month_year_context
+        report_type = report_type_str
         try:
             # Create handler if not provided
             if handler is None:
@@ -563,29 +672,19 @@ class SimplePDFExtractionTool(BaseTool):
                 report_type = handler.__class__.__name__.replace('ReportHandler', '')
                 
             # Extract text from ALL pages
+            # (pages are cached by content hash, so detection and repeat runs share one parse)
             extracted_text = ""
             try:
-                with pdfplumber.open(pdf_path) as pdf:
-                    page_count = len(pdf.pages)
-                    logger.info(f"Extracting all {page_count} pages from PDF")
-                    
-                    for i in range(page_count):
-                        page_text = pdf.pages[i].extract_text()
-                        if page_text:
-                            extracted_text += page_text + "\n\n"
+                pages = get_pdf_pages(pdf_path, 'pdfplumber')
+                logger.info(f"Extracting all {len(pages)} pages from PDF")
+                extracted_text = "".join(page_text + "\n\n" for page_text in pages if page_text)
             except Exception as e:
                 logger.warning(f"Error extracting text with pdfplumber: {str(e)}")
                 # Fallback to PyPDF2
                 try:
-                    from PyPDF2 import PdfReader
-                    reader = PdfReader(pdf_path)
-                    page_count = len(reader.pages)
-                    logger.info(f"Fallback: Extracting all {page_count} pages with PyPDF2")
-                    
-                    for i in range(page_count):
-                        page_text = reader.pages[i].extract_text()
-                        if page_text:
-                            extracted_text += page_text + "\n\n"
+                    pages = get_pdf_pages(pdf_path, 'pypdf2')
+                    logger.info(f"Fallback: Extracting all {len(pages)} pages with PyPDF2")
+                    extracted_text = "".join(page_text + "\n\n" for page_text in pages if page_text)
                 except Exception as e2:
                     logger.error(f"Both PDF extraction methods failed: {str(e2)}")
             
@@ -628,35 +727,49 @@ class SimplePDFExtractionTool(BaseTool):
             # If we get here, either the extraction strategy framework isn't available or it failed
             # Continue with the existing LLM-based extraction
             
+            # Send only the glance table and index summaries when both can be located
+            pdf_hash = document_hash(pdf_path)
+            sections = self._report_sections(extracted_text, report_type, handler)
+            if sections is not None and PARALLEL_SECTIONS:
+                parallel_data = self._extract_sections_in_parallel(pdf_hash, sections, report_type, handler)
+                if parallel_data:
+                    try:
+                        from data_validation import DataTransformationPipeline
+                        return DataTransformationPipeline.process(parallel_data, report_type)
+                    except ImportError:
+                        return parallel_data
+            document_text = sections.render() if sections is not None else extracted_text
+
             # Get extraction prompt from handler
             prompt = f"""
             {handler.get_extraction_prompt()}
             
             Here is the extracted text from the PDF:
-            {extracted_text}
+            {document_text}
             """
             
             # Call OpenAI API with robust error handling and retries
             max_retries = 3
             retry_delay = 2  # seconds
             
+            model = "gpt-4o"  # Using gpt-4o
+            messages = [
+                {"role": "system", "content": "You are a data extraction specialist that returns only valid JSON."},
+                {"role": "user", "content": prompt}
+            ]
+            
             for retry_count in range(max_retries):
                 try:
-                    # Use openai client
-                    client = openai.OpenAI()
-                    response = client.chat.completions.create(
-                        model="gpt-4o",  # Using gpt-4o
-                        messages=[
-                            {"role": "system", "content": "You are a data extraction specialist that returns only valid JSON."},
-                            {"role": "user", "content": prompt}
-                        ],
-                        temperature=0.0  # Low temperature for deterministic output
+                    # Reuse the completion of an identical (document, prompt, model) request
+                    response_text, cache_response = llm_response_cache.complete(
+                        pdf_hash, messages, model,
+                        lambda: openai.OpenAI().chat.completions.create(
+                            model=model, messages=messages,
+                            temperature=0.0  # Low temperature for deterministic output
+                        ).choices[0].message.content,
+                        temperature=0.0
                     )
                     
-                    # Get the response text
-                    response_text = response.choices[0].message.content
-                    # Removed verbose logging
-                    
                     # Try to parse the JSON
                     try:
                         # Clean up the response to extract just the JSON part
@@ -689,6 +802,7 @@ class SimplePDFExtractionTool(BaseTool):
                         # Ensure industry_data field exists
                         if "industry_data" not in json_data:
                             json_data["industry_data"] = {}
+                        cache_response()
                         
                         # NEW ENHANCEMENT: Validate with the new pipeline if available
                         try:
@@ -1278,6 +1392,7 @@ class GoogleSheetsFormatterTool(BaseTool):
         # ADDED: Track current report type for this instance
         self._current_report_type = None
         self._extraction_data = None
+        self._sheets_metadata = None
 
     def _run(self, data: Dict[str, Any]) -> bool:
         """Main entry point for the Google Sheets Formatter Tool."""
@@ -1306,18 +1421,7 @@ class GoogleSheetsFormatterTool(BaseTool):
                     logger.warning(f"Month/year changed during verification - using original {month_year}")
                     data['verification_result']['month_year'] = month_year
             
-            # ENHANCED: Store data in database with proper report type
-            try:
-                if extraction_data and 'month_year' in extraction_data:
-                    from db_utils import store_report_data_in_db
-                    pdf_path = data.get('pdf_path', 'unknown_path')
-                    store_result = store_report_data_in_db(extraction_data, pdf_path, report_type)
-                    if store_result:
-                        logger.info(f"Successfully stored {report_type} report data in database")
-                    else:
-                        logger.warning(f"Failed to store {report_type} report data in database")
-            except Exception as e:
-                logger.error(f"Error storing {report_type} data in database: {str(e)}")
+            # Callers store the report (through their store_fn) before formatting it
             
             # Get Google Sheets service
             service = get_google_sheets_service()
@@ -1325,39 +1429,50 @@ class GoogleSheetsFormatterTool(BaseTool):
                 logger.error("Failed to get Google Sheets service")
                 return False
             
+            # Fresh metadata view for this run: at most one metadata GET per sync
+            self._sheets_metadata = SheetsMetadataCache()
+            
             # ENHANCED: Create report-type specific sheet name
             sheet_title = f"ISM {report_type} Report Analysis"
-            sheet_id = self._get_or_create_sheet(service, sheet_title)
+            tab_names = self._sheet_tab_names(report_type)
+            sheet_id = self._get_or_create_sheet(service, sheet_title, list(tab_names.values()))
             if not sheet_id:
                 logger.error(f"Failed to get or create Google Sheet for {report_type}")
                 return False
             
-            # Get all sheet IDs for tabs
-            sheet_ids = self._get_all_sheet_ids(service, sheet_id)
-            
             # ENHANCED: Create tabs with report type context
             try:
-                # 1. Update the heatmap tab with values only
+                sheet_ids = self._sheets_metadata.ensure_tabs(service, sheet_id, list(tab_names.values()))
+                
+                # Build every tab from the database, then push only what changed since the last sync
+                indices = get_all_indices(report_type=report_type)
+                months = self._report_months(report_type)
+                tabs = []
+                
+                # 1. Heatmap tab with values only
                 monthly_data = get_pmi_data_by_month(24, report_type)  # Pass report_type
-                heatmap_result = self.update_heatmap_tab(service, sheet_id, monthly_data, report_type)
-                if heatmap_result:
-                    logger.info(f"Successfully updated {report_type} heatmap tab")
+                if monthly_data:
+                    tab_id = sheet_ids[tab_names['heatmap']]
+                    rows, formatting_requests = self._build_heatmap_tab(monthly_data, report_type, tab_id)
+                    tabs.append((tab_names['heatmap'], tab_id, rows, formatting_requests))
                 else:
-                    logger.warning(f"Failed to update {report_type} heatmap tab")
+                    logger.warning(f"No monthly data provided for {report_type} heatmap update")
                 
-                # 2. Create alphabetical growth tab with report type
-                alpha_result = self.create_alphabetical_growth_tab(service, sheet_id, sheet_ids, report_type)
-                if alpha_result:
-                    logger.info(f"Successfully created {report_type} alphabetical growth tab")
-                else:
-                    logger.warning(f"Failed to create {report_type} alphabetical growth tab")
+                # 2. Alphabetical growth tab
+                tab_id = sheet_ids[tab_names['alphabetical']]
+                rows, formatting_requests = self._build_alphabetical_growth_tab(tab_id, report_type, indices, months)
+                tabs.append((tab_names['alphabetical'], tab_id, rows, formatting_requests))
                 
-                # 3. Create numerical growth tab with report type  
-                num_result = self.create_numerical_growth_tab(service, sheet_id, sheet_ids, report_type)
-                if num_result:
-                    logger.info(f"Successfully created {report_type} numerical growth tab")
-                else:
-                    logger.warning(f"Failed to create {report_type} numerical growth tab")
+                # 3. Numerical growth tab
+                tab_id = sheet_ids[tab_names['numerical']]
+                rows, formatting_requests = self._build_numerical_growth_tab(tab_id, report_type, indices, months)
+                tabs.append((tab_names['numerical'], tab_id, rows, formatting_requests))
+                
+                stats = self._sync_tabs(service, sheet_id, tabs)
+                logger.info(f"Synced {report_type} tabs: {stats['tabs_changed']}/{stats['tabs']} changed, "
+                            f"{stats['cells_changed']} cells in {stats['ranges']} ranges, "
+                            f"{stats['requests']} requests ({stats['requests_saved']} saved), "
+                            f"{stats['bytes_sent']} bytes ({stats['bytes_saved']} saved)")
                 
                 logger.info(f"Successfully created/updated required tabs for {report_type}")
                 return True
@@ -1365,6 +1480,8 @@ class GoogleSheetsFormatterTool(BaseTool):
             except Exception as e:
                 logger.error(f"Error creating required tabs for {report_type}: {str(e)}")
                 logger.error(traceback.format_exc())
+                # The cached tab layout may be what is out of date; fetch it again next run
+                self._sheets_metadata.invalidate(sheet_id)
                 return False
             
         except Exception as e:
@@ -1488,201 +1605,77 @@ class GoogleSheetsFormatterTool(BaseTool):
         
         return True
     
-    def _get_or_create_sheet(self, service, title):
-        """Get an existing sheet or create a new one."""
-        try:
-            # Define the sheet_id_file path
-            sheet_id_file = "sheet_id.txt"
+    def _sheets_metadata_cache(self):
+        """Spreadsheet/tab metadata for the current run (created on first use)."""
+        if self._sheets_metadata is None:
+            self._sheets_metadata = SheetsMetadataCache()
+        return self._sheets_metadata
 
-            # First check if a saved sheet ID exists in sheet_id.txt
-            sheet_id = None
-            if os.path.exists("sheet_id.txt"):
+    def _get_or_create_sheet(self, service, title, tab_titles=None):
+        """
+        Get the spreadsheet with this title, or create it with the given tabs.
+        
+        The ID comes from the metadata cache; sheet_id.txt (written by older
+        versions) is only consulted when the cache has no entry for the title.
+        """
+        metadata = self._sheets_metadata_cache()
+        tab_titles = list(tab_titles or ['PMI Heatmap Summary', 'Growth Alphabetical', 'Growth Numerical'])
+        try:
+            sheet_id = metadata.get_spreadsheet_id(title)
+            if not sheet_id and os.path.exists("sheet_id.txt"):
                 with open("sheet_id.txt", "r") as f:
-                    sheet_id = f.read().strip()
-                    logger.info(f"Found saved sheet ID: {sheet_id}")
-                    
-                # Verify the sheet exists and is accessible
+                    saved_id = f.read().strip()
+                if saved_id:
+                    logger.info(f"Found saved sheet ID: {saved_id}")
+                    try:
+                        metadata.tabs(service, saved_id)
+                        if metadata.spreadsheet_title(saved_id) == title:
+                            metadata.set_spreadsheet_id(title, saved_id)
+                            sheet_id = saved_id
+                        else:
+                            logger.info(f"Saved sheet has title '{metadata.spreadsheet_title(saved_id)}' but we need '{title}'")
+                    except HttpError as e:
+                        logger.warning(f"Saved sheet {saved_id} is not accessible: {str(e)}")
+            
+            if sheet_id:
                 try:
-                    sheet_metadata = service.spreadsheets().get(spreadsheetId=sheet_id).execute()
-                    sheet_title = sheet_metadata['properties']['title']
-                    
-                    # If the title doesn't match what we want, set sheet_id to None to force creation of a new sheet
-                    if sheet_title != title:
-                        logger.info(f"Saved sheet has title '{sheet_title}' but we need '{title}'. Will create new sheet.")
-                        sheet_id = None
-                    else:
-                        logger.info(f"Successfully accessed existing sheet: {sheet_metadata['properties']['title']}")
-                    
-                    # Check if the default Sheet1 exists and delete it if needed
-                    sheets = sheet_metadata.get('sheets', [])
-                    sheet1_id = None
-                    for sheet in sheets:
-                        if sheet.get('properties', {}).get('title') == 'Sheet1':
-                            sheet1_id = sheet.get('properties', {}).get('sheetId')
-                            break
-                    
-                    # Check if all required tabs exist
-                    existing_tabs = [sheet.get('properties', {}).get('title') for sheet in sheets]
-                    
-                    # ONLY CHECK FOR THE THREE REQUIRED TABS
-                    required_tabs = ['PMI Heatmap Summary', 'Growth Alphabetical', 'Growth Numerical']
-                    missing_tabs = [tab for tab in required_tabs if tab not in existing_tabs]
-                    
-                    # Create any missing tabs
-                    if missing_tabs:
-                        requests = []
-                        for tab in missing_tabs:
-                            requests.append({
-                                'addSheet': {
-                                    'properties': {
-                                        'title': tab
-                                    }
-                                }
-                            })
-                        
-                        # Delete Sheet1 if it exists and we're adding new tabs
-                        if sheet1_id is not None:
-                            requests.append({
-                                'deleteSheet': {
-                                    'sheetId': sheet1_id
-                                }
-                            })
-                        
-                        # Execute batch update to add missing tabs
-                        if requests:
-                            service.spreadsheets().batchUpdate(
-                                spreadsheetId=sheet_id,
-                                body={'requests': requests}
-                            ).execute()
-                            logger.info(f"Added {len(missing_tabs)} missing tabs to existing sheet")
-                    
-                    # If we got here, we have a valid sheet ID and all tabs exist
+                    # Cached tabs need no GET; otherwise this single GET also verifies the sheet exists
+                    metadata.tabs(service, sheet_id)
+                    logger.info(f"Using existing sheet '{title}': {sheet_id}")
                     return sheet_id
                 except HttpError as e:
-                    if e.resp.status == 404:
-                        logger.warning("Sheet not found, creating new sheet")
-                        # Reset sheet_id to force creation of a new sheet
-                        sheet_id = None
-                        # You may want to update sheet_id.txt with empty content or remove it
-                        with open("sheet_id.txt", "w") as f:
-                            f.write("")  # Clear the file
-                    else:
+                    if e.resp.status != 404:
                         # For other HTTP errors, log and propagate
                         logger.error(f"HTTP error accessing sheet: {str(e)}")
                         raise
-                except Exception as e:
-                    # Handle other types of exceptions
-                    logger.error(f"Error accessing saved sheet: {str(e)}")
-                    sheet_id = None
-        
-            # Create a new sheet if needed
-            if not sheet_id:
-                logger.info("Creating new Google Sheet")
-                sheet_metadata = {
-                    'properties': {
-                        'title': title
-                    }
-                }
-                
-                sheet = service.spreadsheets().create(body=sheet_metadata).execute()
-                sheet_id = sheet['spreadsheetId']
-                logger.info(f"Created new sheet with ID: {sheet_id}")
-                
-                # Save the sheet ID for future use
-                with open(sheet_id_file, "w") as f:
-                    f.write(sheet_id)
-                    logger.info(f"Saved sheet ID to {sheet_id_file}")
-                
-                # Create ONLY the three required tabs
-                requests = []
-                
-                # Add PMI Heatmap Summary tab
-                requests.append({
-                    'addSheet': {
-                        'properties': {
-                            'title': 'PMI Heatmap Summary'
-                        }
-                    }
-                })
-                
-                # Add Growth Alphabetical tab
-                requests.append({
-                    'addSheet': {
-                        'properties': {
-                            'title': 'Growth Alphabetical'
-                        }
-                    }
-                })
-                
-                # Add Growth Numerical tab
-                requests.append({
-                    'addSheet': {
-                        'properties': {
-                            'title': 'Growth Numerical'
-                        }
-                    }
-                })
-                
-                # Delete the default Sheet1 if it exists
-                sheet_metadata = service.spreadsheets().get(spreadsheetId=sheet_id).execute()
-                sheets = sheet_metadata.get('sheets', [])
-                default_sheet_id = None
-                
-                # Find the ID of Sheet1
-                for sheet in sheets:
-                    if sheet.get('properties', {}).get('title') == 'Sheet1':
-                        default_sheet_id = sheet.get('properties', {}).get('sheetId')
-                        break
-                
-                if default_sheet_id is not None:
-                    requests.append({
-                        'deleteSheet': {
-                            'sheetId': default_sheet_id
-                        }
-                    })
-                
-                # Execute all sheet operations in one batch
-                if requests:
-                    service.spreadsheets().batchUpdate(
-                        spreadsheetId=sheet_id,
-                        body={'requests': requests}
-                    ).execute()
-                    logger.info("Set up all tabs and removed default Sheet1")
-                
-                return sheet_id
+                    logger.warning("Sheet not found, creating new sheet")
+                    metadata.forget_spreadsheet(title)
+            
+            # Create the spreadsheet with its tabs in one call (no default Sheet1 to delete)
+            logger.info("Creating new Google Sheet")
+            sheet = service.spreadsheets().create(body={
+                'properties': {'title': title},
+                'sheets': [{'properties': {'title': tab}} for tab in tab_titles]
+            }).execute()
+            sheet_id = sheet['spreadsheetId']
+            logger.info(f"Created new sheet with ID: {sheet_id}")
+            
+            metadata.record(sheet, sheet_id)
+            metadata.set_spreadsheet_id(title, sheet_id)
+            
+            # Keep sheet_id.txt pointing at the latest sheet for main.py and the volume tools
+            with open("sheet_id.txt", "w") as f:
+                f.write(sheet_id)
             
             return sheet_id
         except Exception as e:
             logger.error(f"Error finding or creating sheet: {str(e)}")
-            # Attempt to create new sheet as a last resort
-            try:
-                logger.info("Creating new sheet as fallback after error")
-                sheet_metadata = {
-                    'properties': {
-                        'title': title
-                    }
-                }
-                
-                sheet = service.spreadsheets().create(body=sheet_metadata).execute()
-                new_sheet_id = sheet['spreadsheetId']
-                
-                # Save the new sheet ID
-                with open("sheet_id.txt", "w") as f:
-                    f.write(new_sheet_id)
-                
-                return new_sheet_id
-            except Exception as e2:
-                logger.error(f"Final fallback creation failed: {str(e2)}")
-                return None
+            return None
                     
     def _get_all_sheet_ids(self, service, spreadsheet_id):
         """Get a mapping of sheet names to sheet IDs."""
         try:
-            sheet_metadata = service.spreadsheets().get(spreadsheetId=spreadsheet_id).execute()
-            return {
-                sheet.get('properties', {}).get('title'): sheet.get('properties', {}).get('sheetId')
-                for sheet in sheet_metadata.get('sheets', [])
-            }
+            return self._sheets_metadata_cache().sheet_ids(service, spreadsheet_id)
         except Exception as e:
             logger.error(f"Error getting sheet IDs: {str(e)}")
             return {}
@@ -1713,32 +1706,32 @@ class GoogleSheetsFormatterTool(BaseTool):
                     logger.info(f"Table content sample: {table_content[:200]}...")
                 
                 # Get pmi_data from extraction_data if available
-                from db_utils import initialize_database, parse_date
+                from db_utils import parse_date
                 
                 # Format the month_year for database query
                 formatted_date = parse_date(month_year)
                 if formatted_date:
                     logger.info(f"Parsed date: {formatted_date}")
                     # Try to get data from DB using the parsed date
-                    initialize_database()
-                    conn = get_db_connection()
-                    cursor = conn.cursor()
+                    ensure_database_initialized()
+                    with db_connection() as conn:
+                        cursor = conn.cursor()
                     
-                    cursor.execute(
-                        """
-                        SELECT * FROM pmi_indices 
-                        WHERE report_date = ?
-                        """,
-                        (formatted_date.isoformat(),)
-                    )
+                        cursor.execute(
+                            """
+                            SELECT * FROM pmi_indices 
+                            WHERE report_date = ?
+                            """,
+                            (formatted_date.isoformat(),)
+                        )
                     
-                    indices_data = {}
-                    for row in cursor.fetchall():
-                        index_name = row['index_name']
-                        indices_data[index_name] = {
-                            "current": str(row['index_value']),
-                            "direction": row['direction']
-                        }
+                        indices_data = {}
+                        for row in cursor.fetchall():
+                            index_name = row['index_name']
+                            indices_data[index_name] = {
+                                "current": str(row['index_value']),
+                                "direction": row['direction']
+                            }
                     
                     if indices_data:
                         logger.info(f"Found {len(indices_data)} indices in database")
@@ -1796,50 +1789,50 @@ class GoogleSheetsFormatterTool(BaseTool):
             
             # If Manufacturing PMI is missing from indices, check the database
             if "Manufacturing PMI" not in indices:
-                from db_utils import get_db_connection, parse_date
+                from db_utils import parse_date
                 
                 # Try to get data from DB using the date
                 formatted_date = parse_date(formatted_month_year)
                 if formatted_date:
                     try:
-                        initialize_database()
-                        conn = get_db_connection()
-                        cursor = conn.cursor()
-                        
-                        # Look specifically for Manufacturing PMI
-                        cursor.execute(
-                            """
-                            SELECT * FROM pmi_indices 
-                            WHERE report_date = ? AND index_name = ?
-                            """,
-                            (formatted_date.isoformat(), "Manufacturing PMI")
-                        )
+                        ensure_database_initialized()
+                        with db_connection() as conn:
+                            cursor = conn.cursor()
                         
-                        row_data = cursor.fetchone()
-                        if row_data:
-                            indices["Manufacturing PMI"] = {
-                                "current": str(row_data['index_value']),
-                                "direction": row_data['direction']
-                            }
-                            logger.info(f"Retrieved Manufacturing PMI from database: {row_data['index_value']} ({row_data['direction']})")
-                        else:
-                            # If Manufacturing PMI not found, look for any index data
+                            # Look specifically for Manufacturing PMI
                             cursor.execute(
                                 """
                                 SELECT * FROM pmi_indices 
-                                WHERE report_date = ? 
-                                ORDER BY id DESC LIMIT 1
+                                WHERE report_date = ? AND index_name = ?
                                 """,
-                                (formatted_date.isoformat(),)
+                                (formatted_date.isoformat(), "Manufacturing PMI")
                             )
-                            
+                        
                             row_data = cursor.fetchone()
                             if row_data:
-                                logger.info(f"Using fallback index data for Manufacturing PMI from {row_data['index_name']}")
                                 indices["Manufacturing PMI"] = {
                                     "current": str(row_data['index_value']),
                                     "direction": row_data['direction']
                                 }
+                                logger.info(f"Retrieved Manufacturing PMI from database: {row_data['index_value']} ({row_data['direction']})")
+                            else:
+                                # If Manufacturing PMI not found, look for any index data
+                                cursor.execute(
+                                    """
+                                    SELECT * FROM pmi_indices 
+                                    WHERE report_date = ? 
+                                    ORDER BY id DESC LIMIT 1
+                                    """,
+                                    (formatted_date.isoformat(),)
+                                )
+                            
+                                row_data = cursor.fetchone()
+                                if row_data:
+                                    logger.info(f"Using fallback index data for Manufacturing PMI from {row_data['index_name']}")
+                                    indices["Manufacturing PMI"] = {
+                                        "current": str(row_data['index_value']),
+                                        "direction": row_data['direction']
+                                    }
                     except Exception as e:
                         logger.error(f"Error retrieving index data from database: {str(e)}")
             
@@ -2980,31 +2973,8 @@ class GoogleSheetsFormatterTool(BaseTool):
             Boolean indicating success
         """
         try:
-            # First ensure all required tabs exist (do this in one batch)
-            existing_tabs = self._get_all_sheet_ids(service, sheet_id)
-            tabs_to_create = []
-
-            for tab_name in all_tab_data.keys():
-                if tab_name not in existing_tabs:
-                    tabs_to_create.append(tab_name)
-
-            # Create all missing tabs in one batch
-            if tabs_to_create:
-                create_requests = [
-                    {
-                        'addSheet': {
-                            'properties': {
-                                'title': tab_name
-                            }
-                        }
-                    }
-                    for tab_name in tabs_to_create
-                ]
-
-                self._batch_update_requests(service, sheet_id, create_requests)
-
-                # Refresh sheet_id mapping
-                existing_tabs = self._get_all_sheet_ids(service, sheet_id)
+            # First ensure all required tabs exist (one batch; new IDs come from the addSheet replies)
+            existing_tabs = self._sheets_metadata_cache().ensure_tabs(service, sheet_id, list(all_tab_data.keys()))
 
             # Group all value updates
             value_batch_requests = []
@@ -3122,15 +3092,15 @@ class GoogleSheetsFormatterTool(BaseTool):
                 break
         return column_letter
     
-    def _batch_update_requests(self, service, sheet_id, requests, max_batch_size=100):
+    def _batch_update_requests(self, service, sheet_id, requests, max_batch_size=None):
         """
-        Execute batch updates with proper chunking and backoff strategy.
+        Execute batch updates through the rate-limited Sheets client.
         
         Args:
             service: Google Sheets API service
             sheet_id: Spreadsheet ID
             requests: List of update requests
-            max_batch_size: Maximum number of requests per batch (to avoid hitting request size limits)
+            max_batch_size: Unused; batches are sized by payload (ISM_SHEETS_MAX_PAYLOAD_BYTES)
             
         Returns:
             List of response objects
@@ -3138,50 +3108,16 @@ class GoogleSheetsFormatterTool(BaseTool):
         if not requests:
             return []
         
-        responses = []
-        # Split requests into manageable batches to avoid hitting request size limits
-        for i in range(0, len(requests), max_batch_size):
-            batch = requests[i:i + max_batch_size]
-            logger.info(f"Executing batch of {len(batch)} requests")
-            
-            def execute_batch():
-                return service.spreadsheets().batchUpdate(
-                    spreadsheetId=sheet_id,
-                    body={"requests": batch}
-                ).execute()
-            
-            # Execute with backoff
-            response = self._execute_with_backoff(execute_batch)
-            responses.append(response)
-            
-            # Add a brief delay between batches to reduce chance of rate limiting
-            if i + max_batch_size < len(requests):
-                import time
-                time.sleep(1)
-        
-        return responses
+        logger.info(f"Executing batch of {len(requests)} requests")
+        response = SheetsClient.wrap(service).spreadsheets().batchUpdate(
+            spreadsheetId=sheet_id,
+            body={"requests": requests}
+        ).execute()
+        return [response]
                 
     def _execute_with_backoff(self, request_func, max_retries=5, initial_delay=1, backoff_factor=2):
-        """Execute a request with exponential backoff for rate limit errors."""
-        delay = initial_delay
-        for retry in range(max_retries):
-            try:
-                return request_func()
-            except Exception as e:
-                if retry == max_retries - 1:
-                    # Last retry, re-raise the exception
-                    raise
-                
-                if "429" in str(e) or "Quota exceeded" in str(e):
-                    # This is a rate limit error, apply backoff
-                    logger.warning(f"Rate limit error, retrying in {delay} seconds: {str(e)}")
-                    import time
-                    time.sleep(delay)
-                    # Increase delay for next retry
-                    delay *= backoff_factor
-                else:
-                    # Not a rate limit error, re-raise
-                    raise
+        """Execute a request with jittered exponential backoff on throttling and server errors."""
+        return with_backoff(request_func, max_retries=max_retries, initial_delay=initial_delay)
 
     def _update_heatmap_summary_tab(self, service, sheet_id, tab_id, header_row, data_rows):
         """
@@ -3447,6 +3383,49 @@ class GoogleSheetsFormatterTool(BaseTool):
             logger.error(traceback.format_exc())
             return None
 
+    def _sheet_tab_names(self, report_type):
+        """Titles of the formatter tabs for a report type."""
+        return {
+            'heatmap': f'{report_type} PMI Heatmap Summary',
+            'alphabetical': f'{report_type} Growth Alphabetical',
+            'numerical': f'{report_type} Growth Numerical'
+        }
+
+    def _ensure_tabs(self, service, sheet_id, sheet_ids, tab_names):
+        """
+        Create any missing tabs in one batchUpdate.
+        
+        Returns:
+            Updated mapping of tab names to sheet IDs (new IDs come from the addSheet replies,
+            which also update the metadata cache)
+        """
+        if all(sheet_ids.get(name) is not None for name in tab_names):
+            return sheet_ids
+        return dict(sheet_ids, **self._sheets_metadata_cache().ensure_tabs(service, sheet_id, tab_names))
+
+    def _report_months(self, report_type):
+        """Month/year labels of every stored report of a type, newest first."""
+        report_dates = get_all_report_dates(report_type=report_type)
+        report_dates.sort(key=lambda x: x['report_date'], reverse=True)
+        return [date['month_year'] for date in report_dates]
+
+    def _sync_tabs(self, service, sheet_id, tabs):
+        """
+        Push built tabs through the diff-based sync engine.
+        
+        Args:
+            service: Google Sheets API service
+            sheet_id: Spreadsheet ID
+            tabs: List of (tab name, tab ID, rows, formatting requests)
+        
+        Returns:
+            Sync statistics from SheetsSyncEngine.push
+        """
+        sync = SheetsSyncEngine(service, sheet_id, metadata=self._sheets_metadata_cache())
+        for tab_name, tab_id, rows, formatting in tabs:
+            sync.stage(tab_name, tab_id, rows, formatting)
+        return sync.push()
+
     def update_heatmap_tab(self, service, sheet_id, monthly_data, report_type=None):
         """
         Update heatmap tab with values only (no direction).
@@ -3468,154 +3447,153 @@ class GoogleSheetsFormatterTool(BaseTool):
                 logger.warning(f"No monthly data provided for {report_type} heatmap update")
                 return False
                 
-            tab_name = f'{report_type} PMI Heatmap Summary'
+            tab_name = self._sheet_tab_names(report_type)['heatmap']
             tab_id = self._get_all_sheet_ids(service, sheet_id).get(tab_name)
             
-            if not tab_id:
+            if tab_id is None:
                 logger.warning(f"{tab_name} tab not found")
                 return False
-                
-            # Get all unique index names
-            all_indices = set()
-            for data in monthly_data:
-                all_indices.update(data['indices'].keys())
             
-            # Order indices with Manufacturing PMI first, then alphabetically
-            ordered_indices = ['Manufacturing PMI']
-            ordered_indices.extend(sorted([idx for idx in all_indices if idx != 'Manufacturing PMI']))
+            rows, formatting_requests = self._build_heatmap_tab(monthly_data, report_type, tab_id)
+            self._sync_tabs(service, sheet_id, [(tab_name, tab_id, rows, formatting_requests)])
+            logger.info("Successfully updated and formatted heatmap summary (values only)")
+            return True
+        except Exception as e:
+            logger.error(f"Error updating {report_type} heatmap tab: {str(e)}")
+            logger.error(traceback.format_exc())
+            return False
+
+    def _build_heatmap_tab(self, monthly_data, report_type, tab_id):
+        """
+        Build the heatmap tab grid (one row per month, oldest first) and its formatting.
+        
+        Returns:
+            Tuple of (rows including the header, formatting requests)
+        """
+        # Get all unique index names
+        all_indices = set()
+        for data in monthly_data:
+            all_indices.update(data['indices'].keys())
+        
+        # Order indices with the report type's PMI first, then alphabetically
+        main_pmi_index = f"{report_type} PMI"
+        ordered_indices = [main_pmi_index]
+        ordered_indices.extend(sorted([idx for idx in all_indices if idx != main_pmi_index]))
+        
+        # Map to the expected column names
+        column_mapping = {
+            'Manufacturing PMI': 'PMI',
+            'Services PMI': 'PMI',
+            'New Orders': 'New Orders',
+            'Production': 'Production',
+            'Employment': 'Employment',
+            'Supplier Deliveries': 'Deliveries',
+            'Inventories': 'Inventories',
+            "Customers' Inventories": 'Customer Inv',
+            'Prices': 'Prices',
+            'Backlog of Orders': 'Ord Backlog',
+            'New Export Orders': 'Exports',
+            'Imports': 'Imports'
+        }
+        
+        # Prepare header row with mapped column names
+        header_row = ["Month"]
+        header_row.extend([column_mapping.get(idx, idx) for idx in ordered_indices])
+        
+        # Convert month_year to datetime objects for sorting
+        from datetime import datetime
+        import re
+        
+        processed_data = []
+        for data in monthly_data:
+            month_year = data['month_year']
             
-            # Map to the expected column names
-            column_mapping = {
-                'Manufacturing PMI': 'PMI',
-                'New Orders': 'New Orders',
-                'Production': 'Production',
-                'Employment': 'Employment',
-                'Supplier Deliveries': 'Deliveries',
-                'Inventories': 'Inventories',
-                "Customers' Inventories": 'Customer Inv',
-                'Prices': 'Prices',
-                'Backlog of Orders': 'Ord Backlog',
-                'New Export Orders': 'Exports',
-                'Imports': 'Imports'
-            }
+            # Parse the date
+            try:
+                # First, try to directly parse the date if it's in a standard format
+                dt = datetime.strptime(month_year, '%B %Y')
+            except ValueError:
+                try:
+                    # Try to handle formats like "Sep - 24"
+                    match = re.match(r'(\w+)[- ](\d+)', month_year)
+                    if match:
+                        month_abbr, year_str = match.groups()
+                        
+                        # Convert month abbreviation to number
+                        month_map = {
+                            'Jan': 1, 'Feb': 2, 'Mar': 3, 'Apr': 4, 'May': 5, 'Jun': 6,
+                            'Jul': 7, 'Aug': 8, 'Sep': 9, 'Oct': 10, 'Nov': 11, 'Dec': 12
+                        }
+                        
+                        month_num = month_map.get(month_abbr, 1)
+                        
+                        # Convert 2-digit year to 4-digit year
+                        year = int(year_str)
+                        if year < 100:
+                            if year < 50:  # Arbitrary cutoff for century
+                                year += 2000
+                            else:
+                                year += 1900
+                                
+                        dt = datetime(year, month_num, 1)
+                    else:
+                        # Default to current date if parsing fails
+                        dt = datetime.now()
+                        dt = dt.replace(day=1)  # Set to first day of month
+                except Exception as e:
+                    logger.error(f"Date parsing error: {str(e)}")
+                    dt = datetime.now()
+                    dt = dt.replace(day=1)  # Set to first day of month
             
-            # Prepare header row with mapped column names
-            header_row = ["Month"]
-            header_row.extend([column_mapping.get(idx, idx) for idx in ordered_indices])
+            # Date serial number, shown as MM/dd/yyyy by the tab's date format (values are sent RAW)
+            formatted_date = sheets_date_serial(dt)
             
-            # Convert month_year to datetime objects for sorting
-            from datetime import datetime
-            import re
+            # Clean and extract numeric values ONLY (no direction)
+            row_data = [formatted_date]
             
-            processed_data = []
-            for data in monthly_data:
-                month_year = data['month_year']
+            for index_name in ordered_indices:
+                index_data = data['indices'].get(index_name, {})
+                value = index_data.get('value', '')
                 
-                # Parse the date
-                try:
-                    # First, try to directly parse the date if it's in a standard format
-                    dt = datetime.strptime(month_year, '%B %Y')
-                except ValueError:
-                    try:
-                        # Try to handle formats like "Sep - 24"
-                        match = re.match(r'(\w+)[- ](\d+)', month_year)
-                        if match:
-                            month_abbr, year_str = match.groups()
-                            
-                            # Convert month abbreviation to number
-                            month_map = {
-                                'Jan': 1, 'Feb': 2, 'Mar': 3, 'Apr': 4, 'May': 5, 'Jun': 6,
-                                'Jul': 7, 'Aug': 8, 'Sep': 9, 'Oct': 10, 'Nov': 11, 'Dec': 12
-                            }
-                            
-                            month_num = month_map.get(month_abbr, 1)
-                            
-                            # Convert 2-digit year to 4-digit year
-                            year = int(year_str)
-                            if year < 100:
-                                if year < 50:  # Arbitrary cutoff for century
-                                    year += 2000
-                                else:
-                                    year += 1900
-                                    
-                            dt = datetime(year, month_num, 1)
-                        else:
-                            # Default to current date if parsing fails
-                            dt = datetime.now()
-                            dt = dt.replace(day=1)  # Set to first day of month
-                    except Exception as e:
-                        logger.error(f"Date parsing error: {str(e)}")
-                        dt = datetime.now()
-                        dt = dt.replace(day=1)  # Set to first day of month
-                
-                # Format the date as MM/DD/YYYY format to match existing format
-                formatted_date = dt.strftime('%m/%d/%Y')
+                # If value is not available, try 'current' field
+                if not value and 'current' in index_data:
+                    value = index_data['current']
                 
-                # Clean and extract numeric values ONLY (no direction)
-                row_data = [formatted_date]
-                
-                for index_name in ordered_indices:
-                    index_data = data['indices'].get(index_name, {})
-                    value = index_data.get('value', '')
-                    
-                    # If value is not available, try 'current' field
-                    if not value and 'current' in index_data:
-                        value = index_data['current']
-                    
-                    # Clean the value to get just the numeric part
-                    if isinstance(value, str):
-                        # Extract numeric part (e.g., "50.9 (Growing)" -> 50.9)
-                        import re
-                        numeric_match = re.search(r'(\d+\.?\d*)', value)
-                        if numeric_match:
-                            value = numeric_match.group(1)
-                        else:
-                            value = ""
-                    
-                    # Convert to float if possible
-                    try:
-                        if value:
-                            value = float(value)
-                        else:
-                            value = ""
-                    except (ValueError, TypeError):
+                # Clean the value to get just the numeric part
+                if isinstance(value, str):
+                    # Extract numeric part (e.g., "50.9 (Growing)" -> 50.9)
+                    import re
+                    numeric_match = re.search(r'(\d+\.?\d*)', value)
+                    if numeric_match:
+                        value = numeric_match.group(1)
+                    else:
                         value = ""
-                    
-                    row_data.append(value)
                 
-                processed_data.append((dt, row_data))
-            
-            # Sort by date (ascending)
-            processed_data.sort(key=lambda x: x[0])
-            
-            # Extract just the row data
-            data_rows = [row for _, row in processed_data]
-            
-            # Update the tab with the data
-            result = self._update_heatmap_summary_tab(service, sheet_id, tab_id, header_row, data_rows)
-            
-            if result:
-                # Apply formatting
-                formatting_requests = self._prepare_heatmap_summary_data(
-                    tab_id, 
-                    len(data_rows) + 1,  # +1 for header
-                    len(header_row)
-                )
+                # Convert to float if possible
+                try:
+                    if value:
+                        value = float(value)
+                    else:
+                        value = ""
+                except (ValueError, TypeError):
+                    value = ""
                 
-                # Execute formatting requests
-                if formatting_requests:
-                    service.spreadsheets().batchUpdate(
-                        spreadsheetId=sheet_id,
-                        body={"requests": formatting_requests}
-                    ).execute()
-                    
-                logger.info("Successfully updated and formatted heatmap summary (values only)")
+                row_data.append(value)
             
-            return result
-        except Exception as e:
-            logger.error(f"Error updating {report_type} heatmap tab: {str(e)}")
-            logger.error(traceback.format_exc())
-            return False
+            processed_data.append((dt, row_data))
+        
+        # Sort by date (ascending)
+        processed_data.sort(key=lambda x: x[0])
+        
+        # Extract just the row data
+        data_rows = [row for _, row in processed_data]
+        
+        formatting_requests = self._prepare_heatmap_summary_data(
+            tab_id, 
+            len(data_rows) + 1,  # +1 for header
+            len(header_row)
+        )
+        return [header_row] + data_rows, formatting_requests
 
     def create_alphabetical_growth_tab(self, service, sheet_id, sheet_ids, report_type=None):
         """
@@ -3633,308 +3611,277 @@ class GoogleSheetsFormatterTool(BaseTool):
             if not report_type:
                 report_type = self.getCurrentReportType()
                 
-            tab_name = f'{report_type} Growth Alphabetical'
+            tab_name = self._sheet_tab_names(report_type)['alphabetical']
             
-            # Get report type specific indices
-            indices = get_all_indices(report_type=report_type)
-        
-            # Get the current report type from the most recent request
-            report_type = self.getCurrentReportType()
+            # Create the tab if it doesn't exist
+            sheet_ids = self._ensure_tabs(service, sheet_id, sheet_ids, [tab_name])
+            tab_id = sheet_ids[tab_name]
+            
+            rows, formatting_requests = self._build_alphabetical_growth_tab(
+                tab_id, report_type, get_all_indices(report_type=report_type), self._report_months(report_type)
+            )
+            self._sync_tabs(service, sheet_id, [(tab_name, tab_id, rows, formatting_requests)])
+            
+            logger.info(f"Successfully created/updated '{tab_name}' tab")
+            return True
+        except Exception as e:
+            logger.error(f"Error creating {report_type} alphabetical growth tab: {str(e)}")
+            logger.error(traceback.format_exc())
+            return False
 
-            # Check if tab exists
-            tab_id = sheet_ids.get(tab_name)
-            if not tab_id:
-                # Create the tab if it doesn't exist
-                add_sheet_request = {
-                    'requests': [{
-                        'addSheet': {
-                            'properties': {
-                                'title': tab_name
+    def _build_alphabetical_growth_tab(self, tab_id, report_type, indices, months):
+        """
+        Build the alphabetical growth tab: per index, one row per industry with its status each month.
+        
+        Args:
+            tab_id: Sheet ID of the tab (used in formatting ranges)
+            report_type: Type of report (Manufacturing or Services)
+            indices: Index names, in display order
+            months: Month/year column labels, newest first
+        
+        Returns:
+            Tuple of (rows, formatting requests)
+        """
+        # Create array to hold all data for batch update
+        all_rows = []
+        formatting_requests = []
+        current_row = 0
+        
+        # For each index, create a section
+        for index_num, index in enumerate(indices):
+            # Index number in the loop (for formatting)
+            section_start_row = current_row
+            
+            # Add index header with bold formatting
+            all_rows.append([f"INDEX: {index}"])
+            current_row += 1
+            
+            # Add formatting for index header
+            formatting_requests.append({
+                "repeatCell": {
+                    "range": {
+                        "sheetId": tab_id,
+                        "startRowIndex": section_start_row,
+                        "endRowIndex": section_start_row + 1,
+                        "startColumnIndex": 0,
+                        "endColumnIndex": len(months) + 1
+                    },
+                    "cell": {
+                        "userEnteredFormat": {
+                            "textFormat": {
+                                "bold": True
+                            },
+                            "backgroundColor": {
+                                "red": 0.9,
+                                "green": 0.9,
+                                "blue": 0.9
                             }
                         }
-                    }]
+                    },
+                    "fields": "userEnteredFormat.textFormat.bold,userEnteredFormat.backgroundColor"
                 }
-                response = service.spreadsheets().batchUpdate(
-                    spreadsheetId=sheet_id,
-                    body=add_sheet_request
-                ).execute()
-                
-                # Get the new sheet ID
-                tab_id = response['replies'][0]['addSheet']['properties']['sheetId']
-                logger.info(f"Created new tab '{tab_name}' with ID {tab_id}")
-                
-                # Refresh the sheet IDs mapping
-                sheet_ids = self._get_all_sheet_ids(service, sheet_id)
-            
-            # Get all indices
-            indices = get_all_indices(report_type=report_type)
-            
-            # Get all report dates for columns
-            report_dates = get_all_report_dates(report_type=report_type)
-            # Sort by date - assuming report_date is in ISO format
-            report_dates.sort(key=lambda x: x['report_date'], reverse=True)
-            months = [date['month_year'] for date in report_dates]
-            
-            # Create array to hold all data for batch update
-            all_rows = []
-            formatting_requests = []
-            current_row = 0
-            
-            # For each index, create a section
-            for index_num, index in enumerate(indices):
-                # Index number in the loop (for formatting)
-                section_start_row = current_row
-                
-                # Add index header with bold formatting
-                all_rows.append([f"INDEX: {index}"])
-                current_row += 1
-                
-                # Add formatting for index header
-                formatting_requests.append({
-                    "repeatCell": {
-                        "range": {
-                            "sheetId": tab_id,
-                            "startRowIndex": section_start_row,
-                            "endRowIndex": section_start_row + 1,
-                            "startColumnIndex": 0,
-                            "endColumnIndex": len(months) + 1
-                        },
-                        "cell": {
-                            "userEnteredFormat": {
-                                "textFormat": {
-                                    "bold": True
-                                },
-                                "backgroundColor": {
-                                    "red": 0.9,
-                                    "green": 0.9,
-                                    "blue": 0.9
-                                }
-                            }
-                        },
-                        "fields": "userEnteredFormat.textFormat.bold,userEnteredFormat.backgroundColor"
-                    }
-                })
-                
-                # Add months header row
-                header_row = ["Industry"]
-                header_row.extend(months)
-                all_rows.append(header_row)
-                current_row += 1
-                
-                # Add formatting for month header row
-                formatting_requests.append({
-                    "repeatCell": {
-                        "range": {
-                            "sheetId": tab_id,
-                            "startRowIndex": section_start_row + 1,
-                            "endRowIndex": section_start_row + 2,
-                            "startColumnIndex": 0,
-                            "endColumnIndex": len(months) + 1
-                        },
-                        "cell": {
-                            "userEnteredFormat": {
-                                "textFormat": {
-                                    "bold": True
-                                },
-                                "backgroundColor": {
-                                    "red": 0.9,
-                                    "green": 0.9,
-                                    "blue": 0.9
-                                }
+            })
+            
+            # Add months header row
+            header_row = ["Industry"]
+            header_row.extend(months)
+            all_rows.append(header_row)
+            current_row += 1
+            
+            # Add formatting for month header row
+            formatting_requests.append({
+                "repeatCell": {
+                    "range": {
+                        "sheetId": tab_id,
+                        "startRowIndex": section_start_row + 1,
+                        "endRowIndex": section_start_row + 2,
+                        "startColumnIndex": 0,
+                        "endColumnIndex": len(months) + 1
+                    },
+                    "cell": {
+                        "userEnteredFormat": {
+                            "textFormat": {
+                                "bold": True
+                            },
+                            "backgroundColor": {
+                                "red": 0.9,
+                                "green": 0.9,
+                                "blue": 0.9
                             }
-                        },
-                        "fields": "userEnteredFormat.textFormat.bold,userEnteredFormat.backgroundColor"
-                    }
-                })
-                
-                # Get industry data for this index
-                industry_data = get_industry_status_over_time(index, len(months), report_type=report_type)
-                
-                # Check if we have industry data
-                if not industry_data or 'industries' not in industry_data:
-                    logger.warning(f"No industry data found for {index}")
-                    # Add blank row between indices
-                    all_rows.append([""])
-                    current_row += 1
-                    continue
-                
-                # Get all industries and sort alphabetically
-                all_industries = sorted(industry_data['industries'].keys())
-                industry_row_start = current_row
-                
-                # Create a row for each industry
-                for industry in all_industries:
-                    row_data = [industry]
-                    
-                    # Add status for each month
-                    for month in months:
-                        status_data = industry_data['industries'][industry].get(month, {})
-                        status = status_data.get('status', 'Neutral')
-                        row_data.append(status)
-                    
-                    all_rows.append(row_data)
-                    current_row += 1
-                
+                        }
+                    },
+                    "fields": "userEnteredFormat.textFormat.bold,userEnteredFormat.backgroundColor"
+                }
+            })
+            
+            # Get industry data for this index
+            industry_data = get_industry_status_over_time(index, len(months), report_type=report_type)
+            
+            # Check if we have industry data
+            if not industry_data or 'industries' not in industry_data:
+                logger.warning(f"No industry data found for {index}")
                 # Add blank row between indices
                 all_rows.append([""])
                 current_row += 1
+                continue
+            
+            # Get all industries and sort alphabetically
+            all_industries = sorted(industry_data['industries'].keys())
+            industry_row_start = current_row
+            
+            # Create a row for each industry
+            for industry in all_industries:
+                row_data = [industry]
                 
-                # Add conditional formatting for growing/contracting status
-                formatting_requests.append({
-                    "addConditionalFormatRule": {
-                        "rule": {
-                            "ranges": [
-                                {
-                                    "sheetId": tab_id,
-                                    "startRowIndex": industry_row_start,
-                                    "endRowIndex": current_row - 1,  # Exclude the blank row
-                                    "startColumnIndex": 1,
-                                    "endColumnIndex": len(months) + 1
-                                }
-                            ],
-                            "booleanRule": {
-                                "condition": {
-                                    "type": "TEXT_EQ",
-                                    "values": [{"userEnteredValue": "Growing"}]
-                                },
-                                "format": {
-                                    "backgroundColor": {
-                                        "red": 0.7,
-                                        "green": 0.9,
-                                        "blue": 0.7
-                                    }
-                                }
-                            }
-                        },
-                        "index": index_num * 3  # Ensure unique indices for each rule
-                    }
-                })
+                # Add status for each month
+                for month in months:
+                    status_data = industry_data['industries'][industry].get(month, {})
+                    status = status_data.get('status', 'Neutral')
+                    row_data.append(status)
                 
-                formatting_requests.append({
-                    "addConditionalFormatRule": {
-                        "rule": {
-                            "ranges": [
-                                {
-                                    "sheetId": tab_id,
-                                    "startRowIndex": industry_row_start,
-                                    "endRowIndex": current_row - 1,
-                                    "startColumnIndex": 1,
-                                    "endColumnIndex": len(months) + 1
-                                }
-                            ],
-                            "booleanRule": {
-                                "condition": {
-                                    "type": "TEXT_EQ",
-                                    "values": [{"userEnteredValue": "Contracting"}]
-                                },
-                                "format": {
-                                    "backgroundColor": {
-                                        "red": 0.9,
-                                        "green": 0.7,
-                                        "blue": 0.7
-                                    }
-                                }
+                all_rows.append(row_data)
+                current_row += 1
+            
+            # Add blank row between indices
+            all_rows.append([""])
+            current_row += 1
+            
+            # Add conditional formatting for growing/contracting status
+            formatting_requests.append({
+                "addConditionalFormatRule": {
+                    "rule": {
+                        "ranges": [
+                            {
+                                "sheetId": tab_id,
+                                "startRowIndex": industry_row_start,
+                                "endRowIndex": current_row - 1,  # Exclude the blank row
+                                "startColumnIndex": 1,
+                                "endColumnIndex": len(months) + 1
                             }
-                        },
-                        "index": index_num * 3 + 1
-                    }
-                })
-                
-                formatting_requests.append({
-                    "addConditionalFormatRule": {
-                        "rule": {
-                            "ranges": [
-                                {
-                                    "sheetId": tab_id,
-                                    "startRowIndex": industry_row_start,
-                                    "endRowIndex": current_row - 1,
-                                    "startColumnIndex": 1,
-                                    "endColumnIndex": len(months) + 1
-                                }
-                            ],
-                            "booleanRule": {
-                                "condition": {
-                                    "type": "TEXT_EQ",
-                                    "values": [{"userEnteredValue": "Neutral"}]
-                                },
-                                "format": {
-                                    "backgroundColor": {
-                                        "red": 0.9,
-                                        "green": 0.9,
-                                        "blue": 0.7
-                                    }
+                        ],
+                        "booleanRule": {
+                            "condition": {
+                                "type": "TEXT_EQ",
+                                "values": [{"userEnteredValue": "Growing"}]
+                            },
+                            "format": {
+                                "backgroundColor": {
+                                    "red": 0.7,
+                                    "green": 0.9,
+                                    "blue": 0.7
                                 }
                             }
-                        },
-                        "index": index_num * 3 + 2
-                    }
-                })
+                        }
+                    },
+                    "index": index_num * 3  # Ensure unique indices for each rule
+                }
+            })
             
-            # Add borders, freeze, and auto-resize
             formatting_requests.append({
-                "updateBorders": {
-                    "range": {
-                        "sheetId": tab_id,
-                        "startRowIndex": 0,
-                        "endRowIndex": current_row,
-                        "startColumnIndex": 0,
-                        "endColumnIndex": len(months) + 1
+                "addConditionalFormatRule": {
+                    "rule": {
+                        "ranges": [
+                            {
+                                "sheetId": tab_id,
+                                "startRowIndex": industry_row_start,
+                                "endRowIndex": current_row - 1,
+                                "startColumnIndex": 1,
+                                "endColumnIndex": len(months) + 1
+                            }
+                        ],
+                        "booleanRule": {
+                            "condition": {
+                                "type": "TEXT_EQ",
+                                "values": [{"userEnteredValue": "Contracting"}]
+                            },
+                            "format": {
+                                "backgroundColor": {
+                                    "red": 0.9,
+                                    "green": 0.7,
+                                    "blue": 0.7
+                                }
+                            }
+                        }
                     },
-                    "top": {"style": "SOLID"},
-                    "bottom": {"style": "SOLID"},
-                    "left": {"style": "SOLID"},
-                    "right": {"style": "SOLID"},
-                    "innerHorizontal": {"style": "SOLID"},
-                    "innerVertical": {"style": "SOLID"}
+                    "index": index_num * 3 + 1
                 }
             })
             
-            # Freeze first column (industry names)
             formatting_requests.append({
-                "updateSheetProperties": {
-                    "properties": {
-                        "sheetId": tab_id,
-                        "gridProperties": {
-                            "frozenColumnCount": 1
+                "addConditionalFormatRule": {
+                    "rule": {
+                        "ranges": [
+                            {
+                                "sheetId": tab_id,
+                                "startRowIndex": industry_row_start,
+                                "endRowIndex": current_row - 1,
+                                "startColumnIndex": 1,
+                                "endColumnIndex": len(months) + 1
+                            }
+                        ],
+                        "booleanRule": {
+                            "condition": {
+                                "type": "TEXT_EQ",
+                                "values": [{"userEnteredValue": "Neutral"}]
+                            },
+                            "format": {
+                                "backgroundColor": {
+                                    "red": 0.9,
+                                    "green": 0.9,
+                                    "blue": 0.7
+                                }
+                            }
                         }
                     },
-                    "fields": "gridProperties.frozenColumnCount"
+                    "index": index_num * 3 + 2
                 }
             })
-            
-            # Auto-resize columns
-            formatting_requests.append({
-                "autoResizeDimensions": {
-                    "dimensions": {
-                        "sheetId": tab_id,
-                        "dimension": "COLUMNS",
-                        "startIndex": 0,
-                        "endIndex": len(months) + 1
+        
+        # Add borders, freeze, and auto-resize
+        formatting_requests.append({
+            "updateBorders": {
+                "range": {
+                    "sheetId": tab_id,
+                    "startRowIndex": 0,
+                    "endRowIndex": current_row,
+                    "startColumnIndex": 0,
+                    "endColumnIndex": len(months) + 1
+                },
+                "top": {"style": "SOLID"},
+                "bottom": {"style": "SOLID"},
+                "left": {"style": "SOLID"},
+                "right": {"style": "SOLID"},
+                "innerHorizontal": {"style": "SOLID"},
+                "innerVertical": {"style": "SOLID"}
+            }
+        })
+        
+        # Freeze first column (industry names)
+        formatting_requests.append({
+            "updateSheetProperties": {
+                "properties": {
+                    "sheetId": tab_id,
+                    "gridProperties": {
+                        "frozenColumnCount": 1
                     }
+                },
+                "fields": "gridProperties.frozenColumnCount"
+            }
+        })
+        
+        # Auto-resize columns
+        formatting_requests.append({
+            "autoResizeDimensions": {
+                "dimensions": {
+                    "sheetId": tab_id,
+                    "dimension": "COLUMNS",
+                    "startIndex": 0,
+                    "endIndex": len(months) + 1
                 }
-            })
-            
-            # Update the sheet
-            service.spreadsheets().values().update(
-                spreadsheetId=sheet_id,
-                range=f"'{tab_name}'!A1",
-                valueInputOption="RAW",
-                body={"values": all_rows}
-            ).execute()
-            
-            # Apply all the formatting
-            if formatting_requests:
-                service.spreadsheets().batchUpdate(
-                    spreadsheetId=sheet_id,
-                    body={"requests": formatting_requests}
-                ).execute()
-            
-            logger.info(f"Successfully created/updated '{tab_name}' tab")
-            return True
-        except Exception as e:
-            logger.error(f"Error creating {report_type} alphabetical growth tab: {str(e)}")
-            logger.error(traceback.format_exc())
-            return False
+            }
+        })
+        
+        return all_rows, formatting_requests
 
     def create_numerical_growth_tab(self, service, sheet_id, sheet_ids, report_type=None):
         """
@@ -3952,260 +3899,229 @@ class GoogleSheetsFormatterTool(BaseTool):
             if not report_type:
                 report_type = self.getCurrentReportType()
                 
-            tab_name = f'{report_type} Growth Numerical'
+            tab_name = self._sheet_tab_names(report_type)['numerical']
+            
+            # Create the tab if it doesn't exist
+            sheet_ids = self._ensure_tabs(service, sheet_id, sheet_ids, [tab_name])
+            tab_id = sheet_ids[tab_name]
             
-            # ENHANCED: Use report type specific logic
-            main_pmi_index = f"{report_type} PMI"
-            indices = [idx for idx in get_all_indices(report_type=report_type) if idx != main_pmi_index]
+            rows, formatting_requests = self._build_numerical_growth_tab(
+                tab_id, report_type, get_all_indices(report_type=report_type), self._report_months(report_type)
+            )
+            self._sync_tabs(service, sheet_id, [(tab_name, tab_id, rows, formatting_requests)])
             
-            # Get the current report type
-            report_type = getCurrentReportType() 
+            logger.info(f"Successfully created/updated '{tab_name}' tab")
+            return True
+        except Exception as e:
+            logger.error(f"Error creating {report_type} numerical growth tab: {str(e)}")
+            logger.error(traceback.format_exc())
+            return False
 
-            # Check if tab exists
-            tab_id = sheet_ids.get(tab_name)
-            if not tab_id:
-                # Create the tab if it doesn't exist
-                add_sheet_request = {
-                    'requests': [{
-                        'addSheet': {
-                            'properties': {
-                                'title': tab_name
-                            }
-                        }
-                    }]
-                }
-                response = service.spreadsheets().batchUpdate(
-                    spreadsheetId=sheet_id,
-                    body=add_sheet_request
-                ).execute()
-                
-                # Get the new sheet ID
-                tab_id = response['replies'][0]['addSheet']['properties']['sheetId']
-                logger.info(f"Created new tab '{tab_name}' with ID {tab_id}")
-                
-                # Refresh the sheet IDs mapping
-                sheet_ids = self._get_all_sheet_ids(service, sheet_id)
-            
-            # Get all indices - FILTER OUT MANUFACTURING PMI
-            indices = [idx for idx in get_all_indices(report_type=report_type) if idx != 'Manufacturing PMI']
-            
-            # Get report dates filtered by report type
-            from db_utils import get_db_connection
-            conn = get_db_connection()
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                SELECT report_date, month_year 
-                FROM reports 
-                WHERE report_type = ?
-                ORDER BY report_date DESC
+    def _build_numerical_growth_tab(self, tab_id, report_type, indices, months):
+        """
+        Build the numerical growth tab: per index, industries ranked within each month.
+        
+        Args:
+            tab_id: Sheet ID of the tab (used in formatting ranges)
+            report_type: Type of report (Manufacturing or Services)
+            indices: Index names; the report type's headline PMI is skipped
+            months: Month/year column labels, newest first
+        
+        Returns:
+            Tuple of (rows, formatting requests)
+        """
+        main_pmi_index = f"{report_type} PMI"
+        indices = [idx for idx in indices if idx != main_pmi_index]
+        
+        # The 18 standard industries - COMPLETE LIST
+        all_standard_industries = [
+            "Apparel, Leather & Allied Products",
+            "Chemical Products",
+            "Computer & Electronic Products",
+            "Electrical Equipment, Appliances & Components",
+            "Fabricated Metal Products",
+            "Food, Beverage & Tobacco Products",
+            "Furniture & Related Products",
+            "Machinery",
+            "Miscellaneous Manufacturing",
+            "Nonmetallic Mineral Products",
+            "Paper Products",
+            "Petroleum & Coal Products",
+            "Plastics & Rubber Products",
+            "Primary Metals",
+            "Printing & Related Support Activities",
+            "Textile Mills",
+            "Transportation Equipment",
+            "Wood Products"
+        ]
+        
+        # Mapping from DB industry names to standard names
+        standard_industries_mapping = {
+            "Apparel, Leather & Allied Products": ["Apparel", "Apparel, Leather", "Apparel & Leather"],
+            "Chemical Products": ["Chemical", "Chemicals"],
+            "Computer & Electronic Products": ["Computer", "Computer & Electronic", "Electronics"],
+            "Electrical Equipment, Appliances & Components": ["Electrical", "Electrical Equipment", "Appliances"],
+            "Fabricated Metal Products": ["Fabricated Metal", "Metal Products", "Fabricated"],
+            "Food, Beverage & Tobacco Products": ["Food", "Food & Beverage", "Food, Beverage & Tobacco"],
+            "Furniture & Related Products": ["Furniture", "Furniture & Related"],
+            "Machinery": ["Machinery"],
+            "Miscellaneous Manufacturing": ["Miscellaneous"],
+            "Nonmetallic Mineral Products": ["Nonmetallic", "Mineral Products", "Nonmetallic Mineral"],
+            "Paper Products": ["Paper"],
+            "Petroleum & Coal Products": ["Petroleum", "Petroleum & Coal", "Coal Products"],
+            "Plastics & Rubber Products": ["Plastics", "Rubber", "Plastics & Rubber"],
+            "Primary Metals": ["Primary Metal", "Metals"],
+            "Printing & Related Support Activities": ["Printing", "Related Support"],
+            "Textile Mills": ["Textile", "Textiles"],
+            "Transportation Equipment": ["Transportation", "Transportation Equipment"],
+            "Wood Products": ["Wood"]
+        }
+        
+        # Create a reverse lookup for standardizing DB entries
+        industry_standardization = {}
+        for standard, variations in standard_industries_mapping.items():
+            for variation in variations:
+                industry_standardization[variation.lower()] = standard
+            industry_standardization[standard.lower()] = standard
+        
+        # Every industry status of this report type in one query, grouped by (month, index)
+        industry_rows = {}
+        with db_connection() as conn:
+            cursor = conn.execute("""
+                SELECT r.month_year, s.index_name, s.industry_name, s.status, s.category
+                FROM industry_status s
+                JOIN reports r ON r.report_date = s.report_date AND r.report_type = s.report_type
+                WHERE s.report_type = ?
+                ORDER BY s.id
             """, (report_type,))
-
-            report_dates = [dict(row) for row in cursor.fetchall()]
-            months = [date['month_year'] for date in report_dates]
-            
-            # The 18 standard industries - COMPLETE LIST
-            all_standard_industries = [
-                "Apparel, Leather & Allied Products",
-                "Chemical Products",
-                "Computer & Electronic Products",
-                "Electrical Equipment, Appliances & Components",
-                "Fabricated Metal Products",
-                "Food, Beverage & Tobacco Products",
-                "Furniture & Related Products",
-                "Machinery",
-                "Miscellaneous Manufacturing",
-                "Nonmetallic Mineral Products",
-                "Paper Products",
-                "Petroleum & Coal Products",
-                "Plastics & Rubber Products",
-                "Primary Metals",
-                "Printing & Related Support Activities",
-                "Textile Mills",
-                "Transportation Equipment",
-                "Wood Products"
-            ]
+            for row in cursor.fetchall():
+                industry_rows.setdefault((row['month_year'], row['index_name']), []).append(row)
+        
+        # Create array to hold all data for batch update
+        all_rows = []
+        formatting_requests = []
+        current_row = 0
+        
+        # For each index, create a section
+        for index_num, index in enumerate(indices):
+            section_start_row = current_row
             
-            # Mapping from DB industry names to standard names
-            standard_industries_mapping = {
-                "Apparel, Leather & Allied Products": ["Apparel", "Apparel, Leather", "Apparel & Leather"],
-                "Chemical Products": ["Chemical", "Chemicals"],
-                "Computer & Electronic Products": ["Computer", "Computer & Electronic", "Electronics"],
-                "Electrical Equipment, Appliances & Components": ["Electrical", "Electrical Equipment", "Appliances"],
-                "Fabricated Metal Products": ["Fabricated Metal", "Metal Products", "Fabricated"],
-                "Food, Beverage & Tobacco Products": ["Food", "Food & Beverage", "Food, Beverage & Tobacco"],
-                "Furniture & Related Products": ["Furniture", "Furniture & Related"],
-                "Machinery": ["Machinery"],
-                "Miscellaneous Manufacturing": ["Miscellaneous"],
-                "Nonmetallic Mineral Products": ["Nonmetallic", "Mineral Products", "Nonmetallic Mineral"],
-                "Paper Products": ["Paper"],
-                "Petroleum & Coal Products": ["Petroleum", "Petroleum & Coal", "Coal Products"],
-                "Plastics & Rubber Products": ["Plastics", "Rubber", "Plastics & Rubber"],
-                "Primary Metals": ["Primary Metal", "Metals"],
-                "Printing & Related Support Activities": ["Printing", "Related Support"],
-                "Textile Mills": ["Textile", "Textiles"],
-                "Transportation Equipment": ["Transportation", "Transportation Equipment"],
-                "Wood Products": ["Wood"]
-            }
+            # Add index header with bold formatting
+            all_rows.append([f"INDEX: {index}"])
+            current_row += 1
             
-            # Create a reverse lookup for standardizing DB entries
-            industry_standardization = {}
-            for standard, variations in standard_industries_mapping.items():
-                for variation in variations:
-                    industry_standardization[variation.lower()] = standard
-                industry_standardization[standard.lower()] = standard
-            
-            # Create array to hold all data for batch update
-            all_rows = []
-            formatting_requests = []
-            current_row = 0
-            
-            # For each index, create a section
-            for index_num, index in enumerate(indices):
-                section_start_row = current_row
-                
-                # Add index header with bold formatting
-                all_rows.append([f"INDEX: {index}"])
-                current_row += 1
-                
-                # Add formatting for index header
-                formatting_requests.append({
-                    "repeatCell": {
-                        "range": {
-                            "sheetId": tab_id,
-                            "startRowIndex": section_start_row,
-                            "endRowIndex": section_start_row + 1,
-                            "startColumnIndex": 0,
-                            "endColumnIndex": len(months) * 2 + 2  # Enough columns for all tables
-                        },
-                        "cell": {
-                            "userEnteredFormat": {
-                                "textFormat": {
-                                    "bold": True
-                                },
-                                "backgroundColor": {
-                                    "red": 0.9,
-                                    "green": 0.9,
-                                    "blue": 0.9
-                                }
+            # Add formatting for index header
+            formatting_requests.append({
+                "repeatCell": {
+                    "range": {
+                        "sheetId": tab_id,
+                        "startRowIndex": section_start_row,
+                        "endRowIndex": section_start_row + 1,
+                        "startColumnIndex": 0,
+                        "endColumnIndex": len(months) * 2 + 2  # Enough columns for all tables
+                    },
+                    "cell": {
+                        "userEnteredFormat": {
+                            "textFormat": {
+                                "bold": True
+                            },
+                            "backgroundColor": {
+                                "red": 0.9,
+                                "green": 0.9,
+                                "blue": 0.9
                             }
-                        },
-                        "fields": "userEnteredFormat.textFormat.bold,userEnteredFormat.backgroundColor"
-                    }
-                })
+                        }
+                    },
+                    "fields": "userEnteredFormat.textFormat.bold,userEnteredFormat.backgroundColor"
+                }
+            })
 
-                # Define positive and negative categories based on index type
-                pos_category = "Growing"
-                neg_category = "Declining"
-                
-                if index == "Supplier Deliveries":
-                    pos_category = "Slower"
-                    neg_category = "Faster"
-                elif index == "Inventories":
-                    pos_category = "Higher"
-                    neg_category = "Lower"
-                elif index == "Customers' Inventories":
-                    pos_category = "Too High"
-                    neg_category = "Too Low"
-                elif index == "Prices":
-                    pos_category = "Increasing"
-                    neg_category = "Decreasing"
-                
-                # Process each month to determine rankings
-                month_rankings = []
-                
-                for month in months:
-                    try:
-                        # Get report date for this month
-                        cursor.execute("""
-                            SELECT report_date
-                            FROM reports
-                            WHERE month_year = ?
-                        """, (month,))
-                        report_date_row = cursor.fetchone()
+            # Define positive and negative categories based on index type
+            pos_category = "Growing"
+            neg_category = "Declining"
+            
+            if index == "Supplier Deliveries":
+                pos_category = "Slower"
+                neg_category = "Faster"
+            elif index == "Inventories":
+                pos_category = "Higher"
+                neg_category = "Lower"
+            elif index == "Customers' Inventories":
+                pos_category = "Too High"
+                neg_category = "Too Low"
+            elif index == "Prices":
+                pos_category = "Increasing"
+                neg_category = "Decreasing"
+            
+            # Process each month to determine rankings
+            month_rankings = []
+            
+            for month in months:
+                try:
+                    # Industries reported for this index and month (loaded above)
+                    month_rows = industry_rows.get((month, index))
+                    
+                    if month_rows is not None:
+                        # Process into positive and negative categories
+                        pos_industries = []
+                        neg_industries = []
+                        seen_industries = set()
                         
-                        if report_date_row:
-                            report_date = report_date_row['report_date']
-                            
-                            # Get industries for this index and month
-                            cursor.execute("""
-                                SELECT industry_name, status, category
-                                FROM industry_status
-                                WHERE report_date = ? AND index_name = ?
-                                ORDER BY id
-                            """, (report_date, index))
+                        for i, row in enumerate(month_rows):
+                            db_industry = row['industry_name']
+                            category = row['category']
                             
-                            # Process into positive and negative categories
-                            pos_industries = []
-                            neg_industries = []
-                            seen_industries = set()
+                            # Standardize industry name
+                            std_industry = self._standardize_industry_name(
+                                db_industry, 
+                                industry_standardization,
+                                all_standard_industries
+                            )
                             
-                            for i, row in enumerate(cursor.fetchall()):
-                                db_industry = row['industry_name']
-                                category = row['category']
-                                
-                                # Standardize industry name
-                                std_industry = self._standardize_industry_name(
-                                    db_industry, 
-                                    industry_standardization,
-                                    all_standard_industries
-                                )
-                                
-                                # Skip if invalid or already seen
-                                if not std_industry or std_industry not in all_standard_industries or std_industry in seen_industries:
-                                    continue
-                                    
-                                seen_industries.add(std_industry)
+                            # Skip if invalid or already seen
+                            if not std_industry or std_industry not in all_standard_industries or std_industry in seen_industries:
+                                continue
                                 
-                                if category == pos_category:
-                                    pos_industries.append((std_industry, i))
-                                elif category == neg_category:
-                                    neg_industries.append((std_industry, i))
+                            seen_industries.add(std_industry)
                             
-                            # Build the full ranking map
-                            ranking_map = {}
-                            
-                            # Positive industries get positive ranks (highest first)
-                            for i, (industry, order) in enumerate(pos_industries):
-                                rank = len(pos_industries) - i
-                                ranking_map[industry] = rank
-                            
-                            # Negative industries get negative ranks (most negative last)
-                            neg_industries.reverse()  # Reverse to maintain original DBs order
-                            for i, (industry, order) in enumerate(neg_industries):
-                                rank = -1 - i
-                                ranking_map[industry] = rank
-                            
-                            # Add neutral industries (all standard industries not seen)
-                            for industry in all_standard_industries:
-                                if industry not in ranking_map:
-                                    ranking_map[industry] = 0
-                            
-                            # Find min/max for conditional formatting
-                            rank_values = list(ranking_map.values())
-                            max_rank = max(rank_values)
-                            min_rank = min(rank_values)
-                            
-                            # Store month data
-                            month_rankings.append({
-                                'month': month,
-                                'rankings': ranking_map,
-                                'max_rank': max_rank,
-                                'min_rank': min_rank
-                            })
-                        else:
-                            # No data for this month
-                            neutral_map = {industry: 0 for industry in all_standard_industries}
-                            month_rankings.append({
-                                'month': month,
-                                'rankings': neutral_map,
-                                'max_rank': 0,
-                                'min_rank': 0
-                            })
-                            
-                    except Exception as e:
-                        logger.error(f"Error processing rankings for {month}: {str(e)}")
-                        # Create neutral rankings as fallback
+                            if category == pos_category:
+                                pos_industries.append((std_industry, i))
+                            elif category == neg_category:
+                                neg_industries.append((std_industry, i))
+                        
+                        # Build the full ranking map
+                        ranking_map = {}
+                        
+                        # Positive industries get positive ranks (highest first)
+                        for i, (industry, order) in enumerate(pos_industries):
+                            rank = len(pos_industries) - i
+                            ranking_map[industry] = rank
+                        
+                        # Negative industries get negative ranks (most negative last)
+                        neg_industries.reverse()  # Reverse to maintain original DBs order
+                        for i, (industry, order) in enumerate(neg_industries):
+                            rank = -1 - i
+                            ranking_map[industry] = rank
+                        
+                        # Add neutral industries (all standard industries not seen)
+                        for industry in all_standard_industries:
+                            if industry not in ranking_map:
+                                ranking_map[industry] = 0
+                        
+                        # Find min/max for conditional formatting
+                        rank_values = list(ranking_map.values())
+                        max_rank = max(rank_values)
+                        min_rank = min(rank_values)
+                        
+                        # Store month data
+                        month_rankings.append({
+                            'month': month,
+                            'rankings': ranking_map,
+                            'max_rank': max_rank,
+                            'min_rank': min_rank
+                        })
+                    else:
+                        # No data for this month
                         neutral_map = {industry: 0 for industry in all_standard_industries}
                         month_rankings.append({
                             'month': month,
@@ -4214,202 +4130,193 @@ class GoogleSheetsFormatterTool(BaseTool):
                             'min_rank': 0
                         })
                         
-                # Create header row for REFERENCE column and all months
-                header_row = ["REFERENCE"]  # First column is REFERENCE
-                for month in months:
-                    header_row.append(month)  # Month column
-                    header_row.append("Rank")  # Rank column
+                except Exception as e:
+                    logger.error(f"Error processing rankings for {month}: {str(e)}")
+                    # Create neutral rankings as fallback
+                    neutral_map = {industry: 0 for industry in all_standard_industries}
+                    month_rankings.append({
+                        'month': month,
+                        'rankings': neutral_map,
+                        'max_rank': 0,
+                        'min_rank': 0
+                    })
                     
-                all_rows.append(header_row)
-                current_row += 1
+            # Create header row for REFERENCE column and all months
+            header_row = ["REFERENCE"]  # First column is REFERENCE
+            for month in months:
+                header_row.append(month)  # Month column
+                header_row.append("Rank")  # Rank column
                 
-                # Add formatting for header row
-                formatting_requests.append({
-                    "repeatCell": {
-                        "range": {
-                            "sheetId": tab_id,
-                            "startRowIndex": current_row - 1,
-                            "endRowIndex": current_row,
-                            "startColumnIndex": 0,
-                            "endColumnIndex": len(month_rankings) * 2 + 1
-                        },
-                        "cell": {
-                            "userEnteredFormat": {
-                                "textFormat": {
-                                    "bold": True
-                                }
+            all_rows.append(header_row)
+            current_row += 1
+            
+            # Add formatting for header row
+            formatting_requests.append({
+                "repeatCell": {
+                    "range": {
+                        "sheetId": tab_id,
+                        "startRowIndex": current_row - 1,
+                        "endRowIndex": current_row,
+                        "startColumnIndex": 0,
+                        "endColumnIndex": len(month_rankings) * 2 + 1
+                    },
+                    "cell": {
+                        "userEnteredFormat": {
+                            "textFormat": {
+                                "bold": True
                             }
-                        },
-                        "fields": "userEnteredFormat.textFormat.bold"
-                    }
-                })
+                        }
+                    },
+                    "fields": "userEnteredFormat.textFormat.bold"
+                }
+            })
 
-                # For each month, add conditional formatting for the rank column
-                for month_idx, month_data in enumerate(month_rankings):
-                    # Add conditional formatting for the rank column if there's a spread between min and max
-                    if month_data['max_rank'] != month_data['min_rank']:
-                        formatting_requests.append({
-                            "addConditionalFormatRule": {
-                                "rule": {
-                                    "ranges": [
-                                        {
-                                            "sheetId": tab_id,
-                                            "startRowIndex": current_row,
-                                            "endRowIndex": current_row + len(all_standard_industries),
-                                            "startColumnIndex": month_idx * 2 + 2,  # Rank column
-                                            "endColumnIndex": month_idx * 2 + 3
-                                        }
-                                    ],
-                                    "gradientRule": {
-                                        "minpoint": {
-                                            "color": {
-                                                "red": 0.9,
-                                                "green": 0.2,
-                                                "blue": 0.2
-                                            },
-                                            "type": "NUMBER",
-                                            "value": str(month_data['min_rank'])
+            # For each month, add conditional formatting for the rank column
+            for month_idx, month_data in enumerate(month_rankings):
+                # Add conditional formatting for the rank column if there's a spread between min and max
+                if month_data['max_rank'] != month_data['min_rank']:
+                    formatting_requests.append({
+                        "addConditionalFormatRule": {
+                            "rule": {
+                                "ranges": [
+                                    {
+                                        "sheetId": tab_id,
+                                        "startRowIndex": current_row,
+                                        "endRowIndex": current_row + len(all_standard_industries),
+                                        "startColumnIndex": month_idx * 2 + 2,  # Rank column
+                                        "endColumnIndex": month_idx * 2 + 3
+                                    }
+                                ],
+                                "gradientRule": {
+                                    "minpoint": {
+                                        "color": {
+                                            "red": 0.9,
+                                            "green": 0.2,
+                                            "blue": 0.2
                                         },
-                                        "midpoint": {
-                                            "color": {
-                                                "red": 1.0,
-                                                "green": 1.0,
-                                                "blue": 0.2
-                                            },
-                                            "type": "NUMBER",
-                                            "value": "0"
+                                        "type": "NUMBER",
+                                        "value": str(month_data['min_rank'])
+                                    },
+                                    "midpoint": {
+                                        "color": {
+                                            "red": 1.0,
+                                            "green": 1.0,
+                                            "blue": 0.2
                                         },
-                                        "maxpoint": {
-                                            "color": {
-                                                "red": 0.2,
-                                                "green": 0.9,
-                                                "blue": 0.2
-                                            },
-                                            "type": "NUMBER",
-                                            "value": str(month_data['max_rank'])
-                                        }
+                                        "type": "NUMBER",
+                                        "value": "0"
+                                    },
+                                    "maxpoint": {
+                                        "color": {
+                                            "red": 0.2,
+                                            "green": 0.9,
+                                            "blue": 0.2
+                                        },
+                                        "type": "NUMBER",
+                                        "value": str(month_data['max_rank'])
                                     }
-                                },
-                                "index": index_num * len(months) + month_idx
-                            }
-                        })
+                                }
+                            },
+                            "index": index_num * len(months) + month_idx
+                        }
+                    })
 
-                # Create the REFERENCE column with alphabetically sorted industries
-                reference_industries = sorted(all_standard_industries)
+            # Create the REFERENCE column with alphabetically sorted industries
+            reference_industries = sorted(all_standard_industries)
+            
+            # For each month, pre-sort the industries by rank before adding to rows
+            # This replaces the sort requests approach
+            for month_idx, month_data in enumerate(month_rankings):
+                rankings = month_data['rankings']
                 
-                # For each month, pre-sort the industries by rank before adding to rows
-                # This replaces the sort requests approach
-                for month_idx, month_data in enumerate(month_rankings):
-                    rankings = month_data['rankings']
-                    
-                    # Sort industries by rank for this month (descending order)
-                    month_sorted_industries = sorted(
-                        all_standard_industries,
-                        key=lambda ind: rankings.get(ind, 0),
-                        reverse=True  # Highest rank first
-                    )
-                    
-                    # Prepare data for this month's columns
-                    month_column_data = []
-                    for industry in month_sorted_industries:
-                        rank = rankings.get(industry, 0)
-                        month_column_data.append({
-                            'industry': industry,
-                            'rank': rank
-                        })
-                    
-                    # Store the sorted data for this month
-                    month_data['sorted_data'] = month_column_data
+                # Sort industries by rank for this month (descending order)
+                month_sorted_industries = sorted(
+                    all_standard_industries,
+                    key=lambda ind: rankings.get(ind, 0),
+                    reverse=True  # Highest rank first
+                )
                 
-                # Now create rows with REFERENCE and all months' data
-                for i, ref_industry in enumerate(reference_industries):
-                    row = [ref_industry]  # Start with reference industry
-                    
-                    # Add data for each month
-                    for month_data in month_rankings:
-                        # Get the i-th sorted industry for this month
-                        month_sorted = month_data['sorted_data']
-                        if i < len(month_sorted):
-                            row.append(month_sorted[i]['industry'])
-                            row.append(month_sorted[i]['rank'])
-                        else:
-                            # Fallback if somehow there are fewer industries
-                            row.append("")
-                            row.append("")
-                    
-                    all_rows.append(row)
-                    current_row += 1
+                # Prepare data for this month's columns
+                month_column_data = []
+                for industry in month_sorted_industries:
+                    rank = rankings.get(industry, 0)
+                    month_column_data.append({
+                        'industry': industry,
+                        'rank': rank
+                    })
                 
-                # Add blank row between indices
-                all_rows.append([""])
-                current_row += 1
+                # Store the sorted data for this month
+                month_data['sorted_data'] = month_column_data
+            
+            # Now create rows with REFERENCE and all months' data
+            for i, ref_industry in enumerate(reference_industries):
+                row = [ref_industry]  # Start with reference industry
                 
-                # Add borders, freeze first row and column
-                formatting_requests.append({
-                    "updateBorders": {
-                        "range": {
-                            "sheetId": tab_id,
-                            "startRowIndex": section_start_row,
-                            "endRowIndex": current_row - 1,  # Exclude the blank row
-                            "startColumnIndex": 0,
-                            "endColumnIndex": len(months) * 2 + 1
-                        },
-                        "top": {"style": "SOLID"},
-                        "bottom": {"style": "SOLID"},
-                        "left": {"style": "SOLID"},
-                        "right": {"style": "SOLID"},
-                        "innerHorizontal": {"style": "SOLID"},
-                        "innerVertical": {"style": "SOLID"}
-                    }
-                })
+                # Add data for each month
+                for month_data in month_rankings:
+                    # Get the i-th sorted industry for this month
+                    month_sorted = month_data['sorted_data']
+                    if i < len(month_sorted):
+                        row.append(month_sorted[i]['industry'])
+                        row.append(month_sorted[i]['rank'])
+                    else:
+                        # Fallback if somehow there are fewer industries
+                        row.append("")
+                        row.append("")
+                
+                all_rows.append(row)
+                current_row += 1
+            
+            # Add blank row between indices
+            all_rows.append([""])
+            current_row += 1
             
-            # Freeze header rows and first column for entire sheet
+            # Add borders, freeze first row and column
             formatting_requests.append({
-                "updateSheetProperties": {
-                    "properties": {
+                "updateBorders": {
+                    "range": {
                         "sheetId": tab_id,
-                        "gridProperties": {
-                            "frozenRowCount": 2,  # Freeze index header and month headers
-                            "frozenColumnCount": 1  # Freeze industry name column
-                        }
+                        "startRowIndex": section_start_row,
+                        "endRowIndex": current_row - 1,  # Exclude the blank row
+                        "startColumnIndex": 0,
+                        "endColumnIndex": len(months) * 2 + 1
                     },
-                    "fields": "gridProperties.frozenRowCount,gridProperties.frozenColumnCount"
+                    "top": {"style": "SOLID"},
+                    "bottom": {"style": "SOLID"},
+                    "left": {"style": "SOLID"},
+                    "right": {"style": "SOLID"},
+                    "innerHorizontal": {"style": "SOLID"},
+                    "innerVertical": {"style": "SOLID"}
                 }
             })
-            
-            # Auto-resize columns
-            formatting_requests.append({
-                "autoResizeDimensions": {
-                    "dimensions": {
-                        "sheetId": tab_id,
-                        "dimension": "COLUMNS",
-                        "startIndex": 0,
-                        "endIndex": len(months) * 2 + 1
+        
+        # Freeze header rows and first column for entire sheet
+        formatting_requests.append({
+            "updateSheetProperties": {
+                "properties": {
+                    "sheetId": tab_id,
+                    "gridProperties": {
+                        "frozenRowCount": 2,  # Freeze index header and month headers
+                        "frozenColumnCount": 1  # Freeze industry name column
                     }
+                },
+                "fields": "gridProperties.frozenRowCount,gridProperties.frozenColumnCount"
+            }
+        })
+        
+        # Auto-resize columns
+        formatting_requests.append({
+            "autoResizeDimensions": {
+                "dimensions": {
+                    "sheetId": tab_id,
+                    "dimension": "COLUMNS",
+                    "startIndex": 0,
+                    "endIndex": len(months) * 2 + 1
                 }
-            })
-            
-             # Update the sheet with our pre-sorted data
-            service.spreadsheets().values().update(
-                spreadsheetId=sheet_id,
-                range=f"'{tab_name}'!A1",
-                valueInputOption="RAW",
-                body={"values": all_rows}
-            ).execute()
-            
-            # Apply formatting (but not sorting requests)
-            if formatting_requests:
-                service.spreadsheets().batchUpdate(
-                    spreadsheetId=sheet_id,
-                    body={"requests": formatting_requests}
-                ).execute()
-            
-            logger.info(f"Successfully created/updated '{tab_name}' tab")
-            return True
-        except Exception as e:
-            logger.error(f"Error creating {report_type} numerical growth tab: {str(e)}")
-            logger.error(traceback.format_exc())
-            return False
+            }
+        })
+        
+        return all_rows, formatting_requests
 
     def _standardize_industry_name(self, industry_name, standardization_map, standard_industry_list):
         """
@@ -7,106 +7,112 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
-import sqlite3
+import threading
 from datetime import datetime
 
-import openai
+import db_utils
 
 from . import config, search_utils, search_utils_async
 
 # --------------------------------------------------------------------------- #
-# Logging & OpenAI setup
+# Logging setup (openai is imported when an insight is generated)
 # --------------------------------------------------------------------------- #
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
-openai.api_key = config.OPENAI_API_KEY
+
+# Database paths whose web_insights table has already been created in this process
+_tables_created: set[str] = set()
+_tables_lock = threading.Lock()
 
 
 class WebEnhancedInsightGenerator:
     """Generate insights that combine ISM data with fresh web evidence."""
 
     def __init__(self, db_path: str | None = None) -> None:
-        self.db_path = db_path or config.ISM_DB_PATH
-        self.conn = self._get_db_connection()
-        self._create_insights_table()
+        self.db_path = db_path or db_utils.DATABASE_PATH
+        with _tables_lock:
+            if self.db_path not in _tables_created:
+                self._create_insights_table()
+                _tables_created.add(self.db_path)
 
     # ---------------------  DB helpers  --------------------- #
     def _get_db_connection(self):
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+        """Pooled connection shared with db_utils; use as a context manager."""
+        return db_utils.db_connection(self.db_path)
 
     def _create_insights_table(self):
-        cur = self.conn.cursor()
-        cur.execute(
-            """
-        CREATE TABLE IF NOT EXISTS web_insights (
-            insight_id TEXT PRIMARY KEY,
-            report_date DATE NOT NULL,
-            index_name TEXT NOT NULL,
-            trend_description TEXT NOT NULL,
-            search_queries TEXT NOT NULL,
-            evidence TEXT NOT NULL,
-            analysis TEXT NOT NULL,
-            investment_implications TEXT NOT NULL,
-            created_at DATETIME NOT NULL
-        )"""
-        )
-        cur.execute(
-            "CREATE INDEX IF NOT EXISTS idx_web_insights_date ON web_insights(report_date)"
-        )
-        self.conn.commit()
+        with self._get_db_connection() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                """
+            CREATE TABLE IF NOT EXISTS web_insights (
+                insight_id TEXT PRIMARY KEY,
+                report_date DATE NOT NULL,
+                index_name TEXT NOT NULL,
+                trend_description TEXT NOT NULL,
+                search_queries TEXT NOT NULL,
+                evidence TEXT NOT NULL,
+                analysis TEXT NOT NULL,
+                investment_implications TEXT NOT NULL,
+                created_at DATETIME NOT NULL
+            )"""
+            )
+            cur.execute(
+                "CREATE INDEX IF NOT EXISTS idx_web_insights_date ON web_insights(report_date)"
+            )
+            conn.commit()
 
     # -------------------  Trend detection  ------------------ #
     def identify_significant_trends(self, months_to_analyze: int = 2) -> list[dict]:
         try:
-            cur = self.conn.cursor()
-            cur.execute(
-                "SELECT report_date, month_year FROM reports ORDER BY report_date DESC LIMIT ?",
-                (months_to_analyze,),
-            )
-            rows = [dict(r) for r in cur.fetchall()]
-            if len(rows) < 2:
-                return []
-
-            curr, prev = rows[0], rows[1]
-
-            def indices_for(date):
+            with self._get_db_connection() as conn:
+                cur = conn.cursor()
                 cur.execute(
-                    """
-                    SELECT index_name,index_value,direction
-                    FROM pmi_indices WHERE report_date=?""",
-                    (date,),
+                    "SELECT report_date, month_year FROM reports ORDER BY report_date DESC LIMIT ?",
+                    (months_to_analyze,),
                 )
-                return {r["index_name"]: dict(r) for r in cur.fetchall()}
-
-            curr_idx, prev_idx = indices_for(curr["report_date"]), indices_for(prev["report_date"])
-
-            trends = []
-            for name, cd in curr_idx.items():
-                if name not in prev_idx:
-                    continue
-                cv, pv = float(cd["index_value"]), float(prev_idx[name]["index_value"])
-                change = cv - pv
-                if abs(change) >= config.SIGNIFICANT_CHANGE_THRESHOLD:
-                    desc = (
-                        f"{name} rose {abs(change):.1f} points to {cv:.1f} in {curr['month_year']}"
-                        if change > 0
-                        else f"{name} fell {abs(change):.1f} points to {cv:.1f} in {curr['month_year']}"
-                    )
-                    trends.append(
-                        {
-                            "index_name": name,
-                            "current_value": cv,
-                            "previous_value": pv,
-                            "change": change,
-                            "direction": cd["direction"],
-                            "month_year": curr["month_year"],
-                            "report_date": curr["report_date"],
-                            "description": desc,
-                        }
+                rows = [dict(r) for r in cur.fetchall()]
+                if len(rows) < 2:
+                    return []
+
+                curr, prev = rows[0], rows[1]
+
+                def indices_for(date):
+                    cur.execute(
+                        """
+                        SELECT index_name,index_value,direction
+                        FROM pmi_indices WHERE report_date=?""",
+                        (date,),
                     )
-            return sorted(trends, key=lambda t: abs(t["change"]), reverse=True)
+                    return {r["index_name"]: dict(r) for r in cur.fetchall()}
+
+                curr_idx, prev_idx = indices_for(curr["report_date"]), indices_for(prev["report_date"])
+
+                trends = []
+                for name, cd in curr_idx.items():
+                    if name not in prev_idx:
+                        continue
+                    cv, pv = float(cd["index_value"]), float(prev_idx[name]["index_value"])
+                    change = cv - pv
+                    if abs(change) >= config.SIGNIFICANT_CHANGE_THRESHOLD:
+                        desc = (
+                            f"{name} rose {abs(change):.1f} points to {cv:.1f} in {curr['month_year']}"
+                            if change > 0
+                            else f"{name} fell {abs(change):.1f} points to {cv:.1f} in {curr['month_year']}"
+                        )
+                        trends.append(
+                            {
+                                "index_name": name,
+                                "current_value": cv,
+                                "previous_value": pv,
+                                "change": change,
+                                "direction": cd["direction"],
+                                "month_year": curr["month_year"],
+                                "report_date": curr["report_date"],
+                                "description": desc,
+                            }
+                        )
+                return sorted(trends, key=lambda t: abs(t["change"]), reverse=True)
         except Exception as exc:
             logger.error("identify_trends error: %s", exc)
             return []
@@ -170,6 +176,7 @@ Required JSON schema:
 **Key Evidence**  
 {evidence_block}
 """
+        import openai
         client = openai.OpenAI(api_key=config.OPENAI_API_KEY)
         resp = client.chat.completions.create(
             model=config.OPENAI_MODEL,
@@ -239,69 +246,73 @@ Required JSON schema:
 
     def _store_insight(self, ins: dict) -> None:
         try:
-            cur = self.conn.cursor()
-            cur.execute(
-                """
-            INSERT INTO web_insights (
-              insight_id, report_date, index_name, trend_description,
-              search_queries, evidence, analysis, investment_implications,
-              current_value, previous_value, change,
-              created_at
-
-            ) VALUES (?,?,?,?,?,?,?,?,?,?,?,?)""",
-                (
-                    ins["insight_id"],
-                    ins["report_date"],
-                    ins["index_name"],
-                    ins["description"],
-                    json.dumps(ins["search_queries"]),
-                    json.dumps(ins["evidence"]),
-                    ins["analysis"],
-                    json.dumps(ins["investment_implications"]),
-                    ins["current_value"],
-                    ins["previous_value"],
-                    ins["change"],
-                    datetime.now().isoformat(),
-                ),
-            )
-            self.conn.commit()
-            logger.info("Insight stored %s", ins["insight_id"])
+            with self._get_db_connection() as conn:
+                cur = conn.cursor()
+                cur.execute(
+                    """
+                INSERT INTO web_insights (
+                  insight_id, report_date, index_name, trend_description,
+                  search_queries, evidence, analysis, investment_implications,
+                  current_value, previous_value, change,
+                  created_at
+
+                ) VALUES (?,?,?,?,?,?,?,?,?,?,?,?)""",
+                    (
+                        ins["insight_id"],
+                        ins["report_date"],
+                        ins["index_name"],
+                        ins["description"],
+                        json.dumps(ins["search_queries"]),
+                        json.dumps(ins["evidence"]),
+                        ins["analysis"],
+                        json.dumps(ins["investment_implications"]),
+                        ins["current_value"],
+                        ins["previous_value"],
+                        ins["change"],
+                        datetime.now().isoformat(),
+                    ),
+                )
+                conn.commit()
+                logger.info("Insight stored %s", ins["insight_id"])
         except Exception as exc:
             logger.error("Store insight error: %s", exc)
 
     # ------------------- Retrieval helpers ------------------ #
     def get_all_insights(self, limit: int = 10) -> list[dict]:
-        cur = self.conn.cursor()
-        cur.execute(
-            "SELECT * FROM web_insights ORDER BY created_at DESC LIMIT ?", (limit,)
-        )
-        rows = [dict(r) for r in cur.fetchall()]
-        for r in rows:
+        with self._get_db_connection() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                "SELECT * FROM web_insights ORDER BY created_at DESC LIMIT ?", (limit,)
+            )
+            rows = [dict(r) for r in cur.fetchall()]
+            for r in rows:
+                r["search_queries"] = json.loads(r["search_queries"])
+                r["evidence"] = json.loads(r["evidence"])
+                r["investment_implications"] = json.loads(r["investment_implications"])
+                # SQLite returns None for the new REAL columns when reading old rows;
+                # guard so pills don’t blow up
+                for k in ("current_value", "previous_value", "change"):
+                    r[k] = float(r.get(k) or 0)
+            return rows
+
+    def get_insight(self, iid: str) -> dict | None:
+        with self._get_db_connection() as conn:
+            cur = conn.cursor()
+            cur.execute("SELECT * FROM web_insights WHERE insight_id=?", (iid,))
+            row = cur.fetchone()
+            if not row:
+                return None
+            r = dict(row)
             r["search_queries"] = json.loads(r["search_queries"])
             r["evidence"] = json.loads(r["evidence"])
             r["investment_implications"] = json.loads(r["investment_implications"])
-            # SQLite returns None for the new REAL columns when reading old rows;
-            # guard so pills don’t blow up
             for k in ("current_value", "previous_value", "change"):
                 r[k] = float(r.get(k) or 0)
-        return rows
-
-    def get_insight(self, iid: str) -> dict | None:
-        cur = self.conn.cursor()
-        cur.execute("SELECT * FROM web_insights WHERE insight_id=?", (iid,))
-        row = cur.fetchone()
-        if not row:
-            return None
-        r = dict(row)
-        r["search_queries"] = json.loads(r["search_queries"])
-        r["evidence"] = json.loads(r["evidence"])
-        r["investment_implications"] = json.loads(r["investment_implications"])
-        for k in ("current_value", "previous_value", "change"):
-            r[k] = float(r.get(k) or 0)
-        return r
+            return r
 
     def delete_insight(self, iid: str) -> bool:
-        cur = self.conn.cursor()
-        cur.execute("DELETE FROM web_insights WHERE insight_id=?", (iid,))
-        self.conn.commit()
-        return cur.rowcount > 0
+        with self._get_db_connection() as conn:
+            cur = conn.cursor()
+            cur.execute("DELETE FROM web_insights WHERE insight_id=?", (iid,))
+            conn.commit()
+            return cur.rowcount > 0